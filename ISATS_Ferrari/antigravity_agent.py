@@ -32,6 +32,8 @@ if sys.platform == "win32":
 # 프로젝트 루트
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.keyword_matcher import KeywordMatcher
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 선택적 임포트
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -57,6 +59,11 @@ except ImportError:
 class ReportSkill:
     """투자 조언 보고서 생성 스킬"""
     
+    NEWS_MATCHER = KeywordMatcher({
+        "negative": ['하락', '급락', '악재', '손실', '적자', '위험'],
+        "positive": ['상승', '급등', '호재', '수익', '흑자', '성장'],
+    })
+    
     def __init__(self):
         pass
     
@@ -188,22 +195,9 @@ class ReportSkill:
         # 2. 뉴스 감성 분석
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        negative_keywords = ['하락', '급락', '악재', '손실', '적자', '위험']
-        positive_keywords = ['상승', '급등', '호재', '수익', '흑자', '성장']
-        
-        negative_count = 0
-        positive_count = 0
-        
-        for n in news:
-            title = n.get('title', '').lower()
-            
-            for keyword in negative_keywords:
-                if keyword in title:
-                    negative_count += 1
-            
-            for keyword in positive_keywords:
-                if keyword in title:
-                    positive_count += 1
+        counts = self.NEWS_MATCHER.totals(n.get('title', '').lower() for n in news)
+        negative_count = counts['negative']
+        positive_count = counts['positive']
         
         # 뉴스 기반 신뢰도 조정
         if negative_count > positive_count and action == "HOLD":
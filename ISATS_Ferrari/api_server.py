@@ -1,12 +1,17 @@
 import asyncio
+import itertools
 import json
 import os
+import time
+from collections import OrderedDict
 import pandas as pd
 import uvicorn
 import redis.asyncio as redis
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
+from core.stream_publisher import decode_frame
+
 # ==========================================
 # ISATS WebSocket API Server
 # 역할: Redis Pub/Sub 데이터를 WebSocket 클라이언트로 중계
@@ -23,26 +28,140 @@ app.add_middleware(
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379")
 
+# 종목별 최신 상태만 의미가 있는 메시지 타입 (밀린 클라이언트는 최신값으로 덮어씀)
+# log / ai_signal 등 개별 이벤트는 병합하지 않음
+COALESCE_TYPES = {"price", "quote", "tick", "state"}
+
+class ClientChannel:
+    """클라이언트별 전송 큐 (최대 깊이 제한 + 밀린 경우에만 종목별 최신 상태 병합)"""
+    def __init__(self, websocket: WebSocket, max_depth: int, stall_after: float = 0.5):
+        self.websocket = websocket
+        self.max_depth = max_depth
+        self.stall_after = stall_after  # 전송 1건이 이 시간을 넘기면 밀린 클라이언트로 간주
+        self.queue: OrderedDict = OrderedDict()  # seq -> (message, key)
+        self.latest: dict = {}  # key -> 대기 중인 최신 seq
+        self.ready = asyncio.Event()
+        self.sending_since = None
+        self.dropped = 0
+        self.coalesced = 0
+        self.task = None
+        self._seq = itertools.count()
+
+    @property
+    def backlogged(self) -> bool:
+        """큐가 가득 찼거나 진행 중인 전송이 stall_after 이상 걸리는 경우"""
+        if len(self.queue) >= self.max_depth:
+            return True
+        return self.sending_since is not None and time.monotonic() - self.sending_since >= self.stall_after
+
+    def push(self, message: str, key=None):
+        """논블로킹 적재 (밀린 상태에서 key가 같으면 대기 중인 메시지를 최신값으로 교체)"""
+        seq = self.latest.get(key) if key is not None else None
+        if seq is not None and self.backlogged:
+            self.queue[seq] = (message, key)
+            self.coalesced += 1
+        else:
+            seq = next(self._seq)
+            self.queue[seq] = (message, key)
+            if key is not None:
+                self.latest[key] = seq
+
+        # 최대 깊이 초과 시 가장 오래된 상태 메시지부터 폐기 (없으면 가장 오래된 메시지)
+        while len(self.queue) > self.max_depth:
+            victim = next((s for s, (_, k) in self.queue.items() if k is not None), None)
+            if victim is None:
+                victim = next(iter(self.queue))
+            self._forget(victim, self.queue.pop(victim)[1])
+            self.dropped += 1
+
+        self.ready.set()
+
+    def pop(self):
+        seq, (message, key) = self.queue.popitem(last=False)
+        self._forget(seq, key)
+        if not self.queue:
+            self.ready.clear()
+        return message
+
+    def _forget(self, seq, key):
+        if key is not None and self.latest.get(key) == seq:
+            del self.latest[key]
+
+
 class ConnectionManager:
     """WebSocket 연결 관리 및 메시지 브로드캐스트 담당"""
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
+    def __init__(self, max_queue_depth: int = 256, send_timeout: float = 5.0):
+        self.active_connections: dict[WebSocket, ClientChannel] = {}
+        self.max_queue_depth = max_queue_depth
+        self.send_timeout = send_timeout  # 이 시간 동안 전송이 안 되면 느린 클라이언트로 간주하고 종료
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        channel = ClientChannel(websocket, self.max_queue_depth)
+        channel.task = asyncio.create_task(self._sender(channel))
+        self.active_connections[websocket] = channel
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        channel = self.active_connections.pop(websocket, None)
+        if channel and channel.task and channel.task is not asyncio.current_task():
+            channel.task.cancel()
 
-    async def broadcast(self, message: str):
-        # 연결된 모든 클라이언트에 메시지 전송
-        for connection in self.active_connections[:]:
+    async def _sender(self, channel: ClientChannel):
+        """클라이언트 전용 전송 루프 (다른 클라이언트와 독립적으로 동시 전송)"""
+        try:
+            while True:
+                await channel.ready.wait()
+                message = channel.pop()
+                channel.sending_since = time.monotonic()
+                await asyncio.wait_for(channel.websocket.send_text(message), self.send_timeout)
+                channel.sending_since = None
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.disconnect(channel.websocket)
             try:
-                await connection.send_text(message)
+                await channel.websocket.close()
             except Exception:
-                self.disconnect(connection)
+                pass
+
+    @staticmethod
+    def _coalesce_key(packet):
+        """병합 키 산출: (타입, 종목) — 상태성 메시지만 해당"""
+        if not isinstance(packet, dict):
+            return None
+        data = packet.get("data")
+        if packet.get("type") in COALESCE_TYPES and isinstance(data, dict) and data.get("ticker"):
+            return (packet["type"], data["ticker"])
+        return None
+
+    def send_personal(self, websocket: WebSocket, message: str):
+        channel = self.active_connections.get(websocket)
+        if channel:
+            channel.push(message)
+
+    async def broadcast(self, message: str):
+        try:
+            packet = json.loads(message)
+        except ValueError:
+            packet = None
+        self._fan_out(message, self._coalesce_key(packet))
+
+    async def broadcast_packet(self, packet: dict):
+        """이미 디코딩된 패킷 전송 (JSON 직렬화는 1회만 수행)"""
+        self._fan_out(json.dumps(packet, ensure_ascii=False), self._coalesce_key(packet))
+
+    def _fan_out(self, message: str, key):
+        # 클라이언트별 큐에 적재만 수행 (전송은 각 _sender 태스크가 병렬로 처리)
+        for channel in list(self.active_connections.values()):
+            channel.push(message, key)
+
+    def stats(self):
+        return {
+            "clients": len(self.active_connections),
+            "queued": sum(len(c.queue) for c in self.active_connections.values()),
+            "dropped": sum(c.dropped for c in self.active_connections.values()),
+            "coalesced": sum(c.coalesced for c in self.active_connections.values()),
+        }
 
 manager = ConnectionManager()
 
@@ -52,16 +171,22 @@ async def startup_event():
     asyncio.create_task(redis_listener())
 
 async def redis_listener():
-    """Redis 'isats_stream' 채널 구독 및 메시지 브로드캐스팅"""
+    """Redis 'isats_stream' 채널 구독 및 메시지 브로드캐스팅 (배치 프레임은 개별 패킷으로 복원)"""
     try:
-        r = redis.from_url(REDIS_URL, decode_responses=True)
+        # 감시자는 msgpack 바이너리 프레임을 전송하므로 원시 바이트로 수신
+        r = redis.from_url(REDIS_URL, decode_responses=False)
         pubsub = r.pubsub()
         await pubsub.subscribe("isats_stream")
         print("[API] Redis Connected. Listening for messages...")
         
         async for message in pubsub.listen():
             if message["type"] == "message":
-                await manager.broadcast(message["data"])
+                try:
+                    packets = decode_frame(message["data"])
+                except Exception:
+                    continue
+                for packet in packets:
+                    await manager.broadcast_packet(packet)
     except Exception as e:
         print(f"[API Error] Redis Connection Failed: {e}")
 
@@ -77,7 +202,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 df = pd.read_csv(target_path)
                 # 상위 20개 종목 정보 전송
                 targets = df.head(20).to_dict(orient='records')
-                await websocket.send_text(json.dumps({"type": "target_list", "data": targets}))
+                manager.send_personal(websocket, json.dumps({"type": "target_list", "data": targets}))
             except Exception as e:
                 print(f"[API] Target list load error: {e}")
 
@@ -87,6 +212,14 @@ async def websocket_endpoint(websocket: WebSocket):
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
+    except Exception:
+        # 느린 클라이언트로 판정되어 서버 측에서 종료된 경우
+        manager.disconnect(websocket)
+
+@app.get("/ws/stats")
+async def websocket_stats():
+    """클라이언트 수 및 큐 적재/폐기/병합 통계"""
+    return manager.stats()
 
 if __name__ == "__main__":
     # 윈도우 환경 대응 및 서버 기동
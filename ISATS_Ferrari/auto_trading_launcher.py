@@ -21,6 +21,7 @@ import asyncio
 import argparse
 import logging
 from datetime import datetime, time
+from time import perf_counter_ns
 from typing import Dict, List, Optional
 
 # 프로젝트 경로 설정
@@ -30,9 +31,21 @@ if current_dir not in sys.path:
 
 import pandas as pd
 
+try:
+    import redis.asyncio as redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
 # ISATS 모듈 임포트
 from core.kis_official_api import KISUnifiedClient
 from strategy.active_bot import ActiveBot
+from core.quote_board import QuoteReader, FRESH_SECONDS, kis_price_output, normalize_ticker
+from core.target_universe import KR_DEFAULT_TARGETS  # 시세 공급 프로세스와 공유
+from core.state_store import StateStore
+from core.latency_tracer import (
+    tracer, STAGE_QUOTE, STAGE_ORDER, STAGE_FILL, STAGE_TICK_TO_DECISION, STAGE_TICK_TO_ORDER
+)
 
 # 로깅 설정
 logging.basicConfig(
@@ -158,11 +171,7 @@ class TargetManager:
     
     def _set_default_targets(self):
         """기본 관찰 종목 설정"""
-        self.targets = {
-            "S": ["005930", "000660", "035420"],  # 삼성전자, SK하이닉스, NAVER
-            "A": ["035720", "051910", "006400", "068270"],  # 카카오, LG화학, 삼성SDI, 셀트리온
-            "B": ["003550", "017670", "105560", "028260"],  # LG, SK텔레콤, KB금융, 삼성물산
-        }
+        self.targets = {rank: list(tickers) for rank, tickers in KR_DEFAULT_TARGETS.items()}
         logger.info("📋 기본 타겟 리스트 적용")
     
     def get_all_tickers(self) -> List[str]:
@@ -192,6 +201,9 @@ class AutoTradingEngine:
         self.bot: Optional[ActiveBot] = None
         self.target_manager = TargetManager()
         self.running = False
+        self.redis = None  # 텔레메트리 게시용 (선택)
+        self.state: Optional[StateStore] = None  # 종목/엔진 상태 Hash (대시보드 조회용)
+        self.quotes = QuoteReader()  # 공유 시세판 (시세 공급 프로세스 실행 시 API 호출 대체)
         
         # 거래 설정
         self.config = {
@@ -200,6 +212,9 @@ class AutoTradingEngine:
             "stop_loss_rate": 0.03,  # 손절 -3%
             "take_profit_rate": 0.05,  # 익절 +5%
             "scan_interval": 1.0,  # 스캔 주기 (초)
+            "telemetry_every": 10,  # 지연시간 통계 게시 주기 (스캔 횟수)
+            "fill_poll_interval": 1.0,  # 미체결 주문 체결 확인 주기 (초, 미체결 있을 때만)
+            "fill_timeout": 120.0,  # 미체결 추적 만료 (초) - 취소/거부 주문 정리
         }
         
         # 거래 상태
@@ -228,6 +243,16 @@ class AutoTradingEngine:
             # 3. 타겟 종목 로드
             self.target_manager.load_targets()
             
+            # 3.5. 텔레메트리 채널 (Redis 없으면 생략)
+            if HAS_REDIS:
+                try:
+                    self.redis = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
+                    await self.redis.ping()
+                    self.state = StateStore(self.redis)
+                except Exception as e:
+                    logger.warning(f"텔레메트리 Redis 연결 실패: {e}")
+                    self.redis = None
+            
             # 4. 현재 잔고 확인
             await self._sync_positions()
             
@@ -237,15 +262,17 @@ class AutoTradingEngine:
             logger.error(f"❌ 초기화 중 오류: {e}")
             return False
     
-    async def _sync_positions(self):
-        """현재 보유 포지션 동기화"""
+    async def _sync_positions(self, verbose: bool = True):
+        """현재 보유 포지션 동기화 + 미체결 주문 체결 확인"""
         try:
-            holdings, summary = self.client.get_balance()
+            holdings, summary = await asyncio.to_thread(self.client.get_balance)
+            held = set()
             
             if not holdings.empty:
                 for _, row in holdings.iterrows():
                     ticker = row.get("pdno", row.get("PDNO", ""))
                     if ticker:
+                        held.add(ticker)
                         self.positions[ticker] = {
                             "quantity": int(row.get("hldg_qty", row.get("HLDG_QTY", 0))),
                             "avg_price": float(row.get("pchs_avg_pric", row.get("PCHS_AVG_PRIC", 0))),
@@ -253,17 +280,50 @@ class AutoTradingEngine:
                             "profit_rate": float(row.get("evlu_pfls_rt", row.get("EVLU_PFLS_RT", 0))),
                         }
             
-            total_value = summary.get("tot_evlu_amt", summary.get("TOT_EVLU_AMT", 0))
-            logger.info(f"📊 현재 보유: {len(self.positions)}종목, 평가금액: {total_value:,}원")
+            # 미체결 주문 체결 확인 (매수: 잔고 등장, 매도: 잔고 소멸)
+            for ticker, order in list(self.pending_orders.items()):
+                filled = (ticker in held) if order["action"] == "BUY" else (ticker not in held)
+                elapsed_us = (perf_counter_ns() - order["submitted_ns"]) // 1000
+                if filled:
+                    tracer.record(STAGE_FILL, elapsed_us, ticker)
+                    del self.pending_orders[ticker]
+                elif elapsed_us > self.config["fill_timeout"] * 1_000_000:
+                    # 취소/거부/장기 미체결 → 추적 중단 (이후 체결되면 잔고 동기화로 반영)
+                    logger.warning(f"[{ticker}] {order['action']} 주문 {order.get('order_no') or ''} "
+                                   f"{self.config['fill_timeout']:.0f}초 내 체결 미확인 → 추적 만료")
+                    del self.pending_orders[ticker]
+            
+            if verbose:
+                total_value = summary.get("tot_evlu_amt", summary.get("TOT_EVLU_AMT", 0))
+                logger.info(f"📊 현재 보유: {len(self.positions)}종목, 평가금액: {total_value:,}원")
             
         except Exception as e:
             logger.warning(f"잔고 동기화 실패: {e}")
     
+    async def _watch_fills(self):
+        """
+        체결 확인 전용 루프 - 스캔 주기와 무관하게 미체결 주문이 있을 때만 짧은 간격으로 잔고 조회
+        (STAGE_FILL 오차 = fill_poll_interval 이내)
+        """
+        while self.running:
+            if self.pending_orders:
+                await self._sync_positions(verbose=False)
+            await asyncio.sleep(self.config["fill_poll_interval"])
+    
+    def _get_price_data(self, ticker: str) -> Dict:
+        """현재가 (공유 시세판 시세가 신선하면 사용, 아니면 API 조회)"""
+        quote = self.quotes.get(ticker, max_age=FRESH_SECONDS)
+        if quote:
+            return kis_price_output(quote)
+        return self.client.get_price(ticker)
+    
     async def _analyze_ticker(self, ticker: str, rank: str) -> Dict:
         """개별 종목 분석"""
         try:
             # 1. 현재가 조회
-            price_data = self.client.get_price(ticker)
+            tracer.start_trace(ticker)
+            with tracer.span(STAGE_QUOTE, ticker):
+                price_data = self._get_price_data(ticker)
             if not price_data:
                 return {"signal": "HOLD", "reason": "가격 조회 실패"}
             
@@ -296,6 +356,7 @@ class AutoTradingEngine:
             
             # 3. AI 봇 분석
             signal, reason, tp_rate = await self.bot.analyze(ticker, daily_df)
+            tracer.mark(ticker, STAGE_TICK_TO_DECISION)
             
             return {
                 "ticker": ticker,
@@ -340,15 +401,18 @@ class AutoTradingEngine:
                     return False
                 
                 # 매수 주문 실행
-                result = self.client.place_order(
-                    ticker=ticker,
-                    action="BUY",
-                    quantity=quantity,
-                    price=0,  # 시장가
-                    market="KR"
-                )
+                with tracer.span(STAGE_ORDER, ticker):
+                    result = self.client.place_order(
+                        ticker=ticker,
+                        action="BUY",
+                        quantity=quantity,
+                        price=0,  # 시장가
+                        market="KR"
+                    )
                 
                 if result.get("success"):
+                    tracer.finish_trace(ticker, STAGE_TICK_TO_ORDER)
+                    self.pending_orders[ticker] = {"action": "BUY", "order_no": result.get("order_no"), "submitted_ns": perf_counter_ns()}
                     logger.info(f"🟢 [BUY] {ticker} {quantity}주 @ 시장가 | 사유: {reason}")
                     self.trade_history.append({
                         "time": datetime.now().isoformat(),
@@ -373,15 +437,18 @@ class AutoTradingEngine:
                 quantity = position["quantity"]
                 
                 # 매도 주문 실행
-                result = self.client.place_order(
-                    ticker=ticker,
-                    action="SELL",
-                    quantity=quantity,
-                    price=0,  # 시장가
-                    market="KR"
-                )
+                with tracer.span(STAGE_ORDER, ticker):
+                    result = self.client.place_order(
+                        ticker=ticker,
+                        action="SELL",
+                        quantity=quantity,
+                        price=0,  # 시장가
+                        market="KR"
+                    )
                 
                 if result.get("success"):
+                    tracer.finish_trace(ticker, STAGE_TICK_TO_ORDER)
+                    self.pending_orders[ticker] = {"action": "SELL", "order_no": result.get("order_no"), "submitted_ns": perf_counter_ns()}
                     profit = (price - position["avg_price"]) * quantity
                     profit_rate = (price / position["avg_price"] - 1) * 100
                     logger.info(f"🔴 [SELL] {ticker} {quantity}주 @ 시장가 | 손익: {profit:+,.0f}원 ({profit_rate:+.2f}%) | 사유: {reason}")
@@ -410,7 +477,7 @@ class AutoTradingEngine:
         """손절/익절 체크"""
         for ticker, position in list(self.positions.items()):
             try:
-                price_data = self.client.get_price(ticker)
+                price_data = self._get_price_data(ticker)
                 if not price_data:
                     continue
                 
@@ -449,6 +516,7 @@ class AutoTradingEngine:
         logger.info("")
         logger.info("🔥 자동매매 시작! (Ctrl+C로 종료)")
         logger.info("=" * 60)
+        fill_watcher = asyncio.create_task(self._watch_fills())
         
         while self.running:
             try:
@@ -464,8 +532,10 @@ class AutoTradingEngine:
                     continue
                 
                 # S급 종목 분석 (최우선)
+                ticker_states = {}
                 for ticker in self.target_manager.targets["S"]:
                     analysis = await self._analyze_ticker(ticker, "S")
+                    ticker_states[ticker] = ("S", analysis)
                     if analysis.get("signal") != "HOLD":
                         logger.info(f"🎯 [S급] {ticker}: {analysis.get('signal')} - {analysis.get('reason')}")
                         await self._execute_signal(analysis)
@@ -474,6 +544,7 @@ class AutoTradingEngine:
                 # A급 종목 분석
                 for ticker in self.target_manager.targets["A"]:
                     analysis = await self._analyze_ticker(ticker, "A")
+                    ticker_states[ticker] = ("A", analysis)
                     if analysis.get("signal") != "HOLD":
                         logger.info(f"🔍 [A급] {ticker}: {analysis.get('signal')} - {analysis.get('reason')}")
                         await self._execute_signal(analysis)
@@ -482,10 +553,17 @@ class AutoTradingEngine:
                 # 손절/익절 체크
                 await self._check_stop_loss_take_profit()
                 
-                # 잔고 동기화 (10회마다)
+                # 잔고 동기화 (10회마다, 체결 확인은 _watch_fills가 별도 주기로 수행)
                 if scan_count % 10 == 0:
                     await self._sync_positions()
                 
+                # 종목/엔진 상태 게시 (바뀐 필드만, 1회 왕복)
+                await self._publish_state(ticker_states, scan_count)
+                
+                # 지연시간 통계 게시
+                if scan_count % self.config["telemetry_every"] == 0:
+                    await tracer.publish(self.redis)
+                
                 # 상태 출력 (30회마다)
                 if scan_count % 30 == 0:
                     logger.info(f"📊 스캔 #{scan_count} | 보유: {len(self.positions)}종목 | 금일 거래: {len(self.trade_history)}건")
@@ -500,8 +578,35 @@ class AutoTradingEngine:
                 logger.error(f"메인 루프 오류: {e}")
                 await asyncio.sleep(5)
         
+        fill_watcher.cancel()
         await self.shutdown()
     
+    async def _publish_state(self, ticker_states: Dict, scan_count: int):
+        """스캔 결과를 state:ticker:{종목} / state:engine:kr_launcher Hash에 반영"""
+        if self.state is None:
+            return
+        updates = {
+            normalize_ticker(ticker): {
+                "rank": rank,
+                "signal": analysis.get("signal", "HOLD"),
+                "reason": analysis.get("reason", ""),
+                "price": analysis.get("price"),
+                "held": ticker in self.positions,
+            }
+            for ticker, (rank, analysis) in ticker_states.items()
+        }
+        try:
+            await self.state.update_many("ticker", updates)
+            await self.state.update("engine", "kr_launcher", {
+                "mode": self.mode,
+                "scan_count": scan_count,
+                "positions": len(self.positions),
+                "trades_today": len(self.trade_history),
+                "updated": datetime.now().strftime("%H:%M:%S"),
+            })
+        except Exception as e:
+            logger.warning(f"상태 게시 실패: {e}")
+    
     async def shutdown(self):
         """엔진 종료"""
         self.running = False
@@ -19,13 +19,22 @@ import pandas as pd
 import numpy as np
 import random
 import os
+import sys
 import json
 import glob
+import math
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from tqdm import tqdm
 import warnings
 warnings.filterwarnings('ignore')
 
+# 프로젝트 루트 및 모듈 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.shared_frames import SharedFrame
+from core.sector_index import get_service
+from core.backtest_engine import backtest
+
 # ==========================================
 # 🧬 CONTEXT DNA (맥락 인식 유전자)
 # ==========================================
@@ -66,53 +75,111 @@ class ContextDNA:
 # ==========================================
 
 class SectorManager:
-    """가상의 섹터 지수 생성기"""
+    """섹터 지수 제공자 (core.sector_index 저장소 조회)"""
     
     def __init__(self, data_dir):
         self.data_dir = Path(data_dir)
         self.files = list(self.data_dir.glob("*.csv"))
         print(f"📂 [SectorManager] {len(self.files)}개 파일 발견")
+        # 최초 1회 빌드 후 data/<시장>/_sector/에 저장, 이후에는 변경분만 갱신
+        self.index_service = get_service(self.data_dir)
     
     def get_sector_index(self, target_file):
         """
-        타겟 종목을 제외한 나머지 종목들의 평균 등락률을 '섹터 지수'로 정의
-        
-        실전에서는:
-        - 반도체면 반도체 종목만 추려서 평균
-        - 2차전지면 2차전지 종목만 추려서 평균
+        타겟 종목이 속한 실제 업종(sector_map.json)의 동일가중 지수
         
-        여기서는 간소화를 위해 랜덤하게 5개 종목을 뽑아 섹터라고 가정
+        - 타겟 본인 수익률은 제외 (자기 자신과의 동조화로 인한 정보 누수 방지)
+        - 업종 정보가 없으면 시장 전체 그룹(ALL) 기준
         """
-        # 랜덤하게 5개 종목을 뽑아 섹터라고 가정
-        peers = random.sample(self.files, min(len(self.files), 5))
-        sector_df = pd.DataFrame()
-        
-        for p in peers:
-            if p == target_file:
-                continue
-            
+        return self.index_service.ticker_index(Path(target_file).stem, exclude_self=True)
+
+
+# ==========================================
+# ⚙️ EVALUATION KERNEL (직렬/병렬 공용)
+# ==========================================
+
+CONTEXT_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Sector']
+
+
+def resample_context(df_origin, timeframe):
+    """DNA 분봉으로 리샘플 + 섹터 추세선 (MA 설정과 무관 → 분봉별로 재사용)"""
+    df = df_origin.resample(timeframe).agg({
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum',
+        'Sector': 'last'
+    }).dropna()
+    
+    # 섹터 추세 (20일선 기준)
+    df['Sector_MA'] = df['Sector'].rolling(20).mean()
+    return df
+
+
+def backtest_context(dna, df):
+    """리샘플된 데이터로 DNA 백테스팅 (df는 수정하지 않음)"""
+    if len(df) < 60:
+        return -100
+    
+    ma_s = df['Close'].rolling(dna.ma_short).mean().values
+    ma_l = df['Close'].rolling(dna.ma_long).mean().values
+    
+    # 기본 조건: 단기선 > 장기선
+    entries = ma_s > ma_l
+    
+    # [맥락 필터] 섹터가 상승세인가?
+    if dna.use_sector_filter:
+        entries &= df['Sector'].values > df['Sector_MA'].values
+    
+    # 백테스팅 (종가 기준 익절/손절)
+    result = backtest(df['Close'].values, entries,
+                      take_profit=dna.take_profit, stop_loss=dna.stop_loss,
+                      stop_mode='close', start=dna.ma_long, initial_balance=100.0)
+    return result.balance - 100.0
+
+
+def score_dna(dna, frames, cache):
+    """
+    여러 종목에 대한 평균 점수 (종목 1개면 ContextTrainer.evaluate와 동일)
+    
+    Args:
+        frames: {종목명: 원본 DataFrame (Sector 컬럼 포함)}
+        cache: {(종목명, 분봉): 리샘플 결과 또는 None(실패)}
+    """
+    scores = []
+    for name, df_origin in frames.items():
+        key = (name, dna.timeframe)
+        if key not in cache:
             try:
-                df = pd.read_csv(p)
-                if 'Date' in df.columns:
-                    df['Date'] = pd.to_datetime(df['Date'])
-                    df.set_index('Date', inplace=True)
-                
-                # 종가만 가져와서 병합
-                if sector_df.empty:
-                    sector_df = df[['Close']].rename(columns={'Close': 'Peer1'})
-                else:
-                    # 인덱스 기준으로 병합 (날짜 매칭)
-                    temp = df[['Close']]
-                    sector_df = sector_df.join(temp, rsuffix=f'_{len(sector_df.columns)}', how='inner')
-            except:
-                pass
-        
-        # 평균값 계산 (섹터 지수)
-        if not sector_df.empty:
-            sector_df['Sector_Index'] = sector_df.mean(axis=1)
-            return sector_df['Sector_Index']
-        
-        return None
+                cache[key] = resample_context(df_origin, dna.timeframe)
+            except Exception:
+                cache[key] = None
+        df = cache[key]
+        try:
+            scores.append(backtest_context(dna, df) if df is not None else -100)
+        except Exception:
+            scores.append(-100)
+    return sum(scores) / len(scores) if scores else -100
+
+
+# 워커 프로세스 전역 상태 (initializer에서 1회 설정)
+_worker_blocks = []   # SharedFrame 핸들 (워커 수명 동안 유지)
+_worker_frames = {}   # 종목명 -> 공유 메모리 DataFrame
+_worker_cache = {}    # (종목명, 분봉) -> 리샘플 결과
+
+
+def _init_worker(specs):
+    """워커 초기화: 공유 메모리 블록 연결 (데이터 복사 없음)"""
+    for name, spec in specs.items():
+        block = SharedFrame.attach(spec)
+        _worker_blocks.append(block)
+        _worker_frames[name] = block.to_frame()
+
+
+def _evaluate_chunk(dnas):
+    """워커 작업 단위: DNA 묶음 평가"""
+    return [score_dna(dna, _worker_frames, _worker_cache) for dna in dnas]
 
 
 # ==========================================
@@ -122,18 +189,22 @@ class SectorManager:
 class ContextTrainer:
     """맥락 인식 훈련 시스템"""
     
-    def __init__(self, data_dir="data/KR", population=500, generations=3):
+    def __init__(self, data_dir="data/KR", population=500, generations=3, workers=None, max_tickers=1):
         """
         Args:
             data_dir: 데이터 디렉토리
             population: 에이전트 수
             generations: 진화 세대 수
+            workers: 평가 프로세스 수 (None: CPU 코어 수, 1: 직렬)
+            max_tickers: 적합도 산출에 사용할 종목 수 (종목별 점수 평균)
         """
         self.project_root = Path(__file__).parent.parent
         self.data_dir = self.project_root / data_dir
         self.sector_mgr = SectorManager(self.data_dir)
         self.population = population
         self.generations = generations
+        self.workers = workers or os.cpu_count() or 1
+        self.max_tickers = max_tickers
         self.agents = []
         
         print(f"\n{'='*80}")
@@ -142,6 +213,7 @@ class ContextTrainer:
         print(f"📂 데이터 디렉토리: {self.data_dir}")
         print(f"👥 에이전트 수: {population}명")
         print(f"🔄 진화 세대: {generations}세대")
+        print(f"⚙️ 평가 프로세스: {self.workers}개 / 종목 수: 최대 {max_tickers}개")
         print(f"{'='*80}\n")
     
     def load_data(self, filepath):
@@ -152,17 +224,8 @@ class ContextTrainer:
             df.set_index('Date', inplace=True)
         return df
     
-    def run_simulation(self):
-        """전체 시뮬레이션 실행"""
-        # 1. 타겟 데이터 선정
-        files = list(self.data_dir.glob("*.csv"))
-        if not files:
-            print("❌ 데이터가 없습니다.")
-            return
-        
-        target_file = files[0]  # 예시로 첫 번째 파일 사용
-        print(f"🎯 타겟 종목: {target_file.name}")
-        
+    def prepare_frame(self, target_file):
+        """종목 데이터 + 섹터 지수 결합"""
         stock_df = self.load_data(target_file)
         sector_series = self.sector_mgr.get_sector_index(target_file)
         
@@ -175,9 +238,56 @@ class ContextTrainer:
         else:
             stock_df['Sector'] = stock_df['Close']  # 섹터 데이터 없으면 자기 자신으로 대체
         
-        print(f"📊 데이터 기간: {stock_df.index[0]} ~ {stock_df.index[-1]} ({len(stock_df)}일)")
+        return stock_df
+    
+    def run_simulation(self):
+        """전체 시뮬레이션 실행"""
+        # 1. 타겟 데이터 선정
+        files = list(self.data_dir.glob("*.csv"))
+        if not files:
+            print("❌ 데이터가 없습니다.")
+            return
+        
+        frames = {}
+        for target_file in files[:self.max_tickers]:
+            try:
+                stock_df = self.prepare_frame(target_file)
+            except Exception as e:
+                print(f"⚠️ {target_file.name} 로드 실패: {e}")
+                continue
+            if not isinstance(stock_df.index, pd.DatetimeIndex) or \
+                    any(c not in stock_df.columns for c in CONTEXT_COLUMNS) or stock_df.empty:
+                print(f"⚠️ {target_file.name}: 시계열/OHLCV 형식 아님 (제외)")
+                continue
+            frames[target_file.stem] = stock_df[CONTEXT_COLUMNS]
+            print(f"🎯 타겟 종목: {target_file.name}")
+            print(f"📊 데이터 기간: {stock_df.index[0]} ~ {stock_df.index[-1]} ({len(stock_df)}일)")
+        
+        if not frames:
+            print("❌ 사용 가능한 데이터가 없습니다.")
+            return
+        
+        # 2. 병렬 모드: 종목/섹터 배열을 공유 메모리에 1회 적재 후 프로세스 풀에 배포
+        blocks = []
+        pool = None
+        if self.workers > 1:
+            blocks = [SharedFrame.publish(df, CONTEXT_COLUMNS) for df in frames.values()]
+            specs = {name: block.spec() for name, block in zip(frames, blocks)}
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(specs,))
         
-        # 2. 진화 시작
+        try:
+            self.evolve(frames, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            for block in blocks:
+                block.close()
+        
+        # 3. 최적 DNA 압축 저장
+        self.save_essence(self.agents[0]['dna'])
+    
+    def evolve(self, frames, pool=None):
+        """진화 루프"""
         self.agents = [{'dna': ContextDNA(), 'score': 0} for _ in range(self.population)]
         
         for g in range(1, self.generations + 1):
@@ -186,8 +296,7 @@ class ContextTrainer:
             print(f"{'='*80}\n")
             
             # 모든 에이전트 평가
-            for agent in tqdm(self.agents, desc=f"Gen {g} 평가"):
-                agent['score'] = self.evaluate(agent['dna'], stock_df)
+            self.evaluate_population(frames, pool, desc=f"Gen {g} 평가")
             
             # 생존자 선발 (점수 높은 순 정렬)
             self.agents.sort(key=lambda x: x['score'], reverse=True)
@@ -217,67 +326,27 @@ class ContextTrainer:
                     new_dna.ma_long = parent['dna'].ma_long
                     new_dna.mutate()
                     self.agents.append({'dna': new_dna, 'score': 0})
+    
+    def evaluate_population(self, frames, pool=None, desc="평가"):
+        """세대 전체 평가 (pool이 있으면 DNA 묶음 단위로 분산 후 순서대로 수집)"""
+        dnas = [agent['dna'] for agent in self.agents]
+        if pool is None:
+            cache = {}
+            scores = [score_dna(dna, frames, cache) for dna in tqdm(dnas, desc=desc)]
+        else:
+            chunk = max(1, math.ceil(len(dnas) / (self.workers * 4)))
+            chunks = [dnas[i:i + chunk] for i in range(0, len(dnas), chunk)]
+            scores = []
+            for part in tqdm(pool.map(_evaluate_chunk, chunks), total=len(chunks), desc=desc):
+                scores.extend(part)
         
-        # 3. 최적 DNA 압축 저장
-        self.save_essence(self.agents[0]['dna'])
+        for agent, score in zip(self.agents, scores):
+            agent['score'] = score
     
     def evaluate(self, dna, df_origin):
         """에이전트 평가 (백테스팅)"""
         try:
-            # 리샘플링
-            df = df_origin.resample(dna.timeframe).agg({
-                'Open': 'first',
-                'High': 'max',
-                'Low': 'min',
-                'Close': 'last',
-                'Volume': 'sum',
-                'Sector': 'last'
-            }).dropna()
-            
-            if len(df) < 60:
-                return -100
-            
-            # 지표 계산
-            df['MA_S'] = df['Close'].rolling(dna.ma_short).mean()
-            df['MA_L'] = df['Close'].rolling(dna.ma_long).mean()
-            
-            # 섹터 추세 (20일선 기준)
-            df['Sector_MA'] = df['Sector'].rolling(20).mean()
-            
-            # 백테스팅
-            balance = 100.0
-            position = False
-            entry_price = 0
-            
-            closes = df['Close'].values
-            ma_s = df['MA_S'].values
-            ma_l = df['MA_L'].values
-            sectors = df['Sector'].values
-            sec_mas = df['Sector_MA'].values
-            
-            for i in range(dna.ma_long, len(df)):
-                if not position:
-                    # 기본 조건: 골든크로스
-                    signal = ma_s[i] > ma_l[i]
-                    
-                    # [맥락 필터] 섹터가 상승세인가?
-                    if dna.use_sector_filter:
-                        sector_bullish = sectors[i] > sec_mas[i]
-                        if not sector_bullish:
-                            signal = False
-                    
-                    if signal:
-                        position = True
-                        entry_price = closes[i]
-                
-                elif position:
-                    pnl = (closes[i] - entry_price) / entry_price
-                    if pnl >= dna.take_profit or pnl <= -dna.stop_loss:
-                        balance *= (1 + pnl)
-                        position = False
-            
-            return balance - 100.0
-            
+            return backtest_context(dna, resample_context(df_origin, dna.timeframe))
         except Exception as e:
             return -100
     
@@ -299,10 +368,17 @@ class ContextTrainer:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.sector_index import get_service
+
 class ContextMaster:
     """맥락 인식 마스터 전략"""
     
-    def __init__(self):
+    def __init__(self, data_dir="data/KR"):
+        self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), data_dir)
         self.timeframe = "{dna.timeframe}"
         self.use_sector = {dna.use_sector_filter}
         self.tp = {dna.take_profit}
@@ -310,18 +386,21 @@ class ContextMaster:
         self.ma_s = {dna.ma_short}
         self.ma_l = {dna.ma_long}
     
-    def analyze(self, df, sector_trend_bullish):
+    def analyze(self, df, sector_trend_bullish=None, ticker=None):
         """
         맥락 분석
         
         Args:
             df: 종목 데이터 (DataFrame)
-            sector_trend_bullish: 섹터가 상승세인지 (bool)
+            sector_trend_bullish: 섹터가 상승세인지 (bool, None이면 섹터 지수 저장소에서 판단)
+            ticker: 종목 코드 (섹터 지수 조회용, 예: 000660.KS)
         
         Returns:
             (action, take_profit, stop_loss)
         """
-        # 1. 섹터 필터 확인
+        # 1. 섹터 필터 확인 (훈련과 동일한 업종 지수 / MA20 기준)
+        if self.use_sector and sector_trend_bullish is None and ticker:
+            sector_trend_bullish = get_service(self.data_dir).is_bullish(ticker)
         if self.use_sector and not sector_trend_bullish:
             return "HOLD (Sector Weak)", 0, 0
         
@@ -369,7 +448,8 @@ def main():
     trainer = ContextTrainer(
         data_dir="data/KR",
         population=500,
-        generations=3
+        generations=3,
+        max_tickers=10
     )
     trainer.run_simulation()
 
@@ -26,6 +26,8 @@ from datetime import datetime
 # 프로젝트 루트
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from brain.turbulence import calculate_turbulence
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 선택적 임포트
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -44,14 +46,14 @@ except ImportError:
 
 try:
     from stable_baselines3 import PPO, A2C, DDPG
-    from stable_baselines3.common.vec_env import DummyVecEnv
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
     HAS_SB3 = True
 except ImportError:
     HAS_SB3 = False
     print("⚠️ [Warning] stable-baselines3 not found. Installing...")
     os.system("pip install stable-baselines3 --quiet")
     from stable_baselines3 import PPO, A2C, DDPG
-    from stable_baselines3.common.vec_env import DummyVecEnv
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
     HAS_SB3 = True
 
 
@@ -82,6 +84,11 @@ class StockTradingEnv(gym.Env):
         self.initial_balance = initial_balance
         self.transaction_fee = transaction_fee
         
+        # 스텝마다 DataFrame을 조회하지 않도록 배열로 1회 변환
+        self.features = self.df.to_numpy(dtype=np.float32)   # 관측 피처 (행 × 컬럼)
+        self.prices = self.df['Close'].to_numpy(dtype=np.float64)
+        self.n_steps = len(self.df)
+        
         # 상태 공간: [잔고, 보유주식수, 현재가, 기술적지표들...]
         self.observation_space = spaces.Box(
             low=-np.inf,
@@ -112,24 +119,21 @@ class StockTradingEnv(gym.Env):
     
     def _get_observation(self):
         """현재 상태 반환"""
-        if self.current_step >= len(self.df):
-            self.current_step = len(self.df) - 1
-        
-        row = self.df.iloc[self.current_step]
+        if self.current_step >= self.n_steps:
+            self.current_step = self.n_steps - 1
         
         # [잔고, 보유주식수, 현재가, 기술적지표들...]
-        obs = np.array([
-            self.balance / self.initial_balance,  # 정규화
-            self.holdings,
-            *row.values
-        ], dtype=np.float32)
+        obs = np.empty(self.features.shape[1] + 2, dtype=np.float32)
+        obs[0] = self.balance / self.initial_balance  # 정규화
+        obs[1] = self.holdings
+        obs[2:] = self.features[self.current_step]
         
         return obs
     
     def step(self, action):
         """행동 실행"""
         action = action[0]  # [-1, 1]
-        current_price = self.df.iloc[self.current_step]['Close']
+        current_price = self.prices[self.current_step]
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 행동 실행
@@ -159,14 +163,14 @@ class StockTradingEnv(gym.Env):
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         self.current_step += 1
-        done = self.current_step >= len(self.df) - 1
+        done = self.current_step >= self.n_steps - 1
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 보상 계산 (총 자산 변화율)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         if not done:
-            next_price = self.df.iloc[self.current_step]['Close']
+            next_price = self.prices[self.current_step]
         else:
             next_price = current_price
         
@@ -189,6 +193,190 @@ class StockTradingEnv(gym.Env):
               f"Holdings: {self.holdings}, Total: ${self.total_asset:.2f}")
 
 
+# ==========================================
+# 📦 다종목 벡터 환경 (Batched VecEnv)
+# ==========================================
+
+def _slot_state(name: str):
+    """벡터 환경 상태 배열의 종목 i 원소를 단일 환경 속성으로 노출 (읽기/쓰기)"""
+    def fget(self):
+        return getattr(self.vec, name)[self.index].item()
+    def fset(self, value):
+        getattr(self.vec, name)[self.index] = value
+    return property(fget, fset)
+
+
+class _VecSlot(StockTradingEnv):
+    """
+    VecStockTradingEnv의 종목 i 단일 환경 뷰
+    - 상태(잔고/보유/스텝/총자산)는 벡터 환경 배열을 그대로 읽고 씀 → env_method 결과가 벡터 환경에 반영
+    - reset/step/render는 StockTradingEnv 구현을 그대로 사용 (체결/보상 규칙 동일)
+    """
+    
+    balance = _slot_state('balance')
+    holdings = _slot_state('holdings')
+    current_step = _slot_state('current_step')
+    total_asset = _slot_state('total_asset')
+    
+    def __init__(self, vec: "VecStockTradingEnv", index: int):
+        self.vec = vec
+        self.index = index
+        self.observation_space = vec.observation_space
+        self.action_space = vec.action_space
+    
+    @property
+    def initial_balance(self):
+        return self.vec.initial_balance
+    
+    @property
+    def transaction_fee(self):
+        return self.vec.transaction_fee
+    
+    @property
+    def n_steps(self):
+        return int(self.vec.n_steps[self.index])
+    
+    @property
+    def features(self):
+        return self.vec.features[self.index, :self.n_steps]
+    
+    @property
+    def prices(self):
+        return self.vec.prices[self.index, :self.n_steps]
+
+
+class VecStockTradingEnv(VecEnv):
+    """
+    다종목 거래 환경 (stable-baselines3 VecEnv)
+    - 종목별 데이터를 (종목, 스텝, 피처) float32 배열 1개로 적재 (길이가 다르면 뒤를 패딩)
+    - 모든 종목을 배열 연산 한 번으로 스텝 (StockTradingEnv와 동일한 체결/보상 규칙)
+    - 에피소드가 끝난 종목은 자동 초기화 (info['terminal_observation']에 마지막 관측 보관)
+    """
+    
+    def __init__(
+        self,
+        dfs: List[pd.DataFrame],
+        initial_balance: float = 10000.0,
+        transaction_fee: float = 0.001
+    ):
+        """
+        Args:
+            dfs: 종목별 OHLCV + 기술적 지표 데이터프레임 (컬럼 구성 동일)
+            initial_balance: 초기 자금
+            transaction_fee: 거래 수수료 (0.1%)
+        """
+        columns = list(dfs[0].columns)
+        n_envs, max_len = len(dfs), max(len(df) for df in dfs)
+        
+        self.features = np.zeros((n_envs, max_len, len(columns)), dtype=np.float32)
+        self.prices = np.zeros((n_envs, max_len), dtype=np.float64)
+        self.n_steps = np.array([len(df) for df in dfs], dtype=np.int64)
+        for i, df in enumerate(dfs):
+            self.features[i, :len(df)] = df[columns].to_numpy(dtype=np.float32)
+            self.prices[i, :len(df)] = df['Close'].to_numpy(dtype=np.float64)
+        
+        self.initial_balance = initial_balance
+        self.transaction_fee = transaction_fee
+        self._rows = np.arange(n_envs)
+        self._actions = None
+        
+        observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(len(columns) + 2,), dtype=np.float32)
+        action_space = spaces.Box(low=-1, high=1, shape=(1,), dtype=np.float32)
+        super(VecStockTradingEnv, self).__init__(n_envs, observation_space, action_space)
+        
+        self.current_step = np.zeros(n_envs, dtype=np.int64)
+        self.balance = np.full(n_envs, float(initial_balance))
+        self.holdings = np.zeros(n_envs, dtype=np.int64)
+        self.total_asset = np.full(n_envs, float(initial_balance))
+        
+        # 종목별 단일 환경 뷰 (get_attr / set_attr / env_method 디스패치 대상)
+        self.envs = [_VecSlot(self, i) for i in range(n_envs)]
+    
+    def _reset_envs(self, mask):
+        self.current_step[mask] = 0
+        self.balance[mask] = self.initial_balance
+        self.holdings[mask] = 0
+        self.total_asset[mask] = self.initial_balance
+    
+    def _get_observation(self):
+        """전 종목 관측 (종목 수, 피처 + 2)"""
+        step = np.minimum(self.current_step, self.n_steps - 1)
+        obs = np.empty((self.num_envs, self.features.shape[2] + 2), dtype=np.float32)
+        obs[:, 0] = self.balance / self.initial_balance
+        obs[:, 1] = self.holdings
+        obs[:, 2:] = self.features[self._rows, step]
+        return obs
+    
+    def reset(self):
+        self._reset_envs(slice(None))
+        return self._get_observation()
+    
+    def step_async(self, actions):
+        self._actions = actions
+    
+    def step_wait(self):
+        action = np.asarray(self._actions).reshape(self.num_envs, -1)[:, 0].astype(np.float64)
+        fee = self.transaction_fee
+        current_price = self.prices[self._rows, self.current_step]
+        
+        # 매수: 사용 가능한 금액 중 action 비율만큼 (정수 주)
+        buy = action > 0.1
+        max_shares = np.floor(self.balance / (current_price * (1 + fee)))
+        shares_to_buy = np.where(buy, np.floor(max_shares * action), 0).astype(np.int64)
+        bought = shares_to_buy > 0
+        self.balance = np.where(bought, self.balance - shares_to_buy * current_price * (1 + fee), self.balance)
+        self.holdings += np.where(bought, shares_to_buy, 0)
+        
+        # 매도: 보유 주식 중 |action| 비율만큼
+        sell = action < -0.1
+        shares_to_sell = np.where(sell, np.floor(self.holdings * np.abs(action)), 0).astype(np.int64)
+        sold = shares_to_sell > 0
+        self.balance = np.where(sold, self.balance + shares_to_sell * current_price * (1 - fee), self.balance)
+        self.holdings -= np.where(sold, shares_to_sell, 0)
+        
+        # 다음 스텝 + 보상 (총 자산 변화율)
+        self.current_step += 1
+        dones = self.current_step >= self.n_steps - 1
+        next_price = np.where(dones, current_price,
+                              self.prices[self._rows, np.minimum(self.current_step, self.n_steps - 1)])
+        new_total_asset = self.balance + self.holdings * next_price
+        rewards = ((new_total_asset - self.total_asset) / self.total_asset).astype(np.float32)
+        self.total_asset = new_total_asset
+        
+        obs = self._get_observation()
+        infos = [{'balance': b, 'holdings': h, 'total_asset': t}
+                 for b, h, t in zip(self.balance.tolist(), self.holdings.tolist(), self.total_asset.tolist())]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = obs[i].copy()
+            self._reset_envs(dones)
+            obs[dones] = self._get_observation()[dones]
+        
+        return obs, rewards, dones, infos
+    
+    def close(self):
+        pass
+    
+    def seed(self, seed=None):
+        # 결정적 환경 (무작위 요소 없음) - VecEnv 계약상 종목별 시드 목록만 반환
+        return [None if seed is None else seed + i for i in range(self.num_envs)]
+    
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self.envs[i], attr_name) for i in self._get_indices(indices)]
+    
+    def set_attr(self, attr_name, value, indices=None):
+        for i in self._get_indices(indices):
+            setattr(self.envs[i], attr_name, value)
+    
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        # 종목별 단일 환경에서 실행 (DummyVecEnv와 동일한 의미: 인덱스마다 해당 종목 상태 기준 결과)
+        return [getattr(self.envs[i], method_name)(*method_args, **method_kwargs)
+                for i in self._get_indices(indices)]
+    
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+
 # ==========================================
 # 🤖 FinRL 앙상블 에이전트
 # ==========================================
@@ -198,15 +386,15 @@ class FinRLEnsemble:
     
     def __init__(
         self,
-        env: StockTradingEnv,
+        env,
         turbulence_threshold: float = 100.0
     ):
         """
         Args:
-            env: 거래 환경
+            env: 거래 환경 (StockTradingEnv 또는 다종목 VecStockTradingEnv)
             turbulence_threshold: 난기류 지수 임계값
         """
-        self.env = DummyVecEnv([lambda: env])
+        self.env = env if isinstance(env, VecEnv) else DummyVecEnv([lambda: env])
         self.turbulence_threshold = turbulence_threshold
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -327,44 +515,6 @@ class FinRLEnsemble:
                 print(f"✅ [{name}] 로드: {agent_path}")
 
 
-# ==========================================
-# 📈 금융 난기류 지수 (Turbulence Index)
-# ==========================================
-
-def calculate_turbulence(df: pd.DataFrame, window: int = 252) -> pd.Series:
-    """
-    금융 난기류 지수 계산
-    
-    Args:
-        df: OHLCV 데이터프레임
-        window: 계산 윈도우 (252일 = 1년)
-    
-    Returns:
-        난기류 지수 시리즈
-    """
-    returns = df['Close'].pct_change().dropna()
-    
-    turbulence = []
-    
-    for i in range(window, len(returns)):
-        window_returns = returns.iloc[i-window:i]
-        
-        # 평균 및 공분산
-        mean = window_returns.mean()
-        cov = window_returns.var()
-        
-        # 마할라노비스 거리
-        current_return = returns.iloc[i]
-        distance = (current_return - mean) ** 2 / (cov + 1e-9)
-        
-        turbulence.append(distance)
-    
-    # 앞부분 패딩
-    turbulence = [0] * window + turbulence
-    
-    return pd.Series(turbulence, index=df.index)
-
-
 # ==========================================
 # 실행
 # ==========================================
@@ -380,14 +530,17 @@ if __name__ == "__main__":
     
     data_path = "data/KR/005930.KS.csv"
     
-    if os.path.exists(data_path):
-        df = pd.read_csv(data_path)
+    def load_features(path):
+        df = pd.read_csv(path)
         df = df[['Open', 'High', 'Low', 'Close', 'Volume']].dropna()
         
         # 기술적 지표 추가 (간단한 예시)
         df['SMA_20'] = df['Close'].rolling(20).mean()
         df['SMA_60'] = df['Close'].rolling(60).mean()
-        df = df.dropna()
+        return df.dropna()
+    
+    if os.path.exists(data_path):
+        df = load_features(data_path)
         
         print(f"✅ 데이터 로드: {len(df)}개 레코드")
         
@@ -406,8 +559,21 @@ if __name__ == "__main__":
         # 3. 환경 생성
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        train_env = StockTradingEnv(train_df)
+        # 학습: 다른 종목의 같은 비율 구간까지 묶은 다종목 벡터 환경 (최대 8종목)
+        train_dfs = [train_df]
+        for name in sorted(os.listdir("data/KR")):
+            if len(train_dfs) >= 8:
+                break
+            path = os.path.join("data/KR", name)
+            if not name.endswith(".csv") or path == data_path:
+                continue
+            other = load_features(path)
+            if len(other) > 100:
+                train_dfs.append(other.iloc[:int(len(other) * 0.8)])
+        
+        train_env = VecStockTradingEnv(train_dfs)
         test_env = StockTradingEnv(test_df)
+        print(f"✅ 학습 환경: {train_env.num_envs}개 종목 동시 스텝")
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 4. FinRL 앙상블 생성 및 학습
@@ -20,12 +20,13 @@ import os
 import sys
 import copy
 import json
-from tqdm import tqdm
 from typing import List, Dict, Any, Tuple, Optional
 
 # 프로젝트 루트 및 모듈 경로 설정
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.signal_validator import SignalValidator
+from core.backtest_engine import backtest, golden_cross
+from brain.population_evaluator import PopulationEvaluator
 
 class DNA:
     """전략의 유전 정보를 담는 클래스."""
@@ -68,58 +69,22 @@ class IntegratedAgent:
         if len(df) < 60: return
 
         # 2. 기술적 지표 계산
-        df['MA_S'] = df['Close'].rolling(self.dna.ma_short).mean()
-        df['MA_L'] = df['Close'].rolling(self.dna.ma_long).mean()
+        ma_s = df['Close'].rolling(self.dna.ma_short).mean().values
+        ma_l = df['Close'].rolling(self.dna.ma_long).mean().values
         
-        position: bool = False
-        entry_price: float = 0.0
+        # 3. 진입 신호: 기술적 골든크로스 (60봉 이후) + 🛡️ Savage Validator 검증 (배치 모드)
+        entries = golden_cross(ma_s, ma_l, start=60)
+        if entries.any():
+            features = self.validator.precompute(df)
+            entries &= self.validator.validate_mask(features, {})
         
-        # 가속을 위한 Numpy 변환
-        closes = df['Close'].values
-        highs = df['High'].values
-        lows = df['Low'].values
-        ma_s = df['MA_S'].values
-        ma_l = df['MA_L'].values
-        
-        # 3. 시뮬레이션 루프
-        for i in range(60, len(df)):
-            curr_price = closes[i]
-            
-            # [매수 로직]
-            if not position:
-                # 1단계: 기술적 골든크로스
-                if ma_s[i] > ma_l[i] and ma_s[i-1] <= ma_l[i-1]:
-                    
-                    # 2단계: 🛡️ Savage Validator 검증 (핵심)
-                    curr_row = df.iloc[i]
-                    past_data = df.iloc[:i+1] 
-                    
-                    # 시뮬레이션 모드("SIM")로 검증기 가동
-                    is_valid, _ = self.validator.validate("SIM", curr_row.to_dict(), past_data, {})
-                    
-                    if is_valid:
-                        position = True
-                        entry_price = curr_price
-                        self.trades += 1
-            
-            # [청산 로직]
-            elif position:
-                pct_high = (highs[i] - entry_price) / entry_price
-                pct_low = (lows[i] - entry_price) / entry_price
-                
-                pnl: float = 0.0
-                executed: bool = False
-                
-                if pct_low <= -self.dna.stop_loss:
-                    pnl = -self.dna.stop_loss
-                    executed = True
-                elif pct_high >= self.dna.take_profit:
-                    pnl = self.dna.take_profit
-                    executed = True
-                
-                if executed:
-                    self.balance *= (1 + pnl)
-                    position = False
+        # 4. 시뮬레이션 (고가/저가 기준 손절 우선 → 익절)
+        result = backtest(df['Close'].values, entries,
+                          high=df['High'].values, low=df['Low'].values,
+                          take_profit=self.dna.take_profit, stop_loss=self.dna.stop_loss,
+                          stop_mode='hl', start=60, initial_balance=self.balance)
+        self.balance = result.balance
+        self.trades += result.n_entries
 
 class GenesisV2:
     """통합 진화 매니저."""
@@ -138,13 +103,13 @@ class GenesisV2:
     def run(self) -> None:
         """진화 프로세스 시작."""
         self.agents = [IntegratedAgent(i) for i in range(self.population)]
+        # 리샘플/지표/검증 결과를 세대 간 공유하는 일괄 평가기 (60봉 워밍업)
+        evaluator = PopulationEvaluator(self.raw_data, warmup=60)
         
         for g in range(1, self.generations + 1):
             print(f"\n⚔️ [Gen {g}] Savage Validator 통합 훈련 시작...")
             
-            for agent in tqdm(self.agents):
-                agent.balance = 1000.0 
-                agent.simulate(self.raw_data)
+            evaluator.evaluate(self.agents)
             
             # 성적순 정렬
             self.agents.sort(key=lambda x: x.balance, reverse=True)
@@ -154,8 +119,9 @@ class GenesisV2:
             print(f"   🧬 DNA: {top.dna.timeframe} | MA:{top.dna.ma_short}/{top.dna.ma_long} | TP:{top.dna.take_profit} | SL:{top.dna.stop_loss}")
             
             # 하위 50% 도태 및 상위 50% 복제/변이
-            survivors = self.agents[:50]
-            for i in range(50, 100):
+            half = self.population // 2
+            survivors = self.agents[:half]
+            for i in range(half, self.population):
                 parent = random.choice(survivors)
                 child = copy.deepcopy(parent)
                 child.dna.mutate()
@@ -5,11 +5,12 @@ import os
 import sys
 import copy
 import json
-from tqdm import tqdm
 
 # 프로젝트 루트 및 모듈 경로 설정
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.signal_validator import SignalValidator
+from core.backtest_engine import backtest, golden_cross
+from brain.population_evaluator import PopulationEvaluator
 
 # ==========================================
 # 🧬 GENESIS EVOLUTION v2.0 (Integrated)
@@ -55,63 +56,25 @@ class IntegratedAgent:
 
         if len(df) < self.dna.ma_long: return
 
-        # 2. 지표 계산
-        df['MA_S'] = df['Close'].rolling(self.dna.ma_short).mean()
-        df['MA_L'] = df['Close'].rolling(self.dna.ma_long).mean()
+        # 2. 지표 계산 (Numpy 배열)
+        ma_s = df['Close'].rolling(self.dna.ma_short).mean().values
+        ma_l = df['Close'].rolling(self.dna.ma_long).mean().values
         
-        position = False
-        entry_price = 0
+        # 3. 진입 신호
+        # 1차: 기술적 신호 (골든크로스, 지표 계산을 위해 ma_long 이후부터)
+        # 2차: 🛡️ Savage Validator 검증 (실전과 동일한 검문소, 배치 모드)
+        entries = golden_cross(ma_s, ma_l, start=self.dna.ma_long)
+        if entries.any():
+            features = self.validator.precompute(df)
+            entries &= self.validator.validate_mask(features, {})
         
-        # Numpy 변환 가속 (속도 최적화)
-        closes = df['Close'].values
-        highs = df['High'].values
-        lows = df['Low'].values
-        ma_s = df['MA_S'].values
-        ma_l = df['MA_L'].values
-        
-        # 3. 시뮬레이션 루프
-        # (지표 계산을 위해 ma_long 이후부터 시작)
-        for i in range(self.dna.ma_long, len(df)):
-            curr_price = closes[i]
-            
-            # [매수 시도]
-            if not position:
-                # 1차: 기술적 신호 (골든크로스)
-                if ma_s[i] > ma_l[i] and ma_s[i-1] <= ma_l[i-1]:
-                    
-                    # 2차: 🛡️ Savage Validator 검증 (실전과 동일한 검문소)
-                    # 시뮬레이션 속도를 위해 DataFrame Row 하나를 넘김
-                    curr_row = df.iloc[i]
-                    past_data = df.iloc[:i+1] # 현재 시점까지의 데이터
-                    
-                    # 검증기 호출 ("가짜 신호면 진입 불허")
-                    is_valid, _ = self.validator.validate("SIM", curr_row.to_dict(), past_data, {})
-                    
-                    if is_valid:
-                        position = True
-                        entry_price = curr_price
-                        self.trades += 1
-            
-            # [청산 시도]
-            elif position:
-                pct_high = (highs[i] - entry_price) / entry_price
-                pct_low = (lows[i] - entry_price) / entry_price
-                
-                action = None
-                pnl = 0
-                
-                # 손절 (보수적 접근)
-                if pct_low <= -self.dna.stop_loss:
-                    action = 'SL'
-                    pnl = -self.dna.stop_loss
-                # 익절
-                elif pct_high >= self.dna.take_profit:
-                    action = 'TP'
-                    pnl = self.dna.take_profit
-                
-                if action:
-                    self.balance *= (1 + pnl)
-                    position = False
+        # 4. 시뮬레이션 (고가/저가 기준 손절 우선 → 익절)
+        result = backtest(df['Close'].values, entries,
+                          high=df['High'].values, low=df['Low'].values,
+                          take_profit=self.dna.take_profit, stop_loss=self.dna.stop_loss,
+                          stop_mode='hl', start=self.dna.ma_long, initial_balance=self.balance)
+        self.balance = result.balance
+        self.trades += result.n_entries
 
 class GenesisV2:
     def __init__(self, data_path):
@@ -128,14 +91,14 @@ class GenesisV2:
 
     def run(self):
         self.agents = [IntegratedAgent(i) for i in range(self.population)]
+        # 리샘플/지표/검증 결과를 세대 간 공유하는 일괄 평가기
+        evaluator = PopulationEvaluator(self.raw_data)
         
         for g in range(1, self.generations + 1):
             print(f"\n⚔️ [Gen {g}] 검증기 통합 실전 훈련 시작...")
             
-            # 병렬 처리 대신 가시성을 위해 tqdm 루프 사용
-            for agent in tqdm(self.agents):
-                agent.balance = 1000.0 # 자산 초기화 (공정한 경쟁)
-                agent.simulate(self.raw_data)
+            # 전체 에이전트 일괄 평가 (IntegratedAgent.simulate와 동일 규칙, 자산 초기화 포함)
+            evaluator.evaluate(self.agents)
             
             # 생존자 정렬 (수익금 순)
             self.agents.sort(key=lambda x: x.balance, reverse=True)
@@ -148,8 +111,9 @@ class GenesisV2:
             
             # 진화 (하위 50% 도태 및 교체)
             if g < self.generations:
-                survivors = self.agents[:50]
-                for i in range(50, 100):
+                half = self.population // 2
+                survivors = self.agents[:half]
+                for i in range(half, self.population):
                     parent = random.choice(survivors)
                     child = copy.deepcopy(parent)
                     child.dna.mutate() # 돌연변이
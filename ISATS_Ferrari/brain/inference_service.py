@@ -0,0 +1,343 @@
+"""
+⚡ ISATS INFERENCE SERVICE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+배치 CPU 추론 서비스 (HybridCNN_LSTM / Stockformer / DeepEyes)
+
+구조:
+1. 요청 수집: 한 사이클 동안 종목별 입력 윈도우를 모델별로 모음
+   - 동기: submit() 후 run_cycle()
+   - 비동기: await score() → 같은 이벤트 루프 회차의 요청을 모아 1회 실행 (forward는 워커 스레드)
+2. 일괄 실행: 모델당 forward 1회 (배치 = 종목 수, torch.inference_mode)
+3. 백엔드: eager | torchscript (trace) | onnx (ONNX Runtime, 선택 설치)
+4. CPU 동적 int8 양자화 (Linear/LSTM, ONNX는 onnxruntime 양자화)
+5. 결과: {모델: {종목: 점수}}
+
+점수 형식:
+- hybrid: 상승 확률 (float)
+- stockformer: 다음 pred_length 봉 정규화 종가 (list)
+- deep_eyes: [Buy, Hold, Sell] 확률 (list)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+# 프로젝트 루트 및 모듈 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import torch
+    import torch.nn as nn
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic as ort_quantize_dynamic
+    HAS_ORT = True
+except ImportError:
+    HAS_ORT = False
+
+BRAIN_DIR = os.path.dirname(os.path.abspath(__file__))
+WEIGHTS_DIR = os.path.join(BRAIN_DIR, "weights")
+EXPORT_DIR = os.path.join(WEIGHTS_DIR, "export")
+
+
+# ==========================================
+# 후처리 (모델 출력 → 종목별 점수)
+# ==========================================
+
+def _prob(out: np.ndarray):
+    return out[:, 0].tolist()
+
+
+def _softmax(out: np.ndarray):
+    e = np.exp(out - out.max(axis=1, keepdims=True))
+    return (e / e.sum(axis=1, keepdims=True)).tolist()
+
+
+def _raw(out: np.ndarray):
+    return out.tolist()
+
+
+POSTPROCESS = {'prob': _prob, 'softmax': _softmax, 'raw': _raw}
+
+
+# ==========================================
+# 모델 사양 (팩토리는 지연 임포트)
+# ==========================================
+
+def _hybrid():
+    from brain.models import HybridCNN_LSTM
+    return HybridCNN_LSTM()
+
+
+def _stockformer():
+    from brain.stockformer import Stockformer
+    return Stockformer(input_dim=5, d_model=128, nhead=8, num_layers=3, pred_length=5)
+
+
+def _deep_eyes():
+    from brain.model_cnn import DeepEyesModel
+    return DeepEyesModel()
+
+
+# 이름: (팩토리, 샘플 1개 입력 형태, 후처리, 기본 가중치 경로)
+MODEL_SPECS = {
+    'hybrid': (_hybrid, (60, 5), 'prob', os.path.join(WEIGHTS_DIR, "deep_eyes_v2_latest.pth")),
+    'stockformer': (_stockformer, (60, 5), 'raw', os.path.join(BRAIN_DIR, "stockformer_model.pth")),
+    'deep_eyes': (_deep_eyes, (10, 60), 'softmax', None),   # (피처, 시퀀스) 입력
+}
+
+
+class ModelRunner:
+    """
+    모델 1개의 CPU 배치 실행기
+    - quantize: Linear/LSTM 동적 int8 양자화
+    - backend: 'eager' | 'torchscript' | 'onnx'
+    """
+
+    def __init__(self, model, sample_shape: Tuple[int, ...], postprocess: str = 'raw',
+                 quantize: bool = False, backend: str = 'eager', name: str = 'model'):
+        if not HAS_TORCH:
+            raise RuntimeError("PyTorch가 필요합니다 (pip install torch)")
+        if backend not in ('eager', 'torchscript', 'onnx'):
+            raise ValueError(f"지원하지 않는 백엔드: {backend}")
+        if backend == 'onnx' and not HAS_ORT:
+            raise RuntimeError("onnx 백엔드는 onnxruntime이 필요합니다 (pip install onnxruntime)")
+
+        self.name = name
+        self.sample_shape = tuple(sample_shape)
+        self.postprocess = POSTPROCESS[postprocess]
+        self.backend = backend
+        self.quantize = quantize
+        self.float_model = model.cpu().eval()   # 내보내기용 원본 (fp32)
+        self.session = None
+
+        self.model = self.float_model
+        if quantize and backend != 'onnx':
+            self.model = torch.quantization.quantize_dynamic(
+                self.float_model, {nn.Linear, nn.LSTM}, dtype=torch.qint8)
+        if backend == 'torchscript':
+            with torch.no_grad():
+                self.model = torch.jit.trace(self.model, self._example())
+        elif backend == 'onnx':
+            path = self.export_onnx(os.path.join(EXPORT_DIR, f"{name}.onnx"))
+            if quantize:
+                qpath = path.replace(".onnx", ".int8.onnx")
+                ort_quantize_dynamic(path, qpath, weight_type=QuantType.QInt8)
+                path = qpath
+            self.session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+            self.input_name = self.session.get_inputs()[0].name
+
+    def _example(self, batch: int = 2):
+        return torch.zeros((batch,) + self.sample_shape, dtype=torch.float32)
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        """(배치, *sample_shape) float32 → 모델 원출력"""
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        if self.session is not None:
+            return self.session.run(None, {self.input_name: batch})[0]
+        with torch.inference_mode():
+            return self.model(torch.from_numpy(batch)).numpy()
+
+    def predict(self, batch: np.ndarray) -> list:
+        """배치 → 샘플별 점수 리스트"""
+        return self.postprocess(self.forward(batch))
+
+    def export_torchscript(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with torch.no_grad():
+            torch.jit.save(torch.jit.trace(self.model, self._example()), path)
+        return path
+
+    def export_onnx(self, path: str) -> str:
+        """fp32 원본을 배치 축 가변 ONNX로 내보내기"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with torch.no_grad():
+            torch.onnx.export(self.float_model, (self._example(),), path,
+                              input_names=['x'], output_names=['y'],
+                              dynamic_axes={'x': {0: 'batch'}, 'y': {0: 'batch'}},
+                              opset_version=17)
+        return path
+
+
+class InferenceService:
+    """
+    프로세스 내 배치 추론 서비스
+
+    사용 예 (동기):
+        service.submit('hybrid', '005930.KS', window)   # 종목마다
+        scores = service.run_cycle()                     # {'hybrid': {'005930.KS': 0.63, ...}}
+
+    사용 예 (비동기, 종목별 코루틴에서):
+        prob = await service.score('hybrid', ticker, window)
+    """
+
+    def __init__(self, max_wait: float = 0.0, max_batch: int = 1024):
+        """
+        Args:
+            max_wait: 비동기 요청을 모으는 최대 대기 시간(초), 0이면 같은 루프 회차만
+            max_batch: 이 개수가 모이면 즉시 실행
+        """
+        self.runners: Dict[str, ModelRunner] = {}
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self._pending: Dict[str, Dict[str, np.ndarray]] = {}
+        self._waiters: Dict[str, Dict[str, list]] = {}
+        self._flush_handle = None
+        self._inflight = set()                               # 실행 중인 비동기 배치 태스크
+        self.last_cycle: Dict[str, Dict[str, float]] = {}   # 모델별 {batch, ms}
+
+    def register(self, name: str, runner: ModelRunner):
+        self.runners[name] = runner
+        self._pending.setdefault(name, {})
+        self._waiters.setdefault(name, {})
+
+    def submit(self, name: str, ticker: str, window):
+        """이번 사이클 요청 등록 (같은 종목은 마지막 윈도우만 사용)"""
+        if name not in self.runners:
+            raise KeyError(f"등록되지 않은 모델: {name}")
+        self._pending[name][ticker] = np.asarray(window, dtype=np.float32)
+
+    def pending_count(self) -> int:
+        return sum(len(p) for p in self._pending.values())
+
+    def _run(self, name: str, tickers: list, batch: np.ndarray) -> Dict[str, Any]:
+        started = time.perf_counter()
+        scores = self.runners[name].predict(batch)
+        self.last_cycle[name] = {'batch': len(tickers), 'ms': (time.perf_counter() - started) * 1000}
+        return dict(zip(tickers, scores))
+
+    def _take(self) -> Dict[str, Tuple[list, np.ndarray]]:
+        """대기 요청을 모델별 (종목, 배치)로 꺼냄 (대기열은 비움)"""
+        batches = {}
+        for name, pending in self._pending.items():
+            if not pending:
+                continue
+            tickers = list(pending)
+            batches[name] = (tickers, np.stack([pending[t] for t in tickers]))
+            pending.clear()
+        return batches
+
+    def _run_batches(self, batches: Dict[str, Tuple[list, np.ndarray]]) -> Dict[str, Dict[str, Any]]:
+        return {name: self._run(name, tickers, batch) for name, (tickers, batch) in batches.items()}
+
+    def run_cycle(self) -> Dict[str, Dict[str, Any]]:
+        """모은 요청을 모델당 1회 forward로 실행"""
+        return self._run_batches(self._take())
+
+    def predict_many(self, name: str, windows: Dict[str, Any]) -> Dict[str, Any]:
+        """{종목: 윈도우} → {종목: 점수} (대기 요청과 무관하게 단일 모델 즉시 실행)"""
+        if not windows:
+            return {}
+        tickers = list(windows)
+        batch = np.stack([np.asarray(windows[t], dtype=np.float32) for t in tickers])
+        return self._run(name, tickers, batch)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 비동기 인터페이스 (요청 합치기)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    async def score(self, name: str, ticker: str, window):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.submit(name, ticker, window)
+        self._waiters[name].setdefault(ticker, []).append(future)
+
+        if self.pending_count() >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            # 같은 루프 회차에 도착한 다른 종목 요청까지 모은 뒤 실행
+            if self.max_wait > 0:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        # 요청/대기자는 루프에서 즉시 꺼내고 (다음 요청은 새 배치로), forward는 워커 스레드에서 실행
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        waiters = {name: dict(w) for name, w in self._waiters.items() if w}
+        for w in self._waiters.values():
+            w.clear()
+        task = asyncio.ensure_future(self._dispatch(self._take(), waiters))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batches: Dict[str, Tuple[list, np.ndarray]], waiters: Dict[str, Dict[str, list]]):
+        try:
+            results = await asyncio.to_thread(self._run_batches, batches) if batches else {}
+        except Exception as e:
+            for per_model in waiters.values():
+                for futures in per_model.values():
+                    for f in futures:
+                        if not f.done():
+                            f.set_exception(e)
+            return
+        for name, per_model in waiters.items():
+            for ticker, futures in per_model.items():
+                for f in futures:
+                    if f.done():
+                        continue
+                    if ticker in results.get(name, {}):
+                        f.set_result(results[name][ticker])
+                    else:
+                        # 동기 run_cycle()이 먼저 요청을 소비한 경우
+                        f.set_exception(KeyError(f"{name}/{ticker} 요청이 다른 사이클에서 처리됨"))
+
+
+def build_service(models: Iterable[str] = ('hybrid', 'stockformer'), quantize: bool = True,
+                  backend: str = 'eager', weights: Optional[Dict[str, str]] = None,
+                  num_threads: Optional[int] = None, **kwargs) -> InferenceService:
+    """
+    기본 모델 등록 서비스 생성 (가중치 파일이 없는 모델은 건너뜀, 경로가 None인 모델은 초기 가중치)
+    """
+    if not HAS_TORCH:
+        raise RuntimeError("PyTorch가 필요합니다 (pip install torch)")
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    service = InferenceService(**kwargs)
+    weights = weights or {}
+    for name in models:
+        factory, sample_shape, postprocess, default_path = MODEL_SPECS[name]
+        path = weights.get(name, default_path)
+        model = factory()
+        if path is not None:
+            if not os.path.exists(path):
+                print(f"⚠️ [Inference] {name} 가중치 없음 → 건너뜀: {path}")
+                continue
+            model.load_state_dict(torch.load(path, map_location='cpu'))
+        service.register(name, ModelRunner(model, sample_shape, postprocess,
+                                           quantize=quantize, backend=backend, name=name))
+        print(f"✅ [Inference] {name} 등록 (backend={backend}, int8={quantize})")
+    return service
+
+
+if __name__ == "__main__":
+    # 100종목 1사이클 지연시간 측정 (초기 가중치 기준)
+    n = 100
+    for quantize in (False, True):
+        service = build_service(models=('deep_eyes',), quantize=quantize)
+        runner = service.runners['deep_eyes']
+        windows = np.random.rand(n, *runner.sample_shape).astype(np.float32)
+
+        started = time.perf_counter()
+        for k in range(n):
+            runner.predict(windows[k:k + 1])
+        single_ms = (time.perf_counter() - started) * 1000
+
+        for k in range(n):
+            service.submit('deep_eyes', f"T{k:03d}", windows[k])
+        service.run_cycle()
+        print(f"   int8={quantize}: 종목별 {single_ms:.1f}ms → 배치 {service.last_cycle['deep_eyes']['ms']:.1f}ms ({n}종목)")
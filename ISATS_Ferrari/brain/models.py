@@ -31,6 +31,10 @@ class HybridCNN_LSTM(nn.Module):
         )
 
     def forward(self, x):
+        return self.fc(self.embed(x))
+
+    def embed(self, x):
+        """마지막 타임스텝 LSTM 히든 스테이트 (패턴 인덱스 임베딩용)"""
         # x shape: (batch_size, seq_len, input_dim)
         # CNN은 (batch, channel, seq) 형태를 원하므로 transpose
         x = x.transpose(1, 2) 
@@ -44,6 +48,4 @@ class HybridCNN_LSTM(nn.Module):
         
         # 마지막 타임스텝의 히든 스테이트만 사용
         last_hidden = l_out[:, -1, :]
-        
-        prediction = self.fc(last_hidden)
-        return prediction
+        return last_hidden
@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+from typing import Dict, List, Optional
+
+# 프로젝트 루트 및 모듈 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.signal_validator import SignalValidator
+from core.backtest_engine import backtest, golden_cross
+
+# ==========================================
+# ⚡ POPULATION EVALUATOR
+# 역할: Genesis 에이전트 전체를 한 번에 평가
+# - 분봉 리샘플링은 타임프레임당 1회
+# - 필요한 MA 윈도우를 행렬로 1회 계산
+# - 골든크로스 후보 / 청산 시점은 공용 백테스트 엔진(core.backtest_engine)으로 탐색
+# - 검증 결과는 타임프레임당 1회 전체 봉 마스크로 계산 (에이전트와 무관)
+# ==========================================
+
+OHLCV_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+class TimeframeData:
+    """단일 타임프레임의 리샘플 결과 + 지표 캐시"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.closes = df['Close'].values
+        self.highs = df['High'].values
+        self.lows = df['Low'].values
+        self.ma_index: Dict[int, int] = {}       # MA 윈도우 -> ma_matrix 행 번호
+        self.ma_matrix = np.empty((0, len(df)))  # [윈도우 수, 봉 수]
+        self.valid: Optional[np.ndarray] = None   # 봉별 검증기 통과 여부
+
+    def ensure_ma(self, windows):
+        """필요한 MA 윈도우를 한 번에 계산하여 행렬에 추가"""
+        missing = sorted(set(windows) - set(self.ma_index))
+        if not missing:
+            return
+        close = self.df['Close']
+        rows = [close.rolling(w).mean().values for w in missing]
+        base = len(self.ma_index)
+        self.ma_matrix = np.vstack([self.ma_matrix] + rows)
+        for k, w in enumerate(missing):
+            self.ma_index[w] = base + k
+
+    def ma(self, window: int) -> np.ndarray:
+        return self.ma_matrix[self.ma_index[window]]
+
+
+class PopulationEvaluator:
+    """
+    IntegratedAgent.simulate와 동일한 규칙으로 에이전트 집단을 일괄 평가
+    - warmup=None: 각 DNA의 ma_long부터 시작 (genesis_evolution_v2)
+    - warmup=60: 60봉 이후부터 시작 (genesis_evolution)
+    """
+
+    def __init__(self, raw_1min_df: pd.DataFrame, validator: Optional[SignalValidator] = None,
+                 warmup: Optional[int] = None, initial_balance: float = 1000.0):
+        self.raw = raw_1min_df
+        self.validator = validator or SignalValidator()
+        self.warmup = warmup
+        self.initial_balance = initial_balance
+        self.frames: Dict[str, Optional[TimeframeData]] = {}
+
+    def frame(self, timeframe: str) -> Optional[TimeframeData]:
+        """타임프레임별 리샘플 (최초 1회만 수행)"""
+        if timeframe not in self.frames:
+            try:
+                df = self.raw.resample(timeframe).agg(OHLCV_AGG).dropna()
+                self.frames[timeframe] = TimeframeData(df)
+            except Exception:
+                self.frames[timeframe] = None
+        return self.frames[timeframe]
+
+    def _valid_mask(self, tf: TimeframeData) -> np.ndarray:
+        """검증기 통과 마스크 (타임프레임당 1회 계산)"""
+        if tf.valid is None:
+            tf.valid = self.validator.validate_mask(self.validator.precompute(tf.df), {})
+        return tf.valid
+
+    def evaluate_dna(self, dna, tf: TimeframeData):
+        """단일 DNA 평가 → (최종 잔고, 진입 횟수)"""
+        balance = self.initial_balance
+        n = len(tf.closes)
+        start = dna.ma_long if self.warmup is None else self.warmup
+        if n < start:
+            return balance, 0
+
+        entries = golden_cross(tf.ma(dna.ma_short), tf.ma(dna.ma_long), start=start)
+        if entries.any():
+            entries &= self._valid_mask(tf)
+
+        result = backtest(tf.closes, entries, high=tf.highs, low=tf.lows,
+                          take_profit=dna.take_profit, stop_loss=dna.stop_loss,
+                          stop_mode='hl', start=start, initial_balance=balance)
+        return result.balance, result.n_entries
+
+    def evaluate(self, agents: List):
+        """에이전트 집단 평가: agent.balance 갱신, agent.trades 누적"""
+        by_tf: Dict[str, List] = {}
+        for agent in agents:
+            by_tf.setdefault(agent.dna.timeframe, []).append(agent)
+
+        for timeframe, group in by_tf.items():
+            tf = self.frame(timeframe)
+            if tf is None:
+                for agent in group:
+                    agent.balance = self.initial_balance
+                continue
+
+            tf.ensure_ma({a.dna.ma_short for a in group} | {a.dna.ma_long for a in group})
+            for agent in group:
+                agent.balance, trades = self.evaluate_dna(agent.dna, tf)
+                agent.trades += trades
+        return agents
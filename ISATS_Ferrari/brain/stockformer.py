@@ -19,7 +19,7 @@ import os
 import sys
 import numpy as np
 import pandas as pd
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 from datetime import datetime, timedelta
 
 # 프로젝트 루트
@@ -55,55 +55,42 @@ except ImportError:
     from sklearn.preprocessing import MinMaxScaler
     HAS_SKLEARN = True
 
+from brain.window_dataset import SlidingWindowDataset
+
 
 # ==========================================
 # 📊 데이터셋
 # ==========================================
 
-class StockDataset(Dataset):
-    """주가 시계열 데이터셋"""
+class StockDataset(SlidingWindowDataset):
+    """주가 시계열 데이터셋 (종목별 정규화 배열 + 윈도우 뷰, 다종목 지원)"""
     
     def __init__(
         self,
-        data: pd.DataFrame,
+        data: Union[pd.DataFrame, List[pd.DataFrame]],
         seq_length: int = 60,
         pred_length: int = 5
     ):
         """
         Args:
-            data: OHLCV 데이터프레임
+            data: OHLCV 데이터프레임 (또는 종목별 데이터프레임 리스트)
             seq_length: 입력 시퀀스 길이 (60일)
             pred_length: 예측 길이 (5일)
         """
-        self.seq_length = seq_length
-        self.pred_length = pred_length
-        
-        # 정규화
-        self.scaler = MinMaxScaler()
-        self.data = self.scaler.fit_transform(data.values)
-        
-        # 시퀀스 생성
-        self.sequences = []
-        self.targets = []
+        frames = [data] if isinstance(data, pd.DataFrame) else list(data)
         
-        for i in range(len(self.data) - seq_length - pred_length):
-            seq = self.data[i:i + seq_length]
-            target = self.data[i + seq_length:i + seq_length + pred_length, 3]  # Close 가격
-            
-            self.sequences.append(seq)
-            self.targets.append(target)
+        # 정규화 (종목별 스케일러)
+        self.scalers = [MinMaxScaler() for _ in frames]
+        blocks = [s.fit_transform(df.values) for s, df in zip(self.scalers, frames)]
+        self.scaler = self.scalers[0] if self.scalers else None
         
-        self.sequences = np.array(self.sequences)
-        self.targets = np.array(self.targets)
-    
-    def __len__(self):
-        return len(self.sequences)
+        super().__init__(blocks, seq_length, pred_length)
+        self.pred_length = pred_length
     
-    def __getitem__(self, idx):
-        return (
-            torch.FloatTensor(self.sequences[idx]),
-            torch.FloatTensor(self.targets[idx])
-        )
+    def target(self, idx, row):
+        # 윈도우 직후 pred_length 봉의 Close 가격 (3번 컬럼)
+        start = row + self.seq_length
+        return torch.from_numpy(self.data[start:start + self.pred_length, 3].copy())
 
 
 # ==========================================
@@ -260,20 +247,21 @@ class StockformerTrainer:
     
     def predict(self, x: torch.Tensor) -> np.ndarray:
         """
-        예측
+        예측 (여러 종목은 배치로 한 번에)
         
         Args:
-            x: 입력 시퀀스 (seq_length, input_dim)
+            x: 입력 시퀀스 (seq_length, input_dim) 또는 배치 (batch, seq_length, input_dim)
         
         Returns:
-            예측값 (pred_length,)
+            예측값 (pred_length,) 또는 (batch, pred_length)
         """
         self.model.eval()
         
-        with torch.no_grad():
-            x = x.unsqueeze(0).to(self.device)  # (1, seq_length, input_dim)
-            pred = self.model(x)
-            return pred.cpu().numpy()[0]
+        single = x.dim() == 2
+        with torch.inference_mode():
+            x = x.unsqueeze(0) if single else x  # (batch, seq_length, input_dim)
+            pred = self.model(x.to(self.device)).cpu().numpy()
+            return pred[0] if single else pred
     
     def save(self, path: str):
         """모델 저장"""
@@ -331,7 +319,7 @@ if __name__ == "__main__":
         # 4. 예측
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        last_seq = torch.FloatTensor(dataset.sequences[-1])
+        last_seq = torch.from_numpy(dataset.window(-1))
         prediction = trainer.predict(last_seq)
         
         print(f"\n{'='*80}")
@@ -16,7 +16,15 @@ from brain.models import HybridCNN_LSTM
 # ==========================================
 
 class TimeMachineTrainer:
-    def __init__(self, ticker="005930.KS", market="KR"):
+    """
+    워크포워드 재학습 시뮬레이터
+    - retrain_every: 재학습 주기 (k일마다, 1이면 매일)
+    - finetune_window: 재학습 시 사용하는 최근 윈도우 수 (미니배치)
+    - finetune_epochs: 재학습 1회당 옵티마이저 스텝 수
+    기본값(1, 1, 1)은 기존 하루 1샘플 방식과 동일한 결과
+    빠른 시뮬레이션이 필요하면 명시적으로 지정 (예: retrain_every=5, finetune_window=20 → 결과가 달라짐)
+    """
+    def __init__(self, ticker="005930.KS", market="KR", retrain_every=1, finetune_window=1, finetune_epochs=1):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.ticker = ticker
         self.market = market
@@ -26,6 +34,9 @@ class TimeMachineTrainer:
         
         # 하이퍼파라미터
         self.seq_length = 60
+        self.retrain_every = max(1, retrain_every)
+        self.finetune_window = max(1, finetune_window)
+        self.finetune_epochs = max(1, finetune_epochs)
         self.balance = 10_000_000  # 초기 자본금 1,000만원
         self.shares = 0
         self.history = []
@@ -51,8 +62,31 @@ class TimeMachineTrainer:
         
         # MinMax Scaling
         self.df_norm = (df[cols] - df[cols].min()) / (df[cols].max() - df[cols].min() + 1e-8)
+        
+        # 텐서는 1회만 생성: 정규화 배열 + 윈도우 뷰 (windows[m] = data[m : m+seq_length], 복사 없음)
+        self.data = torch.from_numpy(self.df_norm.values.astype(np.float32)).to(self.device)
+        self.windows = self.data.unfold(0, self.seq_length, 1).transpose(1, 2)
+        # 샘플 j: 입력 data[j-seq_length : j], 정답 = 다음 봉 종가 상승 여부 (close[j+1] > close[j])
+        close = self.df_norm['Close'].values
+        self.labels = torch.zeros(len(df), 1)
+        self.labels[:-1, 0] = torch.from_numpy((close[1:] > close[:-1]).astype(np.float32))
+        self.labels = self.labels.to(self.device)
         return len(df)
 
+    def _samples(self, idx):
+        """샘플 번호(j) 배열 → (입력 배치, 정답 배치) (필요한 윈도우만 모아 복사)"""
+        idx = torch.as_tensor(idx, dtype=torch.long, device=self.device)
+        return self.windows[idx - self.seq_length], self.labels[idx]
+
+    def _fit(self, X_tensor, y_tensor, steps):
+        self.model.train()
+        for _ in range(steps):
+            self.optimizer.zero_grad()
+            out = self.model(X_tensor)
+            loss = self.criterion(out, y_tensor)
+            loss.backward()
+            self.optimizer.step()
+
     def run_simulation(self, start_idx_offset=500):
         """
         start_idx_offset: 뒤에서부터 며칠 전으로 돌아갈지 (예: 500일 전)
@@ -68,6 +102,7 @@ class TimeMachineTrainer:
         print(f"\n🕰️ [Time Machine] {self.ticker}의 {start_idx_offset}일 전 과거로 이동합니다...")
         print(f"   -> 시작일: {self.raw_df.iloc[start_idx]['Date']}")
         print(f"   -> 초기 자본: {self.balance:,}원")
+        print(f"   -> 재학습: {self.retrain_every}일마다 최근 {self.finetune_window}개 윈도우")
         print("="*60)
 
         # 2. 초기 학습 (과거 데이터만으로 베이스 모델 생성)
@@ -77,61 +112,41 @@ class TimeMachineTrainer:
         # 3. 하루하루 살아가기 (Walk-Forward)
         win = 0
         loss_cnt = 0
+        prices = self.raw_df['Close'].values
+        dates = self.raw_df['Date'].values
         
         # 진행바 생성
-        pbar = tqdm(range(start_idx, total_len - 1), desc="Daily Trading", unit="day")
+        pbar = tqdm(total=total_len - 1 - start_idx, desc="Daily Trading", unit="day")
         
-        for t in pbar:
-            # --- (1) 아침: 어제까지의 데이터로 학습 ---
-            self._finetune_model(current_idx=t)
+        for block_start in range(start_idx, total_len - 1, self.retrain_every):
+            days = range(block_start, min(block_start + self.retrain_every, total_len - 1))
             
-            # --- (2) 오후: 내일 예측 ---
-            input_seq = self.df_norm.iloc[t-self.seq_length : t].values
-            input_tensor = torch.FloatTensor(input_seq).unsqueeze(0).to(self.device)
+            # --- (1) 아침: 어제까지의 데이터로 학습 (재학습 주기마다) ---
+            self._finetune_model(current_idx=block_start)
             
+            # --- (2) 오후: 다음 재학습 전까지의 예측을 한 번에 (모델이 고정된 구간) ---
             self.model.eval()
             with torch.no_grad():
-                pred = self.model(input_tensor).item()
+                preds = self.model(self.windows[days.start - self.seq_length : days.stop - self.seq_length]).squeeze(1).tolist()
             
-            # --- (3) 매매 결정 ---
-            current_price = self.raw_df.iloc[t]['Close']
-            next_real_price = self.raw_df.iloc[t+1]['Close']
-            date = self.raw_df.iloc[t]['Date']
-            
-            action = "HOLD"
-            # AI가 60% 이상 확신하면 매수
-            if pred > 0.6 and self.balance > 0:
-                buy_amt = int(self.balance // current_price)
-                if buy_amt > 0:
-                    self.shares = buy_amt
-                    self.balance -= buy_amt * current_price
-                    action = "BUY"
-            
-            # AI가 40% 이하로 비관하면 매도
-            elif pred < 0.4 and self.shares > 0:
-                self.balance += self.shares * current_price
-                self.shares = 0
-                action = "SELL"
-            
-            # --- (4) 결과 확인 (내일이 됨) ---
-            asset_value = self.balance + (self.shares * next_real_price)
-            profit = (asset_value - 10_000_000) / 10_000_000 * 100
-            
-            is_correct = (pred > 0.5 and next_real_price > current_price) or \
-                         (pred <= 0.5 and next_real_price <= current_price)
-            if is_correct: win += 1
-            else: loss_cnt += 1
+            for t, pred in zip(days, preds):
+                self._trade_day(t, pred, prices, dates)
+                next_real_price = prices[t+1]
+                current_price = prices[t]
+                
+                is_correct = (pred > 0.5 and next_real_price > current_price) or \
+                             (pred <= 0.5 and next_real_price <= current_price)
+                if is_correct: win += 1
+                else: loss_cnt += 1
             
+            pbar.update(len(days))
+            last = self.history[-1]
             pbar.set_postfix({
-                'Profit': f"{profit:.1f}%", 
+                'Profit': f"{(last['Asset'] - 10_000_000) / 10_000_000 * 100:.1f}%", 
                 'Acc': f"{win/(win+loss_cnt)*100:.1f}%",
-                'Action': action
-            })
-            
-            self.history.append({
-                'Date': date, 'Price': current_price, 'Action': action, 
-                'Asset': asset_value, 'AI_Score': pred
+                'Action': last['Action']
             })
+        pbar.close()
 
         print("\n" + "="*60)
         final_profit = self.history[-1]['Asset']
@@ -144,48 +159,50 @@ class TimeMachineTrainer:
         pd.DataFrame(self.history).to_csv(f"time_machine_result_{self.ticker}.csv", index=False)
         print(f"   💾 상세 기록 저장됨: time_machine_result_{self.ticker}.csv")
 
+    def _trade_day(self, t, pred, prices, dates):
+        """하루 매매 결정 및 자산 기록 (t일 종가 체결, t+1일 종가 평가)"""
+        # --- (3) 매매 결정 ---
+        current_price = prices[t]
+        next_real_price = prices[t+1]
+        date = dates[t]
+        
+        action = "HOLD"
+        # AI가 60% 이상 확신하면 매수
+        if pred > 0.6 and self.balance > 0:
+            buy_amt = int(self.balance // current_price)
+            if buy_amt > 0:
+                self.shares = buy_amt
+                self.balance -= buy_amt * current_price
+                action = "BUY"
+        
+        # AI가 40% 이하로 비관하면 매도
+        elif pred < 0.4 and self.shares > 0:
+            self.balance += self.shares * current_price
+            self.shares = 0
+            action = "SELL"
+        
+        # --- (4) 결과 확인 (내일이 됨) ---
+        asset_value = self.balance + (self.shares * next_real_price)
+        
+        self.history.append({
+            'Date': date, 'Price': current_price, 'Action': action, 
+            'Asset': asset_value, 'AI_Score': pred
+        })
+
     def _train_base_model(self, end_idx):
         """시뮬레이션 시작 전 기본 학습"""
-        X, y = [], []
-        data = self.df_norm.values
         start_train = max(0, end_idx - 365)
-        
-        for i in range(start_train + self.seq_length, end_idx - 1):
-            X.append(data[i-self.seq_length : i])
-            if data[i+1][3] > data[i][3]:
-                y.append(1.0)
-            else:
-                y.append(0.0)
-                
-        if not X: return
+        idx = np.arange(start_train + self.seq_length, end_idx - 1)
+        if len(idx) == 0: return
 
-        X_tensor = torch.FloatTensor(np.array(X)).to(self.device)
-        y_tensor = torch.FloatTensor(np.array(y)).unsqueeze(1).to(self.device)
-        
-        self.model.train()
-        for _ in range(10):
-            self.optimizer.zero_grad()
-            out = self.model(X_tensor)
-            loss = self.criterion(out, y_tensor)
-            loss.backward()
-            self.optimizer.step()
+        X_tensor, y_tensor = self._samples(idx)
+        self._fit(X_tensor, y_tensor, steps=10)
 
     def _finetune_model(self, current_idx):
-        """매일매일 실시간 재학습"""
+        """재학습: 오늘 확정된 정답까지의 최근 finetune_window개 샘플로 미니배치 학습"""
         if current_idx < self.seq_length + 1: return
         
-        data = self.df_norm.values
-        prev_idx = current_idx - 1
-        
-        X = data[prev_idx-self.seq_length : prev_idx]
-        target = 1.0 if data[current_idx][3] > data[prev_idx][3] else 0.0
-            
-        X_tensor = torch.FloatTensor(X).unsqueeze(0).to(self.device)
-        y_tensor = torch.FloatTensor([[target]]).to(self.device)
-        
-        self.model.train()
-        self.optimizer.zero_grad()
-        out = self.model(X_tensor)
-        loss = self.criterion(out, y_tensor)
-        loss.backward()
-        self.optimizer.step()
+        # 샘플 j의 정답은 close[j+1] → 오늘(current_idx)까지 알 수 있는 마지막 샘플은 j = current_idx - 1
+        idx = np.arange(max(self.seq_length, current_idx - self.finetune_window), current_idx)
+        X_tensor, y_tensor = self._samples(idx)
+        self._fit(X_tensor, y_tensor, steps=self.finetune_epochs)
@@ -4,13 +4,14 @@ import torch.nn as nn
 import torch.optim as optim
 import pandas as pd
 import numpy as np
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import DataLoader
 from tqdm import tqdm
 import sys
 
 # 경로 설정
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from brain.models import HybridCNN_LSTM
+from brain.window_dataset import SlidingWindowDataset
 
 # ==========================================
 # 🏋️ Deep Eyes Training System
@@ -24,26 +25,27 @@ EPOCHS = 5
 LEARNING_RATE = 0.001
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-class StockDataset(Dataset):
-    def __init__(self, data_dir, market="KR", limit_files=20):
-        self.samples = []
-        self.targets = []
+class StockDataset(SlidingWindowDataset):
+    """
+    종목별 정규화 배열 1개씩만 보관하고 60봉 윈도우는 요청 시 뷰로 제공
+    (윈도우별 복사본을 만들지 않으므로 전 종목 학습 가능)
+    """
+    def __init__(self, data_dir, market="KR", limit_files=None):
+        blocks, labels, names = [], [], []
         
         target_dir = os.path.join(data_dir, market)
         
         if not os.path.exists(target_dir):
             print(f"❌ [{market}] 데이터 폴더가 없습니다: {target_dir}")
-            return
-            
-        files = [f for f in os.listdir(target_dir) if f.endswith('.csv')]
-        
-        if not files:
-            print(f"❌ [{market}] CSV 파일이 없습니다. 먼저 채굴을 수행하세요.")
-            return
-        
-        print(f"📚 [{market}] 데이터 로딩 중... (최대 {limit_files}개 종목 학습)")
+            files = []
+        else:
+            files = sorted(f for f in os.listdir(target_dir) if f.endswith('.csv'))
+            if not files:
+                print(f"❌ [{market}] CSV 파일이 없습니다. 먼저 채굴을 수행하세요.")
+            else:
+                print(f"📚 [{market}] 데이터 로딩 중... ({len(files[:limit_files])}개 종목 학습)")
         
-        for file in tqdm(files[:limit_files]): # 너무 많으면 메모리 터지므로 제한
+        for file in tqdm(files[:limit_files]):
             path = os.path.join(target_dir, file)
             try:
                 df = pd.read_csv(path)
@@ -64,36 +66,28 @@ class StockDataset(Dataset):
                 data = df_norm.values
                 close_prices = df['Close'].values # 원본 종가
                 
-                # 시퀀스 생성
-                for i in range(len(data) - SEQ_LENGTH - PREDICT_DAY):
-                    x = data[i : i+SEQ_LENGTH]
-                    
-                    # 라벨링: 내일 종가가 오늘 종가보다 2% 이상 오르면 1
-                    today_close = close_prices[i + SEQ_LENGTH - 1]
-                    tomorrow_close = close_prices[i + SEQ_LENGTH]
-                    
-                    if tomorrow_close > today_close * 1.02:
-                        y = 1.0
-                    else:
-                        y = 0.0
-                        
-                    self.samples.append(x)
-                    self.targets.append(y)
+                # 라벨링: 내일 종가가 오늘 종가보다 2% 이상 오르면 1 (윈도우 i의 마지막 봉 기준)
+                n = len(data) - SEQ_LENGTH - PREDICT_DAY
+                today_close = close_prices[SEQ_LENGTH - 1:SEQ_LENGTH - 1 + n]
+                tomorrow_close = close_prices[SEQ_LENGTH:SEQ_LENGTH + n]
+                
+                blocks.append(data.astype(np.float32))
+                labels.append((tomorrow_close > today_close * 1.02).astype(np.float32))
+                names.append(file[:-4])
             except Exception as e:
                 continue
+        
+        super().__init__(blocks, SEQ_LENGTH, PREDICT_DAY, names=names)
+        # 윈도우 번호 순서와 동일하게 이어붙인 라벨 (N, 1)
+        self.targets = torch.from_numpy(np.concatenate(labels) if labels else np.empty(0, dtype=np.float32)).unsqueeze(1)
                 
-        if len(self.samples) > 0:
-            self.samples = torch.FloatTensor(np.array(self.samples))
-            self.targets = torch.FloatTensor(np.array(self.targets)).unsqueeze(1)
-            print(f"✅ 데이터셋 준비 완료: 총 {len(self.samples)}개 샘플")
+        if len(self) > 0:
+            print(f"✅ 데이터셋 준비 완료: 총 {len(self)}개 샘플 ({self.data.nbytes / 1e6:.1f}MB)")
         else:
             print(f"❌ 유효한 샘플을 생성하지 못했습니다.")
 
-    def __len__(self):
-        return len(self.samples)
-
-    def __getitem__(self, idx):
-        return self.samples[idx], self.targets[idx]
+    def target(self, idx, row):
+        return self.targets[idx]
 
 def train():
     print(f"🚀 [Training] Deep Eyes 학습 시작 (Device: {DEVICE})")
@@ -103,7 +97,7 @@ def train():
     data_dir = os.path.join(base_dir, "data")
     
     # 한국 주식 데이터로 학습
-    dataset = StockDataset(data_dir, market="KR", limit_files=20) 
+    dataset = StockDataset(data_dir, market="KR")
     if len(dataset) == 0:
         print("❌ 학습할 데이터가 없습니다. 먼저 채굴(mass_data_miner)을 수행하세요.")
         return
@@ -0,0 +1,40 @@
+import pandas as pd
+
+# ==========================================
+# 📈 금융 난기류 지수 (Turbulence Index)
+# 역할: 수익률 마할라노비스 거리로 시장 이상 변동 감지
+# - brain.finrl_ensemble(gym / stable-baselines3)과 분리 → 감시자가 강화학습 의존성 없이 사용
+# ==========================================
+
+def calculate_turbulence(df: pd.DataFrame, window: int = 252) -> pd.Series:
+    """
+    금융 난기류 지수 계산
+    
+    Args:
+        df: OHLCV 데이터프레임
+        window: 계산 윈도우 (252일 = 1년)
+    
+    Returns:
+        난기류 지수 시리즈
+    """
+    returns = df['Close'].pct_change().dropna()
+    
+    turbulence = []
+    
+    for i in range(window, len(returns)):
+        window_returns = returns.iloc[i-window:i]
+        
+        # 평균 및 공분산
+        mean = window_returns.mean()
+        cov = window_returns.var()
+        
+        # 마할라노비스 거리
+        current_return = returns.iloc[i]
+        distance = (current_return - mean) ** 2 / (cov + 1e-9)
+        
+        turbulence.append(distance)
+    
+    # 앞부분 패딩
+    turbulence = [0] * window + turbulence
+    
+    return pd.Series(turbulence, index=df.index)
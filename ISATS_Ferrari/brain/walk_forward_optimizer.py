@@ -0,0 +1,334 @@
+"""
+🧪 ISATS WALK-FORWARD OPTIMIZER
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+전략 파라미터 병렬 스윕 + 워크포워드 검증 (Walk-Forward Optimization)
+
+기능:
+1. 파라미터 격자 스윕 (기본: ActiveBot의 ma_short/ma_long/rsi_buy/rsi_sell/tp_rate/sl_rate)
+2. 워크포워드 폴드: [학습 구간 → 검증 구간]을 step 봉씩 전진
+3. (종목, 폴드) 단위 작업을 프로세스 풀에서 병렬 평가 (core/backtest_engine.py)
+4. 결과 캐시 (SQLite): 키 = (폴드 데이터 해시, 파라미터, 폴드 구성, 비용)
+   - 작업 1건 완료마다 커밋 → 중단된 스윕은 남은 조합만 이어서 계산
+   - 폴드는 달력 시작점 기준으로 고정 → 새 봉 추가 시 마지막(미완성) 폴드와
+     새로 생긴 폴드만 해시가 바뀌어 재계산, 나머지는 캐시 적중
+5. 폴드별 학습 구간 최적 파라미터 선택 → 검증 구간(표본 외) 성과 집계
+
+캐시/리포트 위치: brain/walk_forward_cache.db, brain/walk_forward_report.json
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 및 모듈 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.backtest_engine import IndicatorCache, run_strategy
+
+BRAIN_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BRAIN_DIR, "walk_forward_cache.db")
+REPORT_PATH = os.path.join(BRAIN_DIR, "walk_forward_report.json")
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# ActiveBot 파라미터 탐색 공간 (표준값 포함)
+ACTIVE_BOT_SPACE = {
+    'ma_short': [3, 5, 10],
+    'ma_long': [20, 40, 60],
+    'rsi_period': [14],
+    'rsi_buy': [25, 30, 35],
+    'rsi_sell': [65, 70, 75],
+    'tp_rate': [0.03, 0.05, 0.10],
+    'sl_rate': [0.02, 0.03, 0.05],
+}
+
+# 폴드: 달력 위치(train_start, test_start, test_end(미포함)) + 기간 표시용 날짜
+Fold = namedtuple("Fold", ["fold", "train_start", "test_start", "test_end", "dates"])
+
+
+def expand_grid(space: Dict[str, List]) -> List[Dict]:
+    """파라미터 격자 전개 (단기/장기 이평, 매수/매도 RSI 역전 조합 제외)"""
+    keys = list(space)
+    grid = []
+    for values in itertools.product(*(space[k] for k in keys)):
+        params = dict(zip(keys, values))
+        if 'ma_short' in params and 'ma_long' in params and params['ma_short'] >= params['ma_long']:
+            continue
+        if 'rsi_buy' in params and 'rsi_sell' in params and params['rsi_buy'] >= params['rsi_sell']:
+            continue
+        grid.append(params)
+    return grid
+
+
+def params_key(params: Dict) -> str:
+    """캐시 키용 파라미터 직렬화 (정렬된 JSON)"""
+    return json.dumps(params, sort_keys=True)
+
+
+def make_folds(calendar: pd.DatetimeIndex, train_bars: int, test_bars: int,
+               step: Optional[int] = None, min_test_bars: int = 5) -> List[Fold]:
+    """
+    워크포워드 폴드 생성 (달력 시작점 고정, step 봉씩 전진)
+    - 마지막 검증 구간은 min_test_bars 이상이면 미완성이어도 포함 (새 봉이 붙으면 해당 폴드만 변경)
+    """
+    step = step or test_bars
+    n = len(calendar)
+    folds = []
+    a = 0
+    while a + train_bars + min_test_bars <= n:
+        b = a + train_bars
+        c = min(n, b + test_bars)
+        dates = (calendar[a].date().isoformat(), calendar[b].date().isoformat(),
+                 calendar[c - 1].date().isoformat())
+        folds.append(Fold(len(folds), a, b, c, dates))
+        a += step
+    return folds
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """폴드 구간 데이터 해시 (날짜 + OHLCV 원시 바이트)"""
+    h = hashlib.sha1()
+    h.update(df.index.values.astype('datetime64[ns]').view(np.int64).tobytes())
+    for col in PRICE_COLUMNS:
+        h.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+def load_universe(data_dir: str, tickers: Optional[List[str]] = None, max_tickers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """data/<시장>/*.csv → {종목: OHLCV DataFrame}"""
+    if tickers:
+        files = [os.path.join(data_dir, f"{t}.csv") for t in tickers]
+    else:
+        files = sorted(os.path.join(data_dir, f) for f in os.listdir(data_dir) if f.endswith('.csv'))
+    frames = {}
+    for path in files[:max_tickers]:
+        if not os.path.exists(path):
+            continue
+        df = pd.read_csv(path, parse_dates=['Date'], index_col='Date')
+        if not set(PRICE_COLUMNS).issubset(df.columns):
+            continue
+        df = df[PRICE_COLUMNS].astype(np.float64).dropna()
+        frames[os.path.basename(path)[:-4]] = df[~df.index.duplicated(keep='last')].sort_index()
+    return frames
+
+
+def evaluate_fold(strategy: str, df: pd.DataFrame, train_len: int, params_list: List[Dict],
+                  fee: float = 0.0, slippage: float = 0.0) -> List[tuple]:
+    """
+    폴드 1개 평가 (프로세스 풀 작업 단위)
+    - 학습: df[:train_len]
+    - 검증: df 전체로 지표를 이어서 계산하고 train_len 봉부터 진입 (표본 외 구간)
+
+    Returns:
+        [(params_key, 학습 summary, 검증 summary), ...]
+    """
+    train_cache = IndicatorCache(df.iloc[:train_len])
+    full_cache = IndicatorCache(df)
+    rows = []
+    for params in params_list:
+        train = run_strategy(train_cache, strategy, params, fee=fee, slippage=slippage).summary()
+        test = run_strategy(full_cache, strategy, params, start=train_len, fee=fee, slippage=slippage).summary()
+        rows.append((params_key(params), train, test))
+    return rows
+
+
+class ResultCache:
+    """SQLite 결과 캐시 (부모 프로세스 전용)"""
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                strategy TEXT, data_hash TEXT, train_len INTEGER, fee REAL, slippage REAL,
+                params TEXT, ticker TEXT, fold INTEGER, train TEXT, test TEXT, created TEXT,
+                PRIMARY KEY (strategy, data_hash, train_len, fee, slippage, params)
+            )
+        """)
+        self.conn.commit()
+
+    def lookup(self, strategy, data_hash, train_len, fee, slippage) -> Dict[str, tuple]:
+        """폴드 구간 1개에 대해 캐시된 {params_key: (train, test)}"""
+        cur = self.conn.execute(
+            "SELECT params, train, test FROM results "
+            "WHERE strategy=? AND data_hash=? AND train_len=? AND fee=? AND slippage=?",
+            (strategy, data_hash, train_len, fee, slippage))
+        return {p: (json.loads(tr), json.loads(te)) for p, tr, te in cur}
+
+    def store(self, strategy, data_hash, train_len, fee, slippage, ticker, fold, rows):
+        now = datetime.now().isoformat()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+            [(strategy, data_hash, train_len, fee, slippage, key, ticker, fold,
+              json.dumps(train), json.dumps(test), now) for key, train, test in rows])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class WalkForwardOptimizer:
+    """
+    워크포워드 파라미터 최적화기
+
+    사용 예:
+        opt = WalkForwardOptimizer("data/KR", strategy='active_bot', max_tickers=20)
+        report = opt.run()
+    """
+
+    def __init__(self, data_dir: str, strategy: str = 'active_bot', space: Optional[Dict] = None,
+                 train_bars: int = 250, test_bars: int = 60, step: Optional[int] = None,
+                 tickers: Optional[List[str]] = None, max_tickers: Optional[int] = None,
+                 metric: str = 'sharpe_ratio', fee: float = 0.00015, slippage: float = 0.0005,
+                 workers: Optional[int] = None, chunk_size: int = 250, cache_path: str = CACHE_PATH):
+        self.data_dir = data_dir
+        self.strategy = strategy
+        self.grid = expand_grid(space or ACTIVE_BOT_SPACE)
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.step = step or test_bars
+        self.tickers = tickers
+        self.max_tickers = max_tickers
+        self.metric = metric
+        self.fee = fee
+        self.slippage = slippage
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.chunk_size = chunk_size
+        self.cache_path = cache_path
+
+    def _jobs(self, frames: Dict[str, pd.DataFrame], folds: List[Fold], calendar: pd.DatetimeIndex):
+        """(종목, 폴드)별 구간 슬라이스 + 해시 (학습 구간 데이터가 부족한 종목은 제외)"""
+        jobs = []
+        for ticker, df in frames.items():
+            for fold in folds:
+                lo = df.index.searchsorted(calendar[fold.train_start])
+                mid = df.index.searchsorted(calendar[fold.test_start])
+                hi = df.index.searchsorted(calendar[fold.test_end - 1], side='right')
+                # 학습 구간의 절반 이상 + 검증 구간 최소 1봉이 있어야 평가
+                if mid - lo < self.train_bars // 2 or hi <= mid:
+                    continue
+                part = df.iloc[lo:hi]
+                jobs.append((ticker, fold, part, mid - lo, frame_hash(part)))
+        return jobs
+
+    def run(self) -> Dict:
+        frames = load_universe(self.data_dir, self.tickers, self.max_tickers)
+        if not frames:
+            print(f"❌ [WFO] 데이터가 없습니다: {self.data_dir}")
+            return {}
+        calendar = pd.DatetimeIndex(sorted(set().union(*(df.index for df in frames.values()))))
+        folds = make_folds(calendar, self.train_bars, self.test_bars, self.step)
+        if not folds:
+            print(f"❌ [WFO] 폴드를 만들 수 없습니다 (달력 {len(calendar)}봉 < 학습 {self.train_bars}봉)")
+            return {}
+
+        print(f"🧪 [WFO] {self.strategy} | 종목 {len(frames)}개 | 폴드 {len(folds)}개 | 조합 {len(self.grid)}개")
+        cache = ResultCache(self.cache_path)
+        try:
+            results, pending = {}, []
+            for ticker, fold, part, train_len, data_hash in self._jobs(frames, folds, calendar):
+                cached = cache.lookup(self.strategy, data_hash, train_len, self.fee, self.slippage)
+                results[(ticker, fold.fold)] = cached
+                missing = [p for p in self.grid if params_key(p) not in cached]
+                for k in range(0, len(missing), self.chunk_size):
+                    pending.append((ticker, fold.fold, part, train_len, data_hash, missing[k:k + self.chunk_size]))
+
+            total = sum(len(r) for r in results.values()) + sum(len(job[5]) for job in pending)
+            print(f"   💾 캐시 적중 {total - sum(len(job[5]) for job in pending)}/{total} | 계산 작업 {len(pending)}건")
+            if pending:
+                self._compute(pending, results, cache)
+        finally:
+            cache.close()
+
+        report = self.summarize(folds, results)
+        self.save_report(report)
+        return report
+
+    def _compute(self, pending: List[tuple], results: Dict, cache: ResultCache):
+        """미계산 조합을 프로세스 풀에서 평가하고, 작업 1건마다 캐시에 커밋"""
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(evaluate_fold, self.strategy, part, train_len, params_list,
+                            self.fee, self.slippage): (ticker, fold, train_len, data_hash)
+                for ticker, fold, part, train_len, data_hash, params_list in pending
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                ticker, fold, train_len, data_hash = futures[future]
+                rows = future.result()
+                cache.store(self.strategy, data_hash, train_len, self.fee, self.slippage, ticker, fold, rows)
+                results[(ticker, fold)].update({key: (train, test) for key, train, test in rows})
+                if done % 20 == 0 or done == len(futures):
+                    print(f"   ⚙️ {done}/{len(futures)} 작업 완료")
+
+    def summarize(self, folds: List[Fold], results: Dict) -> Dict:
+        """폴드별 학습 최적 파라미터 선택 → 검증 구간 성과 (종목 평균)"""
+        keys = [params_key(p) for p in self.grid]
+        fold_reports = []
+        oos = {key: [] for key in keys}   # 조합별 폴드 검증 지표 (안정성 순위용)
+        for fold in folds:
+            per_ticker = [r for (t, f), r in results.items() if f == fold.fold and r]
+            if not per_ticker:
+                continue
+            train = {k: np.mean([r[k][0][self.metric] for r in per_ticker]) for k in keys}
+            test = {k: np.mean([r[k][1][self.metric] for r in per_ticker]) for k in keys}
+            for k in keys:
+                oos[k].append(test[k])
+            best = max(keys, key=lambda k: train[k])
+            fold_reports.append({
+                'fold': fold.fold,
+                'train': f"{fold.dates[0]} ~ {fold.dates[1]}",
+                'test': f"{fold.dates[1]} ~ {fold.dates[2]}",
+                'tickers': len(per_ticker),
+                'best_params': json.loads(best),
+                f'train_{self.metric}': round(float(train[best]), 4),
+                f'test_{self.metric}': round(float(test[best]), 4),
+                'test_return': round(float(np.mean([r[best][1]['total_return'] for r in per_ticker])), 4),
+            })
+
+        robust = sorted((k for k in keys if oos[k]), key=lambda k: np.mean(oos[k]), reverse=True)
+        return {
+            'strategy': self.strategy,
+            'metric': self.metric,
+            'train_bars': self.train_bars,
+            'test_bars': self.test_bars,
+            'step': self.step,
+            'combinations': len(self.grid),
+            'folds': fold_reports,
+            'oos_return': round(float(np.mean([f['test_return'] for f in fold_reports])), 4) if fold_reports else 0.0,
+            'robust_params': [{'params': json.loads(k), f'mean_test_{self.metric}': round(float(np.mean(oos[k])), 4)}
+                              for k in robust[:10]],
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    def save_report(self, report: Dict, path: str = REPORT_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"\n💾 [WFO] 리포트 저장: {path}")
+        if report.get('folds'):
+            print(f"   표본 외 평균 수익률: {report['oos_return']*100:.2f}%")
+            print(f"   안정 파라미터 1위: {report['robust_params'][0]['params']}")
+
+
+def main():
+    """메인 실행 함수"""
+    optimizer = WalkForwardOptimizer(
+        data_dir="data/KR",
+        strategy='active_bot',
+        max_tickers=20
+    )
+    optimizer.run()
+
+
+if __name__ == "__main__":
+    main()
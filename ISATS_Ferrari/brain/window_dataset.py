@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+from typing import List, Optional
+
+# ==========================================
+# Sliding Window Dataset
+# 역할: 종목별 정규화 배열을 하나의 연속 배열에 1회 적재하고, 윈도우는 요청 시 뷰로 제공
+# ==========================================
+
+
+class SlidingWindowDataset(Dataset, ABC):
+    """
+    다종목 슬라이딩 윈도우 데이터셋 (윈도우 사전 생성 없음)
+    - data: 전 종목 (행, 피처) float32 연속 배열 (가격 1회 저장)
+    - offsets: 종목별 시작 행, cum: 종목별 누적 윈도우 수 (idx → 종목/시작 행 변환)
+    - 종목 k의 윈도우 수 = 길이 - seq_length - horizon (기존 반복문 범위와 동일)
+
+    하위 클래스는 target(idx, row)으로 정답을 정의
+    """
+
+    def __init__(self, blocks: List[np.ndarray], seq_length: int, horizon: int,
+                 names: Optional[List[str]] = None, dtype=np.float32):
+        self.seq_length = seq_length
+        self.horizon = horizon
+        self.names = list(names) if names is not None else [str(k) for k in range(len(blocks))]
+
+        lengths = np.array([len(b) for b in blocks], dtype=np.int64)
+        counts = np.maximum(lengths - seq_length - horizon, 0)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        self.cum = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        if blocks:
+            self.data = np.ascontiguousarray(np.concatenate(blocks), dtype=dtype)
+        else:
+            self.data = np.empty((0, 0), dtype=dtype)
+
+    def __len__(self):
+        return int(self.cum[-1])
+
+    def locate(self, idx: int) -> int:
+        """윈도우 번호 → data 내 시작 행"""
+        n = len(self)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError(f"window index {idx} out of range ({n})")
+        k = int(np.searchsorted(self.cum, idx, side='right')) - 1
+        return int(self.offsets[k] + idx - self.cum[k])
+
+    def window(self, idx: int) -> np.ndarray:
+        """(seq_length, 피처) 뷰 (복사 없음)"""
+        row = self.locate(idx)
+        return self.data[row:row + self.seq_length]
+
+    def windows(self, k: int) -> np.ndarray:
+        """종목 k의 전체 윈도우 (윈도우 수, seq_length, 피처) 스트라이드 뷰"""
+        start = self.offsets[k]
+        count = self.cum[k + 1] - self.cum[k]
+        if count == 0:
+            # 윈도우가 없는 종목 (길이 <= seq_length + horizon)
+            return np.empty((0, self.seq_length, self.data.shape[1]), dtype=self.data.dtype)
+        block = self.data[start:start + count + self.seq_length - 1]
+        return np.lib.stride_tricks.sliding_window_view(block, self.seq_length, axis=0).transpose(0, 2, 1)
+
+    @abstractmethod
+    def target(self, idx: int, row: int):
+        """윈도우 idx (data 내 시작 행 row)의 정답"""
+
+    def __getitem__(self, idx):
+        row = self.locate(idx)
+        # from_numpy는 메모리를 공유 → 배치 생성(collate) 시에만 복사
+        x = torch.from_numpy(self.data[row:row + self.seq_length])
+        return x, self.target(idx, row)
@@ -10,6 +10,7 @@
 3. 종합 점수 7점 이상 종목만 필터링
 4. daily_target_list.csv 자동 생성
 5. ISATS 메인 파이프라인 연결
+6. 유사 패턴 승률 일괄 조회 (core.pattern_index 디스크 ANN 인덱스)
 
 작성자: ISATS Neural Swarm
 버전: 2.0 (Optimized)
@@ -37,14 +38,17 @@ except ImportError:
     sys.path.append(os.path.dirname(__file__))
     from deep_insight_v2 import DeepInsightV2
 
+from core.pattern_index import PatternIndex
+
 class AutoScanner:
     """대규모 자동 시장 스캐너 (최적화 버전)"""
     
-    def __init__(self, data_dir: str = "data", min_score: int = 8):
+    def __init__(self, data_dir: str = "data", min_score: int = 8, use_pattern_index: bool = True):
         """
         Args:
             data_dir: 데이터 디렉토리 경로 (기본값: "data")
             min_score: 최소 점수 (기본값: 7점)
+            use_pattern_index: 유사 패턴 인덱스로 패턴 승률 점수 반영 (없으면 빌드, 있으면 증분 갱신)
         """
         self.project_root = Path(__file__).parent.parent
         self.data_dir = self.project_root / data_dir
@@ -54,6 +58,15 @@ class AutoScanner:
         # Deep Insight Scanner 초기화
         self.engine = DeepInsightV2()
         
+        # 패턴 인덱스 (최초 1회 빌드 후 새 봉만 증분 반영)
+        self.pattern_index = None
+        if use_pattern_index:
+            try:
+                self.pattern_index = PatternIndex.open_or_build([self.data_dir / "KR", self.data_dir / "US"])
+                self.pattern_index.update()
+            except Exception as e:
+                print(f"⚠️ [Scanner] 패턴 인덱스 사용 불가 (패턴 점수 제외): {e}")
+        
         print(f"\n{'='*80}")
         print(f"🎯 AUTO MARKET SCANNER v2.0 (Optimized)")
         print(f"{'='*80}")
@@ -86,7 +99,7 @@ class AutoScanner:
             print("❌ 데이터 파일이 없습니다. 데이터 수집기(Miner)를 먼저 실행하십시오.")
             return []
         
-        targets = []
+        candidates = []
         
         print(f"\n{'='*80}")
         print(f"🚀 [Mission Start] 전 종목 정밀 타격 스캔 시작...")
@@ -144,48 +157,74 @@ class AutoScanner:
                     }
                 }
                 
-                # 점수 계산
-                score, reasons = self.engine.calculate_score(analysis)
-                
-                # 3. 타겟 필터링 (min_score 이상)
-                if score >= self.min_score:
-                    current_price = df.iloc[-1]['Close']
-                    prev_close = df.iloc[-2]['Close']
-                    change_pct = (current_price - prev_close) / prev_close * 100
-                    
-                    # 추천 등급
-                    if score >= 8:
-                        recommendation = "STRONG BUY"
-                    elif score >= 6:
-                        recommendation = "BUY"
-                    else:
-                        recommendation = "HOLD"
-                    
-                    targets.append({
-                        'ticker': ticker,
-                        'market': market,
-                        'score': score,
-                        'recommendation': recommendation,
-                        'current_price': current_price,
-                        'change_pct': change_pct,
-                        'rsi': rsi,
-                        'macd_hist': hist,
-                        'trend': trend_info['trend'],
-                        'strength_ratio': vol_profile['strength_ratio'],
-                        'volume_ratio': vol_profile['volume_ratio'],
-                        'accumulation_signal': accumulation['signal'],
-                        'reasons': ' | '.join(reasons),
-                        'scan_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
+                candidates.append((ticker, market, df, analysis))
                     
             except Exception as e:
                 # 에러난 파일은 스킵하고 계속 진행
                 continue
         
+        # 3. 유사 패턴 일괄 조회 (전 종목 최근 60봉 → 인덱스 1회 질의)
+        self.attach_patterns(candidates)
+        
+        # 4. 점수 계산 + 타겟 필터링 (min_score 이상)
+        targets = []
+        for ticker, market, df, analysis in candidates:
+            score, reasons = self.engine.calculate_score(analysis)
+            if score < self.min_score:
+                continue
+            
+            current_price = df.iloc[-1]['Close']
+            prev_close = df.iloc[-2]['Close']
+            change_pct = (current_price - prev_close) / prev_close * 100
+            
+            # 추천 등급
+            if score >= 8:
+                recommendation = "STRONG BUY"
+            elif score >= 6:
+                recommendation = "BUY"
+            else:
+                recommendation = "HOLD"
+            
+            technical, volume = analysis['technical'], analysis['volume']
+            pattern = analysis.get('pattern')
+            targets.append({
+                'ticker': ticker,
+                'market': market,
+                'score': score,
+                'recommendation': recommendation,
+                'current_price': current_price,
+                'change_pct': change_pct,
+                'rsi': technical['rsi'],
+                'macd_hist': technical['macd']['hist'],
+                'trend': technical['trend']['trend'],
+                'strength_ratio': volume['strength_ratio'],
+                'volume_ratio': volume['volume_ratio'],
+                'accumulation_signal': volume['accumulation']['signal'],
+                'pattern_win_prob': pattern['win_probability'] if pattern else None,
+                'reasons': ' | '.join(reasons),
+                'scan_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
+        
         # 결과 저장
         self.save_targets(targets)
         return targets
     
+    def attach_patterns(self, candidates: List[tuple]):
+        """
+        후보 종목 최근 60봉 유사 패턴을 한 번에 조회해 analysis['pattern'] 추가
+        - 자기 자신의 최근 구간이 사례로 잡히지 않도록 최근 60봉 이전에 끝난 사례만 사용
+        """
+        if self.pattern_index is None or not candidates:
+            return
+        window = self.pattern_index.window
+        columns = self.pattern_index.embedder.columns
+        rows = [c for c in candidates if len(c[2]) >= window]
+        windows = np.stack([df[columns].to_numpy(dtype=np.float64)[-window:] for _, _, df, _ in rows])
+        befores = [df['Date'].iloc[-window] if 'Date' in df.columns else None for _, _, df, _ in rows]
+        results = self.pattern_index.query(windows, top_k=50, before=befores)
+        for (_, _, _, analysis), pattern in zip(rows, results):
+            analysis['pattern'] = pattern
+    
     def save_targets(self, targets: List[Dict]):
         """타겟 리스트 저장"""
         if not targets:
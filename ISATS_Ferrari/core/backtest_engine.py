@@ -0,0 +1,297 @@
+"""
+⚡ ISATS BACKTEST ENGINE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+배열 기반 공용 백테스트 엔진 (전략 / 유전 알고리즘 / Celery 공용)
+
+구조:
+1. 신호 배열: entries(진입), exits(청산 신호) - 전략이 벡터 연산으로 생성
+2. 커널: 진입 후보 봉 사이를 점프하며 청산 시점을 배열 구간 탐색으로 찾음
+   (봉 단위 파이썬 루프 없음 → 일봉 기준 초당 수천 개 파라미터 조합)
+3. 청산 규칙 (우선순위: 손절 > 익절 > 청산 신호)
+   - stop_mode='close': 종가 기준 수익률로 판정, 종가 체결
+   - stop_mode='hl': 저가/고가로 판정, 손절/익절 가격 체결
+4. 수수료 / 슬리피지 (편도, 비율)
+5. 결과: 잔고, 거래 목록, 자산 곡선(필요 시 생성), 샤프 지수, 최대 낙폭
+
+규칙 (기존 봉 루프와 동일):
+- 진입 봉 종가 체결, 청산 판정은 다음 봉부터
+- 청산한 봉에서는 재진입하지 않음
+- 마지막까지 보유 중인 포지션은 잔고에 반영하지 않음 (자산 곡선에는 평가액 반영)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+from collections import namedtuple
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+EXIT_STOP = "STOP_LOSS"
+EXIT_TAKE = "TAKE_PROFIT"
+EXIT_SIGNAL = "SIGNAL"
+
+Trade = namedtuple("Trade", ["entry_idx", "exit_idx", "entry_price", "exit_price", "pnl", "reason"])
+
+
+class BacktestResult:
+    """백테스트 결과 (자산 곡선/지표는 조회 시점에 계산)"""
+
+    def __init__(self, close, initial_balance, balance, trades, open_entry, start):
+        self.close = close
+        self.initial_balance = initial_balance
+        self.balance = balance
+        self.trades = trades
+        self.open_entry = open_entry      # 미청산 포지션 진입 봉 (없으면 None)
+        self.start = start
+        self._equity = None
+
+    @property
+    def n_entries(self) -> int:
+        """진입 횟수 (미청산 포함)"""
+        return len(self.trades) + (self.open_entry is not None)
+
+    @property
+    def total_return(self) -> float:
+        return self.balance / self.initial_balance - 1
+
+    @property
+    def equity(self) -> np.ndarray:
+        """봉별 자산 곡선 (보유 구간은 종가 평가)"""
+        if self._equity is None:
+            n = len(self.close)
+            # 실현 잔고 (청산 봉부터 다음 청산 전까지 계단형)
+            before, after, bal = [], [], self.initial_balance
+            for t in self.trades:
+                before.append(bal)
+                bal *= (1 + t.pnl)
+                after.append(bal)
+            exit_idx = np.array([t.exit_idx for t in self.trades], dtype=np.int64)
+            step = np.searchsorted(exit_idx, np.arange(n), side='right') - 1
+            equity = np.where(step >= 0, np.array(after + [0.0])[step], float(self.initial_balance))
+            # 보유 구간은 진입 직전 잔고 × 종가 평가
+            for t, b in zip(self.trades, before):
+                equity[t.entry_idx:t.exit_idx] = b * self.close[t.entry_idx:t.exit_idx] / t.entry_price
+            if self.open_entry is not None:
+                i = self.open_entry
+                equity[i:] = bal * self.close[i:] / self.close[i]
+            self._equity = equity
+        return self._equity
+
+    def sharpe(self, periods_per_year: int = 252) -> float:
+        """연율화 샤프 지수 (무위험 수익률 0)"""
+        eq = self.equity[self.start:]
+        if len(eq) < 2:
+            return 0.0
+        rets = np.diff(eq) / eq[:-1]
+        std = rets.std()
+        return float(rets.mean() / std * np.sqrt(periods_per_year)) if std > 0 else 0.0
+
+    def max_drawdown(self) -> float:
+        """최대 낙폭 (음수 비율)"""
+        eq = self.equity[self.start:]
+        if len(eq) == 0:
+            return 0.0
+        return float((eq / np.maximum.accumulate(eq) - 1).min())
+
+    def summary(self, periods_per_year: int = 252) -> Dict:
+        wins = sum(1 for t in self.trades if t.pnl > 0)
+        return {
+            'total_return': round(self.total_return, 4),
+            'final_balance': round(self.balance, 2),
+            'sharpe_ratio': round(self.sharpe(periods_per_year), 3),
+            'max_drawdown': round(self.max_drawdown(), 4),
+            'total_trades': len(self.trades),
+            'win_trades': wins,
+            'lose_trades': len(self.trades) - wins,
+            'win_rate': round(wins / max(1, len(self.trades)) * 100, 2),
+        }
+
+
+def _find_exit(i, entry_price, close, high, low, exits, take_profit, stop_loss, stop_mode):
+    """
+    진입 봉 i 이후 첫 청산 봉 탐색 (구간을 2배씩 넓혀가며 배열 비교)
+
+    Returns:
+        (exit_idx, exit_price, pnl, reason) 또는 None (끝까지 보유)
+    """
+    n = len(close)
+    lo, width = i + 1, 32
+    while lo < n:
+        hi = min(n, lo + width)
+        if stop_mode == 'hl':
+            down = (low[lo:hi] - entry_price) / entry_price
+            up = (high[lo:hi] - entry_price) / entry_price
+        else:
+            down = up = (close[lo:hi] - entry_price) / entry_price
+
+        sl_hit = down <= -stop_loss if stop_loss is not None else np.zeros(hi - lo, dtype=bool)
+        tp_hit = up >= take_profit if take_profit is not None else np.zeros(hi - lo, dtype=bool)
+        hit = sl_hit | tp_hit
+        if exits is not None:
+            hit = hit | exits[lo:hi]
+
+        if hit.any():
+            m = int(np.argmax(hit))
+            j = lo + m
+            if sl_hit[m]:
+                if stop_mode == 'hl':
+                    return j, entry_price * (1 - stop_loss), -stop_loss, EXIT_STOP
+                return j, close[j], down[m], EXIT_STOP
+            if tp_hit[m]:
+                if stop_mode == 'hl':
+                    return j, entry_price * (1 + take_profit), take_profit, EXIT_TAKE
+                return j, close[j], up[m], EXIT_TAKE
+            return j, close[j], (close[j] - entry_price) / entry_price, EXIT_SIGNAL
+
+        lo, width = hi, width * 2
+    return None
+
+
+def backtest(close, entries, exits=None, high=None, low=None,
+             take_profit: Optional[float] = None, stop_loss: Optional[float] = None,
+             stop_mode: str = 'close', fee: float = 0.0, slippage: float = 0.0,
+             start: int = 0, initial_balance: float = 1.0) -> BacktestResult:
+    """
+    단일 포지션 롱 전략 백테스트
+
+    Args:
+        close/high/low: 가격 배열 (high/low는 stop_mode='hl'일 때 필요)
+        entries: 진입 신호 (bool 배열, 보유 중인 봉의 신호는 무시)
+        exits: 청산 신호 (bool 배열, 종가 체결)
+        take_profit / stop_loss: 익절/손절 비율 (None이면 미사용)
+        stop_mode: 'close' (종가 판정) | 'hl' (고가/저가 판정)
+        fee / slippage: 편도 수수료 / 슬리피지 비율
+        start: 진입 허용 시작 봉 (지표 워밍업)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    entries = np.asarray(entries, dtype=bool)
+    if exits is not None:
+        exits = np.asarray(exits, dtype=bool)
+    if stop_mode == 'hl':
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+    cost = (1 - slippage) * (1 - fee) / ((1 + slippage) * (1 + fee)) if (fee or slippage) else None
+
+    candidates = np.flatnonzero(entries)
+    candidates = candidates[candidates >= start]
+
+    balance = initial_balance
+    trades = []
+    open_entry = None
+    k = 0
+    while k < len(candidates):
+        i = int(candidates[k])
+        entry_price = close[i]
+        found = _find_exit(i, entry_price, close, high, low, exits, take_profit, stop_loss, stop_mode)
+        if found is None:
+            open_entry = i
+            break
+        j, exit_price, pnl, reason = found
+        if cost is not None:
+            pnl = (1 + pnl) * cost - 1
+        balance *= (1 + pnl)
+        trades.append(Trade(i, j, entry_price, exit_price, pnl, reason))
+        # 청산 봉 이후의 다음 진입 후보로 이동
+        k = int(np.searchsorted(candidates, j, side='right'))
+
+    return BacktestResult(close, initial_balance, balance, trades, open_entry, start)
+
+
+# ==========================================
+# 신호 생성 도구
+# ==========================================
+
+def golden_cross(ma_s, ma_l, start: int = 1) -> np.ndarray:
+    """골든크로스 봉 (ma_s[i] > ma_l[i] and ma_s[i-1] <= ma_l[i-1])"""
+    ma_s = np.asarray(ma_s)
+    ma_l = np.asarray(ma_l)
+    cross = np.zeros(len(ma_s), dtype=bool)
+    cross[1:] = (ma_s[1:] > ma_l[1:]) & (ma_s[:-1] <= ma_l[:-1])
+    cross[:max(start, 1)] = False
+    return cross
+
+
+class IndicatorCache:
+    """이동평균/RSI 캐시 (같은 데이터로 여러 파라미터를 돌릴 때 재계산 방지)"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.close = df['Close'].values
+        self._ma: Dict[tuple, np.ndarray] = {}
+        self._rsi: Dict[int, np.ndarray] = {}
+
+    def ma(self, window: int, column: str = 'Close') -> np.ndarray:
+        key = (column, window)
+        if key not in self._ma:
+            self._ma[key] = self.df[column].rolling(window).mean().values
+        return self._ma[key]
+
+    def rsi(self, period: int) -> np.ndarray:
+        """RSI (ActiveBot.calculate_indicators와 동일한 단순이동평균 방식)"""
+        if period not in self._rsi:
+            delta = self.df['Close'].diff()
+            gain = (delta.where(delta > 0, 0)).rolling(period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
+            rs = gain / (loss + 1e-8)
+            self._rsi[period] = (100 - (100 / (1 + rs))).values
+        return self._rsi[period]
+
+
+def golden_cross_strategy(cache: IndicatorCache, params: Dict, start: int = 0, **kwargs) -> BacktestResult:
+    """
+    Genesis DNA 전략: 골든크로스 진입, 고가/저가 기준 익절/손절
+    params: ma_short, ma_long, take_profit, stop_loss
+    start: 진입 허용 시작 봉 하한 (워크포워드 검증 구간)
+    """
+    entries = golden_cross(cache.ma(params['ma_short']), cache.ma(params['ma_long']), start=params['ma_long'])
+    return backtest(cache.close, entries,
+                    high=cache.df['High'].values, low=cache.df['Low'].values,
+                    take_profit=params['take_profit'], stop_loss=params['stop_loss'],
+                    stop_mode='hl', start=max(params['ma_long'], start), **kwargs)
+
+
+def master_v4_strategy(cache: IndicatorCache, params: Dict, start: int = 0, **kwargs) -> BacktestResult:
+    """
+    MasterBotV4 전략: 골든크로스 + 거래량 폭증 진입, 종가 기준 익절/손절 + 데드크로스 청산
+    params: ma_short, ma_long, take_profit, stop_loss, vol_factor
+    """
+    ma_s = cache.ma(params['ma_short'])
+    ma_l = cache.ma(params['ma_long'])
+    volume = cache.df['Volume'].values
+    entries = golden_cross(ma_s, ma_l, start=params['ma_long']) & \
+        (volume > cache.ma(20, 'Volume') * params['vol_factor'])
+    return backtest(cache.close, entries, exits=ma_s < ma_l,
+                    take_profit=params['take_profit'], stop_loss=params['stop_loss'],
+                    stop_mode='close', start=max(params['ma_long'], start), **kwargs)
+
+
+def active_bot_strategy(cache: IndicatorCache, params: Dict, start: int = 0, **kwargs) -> BacktestResult:
+    """
+    ActiveBot 전략: (골든크로스 or RSI 과매도 탈출) 진입, RSI 과열 청산, 종가 기준 익절/손절
+    params: ma_short, ma_long, rsi_period, rsi_buy, rsi_sell, tp_rate, sl_rate
+    (실전의 validate_entry 검증은 호가/계좌 맥락이 필요하여 제외)
+    """
+    rsi = cache.rsi(params['rsi_period'])
+    rsi_buy = np.zeros(len(rsi), dtype=bool)
+    rsi_buy[1:] = (rsi[:-1] < params['rsi_buy']) & (rsi[1:] > params['rsi_buy'])
+    entries = golden_cross(cache.ma(params['ma_short']), cache.ma(params['ma_long'])) | rsi_buy
+    # ActiveBot.analyze는 ma_long + 5봉부터 판단
+    return backtest(cache.close, entries, exits=rsi > params['rsi_sell'],
+                    take_profit=params['tp_rate'], stop_loss=params['sl_rate'],
+                    stop_mode='close', start=max(params['ma_long'] + 4, start), **kwargs)
+
+
+STRATEGIES = {
+    'golden_cross': golden_cross_strategy,
+    'master_v4': master_v4_strategy,
+    'active_bot': active_bot_strategy,
+}
+
+
+def run_strategy(df: pd.DataFrame, strategy: str, params: Dict, **kwargs) -> BacktestResult:
+    """전략명으로 백테스트 실행 (kwargs: start, fee, slippage, initial_balance)"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"알 수 없는 전략: {strategy} (지원: {', '.join(STRATEGIES)})")
+    cache = df if isinstance(df, IndicatorCache) else IndicatorCache(df)
+    return STRATEGIES[strategy](cache, params, **kwargs)
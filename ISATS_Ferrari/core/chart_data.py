@@ -0,0 +1,289 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from core.quote_board import normalize_ticker
+
+# ==========================================
+# Chart Data
+# 역할: 대시보드 차트용 OHLCV 서버 측 다운샘플링
+# - 일봉: data/{KR,US}/<ticker>[.KS|.KQ].csv / 분봉: database/experience.db candle_minutes
+# - 기간(start~end) 잘라낸 뒤 목표 포인트 수로 축소
+#   · lttb: 종가 라인 모양 보존 (Largest-Triangle-Three-Buckets, 실제 봉 선택)
+#   · minmax: 구간별 OHLCV 재집계 (고가=max, 저가=min → 캔들 극값 보존)
+# - 버전(파일 mtime/크기, 분봉 개수/마지막 시각/기록 rowid/마지막 봉) 기반 ETag
+# - since 증분 조회: since 시각의 봉부터 재전송 (클라이언트는 마지막 봉을 교체 후 이어 붙임)
+# - 응답은 컬럼형 배열 (t=epoch 초) → 수년치 차트도 수 KB
+# ==========================================
+
+DATA_DIR = Path(ROOT_DIR) / "data"
+DB_PATH = Path(ROOT_DIR) / "database" / "experience.db"
+
+CHART_POINTS = 500      # 기본 목표 포인트 수
+MAX_POINTS = 5000
+METHODS = ("lttb", "minmax")
+INTERVALS = ("day", "minute")
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    LTTB로 남길 인덱스 (처음/끝 포함, 시간순)
+
+    Args:
+        x: 시간 (단조 증가)
+        y: 값
+        threshold: 목표 포인트 수 (데이터가 더 적으면 전체)
+    """
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1])
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # 처음/끝을 제외한 구간을 threshold-2개 버킷으로 분할
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 버킷 평균점 (마지막 버킷은 끝점)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        # 직전 선택점 - 후보 - 다음 평균점 삼각형 넓이가 최대인 후보
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def bucket_ohlcv(frame: pd.DataFrame, threshold: int) -> pd.DataFrame:
+    """구간별 OHLCV 재집계 (시각=구간 첫 봉, 시가=첫, 고가=max, 저가=min, 종가=끝, 거래량=합)"""
+    n = len(frame)
+    if threshold >= n:
+        return frame
+    starts = np.linspace(0, n, threshold + 1).astype(np.int64)[:-1]
+    ends = np.append(starts[1:], n) - 1
+    return pd.DataFrame({
+        "Date": frame["Date"].values[starts],
+        "Open": frame["Open"].values[starts],
+        "High": np.maximum.reduceat(frame["High"].values, starts),
+        "Low": np.minimum.reduceat(frame["Low"].values, starts),
+        "Close": frame["Close"].values[ends],
+        "Volume": np.add.reduceat(frame["Volume"].values, starts),
+    })
+
+
+def parse_time(value) -> Optional[pd.Timestamp]:
+    """쿼리 시각 파싱 (epoch 초 또는 ISO 문자열 → UTC 기준 naive, None/빈값은 None) - 실패 시 ValueError"""
+    if value is None or value == "":
+        return None
+    try:
+        return pd.Timestamp(float(value), unit="s")
+    except (TypeError, ValueError):
+        pass
+    try:
+        stamp = pd.Timestamp(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"잘못된 시각: {value}") from e
+    # 저장 데이터는 UTC 기준 → 오프셋(+09:00 등)은 UTC로 환산 후 제거 (시간대 없는 값은 UTC로 간주)
+    return stamp.tz_convert("UTC").tz_localize(None) if stamp.tz is not None else stamp
+
+
+class ChartStore:
+    """
+    종목별 OHLCV 로드 + 버전 캐시 + 다운샘플링
+
+    사용 예:
+        store = ChartStore()
+        chart = store.query("KR", "005930", start="2020-01-01", points=400)
+        chart["etag"], chart["data"]["t"], chart["data"]["close"]
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, db_path: Path = DB_PATH, cache_size: int = 64):
+        self.data_dir = Path(data_dir)
+        self.db_path = Path(db_path)
+        self.cache_size = cache_size
+        self._frames: "OrderedDict[Tuple, Tuple[str, pd.DataFrame]]" = OrderedDict()   # (market, ticker, interval) -> (버전, df)
+        self._payloads: "OrderedDict[str, Dict]" = OrderedDict()                     # etag -> 응답
+        self._db = None
+        self._lock = threading.Lock()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 원본 로드
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _csv_path(self, market: str, ticker: str) -> Optional[Path]:
+        folder = self.data_dir / market.upper()
+        for name in (f"{ticker}.csv", f"{ticker}.KS.csv", f"{ticker}.KQ.csv"):
+            path = folder / name
+            if path.exists():
+                return path
+        return None
+
+    @property
+    def db(self):
+        # 분봉 DB가 있을 때만 연결 (조회만으로 빈 DB 파일을 만들지 않음)
+        if self._db is None and self.db_path.exists():
+            from database.database_manager import DatabaseManager
+            self._db = DatabaseManager(str(self.db_path))
+        return self._db
+
+    def version(self, market: str, ticker: str, interval: str = "day") -> Optional[str]:
+        """원본 버전 문자열 (없으면 None)"""
+        if interval == "minute":
+            if self.db is None:
+                return None
+            count, last, *content = self.db.get_candle_version(ticker)
+            if not count:
+                return None
+            # 개수/마지막 시각이 같아도 봉을 고쳐 쓰면 달라지는 부분 (rowid, 마지막 봉 값)
+            digest = hashlib.sha1(repr(content).encode()).hexdigest()[:12]
+            return f"m{count}-{last}-{digest}"
+        path = self._csv_path(market, ticker)
+        if path is None:
+            return None
+        stat = path.stat()
+        return f"d{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _read(self, market: str, ticker: str, interval: str) -> pd.DataFrame:
+        if interval == "minute":
+            rows = self.db.get_candles(ticker)
+            df = pd.DataFrame(rows, columns=["Date"] + COLUMNS)
+        else:
+            df = pd.read_csv(self._csv_path(market, ticker))
+        df["Date"] = pd.to_datetime(df["Date"], utc=True, errors="coerce").dt.tz_localize(None)
+        df = df.dropna(subset=["Date", "Close"]).sort_values("Date").reset_index(drop=True)
+        for column in ("Open", "High", "Low"):
+            df[column] = df[column].fillna(df["Close"])
+        df["Volume"] = df["Volume"].fillna(0)
+        return df[["Date"] + COLUMNS]
+
+    def load(self, market: str, ticker: str, interval: str = "day") -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """(버전, 전체 OHLCV) - 버전이 같으면 메모리 캐시 재사용"""
+        market, ticker = market.upper(), normalize_ticker(ticker)
+        version = self.version(market, ticker, interval)
+        if version is None:
+            return None, None
+        key = (market, ticker, interval)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] == version:
+                self._frames.move_to_end(key)
+                return cached
+        df = self._read(market, ticker, interval)
+        with self._lock:
+            self._frames[key] = (version, df)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.cache_size:
+                self._frames.popitem(last=False)
+        return version, df
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 조회
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @staticmethod
+    def etag(version: str, *params) -> str:
+        digest = hashlib.sha1("|".join(map(str, (version,) + params)).encode()).hexdigest()[:16]
+        return f'W/"{digest}"'
+
+    @staticmethod
+    def _columns(frame: pd.DataFrame) -> Dict:
+        # 가격 자릿수: 1 이상은 소수 2자리 (수정주가 노이즈 제거), 미만(코인/페니주)은 6자리
+        close = frame["Close"].to_numpy()
+        decimals = 2 if len(close) == 0 or np.nanmedian(np.abs(close)) >= 1 else 6
+        out = {"t": (frame["Date"].astype("int64") // 10 ** 9).tolist()}
+        for column in ("Open", "High", "Low", "Close"):
+            out[column.lower()] = np.round(frame[column].to_numpy(dtype=np.float64), decimals).tolist()
+        out["volume"] = frame["Volume"].to_numpy(dtype=np.float64).round().astype(np.int64).tolist()
+        return out
+
+    def query(self, market: str, ticker: str, start=None, end=None, points: int = CHART_POINTS,
+              method: str = "lttb", since=None, interval: str = "day") -> Optional[Dict]:
+        """
+        차트 데이터 (원본 없으면 None, 잘못된 인자는 ValueError)
+
+        Args:
+            start / end: 조회 범위 (epoch 초 또는 ISO, 포함)
+            points: 목표 포인트 수 (2 ~ MAX_POINTS)
+            method: lttb (라인) / minmax (캔들)
+            since: 클라이언트가 가진 마지막 시각(응답의 last) → 그 봉부터 원본 그대로 (points 초과 시 전체 재전송)
+                   첫 봉은 클라이언트의 마지막 봉을 교체 (증분 수집이 마지막 봉을 덮어써 갱신하므로)
+            interval: day / minute
+
+        Returns:
+            Dict: ticker / market / interval / method / etag / incremental / total / last(다음 since) / data(컬럼형)
+        """
+        if method not in METHODS:
+            raise ValueError(f"method는 {METHODS} 중 하나")
+        if interval not in INTERVALS:
+            raise ValueError(f"interval은 {INTERVALS} 중 하나")
+        points = min(max(int(points), 2), MAX_POINTS)
+        start, end, since = parse_time(start), parse_time(end), parse_time(since)
+
+        version, df = self.load(market, ticker, interval)
+        if df is None:
+            return None
+        etag = self.etag(version, start, end, points, method, since, interval)
+        with self._lock:
+            cached = self._payloads.get(etag)
+            if cached is not None:
+                self._payloads.move_to_end(etag)
+                return cached
+
+        frame = df
+        if start is not None:
+            frame = frame[frame["Date"] >= start]
+        if end is not None:
+            frame = frame[frame["Date"] <= end]
+        total = len(frame)
+
+        incremental = False
+        if since is not None:
+            tail = frame[frame["Date"] >= since]   # 마지막 봉 재전송 (수정된 값 반영)
+            if len(tail) <= points:
+                frame, incremental = tail, True
+
+        # 커서 = 다운샘플 전 마지막 원본 봉 (minmax 버킷 시각은 구간 첫 봉 → 그대로 쓰면 마지막 버킷 구간을 다시 받음)
+        last = frame["Date"].iloc[-1] if len(frame) else since
+
+        if not incremental and len(frame) > points:
+            if method == "lttb":
+                x = frame["Date"].astype("int64").to_numpy()
+                frame = frame.iloc[lttb_indices(x, frame["Close"].to_numpy(), points)]
+            else:
+                frame = bucket_ohlcv(frame.reset_index(drop=True), points)
+
+        payload = {
+            "ticker": normalize_ticker(ticker),
+            "market": market.upper(),
+            "interval": interval,
+            "method": method,
+            "etag": etag,
+            "incremental": incremental,
+            "total": total,
+            "last": int(last.value // 10 ** 9) if last is not None else None,
+            "data": self._columns(frame),
+        }
+        with self._lock:
+            self._payloads[etag] = payload
+            while len(self._payloads) > self.cache_size:
+                self._payloads.popitem(last=False)
+        return payload
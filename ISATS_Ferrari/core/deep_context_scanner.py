@@ -25,6 +25,10 @@ from pathlib import Path
 
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.sector_index import get_service
+from core.pattern_search import get_engine
+
 try:
     import FinanceDataReader as fdr
 except ImportError:
@@ -46,6 +50,24 @@ class ContextScanner:
         print("   - 패턴 매칭 엔진 준비")
         print("   - 섹터 지수 로드")
         print(f"{'='*80}\n")
+        self.data_root = Path(__file__).parent.parent / "data"
+        self.last_patterns = None   # 직전 패턴 검색 결과 (유사 사례 목록 포함)
+    
+    def get_sector_data(self, ticker):
+        """
+        섹터 지수 저장소(data/<시장>/_sector)에서 업종 지수 조회
+        
+        Returns:
+            'Close' 컬럼의 섹터 지수 DataFrame (저장소에 종목이 없으면 None)
+        """
+        market = "KR" if ticker.endswith('.KS') or ticker.endswith('.KQ') else "US"
+        price_dir = self.data_root / market
+        if not (price_dir / f"{ticker}.csv").exists():
+            return None
+        series = get_service(price_dir).ticker_index(ticker, exclude_self=True)
+        if series is None:
+            return None
+        return series.to_frame('Close')
     
     def get_data(self, ticker):
         """
@@ -65,14 +87,15 @@ class ContextScanner:
             # 종목 데이터
             df = fdr.DataReader(ticker)
             
-            # 섹터 데이터 (간소화: 코스피 지수로 대체)
-            # 실전에서는 업종 지수 사용 (예: 반도체 지수, 2차전지 지수 등)
-            if ticker.endswith('.KS') or ticker.endswith('.KQ'):
-                # 한국 종목 → 코스피 지수
-                sector_df = fdr.DataReader('KS11')
-            else:
-                # 미국 종목 → S&P 500
-                sector_df = fdr.DataReader('SPY')
+            # 섹터 데이터: 업종 지수 (저장소에 없으면 시장 지수로 대체)
+            sector_df = self.get_sector_data(ticker)
+            if sector_df is None:
+                if ticker.endswith('.KS') or ticker.endswith('.KQ'):
+                    # 한국 종목 → 코스피 지수
+                    sector_df = fdr.DataReader('KS11')
+                else:
+                    # 미국 종목 → S&P 500
+                    sector_df = fdr.DataReader('SPY')
             
             # 날짜 인덱스 맞추기
             common = df.index.intersection(sector_df.index)
@@ -85,33 +108,26 @@ class ContextScanner:
             print(f"❌ 데이터 조회 실패: {e}")
             return None, None
     
-    def analyze_similarity(self, target_series):
+    def analyze_similarity(self, target_series, before=None, top_k=100):
         """
         과거 패턴 매칭
         
+        1. 가격 저장소(data/KR, data/US) 전 종목의 모든 60일 구간과 비교 (Pearson, FFT)
+        2. 유사도 상위 100개 패턴 추출 (같은 종목의 인접 구간은 1개로 취급)
+        3. 그 패턴 이후 5일간 상승한 비율 계산
+        
         Args:
             target_series: 최근 60일 종가 데이터
+            before: 이 날짜 이전에 끝난 과거 사례만 사용 (질의 구간과 겹침 방지)
+            top_k: 사용할 유사 패턴 수
         
         Returns:
-            (similarity_score, win_probability) 튜플
-        
-        Note:
-            실제로는 DB 전체를 뒤져야 함.
-            여기서는 간소화를 위해 시뮬레이션 값 반환
+            (similarity_score, win_probability) 튜플 (%, 저장소가 비어 있으면 (0, 50))
         """
-        # 실전 구현 시:
-        # 1. DB에서 과거 모든 종목의 60일 패턴 로드
-        # 2. 현재 패턴과 유사도 계산 (Pearson Correlation)
-        # 3. 유사도 높은 상위 100개 패턴 추출
-        # 4. 그 패턴 이후 상승한 비율 계산
-        
-        # 가상 유사도 (70~95%)
-        sim_score = np.random.uniform(70, 95)
-        
-        # 가상 승률 (40~80%)
-        win_rate = np.random.uniform(40, 80)
-        
-        return sim_score, win_rate
+        engine = get_engine([self.data_root / "KR", self.data_root / "US"])
+        result = engine.search(np.asarray(target_series, dtype=float), top_k=top_k, before=before)
+        self.last_patterns = result
+        return result['similarity'], result['win_probability']
     
     def scan(self, ticker):
         """
@@ -186,14 +202,17 @@ class ContextScanner:
         # 3. 과거 패턴 매칭
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        sim_score, win_prob = self.analyze_similarity(df['Close'].values[-60:])
+        sim_score, win_prob = self.analyze_similarity(df['Close'].values[-60:], before=df.index[-60])
         
         print(f"\n{'─'*80}")
         print("🔮 [3. 역사적 패턴 매칭]")
         print(f"{'─'*80}")
         print(f"   유사도: {sim_score:.1f}% (과거 데이터 기반)")
         print(f"   당시 상승 확률: {win_prob:.1f}%")
+        print(f"   평균 이후 수익률(5일): {self.last_patterns['expected_return']:+.2f}%")
         print(f"   분석 기간: 최근 60일")
+        for m in self.last_patterns['matches'][:3]:
+            print(f"      - {m['ticker']} {m['start']}~{m['end']} (유사도 {m['similarity']:.2f}, 이후 {m['forward_return']*100:+.1f}%)")
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 4. 최종 확률 계산
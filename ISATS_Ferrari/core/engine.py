@@ -1,5 +1,4 @@
 import asyncio
-import json
 import os
 import sys
 import random
@@ -9,6 +8,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
 from core.redis_client import RedisClient
+from core.state_store import StateStore
 from brain.model_cnn import DeepEyesModel
 from strategy.base import BaseStrategy
 
@@ -19,6 +19,7 @@ class FerrariEngine:
     """
     def __init__(self):
         self.nc = RedisClient()
+        self.state = StateStore(url=self.nc.url)  # engine:ferrari Hash (바뀐 필드만 전송)
         self.brain = DeepEyesModel()
         self.generation = 1
         self.genes = {
@@ -32,7 +33,7 @@ class FerrariEngine:
             "generation": self.generation,
             "genes": self.genes
         }
-        await self.nc.set("dashboard:status", json.dumps(status))
+        await self.state.update("engine", "ferrari", status)
 
     async def run(self):
         print("🏎️ [Ferrari] 엔진 점화... (Pure Core Online)")
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# ==========================================
+# Intelligence Cache
+# 역할: (종목, 소스)별 정성 분석 결과 캐시
+# - 소스별 TTL, 만료 후 stale 구간에는 이전 값을 즉시 반환하고 백그라운드 갱신
+# - 같은 키의 동시 요청은 상류 호출 1회로 병합 (Request Coalescing)
+# - 상류 실패(예외) 또는 cacheable 검사에 걸린 결과(빈 값/대체 응답)는 저장하지 않음
+# - Redis(연결 시) 또는 SQLite 파일에 저장 → 재시작 후에도 캐시 유지
+# ==========================================
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(ROOT_DIR, "data", "intelligence_cache.db")
+REDIS_PREFIX = "intel:"   # String: intel:{source}:{ticker} -> {"stored_at", "value"} JSON
+
+# 소스별 (TTL, stale 허용 구간) 초
+SOURCE_TTLS: Dict[str, Tuple[float, float]] = {
+    "analysis": (300, 1800),         # UltraIntelligenceEngine 종합 분석
+    "news": (600, 3600),             # 뉴스 크롤링
+    "disclosures": (1800, 6 * 3600), # DART 공시
+    "reports": (6 * 3600, 86400),    # 증권사 리포트
+    "deep_research": (3600, 6 * 3600),  # Gemini 딥리서치
+    "broadcast": (600, 0),           # 런처가 게시한 분석 (갱신 불가 → stale 없음)
+}
+DEFAULT_TTL = (600, 3600)
+
+
+class UncacheableResult(Exception):
+    """cacheable 검사에 걸린 상류 결과 (저장하지 않고 호출자에게만 전달)"""
+
+    def __init__(self, value: Any):
+        super().__init__("캐시 불가 결과")
+        self.value = value
+
+
+class IntelligenceCache:
+    """
+    TTL + stale-while-revalidate + 요청 병합 캐시
+
+    사용 예:
+        cache = IntelligenceCache()
+        news = await cache.get_or_fetch(ticker, "news", lambda: collector.collect(ticker))
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH, redis_client=None,
+                 ttls: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (None이면 메모리 전용)
+            redis_client: redis.asyncio 클라이언트 (설정 시 SQLite 대신 Redis에 저장, 나중에 대입 가능)
+            ttls: 소스별 (TTL, stale 구간) 덮어쓰기
+        """
+        self.path = path
+        self.redis = redis_client
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.entries: Dict[str, Tuple[float, Any]] = {}   # key -> (stored_at, value)
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"hit": 0, "stale": 0, "miss": 0, "coalesced": 0, "error": 0}
+        self._db = None
+        self._db_lock = threading.Lock()
+
+    @staticmethod
+    def _key(ticker: str, source: str) -> str:
+        return f"{source}:{ticker}"
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 저장소 (Redis / SQLite)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS intelligence "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+        return self._db
+
+    async def _load(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            if self.redis is not None:
+                raw = await self.redis.get(REDIS_PREFIX + key)
+                if raw is None:
+                    return None
+                data = json.loads(raw)
+                return data["stored_at"], data["value"]
+            if self.path:
+                with self._db_lock:
+                    row = self._conn().execute(
+                        "SELECT stored_at, value FROM intelligence WHERE key = ?", (key,)
+                    ).fetchone()
+                return (row[0], json.loads(row[1])) if row else None
+        except Exception:
+            pass
+        return None
+
+    async def _store(self, key: str, stored_at: float, value: Any, expire: float):
+        try:
+            if self.redis is not None:
+                payload = json.dumps({"stored_at": stored_at, "value": value}, ensure_ascii=False, default=str)
+                await self.redis.set(REDIS_PREFIX + key, payload, ex=max(1, int(expire)))
+            elif self.path:
+                payload = json.dumps(value, ensure_ascii=False, default=str)
+                with self._db_lock:
+                    conn = self._conn()
+                    conn.execute("INSERT OR REPLACE INTO intelligence VALUES (?, ?, ?)", (key, stored_at, payload))
+                    conn.commit()
+        except Exception:
+            pass
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 조회 / 갱신
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    async def _entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = await self._load(key)
+            if entry is not None:
+                self.entries[key] = entry
+        return entry
+
+    async def put(self, ticker: str, source: str, value: Any):
+        """외부에서 받은 결과 저장 (예: 런처 브로드캐스트)"""
+        key = self._key(ticker, source)
+        ttl, stale = self.ttls.get(source, DEFAULT_TTL)
+        stored_at = time.time()
+        self.entries[key] = (stored_at, value)
+        await self._store(key, stored_at, value, ttl + stale)
+
+    async def get(self, ticker: str, source: str, allow_stale: bool = True) -> Optional[Any]:
+        """캐시 값만 조회 (상류 호출 없음)"""
+        key = self._key(ticker, source)
+        entry = await self._entry(key)
+        if entry is None:
+            return None
+        ttl, stale = self.ttls.get(source, DEFAULT_TTL)
+        age = time.time() - entry[0]
+        if age < ttl or (allow_stale and age < ttl + stale):
+            return entry[1]
+        return None
+
+    def _refresh(self, key: str, source: str, fetch: Callable[[], Awaitable[Any]],
+                 cacheable: Optional[Callable[[Any], bool]] = None) -> asyncio.Task:
+        """상류 호출 (같은 키의 진행 중 호출이 있으면 그 작업을 공유)"""
+        task = self.inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return task
+
+        async def run():
+            try:
+                value = await fetch()
+                if cacheable is not None and not cacheable(value):
+                    raise UncacheableResult(value)
+                ttl, stale = self.ttls.get(source, DEFAULT_TTL)
+                stored_at = time.time()
+                self.entries[key] = (stored_at, value)
+                await self._store(key, stored_at, value, ttl + stale)
+                return value
+            finally:
+                self.inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        self.inflight[key] = task
+        return task
+
+    async def get_or_fetch(self, ticker: str, source: str, fetch: Callable[[], Awaitable[Any]],
+                           cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        캐시 조회 → 없거나 만료 시 fetch() 호출
+
+        Args:
+            ticker: 종목 (또는 캐시 키 식별자)
+            source: 소스 이름 (SOURCE_TTLS 키)
+            fetch: 인자 없는 코루틴 함수 (상류 호출, 실패 시 예외 → 캐시하지 않음)
+            cacheable: 결과 저장 여부 검사 (False면 저장하지 않고 이전 값 또는 그 결과를 반환)
+
+        Returns:
+            - 신선한 값: 즉시 반환
+            - stale 값: 즉시 반환 + 백그라운드 갱신
+            - 없음/완전 만료: 상류 호출 결과 (동시 요청은 1회로 병합)
+            - 상류 실패: 만료된 이전 값, 없으면 예외 (캐시 불가 결과는 그대로 반환)
+        """
+        key = self._key(ticker, source)
+        ttl, stale = self.ttls.get(source, DEFAULT_TTL)
+        entry = await self._entry(key)
+        age = time.time() - entry[0] if entry is not None else None
+
+        if age is not None and age < ttl:
+            self.stats["hit"] += 1
+            return entry[1]
+
+        task = self._refresh(key, source, fetch, cacheable)
+        if age is not None and age < ttl + stale:
+            self.stats["stale"] += 1
+            task.add_done_callback(self._consume_error)
+            return entry[1]
+
+        self.stats["miss"] += 1
+        try:
+            # shield: 요청 1개가 취소되어도 같은 작업을 기다리는 다른 요청은 유지
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["error"] += 1
+            if entry is not None:
+                return entry[1]   # 갱신 실패 시 만료된 값이라도 반환
+            if isinstance(e, UncacheableResult):
+                return e.value
+            raise
+
+    def _consume_error(self, task: asyncio.Task):
+        """백그라운드 갱신 실패 기록 (다음 요청에서 재시도)"""
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["error"] += 1
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
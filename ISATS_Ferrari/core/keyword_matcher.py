@@ -0,0 +1,118 @@
+import re
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+try:
+    import ahocorasick   # pyahocorasick (C 구현, 선택)
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# ==========================================
+# Keyword Matcher
+# 역할: 감성 사전(긍정/부정 등)을 1회 컴파일(Aho-Corasick 오토마톤 또는 정규식)하고,
+#       문서 묶음을 문서당 1회 스캔으로 라벨별 키워드 적중 수 집계
+# - 적중 수 = 문서에 포함된 서로 다른 키워드 수 (기존 `keyword in text` 반복과 동일)
+# - pyahocorasick 설치 시 C 오토마톤, 없으면 긴 키워드 우선 교대 정규식 1개 (re 엔진, C)
+# ==========================================
+
+
+def _overlaps(head: str, tail: str) -> bool:
+    """tail이 head 중간에서 시작해 head 끝을 넘어가는 배치가 가능한지"""
+    return any(tail.startswith(head[i:]) and len(tail) > len(head) - i for i in range(1, len(head)))
+
+
+class KeywordMatcher:
+    """
+    다중 키워드 매처
+
+    사용 예:
+        matcher = KeywordMatcher({"positive": ["상승", "호재"], "negative": ["하락"]})
+        hits = matcher.count(titles)          # (문서 수, 라벨 수) int 배열
+        score = hits[:, 0].sum() - hits[:, 1].sum()
+    """
+
+    def __init__(self, lexicons: Dict[str, Sequence[str]]):
+        """
+        Args:
+            lexicons: 라벨 → 키워드 리스트 (라벨 순서 = count() 결과 열 순서)
+        """
+        self.labels: List[str] = list(lexicons)
+        self.keywords: List[str] = []
+        self.keyword_label: List[int] = []
+        for li, words in enumerate(lexicons.values()):
+            for word in words:
+                if word:
+                    self.keywords.append(word)
+                    self.keyword_label.append(li)
+        self._label_arr = np.asarray(self.keyword_label, dtype=np.int64)
+
+        # 같은 단어가 여러 라벨에 있으면 id를 모두 보관
+        ids: Dict[str, List[int]] = {}
+        for kid, word in enumerate(self.keywords):
+            ids.setdefault(word, []).append(kid)
+
+        self._automaton = None
+        if not ids:
+            return
+        if HAS_AHOCORASICK:
+            self._automaton = ahocorasick.Automaton()
+            for word, kids in ids.items():
+                self._automaton.add_word(word, tuple(kids))
+            self._automaton.make_automaton()
+        else:
+            self._build(ids)
+
+    def _build(self, ids: Dict[str, List[int]]):
+        """교대 정규식 (pyahocorasick 미설치 시)"""
+        # 긴 키워드 우선 → 같은 위치에서는 가장 긴 키워드가 일치
+        words = sorted(ids, key=len, reverse=True)
+        self._regex = re.compile("|".join(map(re.escape, words)))
+        # 비중첩 검색이 건너뛰는 키워드 보정
+        # - 일치한 키워드 안에 포함된 키워드는 함께 적중
+        # - 다른 키워드 끝부분과 겹쳐 시작하는 키워드는 적중이 있을 때만 직접 확인
+        self._contains = {w: frozenset(k for v in words if v in w for k in ids[v]) for w in words}
+        self._overlapping = [(v, ids[v]) for v in words if any(_overlaps(w, v) for w in words if w != v)]
+
+    def find(self, text: str) -> set:
+        """문서에 포함된 키워드 id 집합"""
+        if not self.keywords or not text:
+            return set()
+        found = set()
+        if self._automaton is not None:
+            for _, kids in self._automaton.iter(text):
+                found.update(kids)
+            return found
+
+        for word in set(self._regex.findall(text)):
+            found |= self._contains[word]
+        if found:
+            for word, kids in self._overlapping:
+                if word in text:
+                    found.update(kids)
+        return found
+
+    def count(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        문서 묶음의 라벨별 적중 수
+
+        Returns:
+            np.ndarray: (문서 수, 라벨 수) int64 - [d, l] = 문서 d에 포함된 라벨 l 키워드 수
+        """
+        rows, cols = [], []
+        n = 0
+        for d, text in enumerate(texts):
+            n = d + 1
+            for kid in self.find(text):
+                rows.append(d)
+                cols.append(kid)
+        hits = np.zeros((n, len(self.labels)), dtype=np.int64)
+        if rows:
+            np.add.at(hits, (np.asarray(rows), self._label_arr[cols]), 1)
+        return hits
+
+    def totals(self, texts: Iterable[str]) -> Dict[str, int]:
+        """라벨별 전체 적중 수 합계"""
+        hits = self.count(texts)
+        return {label: int(hits[:, li].sum()) for li, label in enumerate(self.labels)}
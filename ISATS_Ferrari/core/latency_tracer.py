@@ -0,0 +1,248 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# ==========================================
+# Latency Tracer
+# 역할: 시세 수신 → 판단 → 주문 → 체결 구간별 지연시간 측정 및 히스토그램 집계
+# ==========================================
+
+# 구간(Stage) 정의
+STAGE_QUOTE = "quote_fetch"      # 시세 조회
+STAGE_ANALYZE = "analyze"        # ActiveBot.analyze (지표 + 판단)
+STAGE_VALIDATE = "validate"      # SignalValidator.validate_entry
+STAGE_ORDER = "place_order"      # 주문 전송 ~ 접수 응답
+STAGE_FILL = "fill_confirm"      # 주문 접수 ~ 체결 확인 (잔고 반영)
+STAGE_TICK_TO_DECISION = "tick_to_decision"  # 시세 수신 ~ 매매 판단 완료
+STAGE_TICK_TO_ORDER = "tick_to_order"        # 시세 수신 ~ 주문 접수 (End-to-End)
+
+STAGES = [
+    STAGE_QUOTE, STAGE_ANALYZE, STAGE_VALIDATE, STAGE_ORDER, STAGE_FILL,
+    STAGE_TICK_TO_DECISION, STAGE_TICK_TO_ORDER,
+]
+
+REDIS_KEY = "telemetry:latency"  # Hash: source -> 직렬화된 히스토그램
+
+
+class LatencyHistogram:
+    """
+    HDR 방식 로그-선형 히스토그램 (마이크로초 단위)
+    - 128 미만: 1us 단위 버킷
+    - 이후: 2의 거듭제곱 구간마다 64개 버킷 (상대오차 ~1.6%)
+    - 버킷 카운트만 저장하므로 프로세스 간 병합이 정확함
+    """
+    SUB_BUCKET_BITS = 7
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS      # 128
+    SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1      # 64
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    @classmethod
+    def _bucket_index(cls, value: int) -> int:
+        if value < cls.SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        return cls.SUB_BUCKET_COUNT + (shift - 1) * cls.SUB_BUCKET_HALF + ((value >> shift) - cls.SUB_BUCKET_HALF)
+
+    @classmethod
+    def _bucket_upper(cls, index: int) -> int:
+        """버킷이 대표하는 최대값 (HDR highest-equivalent-value)"""
+        if index < cls.SUB_BUCKET_COUNT:
+            return index
+        offset = index - cls.SUB_BUCKET_COUNT
+        shift = offset // cls.SUB_BUCKET_HALF + 1
+        mantissa = offset % cls.SUB_BUCKET_HALF + cls.SUB_BUCKET_HALF
+        return (mantissa << shift) + (1 << shift) - 1
+
+    def record(self, value_us: int):
+        value_us = max(0, int(value_us))
+        idx = self._bucket_index(value_us)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other: "LatencyHistogram"):
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, pct: float) -> int:
+        """백분위 값 (us)"""
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(pct / 100.0 * self.count + 0.4999)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= target:
+                return min(self._bucket_upper(idx), self.max_us)
+        return self.max_us
+
+    def summary(self) -> Dict:
+        """대시보드용 요약 (ms 단위)"""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min_ms": round(self.min_us / 1000, 3),
+            "mean_ms": round(self.total_us / self.count / 1000, 3),
+            "p50_ms": round(self.percentile(50) / 1000, 3),
+            "p90_ms": round(self.percentile(90) / 1000, 3),
+            "p99_ms": round(self.percentile(99) / 1000, 3),
+            "p999_ms": round(self.percentile(99.9) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "counts": {str(k): v for k, v in self.counts.items()},
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        hist = cls()
+        hist.counts = {int(k): int(v) for k, v in data.get("counts", {}).items()}
+        hist.count = int(data.get("count", 0))
+        hist.total_us = int(data.get("total_us", 0))
+        hist.min_us = data.get("min_us")
+        hist.max_us = int(data.get("max_us", 0))
+        return hist
+
+
+class LatencyTracer:
+    """
+    경량 Span 계측기
+    - with tracer.span(STAGE, ticker): ... 형태로 구간 측정
+    - 구간별 전체 히스토그램 + 종목별 히스토그램 동시 집계
+    - publish()로 Redis Hash에 프로세스별 스냅샷 저장
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        self.source = source or f"{os.path.basename(sys.argv[0] or 'isats')}:{os.getpid()}"
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.tickers: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._trace_start: Dict[str, int] = {}  # ticker -> 시세 수신 시각 (ns)
+
+    def record(self, stage: str, elapsed_us: int, ticker: Optional[str] = None):
+        """구간 측정값 기록"""
+        self.stages.setdefault(stage, LatencyHistogram()).record(elapsed_us)
+        if ticker:
+            self.tickers.setdefault(ticker, {}).setdefault(stage, LatencyHistogram()).record(elapsed_us)
+
+    @contextmanager
+    def span(self, stage: str, ticker: Optional[str] = None):
+        """구간 측정 컨텍스트 (동기/비동기 코드 모두 사용 가능)"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter_ns() - start) // 1000, ticker)
+
+    def start_trace(self, ticker: str) -> int:
+        """시세 수신 시점 마킹 (End-to-End 측정 시작)"""
+        now = time.perf_counter_ns()
+        self._trace_start[ticker] = now
+        return now
+
+    def mark(self, ticker: str, stage: str = STAGE_TICK_TO_DECISION):
+        """마킹 시점부터 현재까지를 stage로 기록 (추적은 계속 유지)"""
+        start = self._trace_start.get(ticker)
+        if start is not None:
+            self.record(stage, (time.perf_counter_ns() - start) // 1000, ticker)
+
+    def finish_trace(self, ticker: str, stage: str = STAGE_TICK_TO_ORDER):
+        """마킹 시점부터 현재까지를 stage로 기록"""
+        start = self._trace_start.pop(ticker, None)
+        if start is not None:
+            self.record(stage, (time.perf_counter_ns() - start) // 1000, ticker)
+
+    def reset(self):
+        self.stages.clear()
+        self.tickers.clear()
+        self._trace_start.clear()
+
+    def to_dict(self) -> Dict:
+        return {
+            "source": self.source,
+            "updated": time.time(),
+            "stages": {s: h.to_dict() for s, h in self.stages.items()},
+            "tickers": {t: {s: h.to_dict() for s, h in hs.items()} for t, hs in self.tickers.items()},
+        }
+
+    def snapshot(self) -> Dict:
+        """현재 프로세스의 구간별/종목별 백분위 요약"""
+        return summarize([self.to_dict()])
+
+    async def publish(self, redis_client, key: str = REDIS_KEY):
+        """Redis Hash에 이 프로세스의 누적 히스토그램 저장"""
+        if redis_client is None:
+            return
+        try:
+            await redis_client.hset(key, self.source, json.dumps(self.to_dict()))
+        except Exception:
+            # 텔레메트리 실패는 매매에 영향 주지 않음
+            pass
+
+
+def summarize(payloads) -> Dict:
+    """여러 프로세스의 히스토그램 스냅샷을 병합하여 백분위 요약 생성"""
+    stages: Dict[str, LatencyHistogram] = {}
+    tickers: Dict[str, Dict[str, LatencyHistogram]] = {}
+    sources = []
+
+    for payload in payloads:
+        sources.append({"source": payload.get("source"), "updated": payload.get("updated")})
+        for stage, data in payload.get("stages", {}).items():
+            stages.setdefault(stage, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+        for ticker, hs in payload.get("tickers", {}).items():
+            for stage, data in hs.items():
+                tickers.setdefault(ticker, {}).setdefault(stage, LatencyHistogram()).merge(
+                    LatencyHistogram.from_dict(data)
+                )
+
+    return {
+        "sources": sources,
+        "stages": {s: h.summary() for s, h in stages.items()},
+        "tickers": {t: {s: h.summary() for s, h in hs.items()} for t, hs in tickers.items()},
+    }
+
+
+async def load_summary(redis_client, key: str = REDIS_KEY) -> Dict:
+    """Redis에 게시된 모든 프로세스의 지연시간 통계를 읽어 병합"""
+    if redis_client is None:
+        return summarize([])
+    try:
+        raw = await redis_client.hgetall(key)
+    except Exception:
+        return summarize([])
+    payloads = []
+    for value in raw.values():
+        try:
+            payloads.append(json.loads(value))
+        except (TypeError, ValueError):
+            continue
+    return summarize(payloads)
+
+
+# 프로세스 전역 계측기 (모듈 간 공유)
+tracer = LatencyTracer()
@@ -0,0 +1,87 @@
+import importlib
+import threading
+from typing import Any, Optional
+
+# ==========================================
+# Lazy Import
+# 역할: 무거운 선택 의존성(redis, ccxt, pandas, Gemini SDK, 전략/강화학습 모듈)을
+#       모듈 임포트 시점이 아니라 첫 사용 시점에 임포트
+# - available: 첫 확인 때 실제 임포트를 시도하고 결과(성공/실패)를 캐시 → 기능 감지도 첫 사용까지 지연
+# - 실패 시 경고는 1회만 출력, 이후 접근은 ImportError
+# - 모듈 / 모듈 속성(클래스, 함수) 모두 지원: 속성 접근·호출은 대상 객체로 위임
+# ==========================================
+
+
+class LazyImport:
+    """
+    지연 임포트 프록시
+
+    사용 예:
+        redis = LazyImport("redis.asyncio", warning="redis.asyncio not found. Running in MOCK mode.")
+        calculate_turbulence = LazyImport("brain.turbulence", "calculate_turbulence")
+
+        if redis.available:                           # 이 시점에 처음 임포트
+            client = redis.from_url(url)
+        series = calculate_turbulence(df)             # 호출 시 임포트
+    """
+
+    def __init__(self, module: str, attr: Optional[str] = None, warning: Optional[str] = None):
+        """
+        Args:
+            module: 모듈 경로 (예: "ccxt.async_support")
+            attr: 모듈에서 가져올 속성 이름 (None이면 모듈 자체)
+            warning: 임포트 실패 시 1회 출력할 메시지
+        """
+        self._module = module
+        self._attr = attr
+        self._warning = warning
+        self._target: Any = None
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Any:
+        """대상 임포트 (이미 성공/실패했으면 캐시된 결과)"""
+        if self._target is not None:
+            return self._target
+        with self._lock:
+            if self._target is None and self._error is None:
+                try:
+                    target = importlib.import_module(self._module)
+                    self._target = getattr(target, self._attr) if self._attr else target
+                except ImportError as e:
+                    self._error = e
+                    if self._warning:
+                        print(f"⚠️ [Warning] {self._warning}")
+        if self._error is not None:
+            raise ImportError(f"{self.name} 사용 불가: {self._error}") from self._error
+        return self._target
+
+    @property
+    def available(self) -> bool:
+        """사용 가능 여부 (첫 호출 시 임포트 시도)"""
+        try:
+            self.load()
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def loaded(self) -> bool:
+        """이미 임포트되었는지 (임포트를 유발하지 않음)"""
+        return self._target is not None
+
+    @property
+    def name(self) -> str:
+        return f"{self._module}.{self._attr}" if self._attr else self._module
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else ("failed" if self._error else "pending")
+        return f"<LazyImport {self.name} ({state})>"
@@ -0,0 +1,588 @@
+"""
+🗂️ PATTERN ANN INDEX
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+과거 패턴 근사 최근접 이웃 인덱스 (IVF, 디스크 저장 + 메모리 맵)
+
+구조:
+1. 임베딩 (60봉 윈도우 → d차원 벡터)
+   - pca: z-정규화 종가 윈도우를 표본 SVD 상위 d축에 투영 (내적 ≈ Pearson 상관계수)
+   - hybrid: HybridCNN_LSTM 마지막 히든 스테이트 (윈도우별 MinMax OHLCV, 코사인 유사도)
+2. IVF: k-means 중심(nlist개)으로 벡터를 리스트별로 정렬 저장
+   → 질의 시 가까운 nprobe개 리스트만 스캔 (전체의 수 % 이내)
+3. 증분 갱신: 새 봉으로 이후 수익률이 확정된 윈도우만 델타 세그먼트에 추가
+   (델타가 본 세그먼트의 merge_ratio를 넘으면 리스트 순서로 병합)
+4. 저장: data/_pattern_index/<임베딩>/gen_<n>/ (vectors/meta 는 np.load mmap)
+   manifest.json이 현재 세대 + 델타 파일 + 종목별 진행 위치를 원자적으로 가리킴
+
+사용 예:
+    index = PatternIndex.open_or_build(["data/KR", "data/US"])
+    index.update()                                   # 장 시작 전 증분 갱신
+    results = index.query(latest_windows, top_k=50)  # (종목 수, 60) 일괄 질의
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).parent.parent
+INDEX_ROOT = ROOT_DIR / "data" / "_pattern_index"
+MANIFEST_FILE = "manifest.json"
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+META_DTYPE = np.dtype([
+    ('ticker', '<i4'),     # manifest 종목 번호
+    ('start', '<i4'),      # 윈도우 시작 행
+    ('start_date', '<i4'), # 윈도우 첫 봉 일자 (epoch 일)
+    ('end_date', '<i4'),   # 윈도우 마지막 봉 일자
+    ('fwd_date', '<i4'),   # 이후 수익률 기준 봉 일자
+    ('fwd_ret', '<f4'),    # horizon일 이후 수익률
+])
+
+
+def _read_frame(path: Path, columns: List[str]) -> pd.DataFrame:
+    """가격 CSV → 필요한 컬럼만 (Date 인덱스, 결측/0 이하 종가 제거)"""
+    df = pd.read_csv(path, usecols=['Date'] + columns)
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.set_index('Date').dropna()
+    df = df[df['Close'] > 0]
+    return df[~df.index.duplicated(keep='last')].sort_index()
+
+
+def _epoch_days(index) -> np.ndarray:
+    return pd.DatetimeIndex(index).values.astype('datetime64[D]').astype(np.int64).astype(np.int32)
+
+
+# ==========================================
+# 임베딩
+# ==========================================
+
+class ZNormPCAEmbedder:
+    """z-정규화 종가 윈도우 → 비중심 SVD 상위 dim축 투영 (투영 내적 ≈ 상관계수)"""
+
+    name = "pca"
+    columns = ['Close']
+    metric = "dot"
+
+    def __init__(self, dim: int = 32):
+        self.dim = dim
+        self.components: Optional[np.ndarray] = None   # (m, dim)
+
+    @staticmethod
+    def _znorm(windows: np.ndarray):
+        x = windows[..., 0] if windows.ndim == 3 else windows
+        x = x.astype(np.float64)
+        mean = x.mean(axis=1, keepdims=True)
+        std = x.std(axis=1, keepdims=True)
+        valid = std[:, 0] > 1e-8 * np.abs(mean[:, 0])
+        z = (x - mean) / np.where(std > 0, std, 1.0) / np.sqrt(x.shape[1])   # 단위 벡터
+        return z, valid
+
+    def fit(self, windows: np.ndarray):
+        z, valid = self._znorm(windows)
+        _, _, vt = np.linalg.svd(z[valid], full_matrices=False)
+        self.components = np.ascontiguousarray(vt[:self.dim].T)
+
+    def transform(self, windows: np.ndarray):
+        z, valid = self._znorm(windows)
+        return (z @ self.components).astype(np.float32), valid
+
+    def save(self, path: Path):
+        np.save(path / "pca_components.npy", self.components)
+
+    def load(self, path: Path):
+        self.components = np.load(path / "pca_components.npy")
+        self.dim = self.components.shape[1]
+
+
+class HybridHiddenEmbedder:
+    """
+    HybridCNN_LSTM 마지막 히든 스테이트 임베딩 (학습된 특징, 코사인 유사도)
+    - 윈도우별 MinMax 정규화 (파일 전체 기준 정규화는 새 봉마다 값이 바뀌어 증분 인덱스에 부적합)
+    """
+
+    name = "hybrid"
+    columns = OHLCV
+    metric = "cosine"
+
+    def __init__(self, weights: Optional[str] = None, batch_size: int = 4096):
+        self.weights = weights
+        self.batch_size = batch_size
+        self.model = None
+
+    def _model(self):
+        if self.model is None:
+            import torch
+            from brain.models import HybridCNN_LSTM
+            from brain.inference_service import MODEL_SPECS
+            weights = self.weights or MODEL_SPECS['hybrid'][3]
+            model = HybridCNN_LSTM()
+            model.load_state_dict(torch.load(weights, map_location='cpu'))
+            self.model = model.eval()
+        return self.model
+
+    def fit(self, windows: np.ndarray):
+        pass
+
+    def transform(self, windows: np.ndarray):
+        import torch
+        lo = windows.min(axis=1, keepdims=True)
+        hi = windows.max(axis=1, keepdims=True)
+        x = ((windows - lo) / (hi - lo + 1e-6)).astype(np.float32)
+        model = self._model()
+        out = []
+        with torch.inference_mode():
+            for s in range(0, len(x), self.batch_size):
+                out.append(model.embed(torch.from_numpy(x[s:s + self.batch_size])).numpy())
+        emb = np.concatenate(out) if out else np.empty((0, model.lstm.hidden_size), dtype=np.float32)
+        norm = np.linalg.norm(emb, axis=1, keepdims=True)
+        valid = norm[:, 0] > 0
+        return (emb / np.where(norm > 0, norm, 1.0)).astype(np.float32), valid
+
+    def save(self, path: Path):
+        pass
+
+    def load(self, path: Path):
+        pass
+
+
+EMBEDDERS = {'pca': ZNormPCAEmbedder, 'hybrid': HybridHiddenEmbedder}
+
+
+# ==========================================
+# IVF 인덱스
+# ==========================================
+
+def _kmeans(x: np.ndarray, k: int, iters: int = 15, seed: int = 0) -> np.ndarray:
+    """구면 k-means (내적 기준 할당)"""
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), size=k, replace=False)].astype(np.float32)
+    for _ in range(iters):
+        assign = _assign(x, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, x)
+        counts = np.bincount(assign, minlength=k)
+        empty = counts == 0
+        sums[empty] = x[rng.choice(len(x), size=int(empty.sum()))]
+        norm = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.where(norm > 0, norm, 1.0)
+    return centroids.astype(np.float32)
+
+
+def _assign(x: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    out = np.empty(len(x), dtype=np.int32)
+    for s in range(0, len(x), chunk):
+        out[s:s + chunk] = np.argmax(x[s:s + chunk] @ centroids.T, axis=1)
+    return out
+
+
+class PatternIndex:
+    """디스크 IVF 패턴 인덱스 (메모리 맵 조회 + 증분 갱신)"""
+
+    def __init__(self, price_dirs: Sequence, index_dir: Optional[str] = None, embedder: str = 'pca',
+                 window: int = 60, horizon: int = 5, nlist: Optional[int] = None,
+                 merge_ratio: float = 0.2, **embedder_kwargs):
+        """
+        Args:
+            price_dirs: 가격 CSV 폴더 리스트
+            index_dir: 인덱스 폴더 (기본: data/_pattern_index/<embedder>)
+            embedder: 'pca' | 'hybrid'
+            window / horizon: 윈도우 길이 / 이후 수익률 기간
+            nlist: IVF 리스트 수 (None이면 √N × 2)
+            merge_ratio: 델타 / 본 세그먼트 비율이 이 값을 넘으면 병합
+        """
+        self.price_dirs = [Path(p) for p in price_dirs]
+        self.index_dir = Path(index_dir) if index_dir else INDEX_ROOT / embedder
+        self.embedder = EMBEDDERS[embedder](**embedder_kwargs)
+        self.window = window
+        self.horizon = horizon
+        self.nlist = nlist
+        self.merge_ratio = merge_ratio
+        self.manifest: Dict = {}
+        self.loaded = False
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 윈도우 추출
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _price_files(self) -> Dict[str, Path]:
+        files = {}
+        for d in self.price_dirs:
+            if d.is_dir():
+                for path in sorted(d.glob("*.csv")):
+                    files[path.stem] = path
+        return files
+
+    def _windows(self, df: pd.DataFrame, first: int):
+        """
+        시작 행 first 이후, 이후 수익률이 확정된 윈도우
+        - 이후 수익률 기준 봉이 마지막 봉이면 제외 (장중 미완성 봉은 다음 수집 때 교체됨)
+        """
+        m, h = self.window, self.horizon
+        values = df[self.embedder.columns].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        dates = _epoch_days(df.index)
+        last = len(df) - 2 - h - m + 1          # 마지막 시작 행 (fwd 행 ≤ len-2)
+        if last < first:
+            return None
+        starts = np.arange(first, last + 1)
+        view = np.lib.stride_tricks.sliding_window_view(values, m, axis=0)[first:last + 1]
+        windows = view.transpose(0, 2, 1)
+        end = starts + m - 1
+        fwd = end + h
+        meta = np.empty(len(starts), dtype=META_DTYPE)
+        meta['start'] = starts
+        meta['start_date'] = dates[starts]
+        meta['end_date'] = dates[end]
+        meta['fwd_date'] = dates[fwd]
+        meta['fwd_ret'] = close[fwd] / close[end] - 1
+        return windows, meta
+
+    def _embed(self, tickers: Dict[str, tuple]):
+        """{종목: (번호, df, 시작 행)} → (벡터, 메타, 종목별 다음 시작 행)"""
+        vecs, metas, progress = [], [], {}
+        for ticker, (tid, df, first) in tickers.items():
+            out = self._windows(df, first)
+            if out is None:
+                progress[ticker] = first
+                continue
+            windows, meta = out
+            emb, valid = self.embedder.transform(windows)
+            meta['ticker'] = tid
+            vecs.append(emb[valid])
+            metas.append(meta[valid])
+            progress[ticker] = int(meta['start'][-1]) + 1
+        dim = self.manifest.get('dim') or 0
+        if not vecs:
+            return np.empty((0, dim), dtype=np.float32), np.empty(0, dtype=META_DTYPE), progress
+        return np.concatenate(vecs), np.concatenate(metas), progress
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 저장 (세대 디렉토리 + manifest 원자적 교체)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _gen_dir(self, gen: Optional[int] = None) -> Path:
+        return self.index_dir / f"gen_{self.manifest['gen'] if gen is None else gen}"
+
+    def _save_manifest(self):
+        tmp = self.index_dir / (MANIFEST_FILE + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(tmp, self.index_dir / MANIFEST_FILE)
+
+    def _write_main(self, gen: int, vectors: np.ndarray, meta: np.ndarray, lists: np.ndarray, centroids: np.ndarray):
+        """리스트 순서로 정렬한 본 세그먼트 저장"""
+        gen_dir = self._gen_dir(gen)
+        gen_dir.mkdir(parents=True, exist_ok=True)
+        order = np.argsort(lists, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(lists, minlength=len(centroids)))]).astype(np.int64)
+        np.save(gen_dir / "vectors.npy", vectors[order])
+        np.save(gen_dir / "meta.npy", meta[order])
+        np.save(gen_dir / "offsets.npy", offsets)
+        np.save(gen_dir / "centroids.npy", centroids)
+        self.embedder.save(gen_dir)
+
+    def _write_delta(self, vectors: np.ndarray, meta: np.ndarray, lists: np.ndarray) -> str:
+        version = self.manifest.get('delta_version', 0) + 1
+        name = f"delta_{version}.npz"
+        np.savez(self._gen_dir() / name, vectors=vectors, meta=meta, lists=lists)
+        self.manifest['delta_version'] = version
+        return name
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 빌드 / 증분 갱신
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @classmethod
+    def open_or_build(cls, price_dirs: Sequence, **kwargs) -> "PatternIndex":
+        index = cls(price_dirs, **kwargs)
+        if (index.index_dir / MANIFEST_FILE).exists():
+            index.load()
+        else:
+            index.build()
+        return index
+
+    def build(self, sample_size: int = 200_000, seed: int = 0) -> Dict:
+        """전체 빌드 (임베딩 학습 + k-means + 리스트 정렬 저장)"""
+        files = self._price_files()
+        frames = {}
+        for ticker, path in files.items():
+            try:
+                frames[ticker] = (path, _read_frame(path, self.embedder.columns))
+            except Exception:
+                continue
+        tickers = list(frames)
+
+        # 임베딩 학습용 표본 (종목별 균등 추출)
+        rng = np.random.default_rng(seed)
+        per = max(1, sample_size // max(1, len(tickers)))
+        sample = []
+        for ticker in tickers:
+            out = self._windows(frames[ticker][1], 0)
+            if out is not None:
+                w = out[0]
+                sample.append(w[rng.choice(len(w), size=min(per, len(w)), replace=False)])
+        if not sample:
+            raise RuntimeError(f"인덱스를 만들 가격 데이터가 없습니다: {self.price_dirs}")
+        self.embedder.fit(np.concatenate(sample))
+
+        old_gen = self.manifest.get('gen')
+        self.manifest = {
+            'gen': (old_gen or 0) + 1, 'embedder': self.embedder.name, 'window': self.window,
+            'horizon': self.horizon, 'delta': None, 'delta_version': 0, 'dim': None,
+            'tickers': tickers, 'files': {},
+        }
+        vectors, meta, progress = self._embed({t: (k, frames[t][1], 0) for k, t in enumerate(tickers)})
+        self.manifest['dim'] = int(vectors.shape[1])
+
+        nlist = self.nlist or int(2 * np.sqrt(len(vectors)))
+        nlist = max(1, min(nlist, len(vectors)))
+        train = vectors[rng.choice(len(vectors), size=min(len(vectors), nlist * 32), replace=False)]
+        centroids = _kmeans(self._for_ivf(train), nlist, seed=seed)
+        lists = _assign(self._for_ivf(vectors), centroids)
+
+        self._write_main(self.manifest['gen'], vectors, meta, lists, centroids)
+        self.manifest['files'] = {t: self._file_state(frames[t][0], frames[t][1], progress[t]) for t in tickers}
+        self.manifest['size'] = int(len(vectors))
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._save_manifest()
+        if old_gen is not None:
+            shutil.rmtree(self._gen_dir(old_gen), ignore_errors=True)
+
+        self.load()
+        print(f"🗂️ [PatternIndex] 빌드 완료: {len(tickers):,}종목 / {len(vectors):,}윈도우 / {nlist}리스트")
+        return {'tickers': len(tickers), 'windows': int(len(vectors)), 'nlist': nlist}
+
+    @staticmethod
+    def _file_state(path: Path, df: pd.DataFrame, next_start: int) -> Dict:
+        # 봉 수 / 첫 날짜 기록 → 과거 구간 변경(재수집, 수정주가) 감지 시 전체 재빌드
+        return {
+            'mtime': os.path.getmtime(path),
+            'next_start': next_start,
+            'bars': len(df),
+            'first_date': str(df.index[0].date()) if len(df) else None,
+        }
+
+    def _for_ivf(self, x: np.ndarray) -> np.ndarray:
+        """IVF 할당용 단위 벡터 (pca 투영은 노름이 1 이하)"""
+        norm = np.linalg.norm(x, axis=1, keepdims=True)
+        return x / np.where(norm > 0, norm, 1.0)
+
+    def update(self) -> Dict:
+        """
+        증분 갱신
+        - mtime이 바뀐 종목만 읽어 새로 확정된 윈도우를 델타에 추가
+        - 과거 구간이 바뀐 종목(시작일 변경/봉 수 감소)이나 신규 종목이 많으면 전체 재빌드
+        """
+        if not self.loaded:
+            return self.build()
+        files = self._price_files()
+        states = self.manifest['files']
+        tickers = self.manifest['tickers']
+        tid = {t: k for k, t in enumerate(tickers)}
+
+        todo, rebuild = {}, False
+        for ticker, path in files.items():
+            state = states.get(ticker)
+            if state is not None and state['mtime'] == os.path.getmtime(path):
+                continue
+            try:
+                df = _read_frame(path, self.embedder.columns)
+            except Exception:
+                continue
+            if df.empty:
+                continue
+            if state is None:
+                tid[ticker] = len(tickers)
+                tickers.append(ticker)
+                state = {'next_start': 0, 'bars': 0, 'first_date': None}
+            elif state['bars'] and (len(df) < state['bars'] or str(df.index[0].date()) != state['first_date']):
+                rebuild = True
+                break
+            todo[ticker] = (path, df, state['next_start'])
+
+        if rebuild:
+            return self.build()
+        if not todo:
+            return {'added': 0, 'tickers': 0, 'merged': False}
+
+        vectors, meta, progress = self._embed({t: (tid[t], df, first) for t, (_, df, first) in todo.items()})
+        lists = _assign(self._for_ivf(vectors), self.centroids) if len(vectors) else np.empty(0, dtype=np.int32)
+
+        if self.delta_vectors is not None and len(self.delta_vectors):
+            vectors = np.concatenate([self.delta_vectors, vectors])
+            meta = np.concatenate([self.delta_meta, meta])
+            lists = np.concatenate([self.delta_lists, lists])
+
+        for t, (path, df, _) in todo.items():
+            states[t] = self._file_state(path, df, progress[t])
+
+        merged = len(vectors) > self.merge_ratio * self.manifest['size']
+        old_gen, old_delta = self.manifest['gen'], self.manifest.get('delta')
+        if merged:
+            main_lists = np.repeat(np.arange(len(self.offsets) - 1, dtype=np.int32), np.diff(self.offsets))
+            new_gen = old_gen + 1
+            self._write_main(new_gen, np.concatenate([np.asarray(self.vectors), vectors]),
+                             np.concatenate([np.asarray(self.meta), meta]),
+                             np.concatenate([main_lists, lists]), self.centroids)
+            self.manifest.update({'gen': new_gen, 'delta': None, 'size': int(len(self.vectors) + len(vectors))})
+        else:
+            self.manifest['delta'] = self._write_delta(vectors, meta, lists)
+        self._save_manifest()
+
+        # 이전 세대 / 델타 정리 (manifest 교체 후)
+        self._release()
+        if merged:
+            shutil.rmtree(self._gen_dir(old_gen), ignore_errors=True)
+        elif old_delta:
+            try:
+                os.remove(self._gen_dir() / old_delta)
+            except OSError:
+                pass
+        self.load()
+        added = int(sum(progress[t] - first for t, (_, _, first) in todo.items()))
+        return {'added': added, 'tickers': len(todo), 'merged': merged}
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 조회
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def load(self) -> "PatternIndex":
+        """manifest가 가리키는 세대를 메모리 맵으로 열기"""
+        with open(self.index_dir / MANIFEST_FILE, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest['embedder'] != self.embedder.name:
+            raise ValueError(f"임베딩 불일치: {self.manifest['embedder']} != {self.embedder.name}")
+        self.window, self.horizon = self.manifest['window'], self.manifest['horizon']
+        gen_dir = self._gen_dir()
+        self.vectors = np.load(gen_dir / "vectors.npy", mmap_mode='r')
+        self.meta = np.load(gen_dir / "meta.npy", mmap_mode='r')
+        self.offsets = np.load(gen_dir / "offsets.npy")
+        self.centroids = np.load(gen_dir / "centroids.npy")
+        self.embedder.load(gen_dir)
+
+        self.delta_vectors = self.delta_meta = self.delta_lists = None
+        self._delta_offsets = None
+        if self.manifest.get('delta'):
+            with np.load(gen_dir / self.manifest['delta']) as z:
+                order = np.argsort(z['lists'], kind='stable')
+                self.delta_vectors = z['vectors'][order]
+                self.delta_meta = z['meta'][order]
+                self.delta_lists = z['lists'][order]
+            self._delta_offsets = np.searchsorted(self.delta_lists, np.arange(len(self.centroids) + 1))
+        self.tickers = self.manifest['tickers']
+        self.loaded = True
+        return self
+
+    def _release(self):
+        self.vectors = self.meta = None
+        self.loaded = False
+
+    def _candidates(self, lists: np.ndarray):
+        """probe 리스트의 (벡터, 메타) - 본 세그먼트는 메모리 맵 연속 구간"""
+        vecs, metas = [], []
+        for l in lists:
+            a, b = self.offsets[l], self.offsets[l + 1]
+            if b > a:
+                vecs.append(self.vectors[a:b])
+                metas.append(self.meta[a:b])
+            if self._delta_offsets is not None:
+                a, b = self._delta_offsets[l], self._delta_offsets[l + 1]
+                if b > a:
+                    vecs.append(self.delta_vectors[a:b])
+                    metas.append(self.delta_meta[a:b])
+        if not vecs:
+            return np.empty((0, self.vectors.shape[1]), dtype=np.float32), np.empty(0, dtype=META_DTYPE)
+        return np.concatenate(vecs), np.concatenate(metas)
+
+    def query(self, windows: np.ndarray, top_k: int = 50, nprobe: int = 16,
+              before=None, exclude_tickers: Sequence[str] = ()) -> List[Dict]:
+        """
+        일괄 근사 유사 패턴 검색
+
+        Args:
+            windows: (질의 수, window) 종가 또는 (질의 수, window, 컬럼) - 임베딩 컬럼 순서
+            top_k: 질의별 사례 수 (같은 종목의 인접 윈도우는 1개로 취급)
+            nprobe: 스캔할 IVF 리스트 수 (클수록 정확, 느림)
+            before: 이 날짜 이전에 이후 수익률 기간까지 끝난 사례만 사용 (단일 값 또는 질의별 리스트)
+            exclude_tickers: 제외할 종목
+
+        Returns:
+            List[Dict]: 질의별 matches / similarity(%) / win_probability(%) / expected_return(%)
+                        (pattern_search.search와 같은 형식)
+        """
+        if not self.loaded:
+            self.load()
+        windows = np.asarray(windows, dtype=np.float64)
+        if windows.ndim == 2:
+            windows = windows[:, :, None]
+        emb, valid = self.embedder.transform(windows[:, -self.window:])
+        probe = np.argsort(-(self._for_ivf(emb) @ self.centroids.T), axis=1)[:, :nprobe]
+
+        if before is None or isinstance(before, (str, pd.Timestamp, np.datetime64)) or not np.ndim(before):
+            befores = [before] * len(emb)
+        else:
+            befores = list(before)
+        excluded = np.array([self.tickers.index(t) for t in exclude_tickers if t in self.tickers], dtype=np.int32)
+
+        results = []
+        for qi in range(len(emb)):
+            if not valid[qi]:
+                results.append(self._summary([]))
+                continue
+            vecs, meta = self._candidates(probe[qi])
+            score = vecs @ emb[qi]
+            mask = np.ones(len(meta), dtype=bool)
+            if befores[qi] is not None:
+                cutoff = np.datetime64(pd.Timestamp(befores[qi]).date(), 'D').astype(np.int64)
+                mask &= meta['fwd_date'] < cutoff
+            if len(excluded):
+                mask &= ~np.isin(meta['ticker'], excluded)
+            idx = np.flatnonzero(mask)
+            results.append(self._summary(self._top(score[idx], meta[idx], top_k)))
+        return results
+
+    def _top(self, score: np.ndarray, meta: np.ndarray, top_k: int) -> List[Dict]:
+        """상위 사례 (같은 종목에서 window/2 이내 윈도우는 중복 제외)"""
+        zone = max(1, self.window // 2)
+        pool = min(len(score), top_k * 8)
+        while True:
+            cand = np.argpartition(-score, pool - 1)[:pool] if pool else np.empty(0, dtype=np.int64)
+            cand = cand[np.argsort(-score[cand], kind='stable')]
+            chosen, taken = [], {}
+            for c in cand:
+                t, s = int(meta['ticker'][c]), int(meta['start'][c])
+                if any(abs(s - j) < zone for j in taken.get(t, ())):
+                    continue
+                taken.setdefault(t, []).append(s)
+                chosen.append(c)
+                if len(chosen) == top_k:
+                    break
+            if len(chosen) == top_k or pool >= len(score):
+                break
+            pool = min(len(score), pool * 4)
+        return [{
+            'ticker': self.tickers[int(meta['ticker'][c])],
+            'start': str(np.datetime64(int(meta['start_date'][c]), 'D')),
+            'end': str(np.datetime64(int(meta['end_date'][c]), 'D')),
+            'similarity': float(score[c]),
+            'forward_return': float(meta['fwd_ret'][c]),
+        } for c in chosen]
+
+    @staticmethod
+    def _summary(matches: List[Dict]) -> Dict:
+        if not matches:
+            return {'matches': [], 'similarity': 0.0, 'win_probability': 50.0, 'expected_return': 0.0}
+        rets = np.array([m['forward_return'] for m in matches])
+        return {
+            'matches': matches,
+            'similarity': float(np.mean([m['similarity'] for m in matches]) * 100),
+            'win_probability': float((rets > 0).mean() * 100),
+            'expected_return': float(rets.mean() * 100),
+        }
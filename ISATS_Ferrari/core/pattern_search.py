@@ -0,0 +1,320 @@
+"""
+🔮 PATTERN SEARCH ENGINE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+과거 패턴 유사도 검색 엔진 (MASS 방식)
+
+기능:
+1. 가격 저장소(data/<시장>/*.csv) 전 종목 종가를 (종목 × 일자) 배열에 1회 적재
+2. 질의 패턴(예: 최근 60일 종가)과 모든 종목의 모든 60일 구간의
+   z-정규화 Pearson 상관계수를 FFT 합성곱 1회로 계산
+3. 같은 종목의 인접 구간은 하나로 취급(exclusion zone) → 서로 다른 상위 k개 사례
+4. 사례별 이후 수익률(horizon일) + 상승 확률(win probability) 반환
+
+계산 방식:
+- 구간 i 상관계수 = (Σ q_z·x[i:i+m]) / (m · σ_i),  q_z: z-정규화 질의
+- Σ q_z·x 는 전 종목을 한 번에 rfft/irfft (종목 스펙트럼은 창 길이별로 캐시)
+- 구간 평균/표준편차는 누적합으로 사전 계산
+
+저장 형식:
+- data/<시장>/_pattern/closes.npz: 종가/일자 패딩 배열 + 파일 mtime
+  (변경된 CSV만 다시 읽어 갱신)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = "_pattern"          # data/<시장>/_pattern/
+CACHE_FILE = "closes.npz"
+DEFAULT_WINDOW = 60
+DEFAULT_HORIZON = 5
+MIN_STD = 1e-8                  # 가격 변동이 없는 구간 제외 (상대 표준편차)
+
+
+def _read_close(path: Path) -> pd.Series:
+    """가격 CSV → 종가 Series (DatetimeIndex)"""
+    df = pd.read_csv(path, usecols=['Date', 'Close'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    s = df.set_index('Date')['Close'].dropna()
+    s = s[s > 0]
+    return s[~s.index.duplicated(keep='last')].sort_index()
+
+
+def _load_market(price_dir: Path) -> Dict[str, Dict]:
+    """
+    시장 1개의 종목별 (종가, 일자) 배열
+    - 캐시와 mtime이 같은 종목은 캐시에서, 나머지는 CSV에서 읽음
+    """
+    cache_path = price_dir / CACHE_DIR / CACHE_FILE
+    cached: Dict[str, Dict] = {}
+    if cache_path.exists():
+        try:
+            with np.load(cache_path, allow_pickle=False) as z:
+                tickers, lengths, mtimes = z['tickers'], z['lengths'], z['mtimes']
+                closes, dates = z['closes'], z['dates']
+            for k, t in enumerate(tickers):
+                n = int(lengths[k])
+                cached[str(t)] = {
+                    'mtime': float(mtimes[k]),
+                    'close': closes[k, :n].copy(),
+                    'dates': dates[k, :n].copy(),
+                }
+        except (OSError, ValueError, KeyError):
+            cached = {}
+
+    series: Dict[str, Dict] = {}
+    changed = False
+    for path in sorted(price_dir.glob("*.csv")):
+        ticker = path.stem
+        mtime = os.path.getmtime(path)
+        entry = cached.get(ticker)
+        if entry is None or entry['mtime'] != mtime:
+            try:
+                close = _read_close(path)
+            except Exception:
+                continue
+            entry = {
+                'mtime': mtime,
+                'close': close.to_numpy(dtype=np.float64),
+                'dates': close.index.values.astype('datetime64[D]').astype(np.int64),
+            }
+            changed = True
+        series[ticker] = entry
+
+    if changed or set(series) != set(cached):
+        _save_market(cache_path, series)
+    return series
+
+
+def _save_market(cache_path: Path, series: Dict[str, Dict]):
+    tickers = list(series)
+    lengths = np.array([len(series[t]['close']) for t in tickers], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    closes = np.full((len(tickers), width), np.nan)
+    dates = np.zeros((len(tickers), width), dtype=np.int64)
+    for k, t in enumerate(tickers):
+        closes[k, :lengths[k]] = series[t]['close']
+        dates[k, :lengths[k]] = series[t]['dates']
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.stem + ".tmp.npz")
+    np.savez(tmp, tickers=np.array(tickers, dtype=str), lengths=lengths,
+             mtimes=np.array([series[t]['mtime'] for t in tickers]), closes=closes, dates=dates)
+    os.replace(tmp, cache_path)
+
+
+class _WindowIndex:
+    """창 길이 m 기준 사전 계산 (종목 스펙트럼, 구간 평균/표준편차, 유효 마스크)"""
+
+    def __init__(self, closes: np.ndarray, lengths: np.ndarray, m: int):
+        n, width = closes.shape
+        self.m = m
+        self.n_windows = max(width - m + 1, 0)
+        self.n_fft = 1 << int(np.ceil(np.log2(max(width + m, 2))))
+
+        # 종목 평균을 빼서 누적합 분산 계산의 자릿수 손실 완화 (상관계수는 평행이동에 불변)
+        level = np.nanmean(closes, axis=1, keepdims=True) if width else np.zeros((n, 1))
+        level = np.nan_to_num(level, nan=0.0)
+        x = np.nan_to_num(closes - level, nan=0.0)
+        self.spectrum = np.fft.rfft(x, self.n_fft, axis=1)
+
+        csum = np.concatenate([np.zeros((n, 1)), np.cumsum(x, axis=1)], axis=1)
+        csum2 = np.concatenate([np.zeros((n, 1)), np.cumsum(x * x, axis=1)], axis=1)
+        mean = (csum[:, m:] - csum[:, :-m]) / m
+        var = (csum2[:, m:] - csum2[:, :-m]) / m - mean ** 2
+        self.std = np.sqrt(np.maximum(var, 0.0))
+
+        starts = np.arange(self.n_windows)
+        self.valid = (starts[None, :] + m <= lengths[:, None]) & (self.std > MIN_STD * np.abs(mean + level))
+        self.std = np.where(self.valid, self.std, np.inf)
+
+
+class PatternSearchEngine:
+    """
+    전 종목 과거 패턴 유사도 검색
+
+    사용 예:
+        engine = PatternSearchEngine(["data/KR", "data/US"])
+        result = engine.search(df['Close'].values[-60:], top_k=100, before=df.index[-60])
+        result['win_probability'], result['matches'][0]
+    """
+
+    def __init__(self, price_dirs: Sequence, horizon: int = DEFAULT_HORIZON):
+        """
+        Args:
+            price_dirs: 가격 CSV 폴더 리스트 (시장별)
+            horizon: 이후 수익률 계산 기간 (일)
+        """
+        self.price_dirs = [Path(p) for p in price_dirs]
+        self.horizon = horizon
+        self.tickers: List[str] = []
+        self.closes = np.empty((0, 0))
+        self.dates = np.empty((0, 0), dtype=np.int64)
+        self.lengths = np.empty(0, dtype=np.int64)
+        self._windows: Dict[int, _WindowIndex] = {}
+        self.loaded = False
+
+    def load(self) -> "PatternSearchEngine":
+        """가격 저장소 적재 (변경된 CSV만 다시 읽음)"""
+        series: Dict[str, Dict] = {}
+        for price_dir in self.price_dirs:
+            if price_dir.is_dir():
+                series.update(_load_market(price_dir))
+
+        self.tickers = list(series)
+        self.lengths = np.array([len(series[t]['close']) for t in self.tickers], dtype=np.int64)
+        width = int(self.lengths.max()) if len(self.lengths) else 0
+        self.closes = np.full((len(self.tickers), width), np.nan)
+        self.dates = np.zeros((len(self.tickers), width), dtype=np.int64)
+        for k, t in enumerate(self.tickers):
+            self.closes[k, :self.lengths[k]] = series[t]['close']
+            self.dates[k, :self.lengths[k]] = series[t]['dates']
+
+        self._windows = {}
+        self.loaded = True
+        print(f"📚 [PatternDB] {len(self.tickers):,}종목 / {int(self.lengths.sum()):,}봉 적재")
+        return self
+
+    def _index(self, m: int) -> _WindowIndex:
+        if m not in self._windows:
+            self._windows[m] = _WindowIndex(self.closes, self.lengths, m)
+        return self._windows[m]
+
+    def correlations(self, query: np.ndarray) -> np.ndarray:
+        """
+        질의 패턴과 전 종목 전 구간의 Pearson 상관계수
+
+        Returns:
+            np.ndarray: (종목 수, 구간 수) - 유효하지 않은 구간은 -inf
+        """
+        if not self.loaded:
+            self.load()
+        q = np.asarray(query, dtype=np.float64)
+        m = len(q)
+        index = self._index(m)
+        if index.n_windows == 0 or not len(self.tickers):
+            return np.full((len(self.tickers), 0), -np.inf)
+
+        q_std = q.std()
+        if q_std <= MIN_STD * abs(q.mean()):
+            return np.full((len(self.tickers), index.n_windows), -np.inf)
+        qz = (q - q.mean()) / q_std
+
+        # Σ qz[j]·x[i+j] = (x ⊛ reverse(qz))[i+m-1]
+        q_spec = np.fft.rfft(qz[::-1], index.n_fft)
+        dot = np.fft.irfft(index.spectrum * q_spec, index.n_fft, axis=1)[:, m - 1:m - 1 + index.n_windows]
+        corr = dot / (m * index.std)
+        return np.where(index.valid, np.clip(corr, -1.0, 1.0), -np.inf)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 100,
+        horizon: Optional[int] = None,
+        before=None,
+        exclude_tickers: Sequence[str] = (),
+        min_similarity: float = -1.0,
+    ) -> Dict:
+        """
+        유사 패턴 상위 k개 + 이후 수익률 통계
+
+        Args:
+            query: 질의 종가 배열 (길이 = 창 길이)
+            top_k: 반환할 사례 수 (같은 종목의 인접 구간은 1개로 취급)
+            horizon: 이후 수익률 기간 (None이면 엔진 기본값)
+            before: 이 날짜 이전에 이후 수익률 기간까지 끝난 사례만 사용 (질의 구간과 겹침/미래 정보 방지)
+            exclude_tickers: 제외할 종목
+            min_similarity: 최소 상관계수
+
+        Returns:
+            Dict: matches(ticker/start/end/similarity/forward_return), similarity(평균 %),
+                  win_probability(%), expected_return(%)
+        """
+        horizon = self.horizon if horizon is None else horizon
+        corr = self.correlations(query)
+        m = len(query)
+        n_windows = corr.shape[1]
+
+        # 이후 수익률 (구간 끝 종가 → horizon일 뒤 종가)
+        starts = np.arange(n_windows)
+        end = starts + m - 1
+        fwd_idx = end + horizon
+        in_range = fwd_idx[None, :] < self.lengths[:, None]
+        safe = np.minimum(fwd_idx, self.closes.shape[1] - 1)
+        fwd = np.where(in_range, self.closes[:, safe] / self.closes[:, np.minimum(end, self.closes.shape[1] - 1)] - 1, np.nan)
+
+        mask = in_range & (corr >= min_similarity)
+        if before is not None:
+            cutoff = np.datetime64(pd.Timestamp(before).date(), 'D').astype(np.int64)
+            mask &= self.dates[:, safe] < cutoff
+        for t in exclude_tickers:
+            if t in self.tickers:
+                mask[self.tickers.index(t)] = False
+        score = np.where(mask, corr, -np.inf)
+
+        matches = self._top_matches(score, top_k, zone=max(1, m // 2))
+        results = []
+        for k, i in matches:
+            results.append({
+                'ticker': self.tickers[k],
+                'start': str(np.datetime64(int(self.dates[k, i]), 'D')),
+                'end': str(np.datetime64(int(self.dates[k, i + m - 1]), 'D')),
+                'similarity': float(score[k, i]),
+                'forward_return': float(fwd[k, i]),
+            })
+
+        if not results:
+            return {'matches': [], 'similarity': 0.0, 'win_probability': 50.0, 'expected_return': 0.0}
+        rets = np.array([r['forward_return'] for r in results])
+        return {
+            'matches': results,
+            'similarity': float(np.mean([r['similarity'] for r in results]) * 100),
+            'win_probability': float((rets > 0).mean() * 100),
+            'expected_return': float(rets.mean() * 100),
+        }
+
+    @staticmethod
+    def _top_matches(score: np.ndarray, top_k: int, zone: int) -> List[tuple]:
+        """
+        상관계수 상위 구간 선택 (같은 종목에서 zone 이내 구간은 중복으로 보고 제외)
+        - 후보를 넉넉히 뽑아 내림차순으로 탐욕 선택, 부족하면 후보 수를 늘려 재시도
+        """
+        flat = score.ravel()
+        finite = int(np.isfinite(flat).sum())
+        if finite == 0 or top_k <= 0:
+            return []
+        n_windows = score.shape[1]
+        pool = min(finite, top_k * 2 * zone + top_k)
+        while True:
+            cand = np.argpartition(-flat, pool - 1)[:pool]
+            cand = cand[np.argsort(-flat[cand], kind='stable')]
+            chosen: List[tuple] = []
+            taken: Dict[int, List[int]] = {}
+            for c in cand:
+                if not np.isfinite(flat[c]):
+                    break
+                k, i = divmod(int(c), n_windows)
+                if any(abs(i - j) < zone for j in taken.get(k, ())):
+                    continue
+                taken.setdefault(k, []).append(i)
+                chosen.append((k, i))
+                if len(chosen) == top_k:
+                    return chosen
+            if pool >= finite:
+                return chosen
+            pool = min(finite, pool * 4)
+
+
+_engines: Dict[tuple, PatternSearchEngine] = {}
+
+
+def get_engine(price_dirs: Sequence) -> PatternSearchEngine:
+    """가격 폴더 조합별 공유 엔진 (최초 호출 시 1회 적재)"""
+    key = tuple(str(Path(p).resolve()) for p in price_dirs)
+    if key not in _engines:
+        _engines[key] = PatternSearchEngine(price_dirs).load()
+    return _engines[key]
@@ -27,6 +27,10 @@ from typing import Dict, List, Optional
 # 프로젝트 루트 경로
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.intelligence_cache import IntelligenceCache
+from core.keyword_matcher import KeywordMatcher
+from core.lazy_import import LazyImport
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 선택적 임포트
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -41,15 +45,9 @@ except ImportError:
     from bs4 import BeautifulSoup
     HAS_BS4 = True
 
-try:
-    import google.generativeai as genai
-    HAS_GEMINI = True
-except ImportError:
-    HAS_GEMINI = False
-    print("⚠️ [Warning] Google Generative AI not found. Installing...")
-    os.system("pip install google-generativeai --quiet")
-    import google.generativeai as genai
-    HAS_GEMINI = True
+# Gemini SDK는 API 키가 설정된 딥리서치 에이전트 생성 시점에 임포트
+genai = LazyImport("google.generativeai",
+                   warning="Google Generative AI not found (pip install google-generativeai). Deep research disabled.")
 
 
 # ==========================================
@@ -59,17 +57,33 @@ except ImportError:
 class DARTAnalyzer:
     """전자공시 분석 에이전트"""
     
+    # 긍정 키워드
+    POSITIVE_KEYWORDS = [
+        "증자", "배당", "실적개선", "흑자전환", "수주", "계약체결",
+        "신제품", "특허", "인증", "수출", "투자유치"
+    ]
+    
+    # 부정 키워드
+    NEGATIVE_KEYWORDS = [
+        "감자", "적자", "횡령", "배임", "소송", "과징금",
+        "영업정지", "파산", "회생", "구조조정", "감사의견"
+    ]
+    
+    # 사전 컴파일 (클래스 로드 시 1회)
+    MATCHER = KeywordMatcher({"positive": POSITIVE_KEYWORDS, "negative": NEGATIVE_KEYWORDS})
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("DART_API_KEY", "YOUR_DART_API_KEY")
         self.base_url = "https://opendart.fss.or.kr/api"
     
-    async def get_recent_disclosures(self, corp_code: str, days: int = 7) -> List[Dict]:
+    async def get_recent_disclosures(self, corp_code: str, days: int = 7, raise_errors: bool = False) -> List[Dict]:
         """
         최근 공시 조회
         
         Args:
             corp_code: 기업 고유번호
             days: 조회 기간 (일)
+            raise_errors: True면 API 오류 시 빈 리스트 대신 예외 (캐시 저장 방지)
         
         Returns:
             List[Dict]: 공시 리스트
@@ -92,11 +106,15 @@ class DARTAnalyzer:
             
             if data.get("status") == "000":
                 return data.get("list", [])
+            elif data.get("status") == "013":
+                return []  # 조회된 공시 없음
             else:
-                return []
+                raise RuntimeError(f"{data.get('status')} {data.get('message', 'Unknown')}")
         
         except Exception as e:
             print(f"❌ DART API 오류: {e}")
+            if raise_errors:
+                raise
             return []
     
     def analyze_disclosure_sentiment(self, disclosures: List[Dict]) -> float:
@@ -112,32 +130,9 @@ class DARTAnalyzer:
         if not disclosures:
             return 0.0
         
-        # 긍정 키워드
-        positive_keywords = [
-            "증자", "배당", "실적개선", "흑자전환", "수주", "계약체결",
-            "신제품", "특허", "인증", "수출", "투자유치"
-        ]
-        
-        # 부정 키워드
-        negative_keywords = [
-            "감자", "적자", "횡령", "배임", "소송", "과징금",
-            "영업정지", "파산", "회생", "구조조정", "감사의견"
-        ]
-        
-        score = 0
-        
-        for disclosure in disclosures:
-            title = disclosure.get("report_nm", "")
-            
-            # 긍정 키워드 체크
-            for keyword in positive_keywords:
-                if keyword in title:
-                    score += 1
-            
-            # 부정 키워드 체크
-            for keyword in negative_keywords:
-                if keyword in title:
-                    score -= 1
+        # 공시 제목 전체를 1회 스캔 → 문서별 (긍정, 부정) 키워드 수
+        hits = self.MATCHER.count(d.get("report_nm", "") for d in disclosures)
+        score = int(hits[:, 0].sum() - hits[:, 1].sum())
         
         # 정규화 (-1 ~ 1)
         max_score = len(disclosures) * 2
@@ -153,18 +148,33 @@ class DARTAnalyzer:
 class NewsAnalyzer:
     """뉴스 분석 에이전트"""
     
+    # 긍정 키워드
+    POSITIVE_KEYWORDS = [
+        "상승", "급등", "호재", "성장", "실적개선", "흑자",
+        "신고가", "돌파", "강세", "매수", "투자", "확대"
+    ]
+    
+    # 부정 키워드
+    NEGATIVE_KEYWORDS = [
+        "하락", "급락", "악재", "감소", "적자", "부진",
+        "신저가", "약세", "매도", "축소", "위험", "우려"
+    ]
+    
+    MATCHER = KeywordMatcher({"positive": POSITIVE_KEYWORDS, "negative": NEGATIVE_KEYWORDS})
+    
     def __init__(self):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
     
-    async def get_naver_news(self, keyword: str, count: int = 10) -> List[Dict]:
+    async def get_naver_news(self, keyword: str, count: int = 10, raise_errors: bool = False) -> List[Dict]:
         """
         네이버 뉴스 검색
         
         Args:
             keyword: 검색 키워드 (종목명)
             count: 뉴스 개수
+            raise_errors: True면 요청/파싱 오류 시 빈 리스트 대신 예외 (캐시 저장 방지)
         
         Returns:
             List[Dict]: 뉴스 리스트
@@ -179,6 +189,7 @@ class NewsAnalyzer:
         
         try:
             response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response.raise_for_status()
             soup = BeautifulSoup(response.text, "html.parser")
             
             news_list = []
@@ -199,6 +210,8 @@ class NewsAnalyzer:
         
         except Exception as e:
             print(f"❌ 뉴스 크롤링 오류: {e}")
+            if raise_errors:
+                raise
             return []
     
     def analyze_news_sentiment(self, news_list: List[Dict]) -> float:
@@ -214,32 +227,10 @@ class NewsAnalyzer:
         if not news_list:
             return 0.0
         
-        # 긍정 키워드
-        positive_keywords = [
-            "상승", "급등", "호재", "성장", "실적개선", "흑자",
-            "신고가", "돌파", "강세", "매수", "투자", "확대"
-        ]
-        
-        # 부정 키워드
-        negative_keywords = [
-            "하락", "급락", "악재", "감소", "적자", "부진",
-            "신저가", "약세", "매도", "축소", "위험", "우려"
-        ]
-        
-        score = 0
-        
-        for news in news_list:
-            text = news.get("title", "") + " " + news.get("description", "")
-            
-            # 긍정 키워드 체크
-            for keyword in positive_keywords:
-                if keyword in text:
-                    score += 1
-            
-            # 부정 키워드 체크
-            for keyword in negative_keywords:
-                if keyword in text:
-                    score -= 1
+        hits = self.MATCHER.count(
+            news.get("title", "") + " " + news.get("description", "") for news in news_list
+        )
+        score = int(hits[:, 0].sum() - hits[:, 1].sum())
         
         # 정규화 (-1 ~ 1)
         max_score = len(news_list) * 2
@@ -345,7 +336,7 @@ class DeepResearchAgent:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY", "YOUR_GEMINI_API_KEY")
         
-        if HAS_GEMINI and self.api_key != "YOUR_GEMINI_API_KEY":
+        if self.api_key != "YOUR_GEMINI_API_KEY" and genai.available:
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel('gemini-pro')
         else:
@@ -357,7 +348,8 @@ class DeepResearchAgent:
         disclosures: List[Dict],
         news: List[Dict],
         reports: List[Dict],
-        technical_signal: str
+        technical_signal: str,
+        raise_errors: bool = False
     ) -> Dict:
         """
         종합 분석
@@ -368,6 +360,7 @@ class DeepResearchAgent:
             news: 뉴스 리스트
             reports: 리포트 리스트
             technical_signal: 기술적 신호 (BUY/SELL/HOLD)
+            raise_errors: True면 API/파싱 오류 시 대체 응답 대신 예외 (캐시 저장 방지)
         
         Returns:
             Dict: 분석 결과
@@ -384,11 +377,13 @@ class DeepResearchAgent:
         
         try:
             response = self.model.generate_content(prompt)
-            result = self._parse_response(response.text)
+            result = self._parse_response(response.text, raise_errors)
             return result
         
         except Exception as e:
             print(f"❌ Gemini API 오류: {e}")
+            if raise_errors:
+                raise
             return {
                 "recommendation": technical_signal,
                 "confidence": 0.5,
@@ -467,7 +462,7 @@ class DeepResearchAgent:
         
         return "\n".join(lines)
     
-    def _parse_response(self, response_text: str) -> Dict:
+    def _parse_response(self, response_text: str, raise_errors: bool = False) -> Dict:
         """응답 파싱"""
         try:
             # JSON 추출 시도
@@ -487,6 +482,8 @@ class DeepResearchAgent:
                 }
         
         except Exception as e:
+            if raise_errors:
+                raise
             return {
                 "recommendation": "HOLD",
                 "confidence": 0.5,
@@ -504,17 +501,31 @@ class QualitativeIntelligenceTeam:
     def __init__(
         self,
         dart_api_key: Optional[str] = None,
-        gemini_api_key: Optional[str] = None
+        gemini_api_key: Optional[str] = None,
+        cache: Optional[IntelligenceCache] = None
     ):
+        """
+        Args:
+            cache: 소스별 결과 캐시 (None이면 기본 디스크 캐시 생성, Redis 연결 시 cache.redis 대입)
+        """
         self.dart_analyzer = DARTAnalyzer(dart_api_key)
         self.news_analyzer = NewsAnalyzer()
         self.report_analyzer = BrokerageReportAnalyzer()
         self.deep_research = DeepResearchAgent(gemini_api_key)
+        self.cache = cache if cache is not None else IntelligenceCache()
+    
+    async def _cached(self, key: str, source: str, fetch, default):
+        """캐시 경유 수집 (상류 실패 시 이전 값, 없으면 default - 실패 결과는 저장하지 않음)"""
+        try:
+            return await self.cache.get_or_fetch(key, source, fetch)
+        except Exception as e:
+            print(f"   ⚠️ {source} 수집 실패 (캐시 제외): {e}")
+            return default
     
     async def analyze(
         self,
         ticker: str,
-        corp_code: str,
+        corp_code: Optional[str],
         current_price: float,
         technical_signal: str
     ) -> Dict:
@@ -523,7 +534,7 @@ class QualitativeIntelligenceTeam:
         
         Args:
             ticker: 종목 코드
-            corp_code: 기업 고유번호 (DART)
+            corp_code: 기업 고유번호 (DART, 모르면 None → 공시 분석 생략)
             current_price: 현재가
             technical_signal: 기술적 신호 (BUY/SELL/HOLD)
         
@@ -539,7 +550,13 @@ class QualitativeIntelligenceTeam:
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         print("📋 [1/4] 공시 분석 중...")
-        disclosures = await self.dart_analyzer.get_recent_disclosures(corp_code)
+        if corp_code and corp_code.strip("0"):
+            disclosures = await self._cached(
+                ticker, "disclosures",
+                lambda: self.dart_analyzer.get_recent_disclosures(corp_code, raise_errors=True), []
+            )
+        else:
+            disclosures = []  # 고유번호 미상 (더미 "00000000" 포함) → 다른 종목 공시와 섞이지 않도록 조회 생략
         disclosure_sentiment = self.dart_analyzer.analyze_disclosure_sentiment(disclosures)
         print(f"   ✅ 공시 {len(disclosures)}건 분석 완료 (감성: {disclosure_sentiment:.2f})")
         
@@ -548,7 +565,9 @@ class QualitativeIntelligenceTeam:
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         print("📰 [2/4] 뉴스 분석 중...")
-        news = await self.news_analyzer.get_naver_news(ticker)
+        news = await self._cached(
+            ticker, "news", lambda: self.news_analyzer.get_naver_news(ticker, raise_errors=True), []
+        )
         news_sentiment = self.news_analyzer.analyze_news_sentiment(news)
         print(f"   ✅ 뉴스 {len(news)}건 분석 완료 (감성: {news_sentiment:.2f})")
         
@@ -557,7 +576,9 @@ class QualitativeIntelligenceTeam:
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         print("📊 [3/4] 증권사 리포트 분석 중...")
-        reports = await self.report_analyzer.get_reports(ticker)
+        reports = await self.cache.get_or_fetch(
+            ticker, "reports", lambda: self.report_analyzer.get_reports(ticker)
+        )
         report_score = self.report_analyzer.analyze_reports(reports, current_price)
         print(f"   ✅ 리포트 {len(reports)}건 분석 완료 (점수: {report_score:.2f})")
         
@@ -566,9 +587,20 @@ class QualitativeIntelligenceTeam:
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         print("🧠 [4/4] 구글 딥리서치 중...")
-        deep_analysis = await self.deep_research.analyze_comprehensive(
-            ticker, disclosures, news, reports, technical_signal
-        )
+        # 같은 종목/신호에 대한 Gemini 재질의 방지 (입력 소스가 캐시 주기로 갱신되므로 TTL 내 결과 재사용)
+        # API 미설정 응답은 캐시하지 않음 (키 설정 후 바로 반영)
+        fallback = {"recommendation": technical_signal, "confidence": 0.5, "reason": "딥리서치 실패"}
+        if self.deep_research.model is None:
+            deep_analysis = await self.deep_research.analyze_comprehensive(
+                ticker, disclosures, news, reports, technical_signal
+            )
+        else:
+            deep_analysis = await self._cached(
+                f"{ticker}|{technical_signal}", "deep_research",
+                lambda: self.deep_research.analyze_comprehensive(
+                    ticker, disclosures, news, reports, technical_signal, raise_errors=True
+                ), fallback
+            )
         print(f"   ✅ 딥리서치 완료 (신뢰도: {deep_analysis.get('confidence', 0):.2f})")
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
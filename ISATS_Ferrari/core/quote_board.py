@@ -0,0 +1,477 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# ==========================================
+# Quote Board
+# 역할: 시세 공급 프로세스 1개가 공유 메모리 구조화 배열에 최신 시세를 기록하고,
+#       런처 / 대시보드 / 감시자 프로세스는 API 호출 없이 잠금 없이 읽음
+# - 레이아웃: [헤더][슬롯 디렉토리 (종목 키 × capacity)][seq u8 × capacity][시세 레코드 × capacity]
+# - 슬롯 디렉토리: 추가만 (키 기록 → count 증가), 읽는 쪽은 count가 늘었을 때만 디렉토리 재조회
+# - seqlock: 기록 전후로 seq 증가 (홀수 = 기록 중) → 읽는 쪽은 seq가 짝수이고 전후 동일할 때만 채택
+# - 단일 기록자 전제 (QuoteFeed), 종목 키는 '.KS' / '.KQ' 접미사 제거 후 대문자
+# ==========================================
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from core.target_universe import KR_DEFAULT_TARGETS, US_TARGETS, us_exchanges
+
+DEFAULT_NAME = "isats_quote_board"
+DEFAULT_CAPACITY = 4096
+FRESH_SECONDS = 3.0   # 읽는 쪽 기본 허용 시세 나이 (초과 시 API 조회로 대체)
+MAGIC = 0x49534154_51554F54   # "ISATQUOT"
+KEY_SIZE = 32
+US_EXCHANGES = ("NAS", "NYS", "AMS")   # KIS 해외 시세 거래소 코드 (나스닥 / 뉴욕 / 아멕스)
+
+HEADER_DTYPE = np.dtype([
+    ('magic', '<u8'),
+    ('capacity', '<u8'),
+    ('count', '<u8'),        # 할당된 슬롯 수
+    ('writer_pid', '<i8'),
+    ('heartbeat', '<i8'),    # 마지막 기록 시각 (epoch ns)
+    ('_pad', '<u8', 3),
+])
+QUOTE_DTYPE = np.dtype([
+    ('price', '<f8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('volume', '<f8'),
+    ('change_pct', '<f8'),
+    ('ts', '<i8'),           # 시세 기록 시각 (epoch ns)
+])
+
+
+def normalize_ticker(ticker: str) -> str:
+    """프로세스 간 공통 키 (005930.KS / 005930 → 005930)"""
+    ticker = ticker.strip().upper()
+    if ticker.endswith(('.KS', '.KQ')):
+        ticker = ticker[:-3]
+    return ticker
+
+
+_OWNED = set()   # 이 프로세스가 기록자로 연 블록 이름
+
+
+def _track(shm: shared_memory.SharedMemory, owned: bool):
+    """
+    resource_tracker 등록 정리 (POSIX Python < 3.13은 attach만 해도 등록되어 프로세스 종료 시 unlink됨)
+    - 읽기 연결: 등록 해제 → 읽는 프로세스가 종료되어도 블록 유지
+    - 기록자가 기존 블록을 이어받은 경우: 등록 → close() 시 unlink와 짝을 맞춤
+    """
+    if os.name != 'posix' or shm.name in _OWNED:
+        return
+    try:
+        from multiprocessing import resource_tracker
+        if owned:
+            resource_tracker.register(shm._name, "shared_memory")
+        else:
+            resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+class QuoteBoard:
+    """
+    공유 메모리 시세판
+
+    사용 예:
+        board = QuoteBoard.create()                       # 시세 공급 프로세스 (기록자)
+        board.publish("005930", 71500, volume=1.2e7, change_pct=1.2)
+
+        board = QuoteBoard.attach()                       # 다른 프로세스 (읽기)
+        quote = board.get("005930.KS", max_age=3.0)       # {'price', 'bid', 'ask', 'volume', 'change_pct', 'ts', 'seq'}
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        self.shm = shm
+        self.owner = owner
+        header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)
+        if header['magic'][0] != MAGIC:
+            raise ValueError(f"시세판 형식이 아닙니다: {shm.name}")
+        capacity = int(header['capacity'][0])
+        offset = HEADER_DTYPE.itemsize
+        self.header = header
+        self.capacity = capacity
+        self.keys = np.ndarray((capacity,), dtype=f'S{KEY_SIZE}', buffer=shm.buf, offset=offset)
+        offset += capacity * KEY_SIZE
+        self.seqs = np.ndarray((capacity,), dtype='<u8', buffer=shm.buf, offset=offset)
+        offset += capacity * 8
+        self.quotes = np.ndarray((capacity,), dtype=QUOTE_DTYPE, buffer=shm.buf, offset=offset)
+        self.slots: Dict[str, int] = {}
+        self._known = 0
+        self._refresh()
+
+    @staticmethod
+    def _size(capacity: int) -> int:
+        return HEADER_DTYPE.itemsize + capacity * (KEY_SIZE + 8 + QUOTE_DTYPE.itemsize)
+
+    @classmethod
+    def create(cls, name: str = DEFAULT_NAME, capacity: int = DEFAULT_CAPACITY) -> "QuoteBoard":
+        """
+        기록자용 블록 생성
+        - 같은 이름의 블록이 남아 있으면(공급 프로세스 재시작) 슬롯을 유지한 채 이어서 기록
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=cls._size(capacity))
+            header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)
+            header[0] = np.zeros((), dtype=HEADER_DTYPE)
+            header['capacity'] = capacity
+            header['magic'] = MAGIC
+            del header
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(name=name)
+            _track(shm, owned=True)
+        _OWNED.add(shm.name)
+        board = cls(shm, owner=True)
+        board.header['writer_pid'] = os.getpid()
+        return board
+
+    @classmethod
+    def attach(cls, name: str = DEFAULT_NAME) -> "QuoteBoard":
+        """읽기용 연결 (블록이 없으면 FileNotFoundError)"""
+        shm = shared_memory.SharedMemory(name=name)
+        _track(shm, owned=False)
+        return cls(shm)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 슬롯 디렉토리
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _refresh(self):
+        """새로 할당된 슬롯만 디렉토리에 반영"""
+        count = int(self.header['count'][0])
+        for slot in range(self._known, count):
+            self.slots[self.keys[slot].decode()] = slot
+        self._known = count
+
+    def slot(self, ticker: str) -> Optional[int]:
+        """종목 슬롯 번호 (없으면 None)"""
+        key = normalize_ticker(ticker)
+        slot = self.slots.get(key)
+        if slot is None and self.header['count'][0] != self._known:
+            self._refresh()
+            slot = self.slots.get(key)
+        return slot
+
+    def _allocate(self, key: str) -> int:
+        slot = self.slots.get(key)
+        if slot is not None:
+            return slot
+        count = int(self.header['count'][0])
+        if count >= self.capacity:
+            raise ValueError(f"시세판 용량 초과 ({self.capacity}종목)")
+        encoded = key.encode()
+        if len(encoded) > KEY_SIZE:
+            raise ValueError(f"종목 키가 너무 깁니다: {key}")
+        self.keys[count] = encoded
+        self.header['count'] = count + 1   # 키 기록 후 공개
+        self.slots[key] = count
+        self._known = count + 1
+        return count
+
+    @property
+    def tickers(self) -> List[str]:
+        self._refresh()
+        return list(self.slots)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 기록 (단일 기록자)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def publish(self, ticker: str, price: float, bid: float = np.nan, ask: float = np.nan,
+                volume: float = np.nan, change_pct: float = np.nan, ts: Optional[int] = None):
+        """종목 최신 시세 기록"""
+        slot = self._allocate(normalize_ticker(ticker))
+        now = time.time_ns()
+        seq = self.seqs[slot]
+        self.seqs[slot] = seq + 1                 # 홀수: 기록 중
+        self.quotes[slot] = (price, bid, ask, volume, change_pct, ts or now)
+        self.seqs[slot] = seq + 2
+        self.header['heartbeat'] = now
+
+    def heartbeat(self):
+        """시세 변화가 없어도 공급 프로세스 생존 표시"""
+        self.header['heartbeat'] = time.time_ns()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 읽기 (잠금 없음)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _read(self, slot: int, retries: int = 100) -> Optional[Tuple]:
+        seqs, quotes = self.seqs, self.quotes
+        for _ in range(retries):
+            before = int(seqs[slot])
+            if before & 1:
+                continue
+            record = quotes[slot].item()
+            if int(seqs[slot]) == before:
+                return (before >> 1,) + record if before else None
+        return None
+
+    def get(self, ticker: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        최신 시세
+
+        Args:
+            ticker: 종목 (접미사 유무 무관)
+            max_age: 허용 시세 나이(초) - 초과하면 None (호출 측이 API로 대체)
+
+        Returns:
+            {'price', 'bid', 'ask', 'volume', 'change_pct', 'ts'(epoch ns), 'seq'(갱신 횟수)} 또는 None
+        """
+        slot = self.slot(ticker)
+        if slot is None:
+            return None
+        record = self._read(slot)
+        if record is None:
+            return None
+        seq, price, bid, ask, volume, change_pct, ts = record
+        if max_age is not None and time.time_ns() - ts > max_age * 1e9:
+            return None
+        return {'price': price, 'bid': bid, 'ask': ask, 'volume': volume,
+                'change_pct': change_pct, 'ts': ts, 'seq': seq}
+
+    def get_price(self, ticker: str, max_age: Optional[float] = None) -> Optional[float]:
+        quote = self.get(ticker, max_age)
+        return quote['price'] if quote else None
+
+    def snapshot(self, tickers: Optional[Iterable[str]] = None, max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """여러 종목 시세 (None이면 전체)"""
+        tickers = self.tickers if tickers is None else tickers
+        out = {}
+        for ticker in tickers:
+            quote = self.get(ticker, max_age)
+            if quote is not None:
+                out[ticker] = quote
+        return out
+
+    def writer_alive(self, max_age: float = 10.0) -> bool:
+        return time.time_ns() - int(self.header['heartbeat'][0]) < max_age * 1e9
+
+    def close(self):
+        # numpy 뷰를 먼저 해제해야 버퍼를 닫을 수 있음
+        self.header = self.keys = self.seqs = self.quotes = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+        if self.owner:
+            _OWNED.discard(self.shm.name)
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def kis_price_output(quote: Dict, market: str = "KR") -> Dict:
+    """시세판 시세 → KIS 현재가 응답 형식 (기존 get_price 파싱 코드를 그대로 사용, 값 없는 필드는 생략)"""
+    fields = (("stck_prpr", "prdy_ctrt", "acml_vol") if market == "KR" else ("last", "rate", "tvol"))
+    values = (quote['price'], quote['change_pct'], quote['volume'])
+    return {k: v for k, v in zip(fields, values) if v == v}
+
+
+class QuoteReader:
+    """
+    읽는 프로세스용 래퍼 (예외 없음)
+    - 공급 프로세스가 아직 없으면 retry_interval마다 연결 재시도, 그 사이에는 None 반환
+    - 기록이 stale_after초 이상 멈추면 재연결 (공급 프로세스 재시작 시 새 블록으로 전환)
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, retry_interval: float = 5.0, stale_after: float = 30.0):
+        self.name = name
+        self.retry_interval = retry_interval
+        self.stale_after = stale_after
+        self.board: Optional[QuoteBoard] = None
+        self._next_attach = 0.0
+
+    def _board(self) -> Optional[QuoteBoard]:
+        if (self.board is not None and time.monotonic() >= self._next_attach
+                and not self.board.writer_alive(self.stale_after)):
+            self.close()
+        if self.board is None and time.monotonic() >= self._next_attach:
+            self._next_attach = time.monotonic() + self.retry_interval
+            try:
+                self.board = QuoteBoard.attach(self.name)
+            except (FileNotFoundError, ValueError):
+                self.board = None
+        return self.board
+
+    def get(self, ticker: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        board = self._board()
+        return board.get(ticker, max_age) if board else None
+
+    def get_price(self, ticker: str, max_age: Optional[float] = None) -> Optional[float]:
+        board = self._board()
+        return board.get_price(ticker, max_age) if board else None
+
+    def close(self):
+        if self.board is not None:
+            self.board.close()
+            self.board = None
+
+
+# ==========================================
+# 시세 공급 프로세스 (KIS 현재가 → 시세판)
+# ==========================================
+
+def _to_float(value, default=np.nan) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class QuoteFeed:
+    """
+    런처 감시 종목 + 보유 종목 현재가를 주기적으로 조회해 시세판에 기록 (유일한 기록자)
+    - 미국 종목은 종목별 거래소 코드로 조회 (모르면 NAS → NYS → AMS 순으로 찾아 기억)
+    """
+
+    def __init__(self, client, board: QuoteBoard, min_interval: float = 0.05, with_orderbook: bool = False):
+        """
+        Args:
+            client: KISUnifiedClient (initialize 완료)
+            board: QuoteBoard.create()로 만든 기록자 블록
+            min_interval: 요청 간 최소 간격(초) - API 초당 제한 방지
+            with_orderbook: 국내 종목 호가(매수/매도 1호가)도 조회 (요청 2배)
+        """
+        self.client = client
+        self.board = board
+        self.min_interval = min_interval
+        self.with_orderbook = with_orderbook
+        self.exchanges: Dict[str, str] = {}   # 종목 → 시세가 확인된 미국 거래소 코드
+
+    def _overseas_price(self, code: str, exchange: Optional[str]) -> Dict:
+        """미국 종목 현재가 (지정/기억된 거래소 우선, 시세가 없으면 나머지 거래소 순회)"""
+        first = exchange or self.exchanges.get(code) or US_EXCHANGES[0]
+        for k, excd in enumerate([first] + [e for e in US_EXCHANGES if e != first]):
+            if k:
+                time.sleep(self.min_interval)
+            data = self.client.overseas_stock.get_price(code, excd)
+            if data and _to_float(data.get("last")) > 0:
+                self.exchanges[code] = excd
+                return data
+        return {}
+
+    def poll(self, ticker: str, market: str = "KR", exchange: Optional[str] = None) -> bool:
+        code = normalize_ticker(ticker)
+        if market == "US":
+            data = self._overseas_price(code, exchange)
+        else:
+            data = self.client.get_price(code, market=market)
+        if not data:
+            return False
+        if market == "KR":
+            price = _to_float(data.get("stck_prpr"))
+            volume = _to_float(data.get("acml_vol"))
+            change_pct = _to_float(data.get("prdy_ctrt"))
+        else:
+            price = _to_float(data.get("last"))
+            volume = _to_float(data.get("tvol"))
+            change_pct = _to_float(data.get("rate"))
+        if not price > 0:
+            return False
+
+        bid = ask = np.nan
+        if self.with_orderbook and market == "KR":
+            book = self.client.domestic_stock.get_orderbook(code)
+            bid, ask = _to_float(book.get("bidp1")), _to_float(book.get("askp1"))
+        self.board.publish(code, price, bid=bid, ask=ask, volume=volume, change_pct=change_pct)
+        return True
+
+    def run(self, universe, interval: float = 1.0):
+        """
+        Args:
+            universe: [(종목, 시장, 거래소)] 또는 호출할 때마다 목록을 돌려주는 함수 (타겟 파일 갱신 반영)
+            interval: 전체 1회 순회 최소 주기(초)
+        """
+        while True:
+            start = time.monotonic()
+            for ticker, market, exchange in (universe() if callable(universe) else universe):
+                try:
+                    self.poll(ticker, market, exchange)
+                except Exception as e:
+                    logging.warning(f"[QuoteFeed] {ticker} 시세 조회 실패: {e}")
+                time.sleep(self.min_interval)
+            self.board.heartbeat()
+            time.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+
+def load_universe(target_file: str = os.path.join(ROOT_DIR, "daily_target_list.csv"),
+                  wallet_file: str = os.path.join(ROOT_DIR, "config", "virtual_wallet.json")) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    런처 감시 종목 + 가상 지갑 보유 종목 [(종목, 시장, 거래소)]
+    - 국내: 타겟 파일 (없으면 auto_trading_launcher 기본 목록)
+    - 미국: us_trading_launcher 고정 목록 (거래소 코드 포함)
+    - 거래소는 미국 종목만 (모르면 None → QuoteFeed가 조회하며 확인)
+    """
+    universe: Dict[str, Tuple[str, Optional[str]]] = {}
+    if os.path.exists(target_file):
+        try:
+            import pandas as pd
+            df = pd.read_csv(target_file, encoding='utf-8-sig')
+            # 종목 컬럼은 런처와 같은 규칙 (Ticker / ticker / 첫 번째 컬럼)
+            column = next((c for c in ("Ticker", "ticker") if c in df.columns), df.columns[0])
+            markets = df['market'] if 'market' in df.columns else ['KR'] * len(df)
+            exchanges = df['exchange'] if 'exchange' in df.columns else [None] * len(df)
+            for ticker, market, exchange in zip(df[column], markets, exchanges):
+                universe[normalize_ticker(str(ticker))] = (market if isinstance(market, str) else 'KR',
+                                                           exchange if isinstance(exchange, str) else None)
+        except Exception:
+            pass
+    else:
+        for tickers in KR_DEFAULT_TARGETS.values():
+            for ticker in tickers:
+                universe.setdefault(ticker, ("KR", None))
+
+    for stocks in US_TARGETS.values():
+        for stock in stocks:
+            universe.setdefault(stock["ticker"], ("US", stock["exchange"]))
+
+    try:
+        with open(wallet_file, encoding='utf-8') as f:
+            for ticker, position in json.load(f).get('positions', {}).items():
+                universe.setdefault(normalize_ticker(ticker),
+                                    (position.get('market', 'KR'), position.get('exchange')))
+    except Exception:
+        pass
+
+    known = us_exchanges()
+    return [(ticker, market, exchange or (known.get(ticker) if market == "US" else None))
+            for ticker, (market, exchange) in universe.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ISATS 공유 메모리 시세 공급 프로세스")
+    parser.add_argument('--mode', default='virtual', choices=['virtual', 'real'])
+    parser.add_argument('--interval', type=float, default=1.0, help="전체 순회 주기(초)")
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument('--orderbook', action='store_true', help="국내 종목 1호가 포함")
+    args = parser.parse_args()
+
+    from core.kis_official_api import KISUnifiedClient
+    client = KISUnifiedClient(mode=args.mode)
+    if not client.initialize():
+        print("❌ KIS API 초기화 실패")
+        return
+
+    board = QuoteBoard.create(capacity=args.capacity)
+    print(f"📡 [QuoteFeed] 시세판 '{board.shm.name}' 기록 시작 (용량 {board.capacity}종목)")
+    try:
+        QuoteFeed(client, board, with_orderbook=args.orderbook).run(load_universe, args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        board.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,31 @@
 import redis.asyncio as redis
 import os
 
+from core.state_store import get_pool
+
 class RedisClient:
     """
     [ISATS Ferrari Nervous System] 고속 신경망 클라이언트
     - 역할: Redis와 데이터를 주고받아 대시보드와 엔진을 연결
+    - 같은 주소의 클라이언트는 프로세스 공유 커넥션 풀 사용 (core.state_store.get_pool)
     """
     def __init__(self, host='localhost', port=6379, db=0):
         self.host = host
         self.port = port
         self.db = db
+        self.url = f"redis://{host}:{port}/{db}"
         self.client = None
 
     async def connect(self):
         if not self.client:
-            self.client = redis.Redis(
-                host=self.host, 
-                port=self.port, 
-                db=self.db, 
-                decode_responses=True
-            )
+            self.client = redis.Redis(connection_pool=get_pool(self.url))
         return self.client
 
+    async def pipeline(self):
+        """여러 명령을 1회 왕복으로 묶는 파이프라인"""
+        client = await self.connect()
+        return client.pipeline(transaction=False)
+
     async def ping(self):
         client = await self.connect()
         return await client.ping()
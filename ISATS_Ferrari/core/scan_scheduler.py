@@ -0,0 +1,96 @@
+import json
+import time
+from typing import Dict, List
+
+# ==========================================
+# Scan Governor
+# 역할: 감시자 등급별 데드라인 준수 통계 집계 및 과부하 시 하위 등급 작업 차감(Shedding)
+# ==========================================
+
+RANK_PRIORITY = ['S', 'A', 'B']   # 앞쪽일수록 우선순위 높음
+REDIS_KEY = "telemetry:scan"      # Hash: rank -> 통계 JSON
+
+
+class ScanGovernor:
+    """
+    등급별 스캔 주기 통계
+    - 주기(interval)를 데드라인으로 보고 초과 시 miss 기록
+    - 상위 등급의 최근 miss 비율(EWMA)이 높으면 하위 등급부터 작업을 덜어냄
+      (B급: 사이클 전체 생략 → 그래도 부족하면 A급: 하위 절반 생략)
+    """
+
+    def __init__(self, alpha: float = 0.2, shed_b_at: float = 0.2, shed_a_at: float = 0.5):
+        self.alpha = alpha            # miss 비율 EWMA 계수
+        self.shed_b_at = shed_b_at    # B급 전체 생략 임계값
+        self.shed_a_at = shed_a_at    # A급 절반 생략 임계값
+        self.stats: Dict[str, Dict] = {}
+
+    def _rank_stats(self, rank: str) -> Dict:
+        return self.stats.setdefault(rank, {
+            "cycles": 0,
+            "deadline_misses": 0,
+            "shed_targets": 0,
+            "miss_rate": 0.0,
+            "last_cycle_ms": 0.0,
+            "max_cycle_ms": 0.0,
+            "interval_ms": 0.0,
+        })
+
+    def pressure(self, rank: str) -> float:
+        """자신보다 상위 등급들의 최근 miss 비율 최댓값"""
+        higher = RANK_PRIORITY[:RANK_PRIORITY.index(rank)] if rank in RANK_PRIORITY else []
+        return max((self.stats[r]["miss_rate"] for r in higher if r in self.stats), default=0.0)
+
+    def select_targets(self, rank: str, targets: List[Dict]) -> List[Dict]:
+        """과부하 수준에 따라 이번 사이클에 처리할 타겟 선별"""
+        p = self.pressure(rank)
+        if rank == 'B' and p > self.shed_b_at:
+            keep = []
+        elif rank == 'A' and p > self.shed_a_at:
+            ranked = sorted(targets, key=lambda t: t.get('score', 0), reverse=True)
+            keep = ranked[:(len(ranked) + 1) // 2]
+        else:
+            return targets
+        self._rank_stats(rank)["shed_targets"] += len(targets) - len(keep)
+        return keep
+
+    def record_cycle(self, rank: str, elapsed: float, interval: float, missed: bool):
+        """사이클 소요시간 및 데드라인 초과 여부 기록"""
+        st = self._rank_stats(rank)
+        st["cycles"] += 1
+        st["deadline_misses"] += int(missed)
+        st["miss_rate"] = round((1 - self.alpha) * st["miss_rate"] + self.alpha * int(missed), 4)
+        st["last_cycle_ms"] = round(elapsed * 1000, 2)
+        st["max_cycle_ms"] = round(max(st["max_cycle_ms"], elapsed * 1000), 2)
+        st["interval_ms"] = round(interval * 1000, 2)
+
+    async def publish(self, redis_client, rank: str, key: str = REDIS_KEY):
+        """등급별 통계를 Redis Hash에 저장 (대시보드 조회용)"""
+        if redis_client is None or rank not in self.stats:
+            return
+        try:
+            payload = dict(self.stats[rank], updated=time.time())
+            await redis_client.hset(key, rank, json.dumps(payload))
+        except Exception:
+            pass
+
+
+async def load_scan_stats(redis_client, key: str = REDIS_KEY) -> Dict:
+    """Redis에 게시된 등급별 스캔 통계 조회"""
+    if redis_client is None:
+        return {}
+    try:
+        raw = await redis_client.hgetall(key)
+    except Exception:
+        return {}
+    stats = {}
+    for rank, value in raw.items():
+        try:
+            stats[rank] = json.loads(value)
+        except (TypeError, ValueError):
+            continue
+    return stats
+
+
+# 프로세스 전역 조정기 (같은 프로세스의 S/A/B 감시자가 공유)
+governor = ScanGovernor()
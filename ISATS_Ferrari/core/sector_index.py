@@ -0,0 +1,353 @@
+"""
+📊 SECTOR INDEX SERVICE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+섹터 지수 빌더 (Sector Index Builder)
+
+기능:
+1. 실제 업종 분류(sector_map.json) 기준 섹터 지수 생성 (없거나 오래되면 갱신 시 자동 재조회)
+2. 동일가중(EW) + 시가총액가중(CW, 상장주식수 보유 시) 지수
+3. 가격 저장소 옆(data/<시장>/_sector/)에 저장 → 재실행 시 재계산 없음
+4. 새 봉이 들어온 종목이 있는 섹터만, 변경 시점부터 증분 갱신
+5. 종목 본인을 제외한(leave-one-out) 섹터 지수 조회 (학습 시 정보 누수 방지)
+
+저장 형식 (섹터별 CSV, 일자별 집계값):
+- ret_sum / count: 구성종목 수익률 합 / 종목 수 → EW 수익률
+- cap_ret_sum / cap_sum: 전일 시가총액 가중 수익률 합 / 가중치 합 → CW 수익률
+- ew / cw: 100 기준 누적 지수
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import FinanceDataReader as fdr
+    HAS_FDR = True
+except ImportError:
+    HAS_FDR = False
+
+SECTOR_MAP_FILE = "sector_map.json"   # data/sector_map.json: {시장: {종목: {"sector", "shares"}}, "_updated": {시장: 날짜}}
+SECTOR_MAP_MAX_AGE_DAYS = 7           # 업종 분류 재조회 주기 (신규 상장 / 상장주식수 변동 반영)
+INDEX_DIR = "_sector"                 # data/<시장>/_sector/
+MANIFEST_FILE = "manifest.json"
+DEFAULT_SECTOR = "ALL"                # 업종 정보가 없는 종목 (시장 전체 그룹)
+BASE_LEVEL = 100.0
+
+AGG_COLUMNS = ['ret_sum', 'count', 'cap_ret_sum', 'cap_sum']
+
+
+def _slug(name: str) -> str:
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(name)).strip('_') or DEFAULT_SECTOR
+
+
+def _read_close(path: Path) -> pd.Series:
+    """가격 CSV → 종가 Series (DatetimeIndex)"""
+    df = pd.read_csv(path, usecols=['Date', 'Close'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    s = df.set_index('Date')['Close'].dropna()
+    return s[~s.index.duplicated(keep='last')].sort_index()
+
+
+def _member_frame(close: pd.Series, shares: Optional[float]) -> pd.DataFrame:
+    """종목 1개의 일자별 수익률 / 전일 시가총액 (자체 거래일 기준)"""
+    prev = close.shift(1)
+    frame = pd.DataFrame({'ret': close / prev - 1})
+    frame['cap'] = prev * shares if shares else np.nan
+    return frame.dropna(subset=['ret'])
+
+
+def _aggregate(members: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """구성종목 수익률 → 일자별 집계"""
+    if not members:
+        return pd.DataFrame(columns=AGG_COLUMNS)
+    rets = pd.concat({t: m['ret'] for t, m in members.items()}, axis=1)
+    caps = pd.concat({t: m['cap'] for t, m in members.items()}, axis=1)
+    agg = pd.DataFrame({
+        'ret_sum': rets.sum(axis=1, min_count=1),
+        'count': rets.notna().sum(axis=1),
+        'cap_ret_sum': (rets * caps).sum(axis=1, min_count=1),
+        'cap_sum': caps.where(rets.notna()).sum(axis=1, min_count=1),
+    })
+    return agg[agg['count'] > 0].sort_index()
+
+
+def _levels(agg: pd.DataFrame, base_ew: float = BASE_LEVEL, base_cw: float = BASE_LEVEL) -> pd.DataFrame:
+    """집계값 → 누적 지수 (base에서 이어서 계산)"""
+    out = agg.copy()
+    out['ew'] = base_ew * (1 + out['ret_sum'] / out['count']).cumprod()
+    cw_ret = (out['cap_ret_sum'] / out['cap_sum']).fillna(0.0)
+    out['cw'] = base_cw * (1 + cw_ret).cumprod() if out['cap_sum'].notna().any() else np.nan
+    return out
+
+
+class SectorIndexService:
+    """섹터 지수 저장소 (시장 단위)"""
+
+    def __init__(self, price_dir, sector_map: Optional[Dict] = None):
+        """
+        Args:
+            price_dir: 가격 CSV 디렉토리 (예: data/KR)
+            sector_map: {종목: {"sector": ..., "shares": ...}} (None이면 data/sector_map.json)
+        """
+        self.price_dir = Path(price_dir)
+        self.market = self.price_dir.name
+        self.index_dir = self.price_dir / INDEX_DIR
+        self.map_path = self.price_dir.parent / SECTOR_MAP_FILE
+        self.auto_map = sector_map is None     # 명시적으로 받은 분류는 자동 재조회하지 않음
+        self.sector_map = sector_map if sector_map is not None else self._load_sector_map()
+        self._frames: Dict[str, pd.DataFrame] = {}   # 섹터 -> 저장된 지수 (메모리 캐시)
+        self._manifest = self._load_manifest()
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 업종 분류
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _read_map_file(self) -> Dict:
+        if self.map_path.exists():
+            try:
+                with open(self.map_path, encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _load_sector_map(self) -> Dict:
+        return self._read_map_file().get(self.market, {})
+
+    def sector_map_age(self) -> Optional[float]:
+        """이 시장 업종 분류의 경과 일수 (분류 없음 → None)"""
+        all_maps = self._read_map_file()
+        if self.market not in all_maps:
+            return None
+        updated = all_maps.get("_updated", {}).get(self.market)
+        if updated:
+            return (pd.Timestamp.now() - pd.Timestamp(updated)).total_seconds() / 86400
+        return (pd.Timestamp.now().timestamp() - self.map_path.stat().st_mtime) / 86400
+
+    def ensure_sector_map(self, max_age_days: float = SECTOR_MAP_MAX_AGE_DAYS) -> Dict:
+        """업종 분류가 없거나 max_age_days보다 오래되면 재조회 (실패 시 기존 분류 유지)"""
+        age = self.sector_map_age()
+        if age is None or age > max_age_days:
+            self.refresh_sector_map()
+        return self.sector_map
+
+    def refresh_sector_map(self) -> Dict:
+        """FinanceDataReader 상장 목록으로 업종 분류 + 상장주식수 갱신 (data/sector_map.json)"""
+        if not HAS_FDR:
+            print("⚠️ FinanceDataReader 미설치: 업종 분류 없이 시장 전체 그룹 사용")
+            return self.sector_map
+
+        tickers = [p.stem for p in self.price_dir.glob("*.csv")]
+        mapping: Dict[str, Dict] = {}
+        try:
+            if self.market == "KR":
+                desc = fdr.StockListing('KRX-DESC').set_index('Code')
+                listing = fdr.StockListing('KRX').set_index('Code')
+                for t in tickers:
+                    code = t.split('.')[0]
+                    if code in desc.index and pd.notna(desc.at[code, 'Sector']):
+                        mapping[t] = {"sector": str(desc.at[code, 'Sector'])}
+                        if code in listing.index and 'Stocks' in listing.columns:
+                            mapping[t]["shares"] = float(listing.at[code, 'Stocks'])
+            else:
+                listing = fdr.StockListing('S&P500').set_index('Symbol')
+                for t in tickers:
+                    if t in listing.index and pd.notna(listing.at[t, 'Sector']):
+                        mapping[t] = {"sector": str(listing.at[t, 'Sector'])}
+        except Exception as e:
+            print(f"⚠️ 업종 분류 조회 실패: {e}")
+            return self.sector_map
+
+        if not mapping:
+            print(f"⚠️ [{self.market}] 업종 분류 결과 없음: 기존 분류 유지")
+            return self.sector_map
+
+        all_maps = self._read_map_file()
+        all_maps[self.market] = mapping
+        all_maps.setdefault("_updated", {})[self.market] = pd.Timestamp.now().strftime('%Y-%m-%d')
+        with open(self.map_path, 'w', encoding='utf-8') as f:
+            json.dump(all_maps, f, ensure_ascii=False, indent=2)
+        self.sector_map = mapping
+        return mapping
+
+    def sector_of(self, ticker: str) -> str:
+        info = self.sector_map.get(ticker)
+        return info.get("sector", DEFAULT_SECTOR) if info else DEFAULT_SECTOR
+
+    def groups(self) -> Dict[str, List[str]]:
+        """섹터 -> 가격 파일이 있는 구성종목"""
+        groups: Dict[str, List[str]] = {}
+        for path in sorted(self.price_dir.glob("*.csv")):
+            groups.setdefault(self.sector_of(path.stem), []).append(path.stem)
+        return groups
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 빌드 / 증분 갱신
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _load_manifest(self) -> Dict:
+        path = self.index_dir / MANIFEST_FILE
+        if path.exists():
+            try:
+                with open(path, encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {"sectors": {}}
+
+    def _save_manifest(self):
+        with open(self.index_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, ensure_ascii=False, indent=2)
+
+    def _shares(self, ticker: str) -> Optional[float]:
+        return (self.sector_map.get(ticker) or {}).get("shares")
+
+    def update(self, force: bool = False) -> Dict[str, str]:
+        """
+        전체 섹터 지수 빌드/증분 갱신
+        - 구성종목이 바뀐 섹터: 전체 재계산
+        - 가격 파일이 바뀐 종목이 있는 섹터: 해당 종목의 기존 마지막 일자부터 재계산
+        - 변경 없는 섹터: 건너뜀
+
+        Returns:
+            {섹터: "built" | "updated" | "unchanged" | "removed"}
+        """
+        if self.auto_map:
+            self.ensure_sector_map()
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        status = {}
+        groups = self.groups()
+        for sector, tickers in groups.items():
+            status[sector] = self._update_sector(sector, tickers, force)
+        # 분류 변경으로 사라진 섹터 정리 (예: 분류 도입 전 'ALL' 그룹)
+        for sector in [s for s in self._manifest["sectors"] if s not in groups]:
+            entry = self._manifest["sectors"].pop(sector)
+            (self.index_dir / entry["file"]).unlink(missing_ok=True)
+            self._frames.pop(sector, None)
+            status[sector] = "removed"
+        self._save_manifest()
+        return status
+
+    def _update_sector(self, sector: str, tickers: List[str], force: bool) -> str:
+        entry = self._manifest["sectors"].get(sector)
+        path = self.index_dir / f"{_slug(sector)}.csv"
+        mtimes = {t: os.path.getmtime(self.price_dir / f"{t}.csv") for t in tickers}
+
+        rebuild = force or entry is None or not path.exists() or sorted(entry["members"]) != tickers
+        if not rebuild:
+            changed = [t for t in tickers if entry["members"][t]["mtime"] != mtimes[t]]
+            if not changed:
+                return "unchanged"
+            start = min(pd.Timestamp(entry["members"][t]["last_date"]) for t in changed)
+
+        members, last_dates = {}, {}
+        for t in tickers:
+            try:
+                close = _read_close(self.price_dir / f"{t}.csv")
+            except Exception:
+                continue
+            if close.empty:
+                continue
+            last_dates[t] = str(close.index[-1].date())
+            frame = _member_frame(close, self._shares(t))
+            members[t] = frame if rebuild else frame[frame.index >= start]
+
+        agg = _aggregate(members)
+        if rebuild:
+            table = _levels(agg)
+        else:
+            stored = self.load(sector)
+            head = stored[stored.index < start]
+            base_ew = head['ew'].iloc[-1] if len(head) else BASE_LEVEL
+            base_cw = head['cw'].iloc[-1] if len(head) and pd.notna(head['cw'].iloc[-1]) else BASE_LEVEL
+            table = pd.concat([head, _levels(agg, base_ew, base_cw)])
+
+        table.index.name = 'Date'
+        table.to_csv(path)
+        self._frames[sector] = table
+        self._manifest["sectors"][sector] = {
+            "file": path.name,
+            "members": {t: {"mtime": mtimes[t], "last_date": last_dates.get(t, "1970-01-01")} for t in tickers},
+            "last_date": str(table.index[-1].date()) if len(table) else None,
+        }
+        return "built" if rebuild else "updated"
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 조회
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def load(self, sector: str) -> pd.DataFrame:
+        """저장된 섹터 지수 테이블 (메모리 캐시)"""
+        if sector not in self._frames:
+            path = self.index_dir / f"{_slug(sector)}.csv"
+            if not path.exists():
+                return pd.DataFrame(columns=AGG_COLUMNS + ['ew', 'cw'])
+            self._frames[sector] = pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+        return self._frames[sector]
+
+    def get_index(self, sector: str, weighting: str = 'ew') -> Optional[pd.Series]:
+        """섹터 지수 (ew: 동일가중, cw: 시가총액가중)"""
+        table = self.load(sector)
+        if table.empty or table[weighting].isna().all():
+            return None
+        return table[weighting].rename('Sector_Index')
+
+    def ticker_index(self, ticker: str, exclude_self: bool = True, weighting: str = 'ew') -> Optional[pd.Series]:
+        """
+        종목이 속한 섹터 지수
+        - exclude_self=True: 종목 본인 수익률을 집계에서 빼고 재누적 (leave-one-out)
+        """
+        sector = self.sector_of(ticker)
+        table = self.load(sector)
+        if table.empty:
+            return None
+        if not exclude_self:
+            return self.get_index(sector, weighting)
+
+        try:
+            own = _member_frame(_read_close(self.price_dir / f"{ticker}.csv"), self._shares(ticker))
+        except Exception:
+            own = pd.DataFrame(columns=['ret', 'cap'])
+        own = own.reindex(table.index)
+        has_own = own['ret'].notna()
+
+        if weighting == 'cw':
+            num = table['cap_ret_sum'] - (own['ret'] * own['cap']).fillna(0.0)
+            den = table['cap_sum'] - own['cap'].where(has_own).fillna(0.0)
+            ret = num / den.where(den > 0)
+        else:
+            count = table['count'] - has_own.astype(int)
+            ret = (table['ret_sum'] - own['ret'].fillna(0.0)) / count.where(count > 0)
+
+        ret = ret.dropna()
+        if ret.empty:
+            return None
+        return (BASE_LEVEL * (1 + ret).cumprod()).rename('Sector_Index')
+
+    def is_bullish(self, ticker: str, window: int = 20, exclude_self: bool = True,
+                   weighting: str = 'ew') -> Optional[bool]:
+        """섹터 지수가 이동평균 위에 있는지 (데이터 없으면 None, 기본값은 학습과 동일한 본인 제외 지수)"""
+        series = self.ticker_index(ticker, exclude_self=exclude_self, weighting=weighting)
+        if series is None or len(series) < window:
+            return None
+        return bool(series.iloc[-1] > series.rolling(window).mean().iloc[-1])
+
+
+_services: Dict[str, SectorIndexService] = {}
+
+
+def get_service(price_dir) -> SectorIndexService:
+    """가격 디렉토리별 공유 서비스 (최초 호출 시 빌드/증분 갱신 1회)"""
+    key = str(Path(price_dir).resolve())
+    if key not in _services:
+        service = SectorIndexService(price_dir)
+        service.update()
+        _services[key] = service
+    return _services[key]
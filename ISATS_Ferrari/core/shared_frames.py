@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from typing import Dict, List
+
+# ==========================================
+# Shared Frames
+# 역할: 시계열 DataFrame을 공유 메모리에 1회 적재하여 프로세스 풀 워커가 복사 없이 참조
+# ==========================================
+
+
+class SharedFrame:
+    """
+    DatetimeIndex + float64 컬럼으로 구성된 DataFrame의 공유 메모리 표현
+    - 레이아웃: [인덱스 int64 × length][컬럼 float64 × (ncols × length)] (컬럼별 연속)
+    - publish(): 부모 프로세스에서 생성 (소유자, 종료 시 unlink)
+    - attach(): 워커에서 spec으로 연결 후 to_frame()으로 읽기 전용 뷰 사용
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, columns: List[str], length: int, owner: bool = False):
+        self.shm = shm
+        self.columns = list(columns)
+        self.length = length
+        self.owner = owner
+        self.index = np.ndarray((length,), dtype=np.int64, buffer=shm.buf)
+        self.values = np.ndarray((len(self.columns), length), dtype=np.float64,
+                                 buffer=shm.buf, offset=length * 8)
+
+    @classmethod
+    def publish(cls, df: pd.DataFrame, columns: List[str]) -> "SharedFrame":
+        """DataFrame을 공유 메모리 블록에 복사"""
+        length = len(df)
+        size = max(1, length * 8 * (1 + len(columns)))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        frame = cls(shm, columns, length, owner=True)
+        frame.index[:] = df.index.values.astype('datetime64[ns]').view(np.int64)
+        for k, col in enumerate(columns):
+            frame.values[k] = df[col].to_numpy(dtype=np.float64)
+        return frame
+
+    @classmethod
+    def attach(cls, spec: Dict) -> "SharedFrame":
+        """spec(name/columns/length)으로 기존 블록에 연결"""
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        return cls(shm, spec["columns"], spec["length"])
+
+    def spec(self) -> Dict:
+        """워커에 전달할 핸들 (pickle 가능)"""
+        return {"name": self.shm.name, "columns": self.columns, "length": self.length}
+
+    def to_frame(self) -> pd.DataFrame:
+        """공유 메모리를 그대로 참조하는 DataFrame (블록이 열려 있는 동안만 유효)"""
+        index = pd.DatetimeIndex(self.index.view('datetime64[ns]'))
+        return pd.DataFrame(self.values.T, index=index, columns=self.columns, copy=False)
+
+    def close(self):
+        # 소유자는 이름부터 제거 (모든 프로세스가 매핑을 해제하면 메모리 반환)
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+        # numpy 뷰를 먼저 해제해야 버퍼를 닫을 수 있음
+        self.index = None
+        self.values = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # 외부에서 아직 뷰(DataFrame)를 잡고 있는 경우: 프로세스 종료 시 정리
+            pass
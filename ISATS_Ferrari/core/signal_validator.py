@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from core.latency_tracer import tracer, STAGE_VALIDATE
+
 # ==========================================
 # Signal Validator
 # 역할: 기술적 매매 신호의 유효성 검증 (필터링)
@@ -19,6 +21,11 @@ class SignalValidator:
         2. 상위 타임프레임(13분) 추세 일치 확인
         3. 호가 스프레드(체결성) 확인
         """
+        with tracer.span(STAGE_VALIDATE, ticker):
+            return self._validate_entry(current_data, history_data, orderbook)
+
+    def _validate_entry(self, current_data, history_data, orderbook=None):
+        """validate_entry 본체 (지연시간 계측 구간)"""
         try:
             # 1. 거래량 검증
             vol_now = current_data['Volume']
@@ -53,3 +60,163 @@ class SignalValidator:
 
         except Exception as e:
             return False, f"검증 프로세스 오류: {e}"
+
+    def validate(self, ticker, market_data, timeframe_data, orderbook=None):
+        """
+        백테스트/진화 시뮬레이션용 종합 검증 (Savage Validator 기준)
+        1. 거래량: 최근 20봉 평균 대비 min_volume_ratio배 이상
+        2. 상위 프레임(13분봉) MA5 위
+        3. 20MA 위 + 볼린저 상단(2σ)의 95% 이상
+        4. 호가 스프레드 (orderbook 제공 시)
+        ※ 모든 지표는 인과적(rolling) 계산 → precompute()/validate_bar()와 결과 동일
+        """
+        try:
+            current_price = market_data['Close']
+
+            # 1. 수급 검증
+            vol_now = market_data['Volume']
+            vol_avg = timeframe_data['Volume'].rolling(20).mean().iloc[-1] if len(timeframe_data) >= 20 else vol_now
+            if vol_now < vol_avg * self.min_volume_ratio:
+                return False, f"거래량 부족 ({vol_now / (vol_avg + 1e-8):.1f}배)"
+
+            # 2. 상위 프레임(13분봉) 추세
+            if len(timeframe_data) > 60:
+                df_13m = timeframe_data.resample('13T').agg({'Close': 'last'}).dropna()
+                if len(df_13m) >= 5:
+                    ma5_13m = np.mean(df_13m['Close'].values[-5:])
+                    if current_price < ma5_13m:
+                        return False, "상위(13분) 추세 하향 중"
+
+            # 3. 20MA / 볼린저 상단 돌파력
+            if len(timeframe_data) >= 20:
+                std = timeframe_data['Close'].rolling(20).std().iloc[-1]
+                ma20 = timeframe_data['Close'].rolling(20).mean().iloc[-1]
+                upper_band = ma20 + (std * 2)
+                if current_price < ma20:
+                    return False, "20MA 아래 (약세 구간)"
+                if current_price < upper_band * 0.95:
+                    return False, "볼린저 밴드 돌파력 부족"
+
+            # 4. 호가 스프레드
+            return self._check_spread(orderbook)
+
+        except Exception as e:
+            return False, f"검증 프로세스 오류: {e}"
+
+    def _check_spread(self, orderbook):
+        if orderbook and 'bids' in orderbook and 'asks' in orderbook:
+            best_bid = orderbook['bids'][0]['price']
+            best_ask = orderbook['asks'][0]['price']
+            spread = (best_ask - best_bid) / (best_bid + 1e-8)
+            if spread > self.spread_limit:
+                return False, f"스프레드 과다 ({spread*100:.2f}%)"
+        return True, "모든 검증 로직 통과"
+
+    def precompute(self, df):
+        """
+        배치 검증 모드: 전체 봉에 대한 검증 지표를 1회 계산
+        - 이후 validate_bar(features, i)는 조회만 수행 (봉마다 prefix 재계산 없음)
+        """
+        return ValidatorFeatures(df)
+
+    def validate_bar(self, features, i, orderbook=None):
+        """
+        i번째 봉 검증 (validate("SIM", df.iloc[i], df.iloc[:i+1], orderbook)와 동일 결과)
+        """
+        try:
+            f = features
+            n = i + 1  # len(timeframe_data)
+            current_price = f.closes[i]
+
+            # 1. 수급 검증
+            vol_now = f.volumes[i]
+            vol_avg = f.vol_ma20[i] if n >= 20 else vol_now
+            if vol_now < vol_avg * self.min_volume_ratio:
+                return False, f"거래량 부족 ({vol_now / (vol_avg + 1e-8):.1f}배)"
+
+            # 2. 상위 프레임(13분봉) 추세
+            if n > 60:
+                if f.trend_error is not None:
+                    raise f.trend_error
+                if f.bins_13m[i] >= 4:
+                    if current_price < f.ma5_13m[i]:
+                        return False, "상위(13분) 추세 하향 중"
+
+            # 3. 20MA / 볼린저 상단 돌파력
+            if n >= 20:
+                if current_price < f.ma20[i]:
+                    return False, "20MA 아래 (약세 구간)"
+                if current_price < f.upper_band[i] * 0.95:
+                    return False, "볼린저 밴드 돌파력 부족"
+
+            # 4. 호가 스프레드
+            return self._check_spread(orderbook)
+
+        except Exception as e:
+            return False, f"검증 프로세스 오류: {e}"
+
+    def validate_mask(self, features, orderbook=None):
+        """전체 봉 검증 결과 (bool 배열, validate_bar(features, i)[0]과 동일)"""
+        f = features
+        bars = np.arange(1, len(f.closes) + 1)  # 봉 i 시점의 len(timeframe_data)
+
+        # 1. 수급 검증
+        vol_avg = np.where(bars >= 20, f.vol_ma20, f.volumes)
+        ok = ~(f.volumes < vol_avg * self.min_volume_ratio)
+
+        # 2. 상위 프레임(13분봉) 추세
+        trend = bars > 60
+        if f.trend_error is not None:
+            ok &= ~trend
+        else:
+            ok &= ~(trend & (f.bins_13m >= 4) & (f.closes < f.ma5_13m))
+
+        # 3. 20MA / 볼린저 상단 돌파력
+        band = bars >= 20
+        ok &= ~(band & (f.closes < f.ma20))
+        ok &= ~(band & (f.closes < f.upper_band * 0.95))
+
+        # 4. 호가 스프레드 (전 구간 공통)
+        if not self._check_spread(orderbook)[0]:
+            ok[:] = False
+        return ok
+
+
+class ValidatorFeatures:
+    """
+    SignalValidator 배치 모드 지표 (봉 단위 배열)
+    - rolling 지표는 인과적이므로 전체 계산값[i] == prefix 계산값의 마지막 값
+    - 13분봉 MA5: 봉 i 시점의 13분봉 = 완성된 직전 4개 구간 종가 + 현재 구간의 현재 종가
+    """
+
+    def __init__(self, df):
+        self.closes = df['Close'].values
+        self.volumes = df['Volume'].values
+        self.vol_ma20 = df['Volume'].rolling(20).mean().values
+        std = df['Close'].rolling(20).std()
+        ma20 = df['Close'].rolling(20).mean()
+        self.ma20 = ma20.values
+        self.upper_band = (ma20 + (std * 2)).values
+
+        n = len(df)
+        self.bins_13m = np.zeros(n, dtype=np.int64)   # 봉 i가 속한 13분 구간 순번 (빈 구간 제외)
+        self.ma5_13m = np.full(n, np.nan)
+        self.trend_error = None
+        try:
+            # 구간별 마지막 봉 위치 (resample('13T') 구간 경계 그대로 사용)
+            positions = pd.Series(np.arange(n), index=df.index)
+            last_pos = positions.resample('13T').last().dropna().values.astype(np.int64)
+            bins = np.searchsorted(last_pos, np.arange(n), side='left')
+            finals = self.closes[last_pos]
+
+            # [직전 4개 구간 종가, 현재 종가] 행렬 → 행 평균 (np.mean과 동일 순서)
+            window = np.full((n, 5), np.nan)
+            for lag in range(1, 5):
+                prev = bins - lag
+                ok = prev >= 0
+                window[ok, 4 - lag] = finals[prev[ok]]
+            window[:, 4] = self.closes
+            self.bins_13m = bins
+            self.ma5_13m = window.mean(axis=1)
+        except Exception as e:
+            self.trend_error = e
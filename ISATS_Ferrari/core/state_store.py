@@ -0,0 +1,336 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import redis.asyncio as redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+# ==========================================
+# State Store
+# 역할: 엔티티(종목 / 엔진)별 상태를 Redis Hash로 저장 (필드값은 JSON → 타입 유지)
+# - 프로세스당 URL별 커넥션 풀 1개 공유
+# - 필드 단위 부분 갱신: 마지막으로 기록한 값과 다른 필드만 HSET
+#   (무효화 알림 PUBLISH까지 같은 파이프라인 → 1회 왕복)
+#   키가 사라진 경우(TTL 만료 / 타 프로세스 삭제 / Redis 재시작)는 EXISTS·EXPIRE 응답으로 감지해 전체 재전송,
+#   감지할 수 없는 무변경 키는 resync_interval마다 전체 재전송
+# - 다중 키 조회: 파이프라인 HGETALL → 종목 100개 = 1회 왕복
+# - 선택: 클라이언트 측 캐시 (무효화 채널 구독, 구독이 끊기면 캐시 비활성 + 전체 폐기)
+# ==========================================
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+KEY_PREFIX = "state:"                      # Hash: state:{kind}:{id} -> {field: JSON}
+INVALIDATE_CHANNEL = "state:invalidate"    # 메시지: 변경된 키 목록 (줄바꿈 구분)
+
+_pools: Dict[str, Any] = {}
+
+
+def get_pool(url: str = REDIS_URL, max_connections: int = 32):
+    """URL별 공유 커넥션 풀 (같은 프로세스의 모든 클라이언트가 재사용)"""
+    pool = _pools.get(url)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(url, decode_responses=True, max_connections=max_connections)
+        _pools[url] = pool
+    return pool
+
+
+def get_client(url: str = REDIS_URL):
+    """공유 풀 기반 클라이언트"""
+    return redis.Redis(connection_pool=get_pool(url))
+
+
+class StateStore:
+    """
+    엔티티별 Hash 상태 저장소
+
+    사용 예:
+        state = StateStore()                                   # 공유 풀 사용
+        await state.update("ticker", "005930", {"price": 71500, "signal": "BUY"})
+        rows = await state.get_many("ticker", ["005930", "000660"])   # {id: {field: value}}
+
+        cached = StateStore(client_cache=True)                 # 대시보드 (읽기 위주)
+        await cached.start()
+    """
+
+    def __init__(self, client=None, url: str = REDIS_URL, client_cache: bool = False,
+                 cache_ttl: Optional[float] = None, resync_interval: Optional[float] = 60.0):
+        """
+        Args:
+            client: redis.asyncio 클라이언트 (None이면 url의 공유 풀로 생성)
+            url: Redis URL
+            client_cache: 읽은 Hash를 프로세스 메모리에 캐시 (start() 후 무효화 구독 중에만 사용)
+            cache_ttl: 캐시 최대 보관 시간(초, 무효화 누락 대비 - None이면 무제한)
+            resync_interval: 키별 전체 필드 재전송 주기(초, 외부 삭제 대비 - None이면 안 함)
+        """
+        self.url = url
+        self.client = client
+        self.client_cache = client_cache
+        self.cache_ttl = cache_ttl
+        self.resync_interval = resync_interval
+        self.cache: Dict[str, Tuple[float, Dict]] = {}   # key -> (저장 시각, 필드)
+        self.written: Dict[str, Dict[str, str]] = {}     # key -> 이 프로세스가 마지막으로 기록한 필드 (JSON)
+        self._synced: Dict[str, float] = {}              # key -> 마지막 전체 재전송 시각
+        self.stats = {"hit": 0, "miss": 0, "invalidated": 0, "round_trips": 0, "fields_written": 0}
+        self._epochs: Dict[str, int] = {}               # key -> 무효화 횟수 (조회 중 무효화 감지)
+        self._listening = False
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self):
+        if self.client is None:
+            self.client = get_client(self.url)
+        return self.client
+
+    @staticmethod
+    def key(kind: str, entity_id: str) -> str:
+        return f"{KEY_PREFIX}{kind}:{entity_id}"
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Dict[str, Any]:
+        out = {}
+        for field, value in raw.items():
+            try:
+                out[field] = json.loads(value)
+            except (TypeError, ValueError):
+                out[field] = value
+        return out
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 기록 (필드 단위 부분 갱신)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _changed(self, key: str, fields: Dict[str, Any]) -> Dict[str, str]:
+        last = self.written.setdefault(key, {})
+        changed = {}
+        for field, value in fields.items():
+            encoded = json.dumps(value, ensure_ascii=False, default=str)
+            if last.get(field) != encoded:
+                changed[field] = encoded
+        return changed
+
+    def _forget(self, keys: Iterable[str]):
+        for key in keys:
+            self.written.pop(key, None)
+            self._synced.pop(key, None)
+
+    async def update(self, kind: str, entity_id: str, fields: Dict[str, Any], ttl: Optional[int] = None) -> int:
+        """엔티티 1개 부분 갱신 (변경된 필드 수 반환)"""
+        return await self.update_many(kind, {entity_id: fields}, ttl=ttl)
+
+    async def update_many(self, kind: str, updates: Dict[str, Dict[str, Any]], ttl: Optional[int] = None) -> int:
+        """
+        여러 엔티티 부분 갱신 (HSET × 변경 엔티티 + PUBLISH 1회, 파이프라인 1회 왕복)
+        - 기록 전에 키가 사라져 있었으면 전체 필드를 한 번 더 기록 (1회 추가 왕복)
+
+        Args:
+            kind: 엔티티 종류 (예: "ticker", "engine")
+            updates: {id: {field: value}} - 값은 JSON 직렬화 가능 객체
+            ttl: 키 만료(초) - None이면 유지
+        """
+        pending, full, touched = {}, set(), []
+        for entity_id, fields in updates.items():
+            key = self.key(kind, entity_id)
+            if self._needs_resync(key):
+                # 기록 이력 없음 / 재전송 주기 경과 → 이력을 비워 전체 필드 전송
+                self.written.pop(key, None)
+                full.add(key)
+            changed = self._changed(key, fields)
+            if changed:
+                pending[key] = changed
+            elif ttl and self.written[key]:
+                touched.append(key)   # 무변경 키도 만료 연장 (EXPIRE 응답으로 소실 감지)
+        if not pending and not touched:
+            return 0
+
+        # 부분 갱신 키는 HSET 앞의 EXISTS, 무변경 키는 EXPIRE 응답으로 키 존재 여부 확인
+        pipe = self.redis.pipeline(transaction=False)
+        probes: List[Tuple[str, int]] = []   # (key, 응답 위치)
+        for key, changed in pending.items():
+            if key not in full:
+                probes.append((key, len(pipe)))
+                pipe.exists(key)
+            pipe.hset(key, mapping=changed)
+            if ttl:
+                pipe.expire(key, ttl)
+        for key in touched:
+            probes.append((key, len(pipe)))
+            pipe.expire(key, ttl)
+        if pending:
+            pipe.publish(INVALIDATE_CHANNEL, "\n".join(pending))
+        try:
+            replies = await pipe.execute()
+        except Exception:
+            # 기록 실패 시 다음 갱신에서 전체 필드 재전송
+            self._forget(pending)
+            self._forget(touched)
+            raise
+        self.stats["round_trips"] += 1
+
+        # 기록 전에 키가 없었음 (만료 / 삭제 / 재시작) → Hash가 불완전하므로 전체 필드 재전송
+        lost = [key for key, i in probes if not replies[i]]
+
+        now = time.monotonic()
+        count = 0
+        for key, changed in pending.items():
+            self.written[key].update(changed)
+            if key in full:
+                self._synced[key] = now
+            self._invalidate(key)
+            count += len(changed)
+        if lost:
+            count += await self._resend(lost, ttl)
+        self.stats["fields_written"] += count
+        return count
+
+    def _needs_resync(self, key: str) -> bool:
+        synced = self._synced.get(key)
+        if synced is None:
+            return True
+        return self.resync_interval is not None and time.monotonic() - synced > self.resync_interval
+
+    async def _resend(self, keys: List[str], ttl: Optional[int]) -> int:
+        """이 프로세스가 기록한 전체 필드를 다시 기록 (파이프라인 1회 왕복)"""
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.hset(key, mapping=self.written[key])
+            if ttl:
+                pipe.expire(key, ttl)
+        pipe.publish(INVALIDATE_CHANNEL, "\n".join(keys))
+        try:
+            await pipe.execute()
+        except Exception:
+            self._forget(keys)
+            raise
+        self.stats["round_trips"] += 1
+        now = time.monotonic()
+        for key in keys:
+            self._synced[key] = now
+            self._invalidate(key)
+        return sum(len(self.written[key]) for key in keys)
+
+    async def delete(self, kind: str, entity_id: str):
+        key = self.key(kind, entity_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(key)
+        pipe.publish(INVALIDATE_CHANNEL, key)
+        await pipe.execute()
+        self._forget([key])
+        self._invalidate(key)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 조회 (파이프라인 + 선택적 클라이언트 캐시)
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _cached(self, key: str) -> Optional[Dict]:
+        if not self._listening:
+            return None
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if self.cache_ttl is not None and time.monotonic() - entry[0] > self.cache_ttl:
+            self.cache.pop(key, None)
+            return None
+        return entry[1]
+
+    async def get(self, kind: str, entity_id: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """엔티티 1개 (없으면 빈 dict)"""
+        return (await self.get_many(kind, [entity_id], fields)).get(entity_id, {})
+
+    async def get_many(self, kind: str, entity_ids: Iterable[str],
+                       fields: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 엔티티 조회 - 캐시에 없는 키만 파이프라인 HGETALL 1회 왕복
+
+        Args:
+            fields: 반환할 필드 (None이면 전체, 캐시는 항상 전체 Hash 단위)
+
+        Returns:
+            {id: {field: value}} - 존재하는 엔티티만
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        rows: Dict[str, Dict[str, Any]] = {}
+        missing: List[Tuple[str, str]] = []
+        for entity_id in entity_ids:
+            key = self.key(kind, entity_id)
+            hit = self._cached(key)
+            if hit is not None:
+                self.stats["hit"] += 1
+                rows[entity_id] = hit
+            else:
+                missing.append((entity_id, key))
+
+        if missing:
+            self.stats["miss"] += len(missing)
+            epochs = {key: self._epochs.get(key, 0) for _, key in missing}
+            pipe = self.redis.pipeline(transaction=False)
+            for _, key in missing:
+                pipe.hgetall(key)
+            results = await pipe.execute()
+            self.stats["round_trips"] += 1
+            for (entity_id, key), raw in zip(missing, results):
+                if not raw:
+                    continue
+                row = self._decode(raw)
+                rows[entity_id] = row
+                # 조회 도중 무효화된 키는 캐시하지 않음 (오래된 값 고착 방지)
+                if self._listening and self._epochs.get(key, 0) == epochs[key]:
+                    self.cache[key] = (time.monotonic(), row)
+
+        out = {}
+        for entity_id in entity_ids:
+            row = rows.get(entity_id)
+            if row is None:
+                continue
+            out[entity_id] = row if fields is None else {f: row[f] for f in fields if f in row}
+        return out
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 클라이언트 캐시 무효화
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _invalidate(self, key: str):
+        self._epochs[key] = self._epochs.get(key, 0) + 1
+        if self.cache.pop(key, None) is not None:
+            self.stats["invalidated"] += 1
+
+    async def start(self):
+        """무효화 채널 구독 시작 (client_cache=True일 때만)"""
+        if self.client_cache and self._listener is None:
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def _listen(self, retry: float = 5.0):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                self.cache.clear()          # 구독 전 기록분 반영 보장
+                self._listening = True
+                async for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        for key in message['data'].split("\n"):
+                            self._invalidate(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            finally:
+                self._listening = False
+                self.cache.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(retry)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
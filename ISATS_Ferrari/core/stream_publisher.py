@@ -0,0 +1,128 @@
+import json
+from typing import Dict, List
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# ==========================================
+# Stream Publisher
+# 역할: 감시자 리포트를 루프 1회 단위로 모아 압축 프레임으로 Redis 일괄 전송
+# ==========================================
+
+STREAM_CHANNEL = "isats_stream"
+FRAME_VERSION = 1
+
+# 신호 타입 <-> 코드 (와이어 포맷에는 코드만 전송)
+SIGNAL_CODES = {'INFO': 0, 'BUY': 1, 'SELL': 2, 'WARNING': 3}
+SIGNAL_NAMES = {v: k for k, v in SIGNAL_CODES.items()}
+
+# 대시보드 표시 색상 (디코딩 시 복원, 전송하지 않음)
+SIGNAL_COLORS = {
+    'INFO': 'text-gray-300',
+    'BUY': 'text-red-400',
+    'SELL': 'text-blue-400',
+    'WARNING': 'text-yellow-400'
+}
+
+
+def encode_frame(events: List[list], encoding: str = "msgpack") -> bytes:
+    """
+    이벤트 묶음을 단일 프레임으로 인코딩
+    이벤트 형식: [timestamp, rank, ticker, price, signal_code, message]
+    """
+    frame = {"type": "batch", "v": FRAME_VERSION, "e": events}
+    if encoding == "msgpack" and HAS_MSGPACK:
+        return msgpack.packb(frame, use_bin_type=True)
+    return json.dumps(frame, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_frame(raw) -> List[Dict]:
+    """
+    Redis 수신 데이터를 기존 대시보드 패킷(log / ai_signal) 리스트로 복원
+    - batch 프레임 (msgpack / JSON) 및 기존 단건 JSON 패킷 모두 지원
+    """
+    if isinstance(raw, (bytes, bytearray)):
+        if raw[:1] == b"{":
+            frame = json.loads(raw.decode("utf-8"))
+        elif HAS_MSGPACK:
+            frame = msgpack.unpackb(raw, raw=False)
+        else:
+            return []
+    else:
+        frame = json.loads(raw)
+
+    if not isinstance(frame, dict):
+        return []
+    if frame.get("type") != "batch":
+        return [frame]
+
+    packets = []
+    for time_str, rank, ticker, price, code, msg in frame.get("e", []):
+        signal_type = SIGNAL_NAMES.get(code, 'INFO')
+        packets.append({
+            "type": "log",
+            "data": {
+                "timestamp": time_str,
+                "rank": rank,
+                "ticker": ticker,
+                "price": price,
+                "message": msg,
+                "signal_type": signal_type,
+                "color": SIGNAL_COLORS.get(signal_type, 'text-gray-300')
+            }
+        })
+        if signal_type in ('BUY', 'SELL'):
+            packets.append({
+                "type": "ai_signal",
+                "data": {
+                    "ticker": ticker,
+                    "price": price,
+                    "signal": signal_type,
+                    "rank": rank,
+                    "timestamp": time_str
+                }
+            })
+    return packets
+
+
+class StreamPublisher:
+    """
+    배치 퍼블리셔
+    - add(): 이벤트를 버퍼에 적재 (네트워크 호출 없음)
+    - flush(): 루프 1회당 한 번, 버퍼 전체를 프레임으로 묶어 파이프라인 1회로 전송
+    """
+
+    def __init__(self, redis_client=None, channel: str = STREAM_CHANNEL,
+                 encoding: str = "msgpack", max_frame_events: int = 256):
+        self.redis = redis_client
+        self.channel = channel
+        self.encoding = encoding
+        self.max_frame_events = max_frame_events
+        self.buffer: List[list] = []
+        self.frames_sent = 0
+        self.events_sent = 0
+
+    def add(self, time_str: str, rank: str, ticker: str, price: float, signal_type: str, msg: str):
+        if self.redis is None:
+            return
+        self.buffer.append([time_str, rank, ticker, price, SIGNAL_CODES.get(signal_type, 0), msg])
+
+    async def flush(self):
+        if not self.buffer or self.redis is None:
+            self.buffer.clear()
+            return
+        events, self.buffer = self.buffer, []
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            chunks = range(0, len(events), self.max_frame_events)
+            for i in chunks:
+                pipe.publish(self.channel, encode_frame(events[i:i + self.max_frame_events], self.encoding))
+            await pipe.execute()
+            self.frames_sent += len(chunks)
+            self.events_sent += len(events)
+        except Exception:
+            # Redis 에러는 무시 (콘솔 출력은 계속)
+            pass
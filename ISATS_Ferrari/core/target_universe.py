@@ -0,0 +1,38 @@
+from typing import Dict, List
+
+# ==========================================
+# Target Universe
+# 역할: 런처 기본 감시 종목 (런처 / 시세 공급 프로세스 공유)
+# - 국내: 타겟 파일(daily_target_list.csv)이 없을 때 auto_trading_launcher가 쓰는 기본 목록
+# - 미국: us_trading_launcher 고정 목록 (KIS 해외 시세 거래소 코드 포함)
+# ==========================================
+
+KR_DEFAULT_TARGETS: Dict[str, List[str]] = {
+    "S": ["005930", "000660", "035420"],  # 삼성전자, SK하이닉스, NAVER
+    "A": ["035720", "051910", "006400", "068270"],  # 카카오, LG화학, 삼성SDI, 셀트리온
+    "B": ["003550", "017670", "105560", "028260"],  # LG, SK텔레콤, KB금융, 삼성물산
+}
+
+US_TARGETS: Dict[str, List[Dict]] = {
+    "S": [  # S급 - 핵심 대형주
+        {"ticker": "AAPL", "name": "Apple", "exchange": "NAS"},
+        {"ticker": "MSFT", "name": "Microsoft", "exchange": "NAS"},
+        {"ticker": "NVDA", "name": "NVIDIA", "exchange": "NAS"},
+    ],
+    "A": [  # A급 - 성장주
+        {"ticker": "GOOGL", "name": "Alphabet", "exchange": "NAS"},
+        {"ticker": "AMZN", "name": "Amazon", "exchange": "NAS"},
+        {"ticker": "META", "name": "Meta", "exchange": "NAS"},
+        {"ticker": "TSLA", "name": "Tesla", "exchange": "NAS"},
+    ],
+    "B": [  # B급 - ETF 및 기타
+        {"ticker": "SPY", "name": "S&P 500 ETF", "exchange": "NYS"},
+        {"ticker": "QQQ", "name": "NASDAQ 100 ETF", "exchange": "NAS"},
+        {"ticker": "VOO", "name": "Vanguard S&P 500", "exchange": "NYS"},
+    ],
+}
+
+
+def us_exchanges() -> Dict[str, str]:
+    """미국 고정 목록 종목 → KIS 거래소 코드 (NAS / NYS / AMS)"""
+    return {stock["ticker"]: stock["exchange"] for stocks in US_TARGETS.values() for stock in stocks}
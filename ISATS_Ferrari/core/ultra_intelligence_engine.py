@@ -11,6 +11,11 @@
 4. 차트 기술적 분석 - RSI/MACD/볼린저밴드
 5. Stockformer - 미래 5일 예측
 
+동시 수집:
+- 4개 소스를 asyncio.gather로 동시에 수집 (소요 시간 ≈ 가장 느린 소스 1개)
+- HTTP 소스는 공유 aiohttp 세션 사용, yfinance 단계는 스레드에서 실행
+- 소스별 타임아웃 초과 시 해당 소스만 빈 결과로 두고 판단 진행
+
 작성자: ISATS Neural Swarm
 버전: 6.0 (Ultra Intelligence)
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -19,6 +24,7 @@
 import asyncio
 import os
 import sys
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
@@ -40,6 +46,12 @@ except ImportError:
     from bs4 import BeautifulSoup
     HAS_BS4 = True
 
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
 try:
     import yfinance as yf
     import pandas as pd
@@ -48,6 +60,31 @@ try:
 except ImportError:
     HAS_YFINANCE = False
 
+# 소스별 타임아웃 (초) - 초과한 소스는 빈 결과로 처리
+SOURCE_TIMEOUTS = {
+    'news': 12.0,
+    'disclosures': 12.0,
+    'technical': 20.0,
+    'prediction': 20.0,
+}
+
+
+async def _http_get(session, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                    timeout: float = 10.0, as_json: bool = False):
+    """
+    비동기 GET (이벤트 루프 차단 없음)
+    - session: 공유 aiohttp 세션 (None이면 requests를 스레드에서 실행)
+    """
+    if session is None:
+        response = await asyncio.to_thread(requests.get, url, params=params, headers=headers, timeout=timeout)
+        return response.json() if as_json else response.text
+
+    async with session.get(url, params=params, headers=headers,
+                           timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+        if as_json:
+            return await response.json(content_type=None)
+        return await response.text()
+
 
 # ==========================================
 # 📰 1. Google News Collector (강화)
@@ -61,13 +98,14 @@ class GoogleNewsCollector:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
     
-    async def collect_news(self, ticker: str, company_name: str) -> List[Dict]:
+    async def collect_news(self, ticker: str, company_name: str, session=None) -> List[Dict]:
         """
         Google News 검색
         
         Args:
             ticker: 종목 코드
             company_name: 회사명
+            session: 공유 aiohttp 세션 (선택)
         
         Returns:
             List[Dict]: 뉴스 리스트
@@ -77,25 +115,12 @@ class GoogleNewsCollector:
         try:
             # Google News 검색
             query = f"{company_name} stock news"
-            url = f"https://news.google.com/search?q={query}&hl=en-US&gl=US&ceid=US:en"
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            news_list = []
-            articles = soup.find_all('article')[:10]  # 상위 10개
+            url = "https://news.google.com/search"
+            params = {"q": query, "hl": "en-US", "gl": "US", "ceid": "US:en"}
             
-            for article in articles:
-                title_elem = article.find('a', class_='DY5T1d')
-                time_elem = article.find('time')
-                
-                if title_elem:
-                    news_list.append({
-                        'title': title_elem.get_text(strip=True),
-                        'link': f"https://news.google.com{title_elem.get('href', '')[1:]}",
-                        'time': time_elem.get('datetime', '') if time_elem else '',
-                        'source': 'Google News'
-                    })
+            html = await _http_get(session, url, params=params, headers=self.headers, timeout=10)
+            # HTML 파싱은 CPU 작업 → 스레드에서 실행
+            news_list = await asyncio.to_thread(self._parse, html)
             
             print(f"   ✅ {len(news_list)}건 수집 완료")
             return news_list
@@ -103,6 +128,28 @@ class GoogleNewsCollector:
         except Exception as e:
             print(f"   ❌ Google News 수집 실패: {e}")
             return []
+    
+    @staticmethod
+    def _parse(html: str) -> List[Dict]:
+        """검색 결과 HTML → 뉴스 리스트"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        news_list = []
+        articles = soup.find_all('article')[:10]  # 상위 10개
+        
+        for article in articles:
+            title_elem = article.find('a', class_='DY5T1d')
+            time_elem = article.find('time')
+            
+            if title_elem:
+                news_list.append({
+                    'title': title_elem.get_text(strip=True),
+                    'link': f"https://news.google.com{title_elem.get('href', '')[1:]}",
+                    'time': time_elem.get('datetime', '') if time_elem else '',
+                    'source': 'Google News'
+                })
+        
+        return news_list
 
 
 # ==========================================
@@ -116,12 +163,13 @@ class DARTCollector:
         self.api_key = api_key or os.getenv("DART_API_KEY", "")
         self.base_url = "https://opendart.fss.or.kr/api"
     
-    async def collect_disclosures(self, corp_code: str) -> List[Dict]:
+    async def collect_disclosures(self, corp_code: str, session=None) -> List[Dict]:
         """
         최근 공시 수집
         
         Args:
             corp_code: 기업 고유번호
+            session: 공유 aiohttp 세션 (선택)
         
         Returns:
             List[Dict]: 공시 리스트
@@ -145,8 +193,7 @@ class DARTCollector:
                 "page_count": 100
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            data = await _http_get(session, url, params=params, timeout=10, as_json=True)
             
             if data.get("status") == "000":
                 disclosures = data.get("list", [])
@@ -173,7 +220,7 @@ class TechnicalAnalyzer:
     
     async def analyze_chart(self, ticker: str) -> Dict:
         """
-        차트 기술적 분석
+        차트 기술적 분석 (yfinance 호출 + 계산은 스레드에서 실행)
         
         Args:
             ticker: 종목 코드
@@ -182,7 +229,10 @@ class TechnicalAnalyzer:
             Dict: 분석 결과
         """
         print(f"📊 차트 분석 중: {ticker}")
-        
+        return await asyncio.to_thread(self._analyze, ticker)
+    
+    def _analyze(self, ticker: str) -> Dict:
+        """차트 기술적 분석 (동기)"""
         try:
             # yfinance로 데이터 수집
             stock = yf.Ticker(ticker)
@@ -285,7 +335,7 @@ class FuturePredictor:
     
     async def predict_future(self, ticker: str) -> Dict:
         """
-        미래 5일 예측
+        미래 5일 예측 (yfinance 호출은 스레드에서 실행)
         
         Args:
             ticker: 종목 코드
@@ -294,7 +344,10 @@ class FuturePredictor:
             Dict: 예측 결과
         """
         print(f"🔮 미래 예측 중: {ticker}")
-        
+        return await asyncio.to_thread(self._predict, ticker)
+    
+    def _predict(self, ticker: str) -> Dict:
+        """미래 5일 예측 (동기)"""
         try:
             # 간단한 이동평균 기반 예측 (Stockformer 대체)
             stock = yf.Ticker(ticker)
@@ -346,11 +399,40 @@ class FuturePredictor:
 class UltraIntelligenceEngine:
     """초강화 정성적 분석 엔진"""
     
-    def __init__(self):
+    def __init__(self, timeouts: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            timeouts: 소스별 타임아웃 덮어쓰기 (예: {'news': 5.0})
+        """
         self.news_collector = GoogleNewsCollector()
         self.dart_collector = DARTCollector()
         self.technical_analyzer = TechnicalAnalyzer()
         self.future_predictor = FuturePredictor()
+        self.timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+        self.session = None
+    
+    def _get_session(self):
+        """공유 aiohttp 세션 (실행 중인 루프에서 최초 1회 생성)"""
+        if HAS_AIOHTTP and (self.session is None or self.session.closed):
+            self.session = aiohttp.ClientSession()
+        return self.session
+    
+    async def close(self):
+        """공유 세션 종료"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def _guarded(self, name: str, coro, default):
+        """소스 1개 실행 (타임아웃/예외 시 default 반환 → 다른 소스는 계속 진행)"""
+        timeout = self.timeouts[name]
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError:
+            print(f"   ⏱️ {name} 시간 초과 ({timeout:.0f}초) - 제외하고 진행")
+        except Exception as e:
+            print(f"   ❌ {name} 실패: {e}")
+        return default
     
     async def analyze(
         self,
@@ -374,30 +456,30 @@ class UltraIntelligenceEngine:
         print(f"{'='*80}\n")
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 1. Google News 수집
+        # 1~4. 뉴스 / DART 공시 / 차트 분석 / 미래 예측 (동시 수집)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        news = await self.news_collector.collect_news(ticker, company_name)
+        started = time.perf_counter()
+        session = self._get_session()
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 2. DART 공시 수집
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        
-        disclosures = []
+        sources = {
+            'news': (self.news_collector.collect_news(ticker, company_name, session), []),
+            'technical': (self.technical_analyzer.analyze_chart(ticker), {}),
+            'prediction': (self.future_predictor.predict_future(ticker), {}),
+        }
         if corp_code:
-            disclosures = await self.dart_collector.collect_disclosures(corp_code)
+            sources['disclosures'] = (self.dart_collector.collect_disclosures(corp_code, session), [])
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 3. 차트 기술적 분석
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        results = await asyncio.gather(*(
+            self._guarded(name, coro, default) for name, (coro, default) in sources.items()
+        ))
+        results = dict(zip(sources, results))
         
-        technical = await self.technical_analyzer.analyze_chart(ticker)
-        
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 4. 미래 예측
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        
-        prediction = await self.future_predictor.predict_future(ticker)
+        news = results['news']
+        disclosures = results.get('disclosures', [])
+        technical = results['technical']
+        prediction = results['prediction']
+        elapsed = time.perf_counter() - started
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 5. 종합 판단
@@ -424,10 +506,16 @@ class UltraIntelligenceEngine:
         print(f"   추천: {result['recommendation']}")
         print(f"   신뢰도: {result['confidence']:.2f}")
         print(f"   근거: {result['reason']}")
+        print(f"   수집 시간: {elapsed:.2f}초")
         print(f"{'='*80}\n")
         
         return result
     
+    @staticmethod
+    def is_complete(analysis: Dict) -> bool:
+        """뉴스/차트/예측이 모두 채워진 분석인지 (수집 실패·시간 초과 시 빈 값 → 캐시 저장 제외)"""
+        return all(analysis.get(name) for name in ('news', 'technical', 'prediction'))
+    
     def _综合_judgment(self, news, disclosures, technical, prediction) -> Dict:
         """종합 판단"""
         
@@ -484,11 +572,14 @@ async def main():
     
     engine = UltraIntelligenceEngine()
     
-    result = await engine.analyze(
-        ticker="RKLB",
-        company_name="Rocket Lab",
-        corp_code=None
-    )
+    try:
+        result = await engine.analyze(
+            ticker="RKLB",
+            company_name="Rocket Lab",
+            corp_code=None
+        )
+    finally:
+        await engine.close()
     
     print(f"\n✅ 최종 결과: {result['recommendation']}")
 
@@ -9,6 +9,7 @@
 - CCXT 거래소 연결 (실시간 시세)
 - AI 전략 모듈 연동 (신경망 판단)
 - 3명의 전담 요원 (SniperAgent, ScoutAgent, PatrolAgent)
+- 통합 스케줄러 (TierScheduler: 단일 힙 + 실시간 승격/강등)
 
 작성자: ISATS Neural Swarm
 버전: 6.0 (Context Aware + Neural Network)
@@ -16,10 +17,13 @@
 """
 
 import asyncio
-import json
+import heapq
+import itertools
 import os
 import sys
 import random
+import threading
+import time
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -27,50 +31,53 @@ from typing import List, Dict, Optional
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 선택적 임포트 (없으면 Mock 모드로 작동)
+# 선택적 임포트 (첫 사용 시 임포트, 없으면 Mock 모드로 작동)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-try:
-    import redis.asyncio as redis
-    HAS_REDIS = True
-except ImportError:
-    HAS_REDIS = False
-    print("⚠️ [Warning] redis.asyncio not found. Running in MOCK mode.")
-
-try:
-    import ccxt.async_support as ccxt
-    HAS_CCXT = True
-except ImportError:
-    HAS_CCXT = False
-    print("⚠️ [Warning] ccxt not found. Running in MOCK mode.")
-
-try:
-    import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
-    print("⚠️ [Warning] pandas not found. Running in MOCK mode.")
-
-try:
-    from strategy.active_bot import ActiveBot
-    HAS_STRATEGY = True
-except ImportError:
-    HAS_STRATEGY = False
-    print("⚠️ [Warning] ActiveBot not found. Running without AI strategy.")
-
-try:
-    from brain.finrl_ensemble import calculate_turbulence
-    HAS_TURBULENCE = True
-except ImportError:
-    HAS_TURBULENCE = False
-    print("⚠️ [Warning] Turbulence Index not found. Running without risk management.")
-
-try:
-    from core.qualitative_intelligence_team import QualitativeIntelligenceTeam
-    HAS_QUALITATIVE = True
-except ImportError:
-    HAS_QUALITATIVE = False
-    print("⚠️ [Warning] Qualitative Intelligence not found. Running without news analysis.")
+from core.lazy_import import LazyImport
+
+redis = LazyImport("redis.asyncio", warning="redis.asyncio not found. Running in MOCK mode.")
+ccxt = LazyImport("ccxt.async_support", warning="ccxt not found. Running in MOCK mode.")
+pd = LazyImport("pandas", warning="pandas not found. Running in MOCK mode.")
+ActiveBot = LazyImport("strategy.active_bot", "ActiveBot",
+                       warning="ActiveBot not found. Running without AI strategy.")
+calculate_turbulence = LazyImport("brain.turbulence", "calculate_turbulence",
+                                  warning="Turbulence Index not found. Running without risk management.")
+quote_board = LazyImport("core.quote_board")   # 공유 시세판 (numpy)
+inference_service = LazyImport("brain.inference_service",
+                               warning="Inference Service not found. Running without neural scoring.")
+QualitativeIntelligenceTeam = LazyImport("core.qualitative_intelligence_team", "QualitativeIntelligenceTeam",
+                                         warning="Qualitative Intelligence not found. Running without news analysis.")
+
+from core.latency_tracer import tracer, STAGE_QUOTE, STAGE_TICK_TO_DECISION
+from core.stream_publisher import StreamPublisher
+from core.scan_scheduler import governor, RANK_PRIORITY
+
+# 등급별 이모지 / 역할
+RANK_EMOJI = {'S': '🔴', 'A': '🟡', 'B': '🟢'}
+RANK_ROLE = {'S': 'SNIPER', 'A': 'SCOUT', 'B': 'PATROL'}
+
+# 신경망 판단 (HybridCNN_LSTM 상승 확률)
+MODEL_NAME = 'hybrid'
+MODEL_WINDOW = 60
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_inference = None   # 감시자 공유 배치 추론 서비스 (None: 미생성, False: 사용 불가)
+_inference_lock = threading.Lock()
+
+
+def shared_inference():
+    """감시자 공유 추론 서비스 (첫 호출 시 가중치 로드, 블로킹 → 워커 스레드에서 호출)"""
+    global _inference
+    with _inference_lock:
+        if _inference is None:
+            try:
+                service = inference_service.build_service(models=(MODEL_NAME,))
+                _inference = service if MODEL_NAME in service.runners else False
+            except Exception as e:
+                print(f"⚠️ [Warning] Inference Service 초기화 실패: {e}")
+                _inference = False
+    return _inference or None
 
 
 # ==========================================
@@ -80,19 +87,25 @@ except ImportError:
 class BaseWatcher:
     """모든 감시자의 기본 템플릿 (신경망 연결)"""
     
-    def __init__(self, rank: str, targets: List[Dict], interval: float, bot=None):
+    def __init__(self, rank: str, targets: List[Dict], interval: float, bot=None, max_concurrency: int = 8):
         """
         Args:
             rank: 등급 (S, A, B)
             targets: 감시 대상 리스트
-            interval: 감시 주기 (초)
+            interval: 감시 주기 (초) - 사이클 데드라인
             bot: ActiveBot 인스턴스 (AI 전략)
+            max_concurrency: 동시 분석 타겟 수 상한
         """
         self.rank = rank
         self.targets = targets
         self.interval = interval
         self.is_active = True
         self.scan_count = 0
+        self.deadline_misses = 0
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # 지연시간 텔레메트리 게시 주기 (스캔 횟수)
+        self.telemetry_every = 10
         
         # 리스크 관리
         self.turbulence_threshold = 100.0  # 난기류 지수 임계값
@@ -102,30 +115,28 @@ class BaseWatcher:
         self.qi_team = None  # Qualitative Intelligence Team
         self.min_confidence = 0.7  # 최소 신뢰도
         
-        # 등급별 이모지
-        self.emoji = {
-            'S': '🔴',
-            'A': '🟡',
-            'B': '🟢'
-        }[rank]
+        # 신경망 판단 (상승 확률 임계값, 종목별 마지막 신호)
+        self.inference = None
+        self.buy_threshold = 0.6
+        self.sell_threshold = 0.4
+        self.signals: Dict[str, str] = {}
         
-        # 등급별 역할
-        self.role = {
-            'S': 'SNIPER',
-            'A': 'SCOUT',
-            'B': 'PATROL'
-        }[rank]
+        # 등급별 이모지 / 역할
+        self.emoji = RANK_EMOJI[rank]
+        self.role = RANK_ROLE[rank]
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 신경망 연결 장비
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         self.redis = None          # Redis 클라이언트 (대시보드 통신)
+        self.publisher = StreamPublisher()  # 리포트 배치 전송기 (스캔 1회당 1프레임)
         self.exchange = None       # CCXT 거래소 (실시간 시세)
+        self.quotes = quote_board.QuoteReader()  # 공유 시세판 (시세 공급 프로세스가 기록, API 호출 없음)
         self.strategy = bot        # AI 전략 (신경망 판단)
         
         # 정성적 분석 팀 초기화
-        if HAS_QUALITATIVE:
+        if QualitativeIntelligenceTeam.available:
             self.qi_team = QualitativeIntelligenceTeam()
     
     async def _setup(self):
@@ -134,20 +145,24 @@ class BaseWatcher:
         # Redis 연결 (대시보드 실시간 통신)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        if HAS_REDIS and not self.redis:
+        if not self.redis and redis.available:
             try:
                 self.redis = redis.from_url("redis://localhost:6379", decode_responses=True)
                 await self.redis.ping()
+                self.publisher.redis = self.redis
+                if self.qi_team:
+                    self.qi_team.cache.redis = self.redis  # 정성 분석 캐시를 프로세스 간 공유
                 print(f"   ✅ [{self.role}] Redis 연결 성공")
             except Exception as e:
                 print(f"   ⚠️ [{self.role}] Redis 연결 실패: {e} (Mock 모드로 전환)")
                 self.redis = None
+                self.publisher.redis = None
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # CCXT 거래소 연결 (실시간 시세)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        if HAS_CCXT and not self.exchange:
+        if not self.exchange and ccxt.available:
             try:
                 # 예시: 업비트 (한국 거래소)
                 # 실제로는 KIS API 또는 yfinance 사용
@@ -156,14 +171,32 @@ class BaseWatcher:
             except Exception as e:
                 print(f"   ⚠️ [{self.role}] CCXT 연결 실패: {e} (Mock 모드로 전환)")
                 self.exchange = None
+        
+        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        # 배치 추론 서비스 (감시자 간 공유, 종목별 요청을 모아 모델당 1회 forward)
+        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        
+        if self.inference is None and inference_service.available and inference_service.HAS_TORCH:
+            self.inference = await asyncio.to_thread(shared_inference)
+            if self.inference:
+                print(f"   ✅ [{self.role}] 신경망 추론 서비스 연결 ({MODEL_NAME})")
     
     async def _teardown(self):
         """철수 (연결 종료)"""
+        await self.publisher.flush()
         if self.exchange:
             await self.exchange.close()
         if self.redis:
             await self.redis.close()
     
+    def rank_of(self, ticker: str) -> str:
+        """종목의 현재 등급 (고정 등급 감시자는 자신의 등급)"""
+        return self.rank
+    
+    async def request_promotion(self, ticker: str, rank: str, reason: str = ""):
+        """등급 변경 요청 (고정 등급 감시자는 보고만 수행, TierScheduler가 실제 반영)"""
+        pass
+    
     async def report(self, ticker: str, price: float, msg: str, signal_type: str = "INFO"):
         """
         사령부(Console + Dashboard)로 전술 데이터 전송
@@ -188,52 +221,15 @@ class BaseWatcher:
             'WARNING': '⚠️ '
         }.get(signal_type, '')
         
-        log_msg = f"{prefix}{self.emoji} [{self.role}] {ticker} ({price:,.2f}) >> {level_prefix}{msg}"
+        rank = self.rank_of(ticker)
+        log_msg = f"{prefix}{RANK_EMOJI[rank]} [{RANK_ROLE[rank]}] {ticker} ({price:,.2f}) >> {level_prefix}{msg}"
         print(log_msg)
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 2. Redis 전송 (대시보드용)
+        # 2. Redis 전송 (대시보드용) - 버퍼 적재 후 스캔 종료 시 일괄 전송
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        if self.redis:
-            try:
-                # 로그 패킷
-                log_payload = {
-                    "type": "log",
-                    "data": {
-                        "timestamp": time_str,
-                        "rank": self.rank,
-                        "ticker": ticker,
-                        "price": price,
-                        "message": msg,
-                        "signal_type": signal_type,
-                        "color": {
-                            'INFO': 'text-gray-300',
-                            'BUY': 'text-red-400',
-                            'SELL': 'text-blue-400',
-                            'WARNING': 'text-yellow-400'
-                        }.get(signal_type, 'text-gray-300')
-                    }
-                }
-                await self.redis.publish("isats_stream", json.dumps(log_payload))
-                
-                # AI 신호 패킷 (매수/매도 시)
-                if signal_type in ['BUY', 'SELL']:
-                    ai_payload = {
-                        "type": "ai_signal",
-                        "data": {
-                            "ticker": ticker,
-                            "price": price,
-                            "signal": signal_type,
-                            "rank": self.rank,
-                            "timestamp": time_str
-                        }
-                    }
-                    await self.redis.publish("isats_stream", json.dumps(ai_payload))
-            
-            except Exception as e:
-                # Redis 에러는 무시 (콘솔 출력은 계속)
-                pass
+        self.publisher.add(time_str, rank, ticker, price, signal_type, msg)
     
     async def fetch_price(self, ticker: str) -> Optional[float]:
         """
@@ -245,6 +241,14 @@ class BaseWatcher:
         Returns:
             현재가 또는 None
         """
+        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        # 공유 시세판 (다른 프로세스와 같은 시세 공유)
+        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        
+        price = self.quotes.get_price(ticker, max_age=quote_board.FRESH_SECONDS)
+        if price is not None:
+            return price
+        
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # CCXT 모드 (실전)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -272,7 +276,7 @@ class BaseWatcher:
         Returns:
             DataFrame 또는 None
         """
-        if not HAS_PANDAS:
+        if not pd.available:
             return None
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -296,6 +300,15 @@ class BaseWatcher:
         
         return None
     
+    @staticmethod
+    def model_window(df) -> Optional[object]:
+        """최근 MODEL_WINDOW봉 OHLCV → 윈도우 MinMax 정규화 (MODEL_WINDOW, 5), 봉이 모자라면 None"""
+        if df is None or len(df) < MODEL_WINDOW:
+            return None
+        values = df[OHLCV].to_numpy(dtype='float32')[-MODEL_WINDOW:]
+        low, high = values.min(axis=0), values.max(axis=0)
+        return (values - low) / (high - low + 1e-6)
+    
     async def analyze_target(self, target: Dict):
         """
         개별 타겟 분석 (신경망 판단 + 리스크 관리 + 정성적 분석)
@@ -305,6 +318,7 @@ class BaseWatcher:
         """
         ticker = target['ticker']
         score = target['score']
+        rank = self.rank_of(ticker)
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 0. 시장 붕괴 모드 확인 (최우선)
@@ -318,7 +332,9 @@ class BaseWatcher:
         # 1. 현재가 조회
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        current_price = await self.fetch_price(ticker)
+        tracer.start_trace(ticker)
+        with tracer.span(STAGE_QUOTE, ticker):
+            current_price = await self.fetch_price(ticker)
         
         if current_price is None:
             return
@@ -327,7 +343,8 @@ class BaseWatcher:
         # 1.5. 난기류 지수 확인 (리스크 관리)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        if HAS_TURBULENCE and HAS_PANDAS:
+        df = None  # 캔들은 종목당 1회만 조회해 이후 단계에서 재사용
+        if calculate_turbulence.available and pd.available:
             df = await self.fetch_candle_data(ticker)
             
             if df is not None and len(df) > 252:
@@ -350,15 +367,33 @@ class BaseWatcher:
         
         signal = "HOLD"
         
+        if self.inference is not None:
+            if df is None:
+                df = await self.fetch_candle_data(ticker)
+            window = self.model_window(df)
+            if window is not None:
+                try:
+                    # 같은 루프 회차의 다른 종목 요청과 묶여 1회 forward (워커 스레드)
+                    prob = await self.inference.score(MODEL_NAME, ticker, window)
+                    if prob >= self.buy_threshold:
+                        signal = "BUY"
+                    elif prob <= self.sell_threshold:
+                        signal = "SELL"
+                    if signal != self.signals.get(ticker, "HOLD") and signal != "HOLD":
+                        await self.report(ticker, current_price, f"🧠 신경망 {signal} (상승 확률: {prob:.2f})", signal)
+                    self.signals[ticker] = signal
+                except Exception:
+                    pass  # 추론 실패 시 HOLD 유지
+        
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 2.5. 정성적 분석 (뉴스/공시 필터)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        if HAS_QUALITATIVE and self.qi_team and self.rank == 'S':  # S급만 정성적 분석
+        if self.qi_team and rank == 'S':  # S급만 정성적 분석
             try:
                 qualitative_result = await self.qi_team.analyze(
                     ticker=ticker,
-                    corp_code="00000000",  # 실제 구현 시 매핑 필요
+                    corp_code=target.get('corp_code'),  # DART 고유번호 (없으면 공시 분석 생략)
                     current_price=current_price,
                     technical_signal="BUY"
                 )
@@ -377,9 +412,10 @@ class BaseWatcher:
                 # 정성적 분석 실패 시 무시하고 계속
                 pass
         
-        if self.strategy and HAS_STRATEGY:
+        if self.strategy and ActiveBot.available:
             # 캔들 데이터 가져오기
-            df = await self.fetch_candle_data(ticker)
+            if df is None:
+                df = await self.fetch_candle_data(ticker)
             
             if df is not None:
                 # ActiveBot의 on_tick 메서드 호출
@@ -404,17 +440,20 @@ class BaseWatcher:
         # 3. 등급별 임무 수행
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        if self.rank == 'S':
+        if rank == 'S':
             # 🔴 S급: 초정밀 저격 (매수 타점 포착)
             await self.sniper_mission(ticker, current_price, score)
         
-        elif self.rank == 'A':
+        elif rank == 'A':
             # 🟡 A급: S급 후보 발굴 (급등 조짐 감시)
             await self.scout_mission(ticker, current_price, score)
         
         else:
             # 🟢 B급: 주기적 순찰 (퇴출 대상 선별)
             await self.patrol_mission(ticker, current_price, score)
+        
+        # 시세 수신 ~ 판단 완료 지연시간 기록
+        tracer.mark(ticker, STAGE_TICK_TO_DECISION)
     
     async def sniper_mission(self, ticker: str, price: float, score: float):
         """🔴 S급 임무: 초정밀 저격"""
@@ -432,36 +471,68 @@ class BaseWatcher:
         # 가상 급등 감지 (2% 확률)
         if random.random() > 0.98:
             await self.report(ticker, price, "⚡ S급 승격 심사 요청! (급등 감지)", 'WARNING')
+            await self.request_promotion(ticker, 'S', "급등 감지")
     
     async def patrol_mission(self, ticker: str, price: float, score: float):
         """🟢 B급 임무: 주기적 순찰"""
         # 가상 특이사항 발생 (1% 확률)
         if random.random() > 0.99:
             await self.report(ticker, price, "👀 특이사항 발생. A급 격상 고려.", 'INFO')
+            await self.request_promotion(ticker, 'A', "특이사항 발생")
+    
+    async def _guarded_analyze(self, target: Dict):
+        """동시성 상한 내에서 타겟 분석 (개별 실패가 사이클 전체를 멈추지 않음)"""
+        async with self.semaphore:
+            try:
+                await self.analyze_target(target)
+            except Exception as e:
+                print(f"   ⚠️ [{self.role}] {target.get('ticker')} 분석 오류: {e}")
     
     async def scan_market(self):
-        """시장 감시 (전체 타겟 순회)"""
+        """시장 감시 (전체 타겟 동시 분석)"""
         if not self.targets:
-            await asyncio.sleep(self.interval)
             return
         
-        # 모든 타겟 분석
-        for target in self.targets:
-            await self.analyze_target(target)
+        # 과부하 시 하위 등급 작업 차감 (B급 우선)
+        targets = governor.select_targets(self.rank, self.targets)
+        
+        # 타겟 동시 분석 (동시성 상한 적용)
+        await asyncio.gather(*(self._guarded_analyze(t) for t in targets))
+        
+        # 이번 스캔의 리포트를 단일 파이프라인으로 전송
+        await self.publisher.flush()
         
         self.scan_count += 1
     
     async def run(self):
-        """감시자 실행 (무한 루프)"""
+        """감시자 실행 (주기 = 데드라인, 남은 시간만 대기)"""
         await self._setup()
         
         print(f"   👮 {self.emoji} {self.rank}급 담당관 배치 완료 "
               f"(주기: {self.interval}초, 타겟: {len(self.targets)}개)")
         
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.interval
+        
         try:
             while self.is_active:
+                cycle_start = loop.time()
                 await self.scan_market()
-                await asyncio.sleep(self.interval)
+                
+                now = loop.time()
+                missed = now > deadline
+                governor.record_cycle(self.rank, now - cycle_start, self.interval, missed)
+                if missed:
+                    # 데드라인 초과: 밀린 사이클을 몰아서 돌리지 않고 현재 시점부터 재정렬
+                    self.deadline_misses += 1
+                    deadline = now + self.interval
+                else:
+                    await asyncio.sleep(deadline - now)
+                    deadline += self.interval
+                
+                if self.scan_count % self.telemetry_every == 0:
+                    await tracer.publish(self.redis)
+                    await governor.publish(self.redis, self.rank)
         finally:
             await self._teardown()
 
@@ -508,6 +579,206 @@ class PatrolAgent(BaseWatcher):
         super().__init__('B', targets, interval=2.0, bot=bot)
 
 
+# ==========================================
+# 🧭 TIER SCHEDULER (S/A/B 통합 우선순위 큐)
+# ==========================================
+
+TIER_INTERVALS = {'S': 0.5, 'A': 1.0, 'B': 2.0}
+
+
+class TierScheduler(BaseWatcher):
+    """
+    🧭 S/A/B 통합 스케줄러
+    - 전 종목을 '다음 조회 시각' 기준 힙(heap) 하나로 관리
+    - 신호 발생 시 승격, 일정 시간 무신호 시 강등 → 조회 주기 즉시 변경
+    - 초당 조회 예산(polls_per_sec) 안에서 마감이 임박한 순, 동시각이면 상위 등급 우선
+    - 종목별 조회는 개별 태스크로 실행 (느린 분석이 힙 전체를 막지 않음), 리포트는 주기적으로 일괄 전송
+    """
+    
+    def __init__(self, targets: Dict[str, List[Dict]], bot=None, max_concurrency: int = 8,
+                 polls_per_sec: float = 20.0, tier_intervals: Optional[Dict[str, float]] = None,
+                 demote_after: float = 60.0, flush_interval: float = 0.25):
+        """
+        Args:
+            targets: 등급별 초기 타겟 {'S': [...], 'A': [...], 'B': [...]}
+            polls_per_sec: 초당 시세 조회 예산 (API 한도)
+            tier_intervals: 등급별 조회 주기 (초)
+            demote_after: 이 시간(초) 동안 신호가 없으면 한 단계 강등
+            flush_interval: 리포트 프레임 전송 주기 (초)
+        """
+        self.tier_intervals = dict(TIER_INTERVALS, **(tier_intervals or {}))
+        super().__init__('S', [], interval=min(self.tier_intervals.values()), bot=bot,
+                         max_concurrency=max_concurrency)
+        self.role = 'SCHEDULER'
+        self.polls_per_sec = polls_per_sec
+        self.demote_after = demote_after
+        self.max_concurrency = max_concurrency
+        self.flush_interval = flush_interval
+        
+        self.entries: Dict[str, Dict] = {}   # ticker -> 타겟 + 현재 등급/버전
+        self.heap: List = []                 # (due, 등급 우선순위, seq, version, ticker)
+        self.polling: Dict[str, asyncio.Task] = {}  # 조회 진행 중인 종목
+        self.wakeup = asyncio.Event()        # 승격 / 조회 완료 시 스케줄 루프 깨우기
+        self._seq = itertools.count()
+        
+        for rank, items in targets.items():
+            for target in items:
+                self.add_target(target, rank)
+    
+    def add_target(self, target: Dict, rank: str):
+        """감시 종목 추가 (즉시 조회 대상으로 등록)"""
+        entry = dict(target, rank=rank, version=0, last_signal=time.monotonic())
+        self.entries[entry['ticker']] = entry
+        self.targets = list(self.entries.values())
+        self._schedule(entry, time.monotonic())
+    
+    def _schedule(self, entry: Dict, due: float):
+        """다음 조회 시각 등록 (이전 예약은 version 불일치로 무효화)"""
+        entry['version'] += 1
+        heapq.heappush(self.heap, (due, RANK_PRIORITY.index(entry['rank']), next(self._seq),
+                                   entry['version'], entry['ticker']))
+    
+    def rank_of(self, ticker: str) -> str:
+        entry = self.entries.get(ticker)
+        return entry['rank'] if entry else self.rank
+    
+    def tier_counts(self) -> Dict[str, int]:
+        counts = {rank: 0 for rank in RANK_PRIORITY}
+        for entry in self.entries.values():
+            counts[entry['rank']] += 1
+        return counts
+    
+    async def request_promotion(self, ticker: str, rank: str, reason: str = ""):
+        """승격: 더 높은 등급이면 즉시 반영하고 바로 다음 조회 예약"""
+        entry = self.entries.get(ticker)
+        if not entry or RANK_PRIORITY.index(rank) >= RANK_PRIORITY.index(entry['rank']):
+            return
+        entry['rank'] = rank
+        entry['last_signal'] = time.monotonic()
+        self._schedule(entry, time.monotonic())
+        self.wakeup.set()
+        print(f"   ⬆️ [{self.role}] {ticker} → {rank}급 승격 ({reason})")
+    
+    def _maybe_demote(self, entry: Dict, now: float):
+        """무신호 시간이 demote_after를 넘으면 한 단계 강등"""
+        idx = RANK_PRIORITY.index(entry['rank'])
+        if idx < len(RANK_PRIORITY) - 1 and now - entry['last_signal'] > self.demote_after:
+            entry['rank'] = RANK_PRIORITY[idx + 1]
+            entry['last_signal'] = now
+            print(f"   ⬇️ [{self.role}] {entry['ticker']} → {entry['rank']}급 강등 (무신호)")
+    
+    async def report(self, ticker: str, price: float, msg: str, signal_type: str = "INFO"):
+        # 유의미한 신호는 강등 타이머 초기화
+        entry = self.entries.get(ticker)
+        if entry and signal_type != 'INFO':
+            entry['last_signal'] = time.monotonic()
+        await super().report(ticker, price, msg, signal_type)
+    
+    async def _poll(self, due: float, entry: Dict):
+        """예약된 종목 1회 조회 후 현재 등급 주기로 재예약"""
+        version = entry['version']
+        started = time.monotonic()
+        try:
+            await self._guarded_analyze(entry)
+            now = time.monotonic()
+            
+            interval = self.tier_intervals[entry['rank']]
+            governor.record_cycle(entry['rank'], now - started, interval, missed=(started - due) > interval)
+            
+            if entry['version'] != version:
+                # 분석 중 승격 → 진행 중에는 중복 조회하지 않았으므로 끝나는 즉시 재조회
+                self._schedule(entry, now)
+                return
+            
+            self._maybe_demote(entry, now)
+            interval = self.tier_intervals[entry['rank']]
+            # 주기 정렬 유지 (밀렸으면 현재 시점 기준)
+            self._schedule(entry, max(due + interval, now))
+        finally:
+            self.polling.pop(entry['ticker'], None)
+            self.wakeup.set()
+    
+    def _start_poll(self, due: float, entry: Dict):
+        self.polling[entry['ticker']] = asyncio.create_task(self._poll(due, entry))
+    
+    def _shed(self, batch: List) -> List:
+        """과부하 시 하위 등급 조회 차감 (governor 기준) - 생략된 종목은 다음 주기로 재예약"""
+        now = time.monotonic()
+        kept = []
+        for rank in RANK_PRIORITY:
+            group = [(due, entry) for due, entry in batch if entry['rank'] == rank]
+            if not group:
+                continue
+            keep = {entry['ticker'] for entry in governor.select_targets(rank, [entry for _, entry in group])}
+            for due, entry in group:
+                if entry['ticker'] in keep:
+                    kept.append((due, entry))
+                else:
+                    self._schedule(entry, max(due + self.tier_intervals[rank], now))
+        return kept
+    
+    async def run(self):
+        """단일 루프: 마감 도래 종목을 예산 내에서 꺼내 개별 태스크로 조회 (완료를 기다리지 않음)"""
+        await self._setup()
+        
+        counts = self.tier_counts()
+        print(f"   🧭 통합 스케줄러 배치 완료 (S: {counts['S']}, A: {counts['A']}, B: {counts['B']}, "
+              f"예산: {self.polls_per_sec}회/초)")
+        
+        tokens = self.polls_per_sec
+        last = last_flush = time.monotonic()
+        
+        try:
+            while self.is_active:
+                self.wakeup.clear()
+                now = time.monotonic()
+                tokens = min(self.polls_per_sec, tokens + (now - last) * self.polls_per_sec)
+                last = now
+                
+                # 동시 조회 슬롯이 빈 만큼만 꺼냄 (대기 순서는 세마포어가 아닌 힙이 결정)
+                batch = []
+                slots = min(int(tokens), self.max_concurrency - len(self.polling))
+                while self.heap and self.heap[0][0] <= now and len(batch) < slots:
+                    due, _, _, version, ticker = heapq.heappop(self.heap)
+                    entry = self.entries.get(ticker)
+                    if entry is None or entry['version'] != version:
+                        continue  # 승격/재예약으로 무효화된 항목
+                    if ticker in self.polling:
+                        continue  # 조회 진행 중 → 완료 시 재예약
+                    batch.append((due, entry))
+                batch = self._shed(batch)
+                tokens -= len(batch)
+                for due, entry in batch:
+                    self._start_poll(due, entry)
+                
+                # 리포트는 조회 완료와 무관하게 주기적으로 일괄 전송
+                if now - last_flush >= self.flush_interval:
+                    last_flush = now
+                    await self.publisher.flush()
+                    self.scan_count += 1
+                    
+                    if self.scan_count % self.telemetry_every == 0:
+                        await tracer.publish(self.redis)
+                        for rank in RANK_PRIORITY:
+                            await governor.publish(self.redis, rank)
+                
+                # 다음 마감 / 예산 회복 / 전송 시점까지 대기 (승격·조회 완료 시 즉시 재개)
+                wait = min(self.interval, max(0.0, last_flush + self.flush_interval - time.monotonic()))
+                if self.heap and len(self.polling) < self.max_concurrency:
+                    wait = min(wait, max(0.0, self.heap[0][0] - time.monotonic()))
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / self.polls_per_sec)
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in self.polling.values():
+                task.cancel()
+            await asyncio.gather(*self.polling.values(), return_exceptions=True)
+            await self._teardown()
+
+
 # ==========================================
 # 테스트 코드
 # ==========================================
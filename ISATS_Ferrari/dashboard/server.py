@@ -22,6 +22,12 @@ from core.kis_official_api import KISUnifiedClient
 from virtual_trading_engine import VirtualWallet
 from core.macro_sentinel import MacroSentinel
 from core.ultra_intelligence_engine import UltraIntelligenceEngine
+from core.intelligence_cache import IntelligenceCache
+from core.latency_tracer import load_summary
+from core.scan_scheduler import load_scan_stats
+from core.quote_board import QuoteReader, FRESH_SECONDS, kis_price_output, normalize_ticker
+from core.state_store import StateStore
+from core.chart_data import ChartStore, CHART_POINTS
 
 class DashboardServer:
     def __init__(self, port=9053):
@@ -32,9 +38,18 @@ class DashboardServer:
         self.macro = MacroSentinel()
         self.engine = UltraIntelligenceEngine()
         self.redis = None
-        self.intelligence_cache = {} # Ticker -> Last Analysis
+        self.intelligence_cache = IntelligenceCache() # (Ticker, Source) -> Analysis (TTL + 요청 병합, 디스크 유지)
+        self.quotes = QuoteReader() # 공유 시세판 (시세 공급 프로세스 실행 시 API 호출 대체)
+        self.charts = ChartStore() # 로컬 가격 저장소 OHLCV → 다운샘플링 차트
+        self.state = StateStore(client_cache=True, cache_ttl=60) # 종목/엔진 상태 Hash (파이프라인 조회 + 무효화 구독 캐시)
         
         self.setup_routes()
+        self.app.on_cleanup.append(self.on_cleanup)
+        
+    async def on_cleanup(self, app):
+        # 종료 시 공유 aiohttp 세션 / 상태 캐시 구독 정리
+        await self.engine.close()
+        await self.state.close()
         
     def setup_routes(self):
         self.app.router.add_get('/', self.serve_dashboard)
@@ -48,6 +63,8 @@ class DashboardServer:
         self.app.router.add_get('/api/chart/{market}/{ticker}', self.get_chart_data)
         self.app.router.add_get('/api/system/telemetry', self.get_system_telemetry)
         self.app.router.add_get('/api/system/health', self.get_system_health)
+        self.app.router.add_get('/api/state/tickers', self.get_ticker_states)
+        self.app.router.add_get('/api/state/engine/{name}', self.get_engine_state)
 
     async def serve_dashboard(self, request):
         path = Path(__file__).parent / "mts_supreme_v4_ultimate.html"
@@ -55,13 +72,59 @@ class DashboardServer:
             return web.Response(text=f.read(), content_type='text/html')
 
     async def get_chart_data(self, request):
+        # ?start=&end=(epoch 초/ISO) &points=500 &method=lttb|minmax &interval=day|minute &since=(마지막 수신 시각, 그 봉부터 재전송 → 클라이언트가 마지막 봉 교체)
         market = request.match_info['market']
         ticker = request.match_info['ticker']
-        # 차트 데이터 반환 (구현 필요)
-        return web.json_response({"ticker": ticker, "market": market, "data": []})
+        q = request.query
+        try:
+            chart = await asyncio.to_thread(
+                self.charts.query, market, ticker,
+                start=q.get("start"), end=q.get("end"), points=int(q.get("points", CHART_POINTS)),
+                method=q.get("method", "lttb"), since=q.get("since"), interval=q.get("interval", "day"))
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        if chart is None:
+            return web.json_response({"ticker": ticker, "market": market, "data": {}}, status=404)
+
+        headers = {"ETag": chart["etag"], "Cache-Control": "no-cache"}
+        if chart["etag"] in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+        response = web.json_response(chart, headers=headers)
+        response.enable_compression()
+        return response
+
+    async def get_ticker_states(self, request):
+        # ?tickers=005930,000660 (없으면 레이더 타겟 전체) → 파이프라인 1회 왕복 (캐시 적중분 제외)
+        tickers = [t for t in request.query.get("tickers", "").split(",") if t]
+        if not tickers:
+            target_file = Path(ROOT_DIR) / "daily_target_list.csv"
+            if target_file.exists():
+                df = pd.read_csv(target_file, dtype=str)
+                column = "Ticker" if "Ticker" in df.columns else "ticker"
+                tickers = df[column].tolist() if column in df.columns else []
+        fields = [f for f in request.query.get("fields", "").split(",") if f] or None
+        try:
+            states = await self.state.get_many("ticker", [normalize_ticker(t) for t in tickers], fields)
+        except Exception:
+            states = {}
+        return web.json_response({"tickers": states, "cache": self.state.stats})
+
+    async def get_engine_state(self, request):
+        try:
+            state = await self.state.get("engine", request.match_info['name'])
+        except Exception:
+            state = {}
+        return web.json_response(state)
 
     async def get_system_telemetry(self, request):
-        return web.json_response({"cpu": 0, "memory": 0, "uptime": "0s"})
+        # 구간별 지연시간 (런처/감시자 프로세스가 Redis에 게시한 히스토그램 병합)
+        latency = await load_summary(self.redis)
+        ticker = request.query.get("ticker")
+        if ticker:
+            latency["tickers"] = {ticker: latency["tickers"].get(ticker, {})}
+        # 감시자 등급별 데드라인 준수 현황
+        scan = await load_scan_stats(self.redis)
+        return web.json_response({"cpu": 0, "memory": 0, "uptime": "0s", "latency": latency, "scan": scan})
 
     async def get_system_health(self, request):
         return web.json_response({"status": "healthy", "services": {"scanner": "active", "trader": "active"}})
@@ -82,7 +145,9 @@ class DashboardServer:
         enriched = {}
         for t, p in self.wallet.positions.items():
             try:
-                price_info = self.kis_virtual.get_price(t, market=p.get("market", "KR"))
+                market = p.get("market", "KR")
+                quote = self.quotes.get(t, max_age=FRESH_SECONDS)
+                price_info = kis_price_output(quote, market) if quote else self.kis_virtual.get_price(t, market=market)
                 p["current_price"] = float(price_info.get("stck_prpr", price_info.get("last", p["avg_price"])))
                 p["profit_pct"] = round(((p["current_price"] / p["avg_price"]) - 1) * 100, 2)
             except:
@@ -99,7 +164,11 @@ class DashboardServer:
 
     async def get_ticker_intelligence(self, request):
         ticker = request.match_info['ticker']
-        analysis = await self.engine.analyze(ticker, ticker)
+        # 일부 소스가 실패한 분석은 응답만 하고 캐시하지 않음 (다음 요청에서 재수집)
+        analysis = await self.intelligence_cache.get_or_fetch(
+            ticker, "analysis", lambda: self.engine.analyze(ticker, ticker),
+            cacheable=UltraIntelligenceEngine.is_complete
+        )
         return web.json_response(analysis)
 
     async def get_market_radar(self, request):
@@ -117,7 +186,7 @@ class DashboardServer:
             async for message in pubsub.listen():
                 if message['type'] == 'message':
                     data = json.loads(message['data'])
-                    self.intelligence_cache[data['ticker']] = data
+                    await self.intelligence_cache.put(data['ticker'], "broadcast", data)
         except: pass
 
     async def keep_alive_task(self):
@@ -136,6 +205,7 @@ class DashboardServer:
 
     async def start(self):
         asyncio.create_task(self.redis_listener())
+        await self.state.start() # 상태 캐시 무효화 구독
         asyncio.create_task(self.keep_alive_task()) # Start Keep-Alive
         runner = web.AppRunner(self.app)
         await runner.setup()
@@ -147,7 +217,10 @@ class DashboardServer:
         site = web.TCPSite(runner, host, port)
         await site.start()
         print(f"🚀 Scuderia Terminal active at: http://{host}:{port}")
-        while True: await asyncio.sleep(3600)
+        try:
+            while True: await asyncio.sleep(3600)
+        finally:
+            await runner.cleanup()
 
 if __name__ == "__main__":
     if os.name == 'nt': asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -72,6 +72,39 @@ class DatabaseManager:
         conn.commit()
         conn.close()
 
+    def get_candles(self, ticker, start=None, end=None):
+        """분봉 데이터 조회 (시간순, 차트용) - start/end는 포함 범위"""
+        query = 'SELECT timestamp, open, high, low, close, volume FROM candle_minutes WHERE ticker = ?'
+        params = [ticker]
+        if start is not None:
+            query += ' AND timestamp >= ?'
+            params.append(str(start))
+        if end is not None:
+            query += ' AND timestamp <= ?'
+            params.append(str(end))
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(query + ' ORDER BY timestamp', params)
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+    def get_candle_version(self, ticker):
+        """
+        분봉 변경 감지용 (개수, 마지막 시각, 마지막 기록 rowid, 마지막 봉 OHLCV) - 기본키 인덱스 + 마지막 행 1건
+        - INSERT OR REPLACE는 기존 행을 지우고 새 rowid로 다시 넣으므로 어느 봉을 고쳐 써도 MAX(rowid)가 바뀜
+        - 마지막 봉 값: 진행 중인 봉을 UPDATE로 갱신하는 경우까지 감지
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*), MAX(timestamp), MAX(rowid) FROM candle_minutes WHERE ticker = ?', (ticker,))
+        row = cursor.fetchone()
+        cursor.execute('SELECT open, high, low, close, volume FROM candle_minutes WHERE ticker = ? '
+                       'ORDER BY timestamp DESC LIMIT 1', (ticker,))
+        bar = cursor.fetchone() or ()
+        conn.close()
+        return tuple(row) + tuple(bar)
+
     def get_recent_ticks(self, ticker, limit=100):
         """최근 틱 데이터 조회 (AI 학습용)"""
         conn = sqlite3.connect(self.db_path)
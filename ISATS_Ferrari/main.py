@@ -8,20 +8,24 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.append(current_dir)
 
-from core.auto_market_scanner import AutoScanner
-from core.watchers import SniperAgent, ScoutAgent, PatrolAgent
+from core.lazy_import import LazyImport
+from core.watchers import TierScheduler
 from core.system_monitor import SystemMonitor
 
+# 스캐너(패턴 인덱스 / Deep Insight 포함)는 타겟 리스트가 없을 때만 임포트
+AutoScanner = LazyImport("core.auto_market_scanner", "AutoScanner")
+
 # ==========================================
 # ISATS Main Engine
 # 역할: 시스템 초기화 및 감시 에이전트 실행 조율
 # ==========================================
 
 class MainEngine:
-    def __init__(self):
+    def __init__(self, polls_per_sec=20.0):
         """기본 설정 및 모니터 초기화"""
         self.target_file = "daily_target_list.csv"
         self.targets = {'S': [], 'A': [], 'B': []}
+        self.polls_per_sec = polls_per_sec  # 시세 조회 API 예산 (초당)
         self.monitor = SystemMonitor()
 
     def initialize(self):
@@ -47,40 +51,38 @@ class MainEngine:
         return self._load_targets()
 
     def _load_targets(self):
-        """리스트에서 등급별 전술적 타겟 분배"""
+        """리스트에서 등급별 초기 타겟 분배 (이후 등급은 스케줄러가 실시간 조정)"""
         try:
             if not os.path.exists(self.target_file):
                  raise FileNotFoundError("타겟 파일 부재")
                  
-            df = pd.read_csv(self.target_file)
-            # Tier 분배 규정 (Top 3: S, 4~10: A, 이후: B)
-            self.targets['S'] = df.iloc[:3]['Ticker'].tolist()
-            self.targets['A'] = df.iloc[3:10]['Ticker'].tolist()
-            self.targets['B'] = df.iloc[10:20]['Ticker'].tolist()
+            df = pd.read_csv(self.target_file, encoding='utf-8-sig')
+            df.columns = [c.lower() for c in df.columns]
+            records = [
+                {'ticker': row['ticker'], 'score': row.get('score', 0), 'market': row.get('market', 'KR')}
+                for _, row in df.iterrows()
+            ]
+            # 초기 Tier 분배 (Top 3: S, 4~10: A, 나머지 전체: B)
+            self.targets['S'] = records[:3]
+            self.targets['A'] = records[3:10]
+            self.targets['B'] = records[10:]
             
             print(f"✅ 타겟 로드 완료: S({len(self.targets['S'])}), A({len(self.targets['A'])}), B({len(self.targets['B'])})")
             return True
         except Exception as e:
             print(f"❌ 타겟 파일 분석 실패: {e}. 기본 관찰 종목으로 전환합니다.")
-            self.targets['S'] = ["005930.KS"] # 예시 (삼성전자)
+            self.targets['S'] = [{'ticker': "005930.KS", 'score': 0, 'market': 'KR'}] # 예시 (삼성전자)
             return True
 
     async def run_loop(self):
-        """등급별 전술 에이전트 병렬 기동"""
-        print("[Engine] 전술 에이전트 그룹(Sniper, Scout, Patrol) 기동 중...")
+        """통합 스케줄러 기동 (S/A/B 단일 우선순위 큐)"""
+        print("[Engine] 통합 스케줄러(Sniper/Scout/Patrol 통합) 기동 중...")
         
-        # 등급별 특화 에이전트 인스턴스 생성
-        sniper = SniperAgent(self.targets['S'])
-        scout = ScoutAgent(self.targets['A'])
-        patrol = PatrolAgent(self.targets['B'])
+        # 전 종목을 하나의 힙에서 등급별 주기로 관리 (승격/강등 시 주기 즉시 변경)
+        scheduler = TierScheduler(self.targets, polls_per_sec=self.polls_per_sec)
         
         try:
-            # 병렬 감시 시작
-            await asyncio.gather(
-                sniper.run(),
-                scout.run(),
-                patrol.run()
-            )
+            await scheduler.run()
         except KeyboardInterrupt:
             print("\n[Engine] 중단 요청 수신. 안전 종료 절차를 시작합니다.")
 
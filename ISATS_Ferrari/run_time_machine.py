@@ -29,11 +29,20 @@ def start_mission():
         days_back = int(days_input)
     except:
         days_back = 730
+    
+    # 4. 재학습 주기 (1 = 매일 1샘플 재학습, k > 1이면 k일마다 최근 20개 윈도우로 묶어 재학습 → 빠르지만 결과가 다름)
+    try:
+        retrain_every = max(1, int(input("   🔁 재학습 주기 (일, 기본: 1): ") or "1"))
+    except ValueError:
+        retrain_every = 1
         
     print(f"\n   ⚙️ 설정 확인: {ticker_input} / {days_back}일 간의 {'탄력적' if mode_input == '2' else '표준'} 생존 훈련")
     
-    # 4. 훈련 개시
-    pilot = TimeMachineTrainer(ticker=ticker_input, market="KR")
+    # 5. 훈련 개시
+    if retrain_every > 1:
+        pilot = TimeMachineTrainer(ticker=ticker_input, market="KR", retrain_every=retrain_every, finetune_window=20)
+    else:
+        pilot = TimeMachineTrainer(ticker=ticker_input, market="KR")
     
     # Elastic 모드일 경우 데이터 리샘플링 전처리 (여기서는 시뮬레이션 로직에 통합)
     if mode_input == "2":
@@ -11,6 +11,7 @@ if project_root not in sys.path:
 
 from core.signal_validator import SignalValidator
 from core.risk_manager import RiskManager
+from core.latency_tracer import tracer, STAGE_ANALYZE
 
 # ==========================================
 # Active Trading Bot
@@ -55,6 +56,11 @@ class ActiveBot:
         대상 종목에 대한 매매 신호 분석 실행
         Return: (Signal, Message, TargetProfitPercentage)
         """
+        with tracer.span(STAGE_ANALYZE, ticker):
+            return self._analyze(ticker, raw_df)
+
+    def _analyze(self, ticker, raw_df):
+        """analyze 본체 (지연시간 계측 구간)"""
         # 1. 시장 전체 리스크 판단
         status, msg = self.risk_manager.analyze_market_status()
         if status == "CRASH":
@@ -55,10 +55,22 @@ def generate_strategy_code(dna):
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.backtest_engine import run_strategy, EXIT_STOP, EXIT_TAKE, EXIT_SIGNAL
+
+# 엔진 청산 사유 → 리포트 표기
+EXIT_ACTIONS = {{EXIT_STOP: 'STOP_LOSS', EXIT_TAKE: 'TAKE_PROFIT', EXIT_SIGNAL: 'TREND_END'}}
+
+# 샤프 연율화 기준 (정규장 09:00~15:30 / 09:30~16:00 = 390분, 연 252거래일)
+SESSION_MINUTES = 390
+TRADING_DAYS = 252
+
 
 class MasterBotV4:
     """Genesis Champion Strategy"""
@@ -90,6 +102,13 @@ class MasterBotV4:
         print(f"   이평선: {{self.ma_short}}/{{self.ma_long}}")
         print(f"   익절/손절: {{self.take_profit*100:.1f}}% / {{self.stop_loss*100:.1f}}%")
     
+    def periods_per_year(self):
+        """분봉 주기 → 연간 봉 수 (예: 5분봉 = 252 × 78)"""
+        minutes = pd.Timedelta(pd.tseries.frequencies.to_offset(self.timeframe)).total_seconds() / 60
+        if minutes >= 24 * 60:
+            return TRADING_DAYS * 24 * 60 / minutes
+        return TRADING_DAYS * max(1.0, SESSION_MINUTES / minutes)
+    
     def on_tick(self, market_data):
         """
         실시간 틱 데이터 수신
@@ -177,15 +196,17 @@ class MasterBotV4:
         
         return 'HOLD'
     
-    def backtest(self, df):
+    def backtest(self, df, fee=0.0, slippage=0.0):
         """
         백테스팅
         
         Args:
             df: DataFrame with columns: Date, Open, High, Low, Close, Volume
+            fee: 편도 수수료 비율
+            slippage: 편도 슬리피지 비율
         
         Returns:
-            Dict: 백테스팅 결과
+            Dict: 백테스팅 결과 (수익률/MDD는 %, 샤프 지수 포함)
         """
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 1. 분봉 변환
@@ -206,76 +227,40 @@ class MasterBotV4:
             return {{'error': 'Not enough data'}}
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 2. 지표 계산
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        
-        df_resampled['MA_S'] = df_resampled['Close'].rolling(self.ma_short).mean()
-        df_resampled['MA_L'] = df_resampled['Close'].rolling(self.ma_long).mean()
-        df_resampled['Vol_MA'] = df_resampled['Volume'].rolling(20).mean()
-        
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 3. 백테스팅 루프
+        # 2. 백테스팅 (공용 엔진: 골든크로스 + 수급 폭발 진입,
+        #    종가 기준 손절 > 익절 > 데드크로스 청산)
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        balance = 10000.0
-        position = False
-        entry_price = 0
-        trades = []
-        
-        for i in range(self.ma_long, len(df_resampled)):
-            current = df_resampled.iloc[i]
-            prev = df_resampled.iloc[i-1]
-            
-            if not position:
-                # 매수
-                golden_cross = (current['MA_S'] > current['MA_L']) and (prev['MA_S'] <= prev['MA_L'])
-                volume_spike = current['Volume'] > current['Vol_MA'] * self.vol_factor
-                
-                if golden_cross and volume_spike:
-                    position = True
-                    entry_price = current['Close']
-            
-            else:
-                # 청산
-                pct_change = (current['Close'] - entry_price) / entry_price
-                
-                action = None
-                
-                if pct_change <= -self.stop_loss:
-                    action = 'STOP_LOSS'
-                elif pct_change >= self.take_profit:
-                    action = 'TAKE_PROFIT'
-                elif current['MA_S'] < current['MA_L']:
-                    action = 'TREND_END'
-                
-                if action:
-                    balance *= (1 + pct_change)
-                    position = False
-                    
-                    trades.append({{
-                        'entry': entry_price,
-                        'exit': current['Close'],
-                        'pnl': pct_change * 100,
-                        'action': action
-                    }})
+        params = {{
+            'ma_short': self.ma_short,
+            'ma_long': self.ma_long,
+            'take_profit': self.take_profit,
+            'stop_loss': self.stop_loss,
+            'vol_factor': self.vol_factor
+        }}
+        result = run_strategy(df_resampled, 'master_v4', params,
+                              fee=fee, slippage=slippage, initial_balance=10000.0)
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # 4. 결과 집계
+        # 3. 결과 집계
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
-        total_return = (balance - 10000.0) / 10000.0 * 100
-        win_trades = [t for t in trades if t['pnl'] > 0]
-        lose_trades = [t for t in trades if t['pnl'] <= 0]
+        index = df_resampled.index
+        close = df_resampled['Close'].values
+        trades = [{{
+            'entry_time': index[t.entry_idx],
+            'exit_time': index[t.exit_idx],
+            'entry': t.entry_price,
+            'exit': close[t.exit_idx],
+            'pnl': t.pnl * 100,
+            'action': EXIT_ACTIONS[t.reason]
+        }} for t in result.trades]
         
-        return {{
-            'total_return': round(total_return, 2),
-            'final_balance': round(balance, 2),
-            'total_trades': len(trades),
-            'win_trades': len(win_trades),
-            'lose_trades': len(lose_trades),
-            'win_rate': round(len(win_trades) / max(1, len(trades)) * 100, 2),
-            'trades': trades
-        }}
+        summary = result.summary(periods_per_year=self.periods_per_year())
+        summary['total_return'] = round(result.total_return * 100, 2)
+        summary['max_drawdown'] = round(summary['max_drawdown'] * 100, 2)
+        summary['trades'] = trades
+        return summary
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -306,6 +291,7 @@ if __name__ == "__main__":
             print(f"   최종 잔고: ${{result['final_balance']:,.2f}}")
             print(f"   총 거래: {{result['total_trades']}}회")
             print(f"   승률: {{result['win_rate']}}%")
+            print(f"   샤프: {{result['sharpe_ratio']}} / MDD: {{result['max_drawdown']}}%")
             
             break
 '''
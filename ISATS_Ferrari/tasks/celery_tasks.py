@@ -185,18 +185,55 @@ def train_models(model_type: str = 'all') -> Dict:
 # 📈 Task 4: 백테스팅
 # ==========================================
 
+# 챔피언 DNA가 없을 때 사용할 기본 파라미터 (전략별 키 전체)
+DEFAULT_BACKTEST_PARAMS = {
+    # golden_cross / master_v4
+    'ma_short': 5,
+    'ma_long': 20,
+    'take_profit': 0.10,
+    'stop_loss': 0.05,
+    'vol_factor': 1.5,
+    # active_bot (strategy/active_bot.py 표준값)
+    'rsi_period': 14,
+    'rsi_buy': 30,
+    'rsi_sell': 70,
+    'tp_rate': 0.05,
+    'sl_rate': 0.02
+}
+
+
+def _load_backtest_params() -> Dict:
+    """챔피언 DNA(brain/genesis_champion.json) 기반 전략 파라미터"""
+    import json
+    
+    params = dict(DEFAULT_BACKTEST_PARAMS)
+    dna_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "brain", "genesis_champion.json")
+    if os.path.exists(dna_path):
+        with open(dna_path, "r") as f:
+            dna = json.load(f)
+        params.update({k: dna[k] for k in params if k in dna})
+    return params
+
+
 @app.task(name='tasks.run_backtest')
-def run_backtest(strategy: str, start_date: str, end_date: str) -> Dict:
+def run_backtest(strategy: str, start_date: str, end_date: str, tickers: List[str] = None,
+                 market: str = 'KR', params: Dict = None,
+                 fee: float = 0.00015, slippage: float = 0.0005) -> Dict:
     """
-    백테스팅 실행
+    백테스팅 실행 (core/backtest_engine.py)
     
     Args:
-        strategy: 전략명
+        strategy: 전략명 (golden_cross / master_v4 / active_bot)
         start_date: 시작일 (YYYY-MM-DD)
         end_date: 종료일 (YYYY-MM-DD)
+        tickers: 대상 종목 (None이면 data/<market>의 전체 종목)
+        market: 시장 (KR/US)
+        params: 전략 파라미터 (빠진 키는 챔피언 DNA / 기본값으로 채움)
+        fee: 편도 수수료 비율
+        slippage: 편도 슬리피지 비율
     
     Returns:
-        Dict: 백테스팅 결과
+        Dict: 백테스팅 결과 (종목 평균 수익률/샤프/MDD)
     """
     print(f"\n{'='*80}")
     print(f"📈 백테스팅 시작: {strategy}")
@@ -204,17 +241,53 @@ def run_backtest(strategy: str, start_date: str, end_date: str) -> Dict:
     print(f"{'='*80}\n")
     
     try:
-        # 실제 구현 시 백테스팅 엔진 실행
+        import pandas as pd
+        from core.backtest_engine import STRATEGIES, run_strategy
+        
+        if strategy not in STRATEGIES:
+            return {'status': 'error', 'message': f"Unknown strategy: {strategy} (supported: {', '.join(STRATEGIES)})"}
+        params = dict(_load_backtest_params(), **(params or {}))
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", market)
+        if tickers:
+            files = [os.path.join(data_dir, f"{t}.csv") for t in tickers]
+        else:
+            files = sorted(os.path.join(data_dir, f) for f in os.listdir(data_dir) if f.endswith('.csv'))
+        
+        summaries = {}
+        for path in files:
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path, parse_dates=['Date'], index_col='Date').sort_index()
+            df = df.loc[start_date:end_date]
+            if len(df) <= params['ma_long']:
+                continue
+            ticker = os.path.basename(path)[:-4]
+            summaries[ticker] = run_strategy(df, strategy, params, fee=fee, slippage=slippage).summary()
+        
+        if not summaries:
+            return {'status': 'error', 'message': f'No data for {start_date} ~ {end_date}'}
+        
+        ranked = sorted(summaries.items(), key=lambda kv: kv[1]['total_return'], reverse=True)
+        count = len(summaries)
         result = {
             'status': 'success',
             'strategy': strategy,
             'period': f"{start_date} ~ {end_date}",
-            'total_return': 0.15,  # 15% (예시)
-            'sharpe_ratio': 1.5,
-            'max_drawdown': -0.10
+            'params': params,
+            'tickers': count,
+            'total_return': round(sum(s['total_return'] for s in summaries.values()) / count, 4),
+            'sharpe_ratio': round(sum(s['sharpe_ratio'] for s in summaries.values()) / count, 3),
+            'max_drawdown': round(sum(s['max_drawdown'] for s in summaries.values()) / count, 4),
+            'worst_drawdown': min(s['max_drawdown'] for s in summaries.values()),
+            'total_trades': sum(s['total_trades'] for s in summaries.values()),
+            'win_rate': round(
+                sum(s['win_trades'] for s in summaries.values()) /
+                max(1, sum(s['total_trades'] for s in summaries.values())) * 100, 2),
+            'best': [{'ticker': t, **s} for t, s in ranked[:5]],
+            'worst': [{'ticker': t, **s} for t, s in ranked[-5:]]
         }
         
-        print(f"\n✅ 백테스팅 완료: {result}")
+        print(f"\n✅ 백테스팅 완료: {count}개 종목, 평균 수익률 {result['total_return']*100:.2f}%")
         return result
     
     except Exception as e:
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+import sys
+import types
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_server
+from api_server import ConnectionManager
+from core.stream_publisher import encode_frame
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(message))
+
+    async def close(self):
+        pass
+
+
+class FakePubSub:
+    def __init__(self, frames):
+        self.frames = frames
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        for frame in self.frames:
+            yield {"type": "message", "data": frame}
+
+
+def fake_redis(frames):
+    client = types.SimpleNamespace(pubsub=lambda: FakePubSub(frames))
+    return types.SimpleNamespace(from_url=lambda *a, **k: client)
+
+
+def test_batch_frame_delivers_every_log(monkeypatch):
+    frame = encode_frame([
+        ["09:00:01", "S", "005930", 71500, 3, "난기류 경고"],
+        ["09:00:01", "S", "005930", 71500, 1, "신경망 BUY"],
+    ])
+
+    async def scenario():
+        manager = ConnectionManager()
+        monkeypatch.setattr(api_server, "manager", manager)
+        monkeypatch.setattr(api_server, "redis", fake_redis([frame]))
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        await api_server.redis_listener()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        manager.disconnect(ws)
+        return ws.sent, manager.stats()
+
+    sent, stats = asyncio.run(scenario())
+    logs = [p["data"]["message"] for p in sent if p["type"] == "log"]
+    assert logs == ["난기류 경고", "신경망 BUY"]
+    assert [p["type"] for p in sent] == ["log", "log", "ai_signal"]
+    assert stats["coalesced"] == 0 and stats["dropped"] == 0
+
+
+def test_state_packets_merge_only_when_backlogged():
+    async def scenario():
+        manager = ConnectionManager(max_queue_depth=8)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.3)
+        await manager.connect(fast)
+        await manager.connect(slow)
+        for channel in manager.active_connections.values():
+            channel.stall_after = 0.1
+
+        await manager.broadcast_packet({"type": "price", "data": {"ticker": "005930", "price": 0}})
+        await asyncio.sleep(0.15)               # slow: 첫 전송이 stall_after 초과
+        for i in range(1, 4):
+            await manager.broadcast_packet({"type": "price", "data": {"ticker": "005930", "price": i}})
+            await manager.broadcast_packet({"type": "log", "data": {"ticker": "005930", "message": str(i)}})
+        await asyncio.sleep(1.5)
+        manager.disconnect(fast)
+        manager.disconnect(slow)
+        return fast.sent, slow.sent
+
+    fast, slow = asyncio.run(scenario())
+    assert [p["data"].get("price") for p in fast if p["type"] == "price"] == [0, 1, 2, 3]
+    # 밀린 클라이언트: 시세는 최신값 하나로 병합, 로그는 모두 전달
+    assert [p["data"]["price"] for p in slow if p["type"] == "price"] == [0, 3]
+    assert [p["data"]["message"] for p in slow if p["type"] == "log"] == ["1", "2", "3"]
+
+
+def test_overflow_drops_state_before_events():
+    async def scenario():
+        channel = api_server.ClientChannel(FakeWebSocket(), max_depth=3)
+        channel.push("a", ("price", "A"))
+        channel.push("l1")
+        channel.push("b", ("price", "B"))
+        channel.push("l2")                      # 초과 → 가장 오래된 상태 메시지 폐기
+        channel.push("b2", ("price", "B"))      # 가득 참 → 병합
+        return [channel.pop() for _ in range(len(channel.queue))], channel.dropped, channel.coalesced
+
+    messages, dropped, coalesced = asyncio.run(scenario())
+    assert messages == ["l1", "b2", "l2"]
+    assert dropped == 1 and coalesced == 1
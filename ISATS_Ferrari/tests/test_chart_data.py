@@ -0,0 +1,128 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chart_data import ChartStore, bucket_ohlcv, lttb_indices, parse_time
+from database.database_manager import DatabaseManager
+
+
+def ohlcv(n, start='2015-01-01', seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'Date': pd.bdate_range(start, periods=n),
+        'Open': close * (1 + rng.normal(0, 0.003, n)),
+        'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(1, 10_000, n).astype(float),
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / "data" / "KR").mkdir(parents=True)
+    return ChartStore(data_dir=tmp_path / "data", db_path=tmp_path / "db" / "experience.db")
+
+
+def write_csv(store, df, ticker="005930"):
+    path = store.data_dir / "KR" / f"{ticker}.csv"
+    out = df.copy()
+    out['Date'] = out['Date'].dt.strftime('%Y-%m-%d')
+    out.to_csv(path, index=False)
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10 ** 9,) * 2)   # 같은 초 안의 재기록도 버전 변경
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    n = 1000
+    x = np.arange(n)
+    y = np.sin(np.linspace(0, 6 * np.pi, n))
+    y[437] = 25.0                                      # 단일 급등
+    idx = lttb_indices(x, y, 100)
+
+    assert len(idx) == 100 and idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 437 in idx
+    assert lttb_indices(x, y, n).tolist() == list(range(n))
+    assert lttb_indices(x, y, 2).tolist() == [0, n - 1]
+
+
+def test_minmax_buckets_match_groupby():
+    df = ohlcv(1003)
+    out = bucket_ohlcv(df, 50)
+
+    groups = np.repeat(np.arange(50), np.diff(np.append(np.linspace(0, 1003, 51).astype(int)[:-1], 1003)))
+    naive = df.groupby(groups).agg(Date=('Date', 'first'), Open=('Open', 'first'), High=('High', 'max'),
+                                   Low=('Low', 'min'), Close=('Close', 'last'), Volume=('Volume', 'sum'))
+    pd.testing.assert_frame_equal(out.reset_index(drop=True), naive.reset_index(drop=True), check_dtype=False)
+    assert out['Volume'].sum() == df['Volume'].sum()
+    assert out['High'].max() == df['High'].max() and out['Low'].min() == df['Low'].min()
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_since_cursor_resends_last_bar_and_new_bars(store, method):
+    df = ohlcv(2000)
+    write_csv(store, df.iloc[:1990])
+
+    full = store.query("KR", "005930", points=200, method=method)
+    assert len(full['data']['t']) == 200 and not full['incremental']
+    assert full['total'] == 1990
+    assert full['last'] == df['Date'].iloc[1989].value // 10 ** 9   # 마지막 원본 봉 (버킷 시작 아님)
+
+    # 새 봉 없음 → 마지막 봉만 재전송
+    same = store.query("KR", "005930", points=200, method=method, since=full['last'])
+    assert same['incremental'] and same['data']['t'] == [full['last']] and same['last'] == full['last']
+
+    # 증분 수집: 마지막 봉 덮어쓰기 + 새 봉 추가 → 수정된 마지막 봉부터 전달
+    df.loc[1989, 'Close'] *= 1.05
+    write_csv(store, df)
+    tail = store.query("KR", "005930", points=200, method=method, since=full['last'])
+    assert tail['incremental']
+    assert tail['data']['t'] == (df['Date'].iloc[1989:].astype('int64') // 10 ** 9).tolist()
+    np.testing.assert_allclose(tail['data']['close'], df['Close'].iloc[1989:].round(2))
+    assert tail['last'] == df['Date'].iloc[-1].value // 10 ** 9
+
+
+def test_parse_time_converts_offsets_to_utc():
+    utc = pd.Timestamp('2025-01-02 00:00')
+    assert parse_time('2025-01-02T09:00:00+09:00') == utc
+    assert parse_time('2025-01-02T00:00:00Z') == utc
+    assert parse_time('2025-01-02') == utc
+    assert parse_time(str(utc.value // 10 ** 9)) == utc
+    assert parse_time('') is None
+    with pytest.raises(ValueError):
+        parse_time('not-a-date')
+
+
+def test_day_etag_tracks_file_and_params(store):
+    write_csv(store, ohlcv(600))
+    a = store.query("KR", "005930.KS", points=100)
+    assert store.query("KR", "005930", points=100)['etag'] == a['etag']
+    assert store.query("KR", "005930", points=120)['etag'] != a['etag']
+    write_csv(store, ohlcv(600, seed=1))
+    assert store.query("KR", "005930", points=100)['etag'] != a['etag']
+    assert store.query("KR", "999999") is None
+
+
+def test_minute_etag_changes_when_last_bar_is_rewritten(store):
+    db = DatabaseManager(str(store.db_path))
+    t0 = datetime(2025, 1, 2, 9, 0)
+    for k in range(30):
+        db.save_candle("005930", "KR", t0 + timedelta(minutes=k), 100 + k, 101 + k, 99 + k, 100 + k, 10)
+
+    before = store.query("KR", "005930", interval="minute", points=100)
+    assert before['data']['close'][-1] == 129
+
+    # 같은 봉을 INSERT OR REPLACE로 다시 기록 (개수/마지막 시각 동일)
+    db.save_candle("005930", "KR", t0 + timedelta(minutes=29), 129, 135, 99, 133, 25)
+    after = store.query("KR", "005930", interval="minute", points=100)
+    assert after['etag'] != before['etag']
+    assert after['data']['close'][-1] == 133 and after['data']['volume'][-1] == 25
+
+    # 중간 봉 재기록도 감지
+    db.save_candle("005930", "KR", t0 + timedelta(minutes=5), 1, 1, 1, 1, 1)
+    assert store.query("KR", "005930", interval="minute", points=100)['data']['close'][5] == 1
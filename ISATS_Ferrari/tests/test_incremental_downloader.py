@@ -0,0 +1,119 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.incremental_downloader import IncrementalDownloader, append_bars, read_tail, write_full
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def bars(start, periods, seed=0, tz=None):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=periods, name='Date', tz=tz)
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame({'Open': close - 0.5, 'High': close + 1, 'Low': close - 1,
+                         'Close': close, 'Volume': rng.integers(1, 1000, periods)}, index=index)
+
+
+def load(path):
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def merged(old, new):
+    # 기대값: 겹치는 날짜는 새 값, 나머지는 이어붙임
+    frame = pd.concat([old[old.index < new.index[0]], new])
+    frame.index.name = 'Date'
+    return frame
+
+
+def test_append_replaces_last_bar_and_adds_new(tmp_path):
+    path = str(tmp_path / "AAA.csv")
+    old = bars('2024-01-01', 30)
+    write_full(path, old)
+    last_date, offset = read_tail(path)
+    assert last_date == old.index[-1]
+
+    # 마지막 저장일부터 다시 받은 응답 (마지막 봉 수정 + 새 봉 3개)
+    new = bars(old.index[-1], 4, seed=1)
+    added = append_bars(path, new, last_date, offset)
+
+    assert added == 3
+    pd.testing.assert_frame_equal(load(path), merged(old, new), check_freq=False)
+    assert read_tail(path)[0] == new.index[-1]
+
+
+def test_append_without_overlap_and_uptodate(tmp_path):
+    path = str(tmp_path / "BBB.csv")
+    old = bars('2024-01-01', 10)
+    write_full(path, old)
+    last_date, offset = read_tail(path)
+
+    assert append_bars(path, old.iloc[:5], last_date, offset) == 0   # 이전 구간만 → 변경 없음
+    pd.testing.assert_frame_equal(load(path), old, check_freq=False)
+
+    new = bars(old.index[-1] + pd.offsets.BDay(1), 2, seed=2)
+    assert append_bars(path, new, last_date, offset) == 2
+    pd.testing.assert_frame_equal(load(path), merged(old, new), check_freq=False)
+
+
+def test_torn_last_row_is_truncated_then_replaced(tmp_path):
+    path = str(tmp_path / "CCC.csv")
+    old = bars('2024-01-01', 10)
+    write_full(path, old)
+    with open(path, 'ab') as f:
+        f.write(b'2024-01-15,1.0,2.0')   # 추가 도중 중단된 행
+
+    last_date, offset = read_tail(path)
+    assert last_date == old.index[-1]
+    assert len(load(path)) == 10
+
+    new = bars(old.index[-1], 3, seed=3)
+    assert append_bars(path, new, last_date, offset) == 2
+    pd.testing.assert_frame_equal(load(path), merged(old, new), check_freq=False)
+
+
+def test_timezone_index_matches_by_local_date(tmp_path):
+    # yfinance 형식 (시간대 포함 인덱스)도 현지 날짜로 비교
+    path = str(tmp_path / "DDD.csv")
+    old = bars('2024-01-01', 10)
+    write_full(path, old)
+    last_date, offset = read_tail(path)
+
+    new = bars(old.index[-1], 3, seed=4, tz='America/New_York')
+    assert append_bars(path, new, last_date, offset) == 2
+    frame = load(path)
+    assert len(frame) == 12
+    assert frame['Close'].iloc[-3:].tolist() == pytest.approx(new['Close'].tolist())
+
+
+def test_downloader_incremental_and_resume(tmp_path):
+    full = bars('2024-01-01', 40)
+    calls = []
+
+    def fetch(symbol, start, end):
+        calls.append((symbol, pd.Timestamp(start)))
+        return full[(full.index >= pd.Timestamp(start)) & (full.index <= pd.Timestamp(end))]
+
+    downloader = IncrementalDownloader(fetch, str(tmp_path), workers=2, min_interval=0)
+    first_end = full.index[29].to_pydatetime()
+    summary = downloader.run(['AAA', 'BBB'], datetime(2024, 1, 1), end=first_end)
+    assert summary['new'] == 2
+
+    # 같은 날 재실행: 체크포인트에서 모두 완료 → 요청 없음
+    calls.clear()
+    assert downloader.run(['AAA', 'BBB'], datetime(2024, 1, 1), end=first_end)['new'] == 0
+    assert calls == []
+
+    # 다음 날: 마지막 저장일부터만 요청하고 빠진 봉만 추가
+    summary = downloader.run(['AAA', 'BBB'], datetime(2024, 1, 1), end=full.index[-1].to_pydatetime())
+    assert summary['appended'] == 2 and summary['bars'] == 20
+    assert {start for _, start in calls} == {full.index[29]}
+    for symbol in ('AAA', 'BBB'):
+        frame = load(os.path.join(tmp_path, f"{symbol}.csv"))
+        pd.testing.assert_frame_equal(frame, full, check_freq=False)
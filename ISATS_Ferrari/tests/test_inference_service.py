@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+torch = pytest.importorskip("torch")
+
+from brain.inference_service import InferenceService, ModelRunner
+from core import watchers
+
+
+class ProbeModel(torch.nn.Module):
+    """종가 평균을 확률로 돌려주고 배치 크기/실행 스레드를 기록"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def forward(self, x):
+        self.calls.append((x.shape[0], threading.get_ident()))
+        return x[:, :, 3].mean(dim=1, keepdim=True)
+
+
+@pytest.fixture
+def service():
+    service = InferenceService(max_batch=4)
+    service.register('hybrid', ModelRunner(ProbeModel(), (60, 5), 'prob', name='hybrid'))
+    return service
+
+
+def windows(n):
+    rng = np.random.default_rng(0)
+    return {f"T{k}": rng.random((60, 5), dtype=np.float32) for k in range(n)}
+
+
+def test_score_coalesces_and_runs_off_loop(service):
+    model = service.runners['hybrid'].float_model
+    inputs = windows(3)
+
+    async def main():
+        return await asyncio.gather(*(service.score('hybrid', t, w) for t, w in inputs.items()))
+
+    probs = asyncio.run(main())
+    assert model.calls[0][0] == 3                          # 3종목 → forward 1회
+    assert model.calls[0][1] != threading.get_ident()      # 이벤트 루프 스레드가 아님
+    expected = service.predict_many('hybrid', inputs)
+    assert probs == pytest.approx([expected[t] for t in inputs])
+
+
+def test_max_batch_flush_runs_off_loop(service):
+    model = service.runners['hybrid'].float_model
+    inputs = windows(6)
+
+    async def main():
+        return await asyncio.gather(*(service.score('hybrid', t, w) for t, w in inputs.items()))
+
+    assert len(asyncio.run(main())) == 6
+    assert [batch for batch, _ in model.calls] == [4, 2]   # max_batch 즉시 실행 + 나머지
+    assert all(ident != threading.get_ident() for _, ident in model.calls)
+
+
+def test_watcher_scores_through_service(service, monkeypatch):
+    model = service.runners['hybrid'].float_model
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 1, 60))
+    candles = pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1,
+                            'Close': close, 'Volume': rng.integers(1, 100, 60)})
+
+    watcher = watchers.BaseWatcher('A', [], interval=1.0)
+    watcher.qi_team = None
+    watcher.inference = service
+    watcher.buy_threshold = 0.0   # 항상 BUY
+    reports = []
+
+    async def fetch_price(ticker):
+        return 100.0
+
+    async def fetch_candle_data(ticker):
+        return candles
+
+    async def report(ticker, price, msg, signal_type="INFO"):
+        reports.append((ticker, signal_type))
+
+    monkeypatch.setattr(watcher, 'fetch_price', fetch_price)
+    monkeypatch.setattr(watcher, 'fetch_candle_data', fetch_candle_data)
+    monkeypatch.setattr(watcher, 'report', report)
+
+    targets = [{'ticker': t, 'score': 8} for t in ('AAA', 'BBB', 'CCC')]
+
+    async def main():
+        await asyncio.gather(*(watcher.analyze_target(t) for t in targets))
+
+    asyncio.run(main())
+    assert [batch for batch, _ in model.calls] == [3]
+    assert watcher.signals == {'AAA': 'BUY', 'BBB': 'BUY', 'CCC': 'BUY'}
+    assert [r for r in reports if r[1] == 'BUY'] == [('AAA', 'BUY'), ('BBB', 'BUY'), ('CCC', 'BUY')]
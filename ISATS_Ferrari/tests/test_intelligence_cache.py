@@ -0,0 +1,141 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import intelligence_cache
+from core.intelligence_cache import IntelligenceCache
+from core.qualitative_intelligence_team import QualitativeIntelligenceTeam
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(intelligence_cache.time, 'time', clock.time)
+    return clock
+
+
+@pytest.fixture
+def cache(clock):
+    return IntelligenceCache(path=None, ttls={'news': (10, 20)})
+
+
+class Upstream:
+    """호출 횟수를 세는 상류 (values를 차례로 반환, Exception이면 발생)"""
+
+    def __init__(self, *values, delay=0.01):
+        self.values = list(values)
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+def test_concurrent_misses_coalesce(cache):
+    fetch = Upstream(['a'])
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fetch('AAA', 'news', fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == [['a']] * 5
+    assert fetch.calls == 1
+    assert cache.stats['coalesced'] == 4
+
+
+def test_fresh_hit_then_stale_revalidate(cache, clock):
+    fetch = Upstream(['v1'], ['v2'])
+
+    async def main():
+        assert await cache.get_or_fetch('AAA', 'news', fetch) == ['v1']
+        clock.now += 5
+        assert await cache.get_or_fetch('AAA', 'news', fetch) == ['v1']    # 신선
+        assert fetch.calls == 1
+
+        clock.now += 10                                                    # TTL 지남, stale 구간
+        assert await cache.get_or_fetch('AAA', 'news', fetch) == ['v1']    # 이전 값 즉시 반환
+        await asyncio.gather(*cache.inflight.values())                     # 백그라운드 갱신 완료
+        assert fetch.calls == 2
+        assert await cache.get('AAA', 'news') == ['v2']
+
+    asyncio.run(main())
+    assert cache.stats['stale'] == 1
+
+
+def test_failure_is_not_cached_and_falls_back(cache, clock):
+    fetch = Upstream(['v1'], RuntimeError('down'), RuntimeError('down'), ['v2'])
+
+    async def main():
+        await cache.get_or_fetch('AAA', 'news', fetch)
+        clock.now += 100                                                   # 완전 만료
+        assert await cache.get_or_fetch('AAA', 'news', fetch) == ['v1']    # 실패 → 만료된 값
+        assert await cache.get('AAA', 'news', allow_stale=True) is None     # 실패가 갱신하지 않음
+        assert await cache.get_or_fetch('AAA', 'news', fetch) == ['v1']    # 다음 요청에서 재시도
+        assert await cache.get_or_fetch('AAA', 'news', fetch) == ['v2']
+
+    asyncio.run(main())
+    assert fetch.calls == 4
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_fetch('BBB', 'news', Upstream(RuntimeError('down'))))
+
+
+def test_uncacheable_result_is_returned_but_not_stored(cache):
+    fetch = Upstream([], [], ['n1'])
+
+    async def main():
+        for expected in ([], [], ['n1']):
+            assert await cache.get_or_fetch('AAA', 'news', fetch, cacheable=bool) == expected
+        assert await cache.get_or_fetch('AAA', 'news', fetch, cacheable=bool) == ['n1']   # 이제 캐시
+
+    asyncio.run(main())
+    assert fetch.calls == 3
+
+
+def test_team_does_not_cache_fetcher_failures(cache, monkeypatch):
+    team = QualitativeIntelligenceTeam(cache=cache)
+    calls = {'dart': [], 'news': 0}
+
+    async def disclosures(corp_code, days=7, raise_errors=False):
+        calls['dart'].append(corp_code)
+        return [{'report_nm': f'{corp_code} 수주'}]
+
+    async def news(keyword, count=10, raise_errors=False):
+        calls['news'] += 1
+        if calls['news'] == 1:
+            assert raise_errors
+            raise RuntimeError('blocked')
+        return [{'title': '실적개선', 'description': ''}]
+
+    monkeypatch.setattr(team.dart_analyzer, 'get_recent_disclosures', disclosures)
+    monkeypatch.setattr(team.news_analyzer, 'get_naver_news', news)
+
+    async def main():
+        first = await team.analyze('005930', '00126380', 72000, 'BUY')
+        second = await team.analyze('005930', '00126380', 72000, 'BUY')
+        other = await team.analyze('000660', '00164779', 120000, 'BUY')
+        unknown = await team.analyze('035720', '00000000', 50000, 'BUY')
+        return first, second, other, unknown
+
+    first, second, other, unknown = asyncio.run(main())
+    assert first['qualitative_analysis']['news_sentiment'] == 0.0          # 실패 → 빈 결과
+    assert second['qualitative_analysis']['news_sentiment'] > 0           # 실패가 캐시되지 않아 재수집
+    assert calls['dart'] == ['00126380', '00164779']                       # 종목별 키, 더미 고유번호는 조회 생략
+    assert unknown['qualitative_analysis']['disclosure_sentiment'] == 0.0
+    assert asyncio.run(cache.get('000660', 'disclosures')) == [{'report_nm': '00164779 수주'}]
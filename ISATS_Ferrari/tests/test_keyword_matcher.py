@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import keyword_matcher
+from core.keyword_matcher import KeywordMatcher
+from core.qualitative_intelligence_team import DARTAnalyzer, NewsAnalyzer
+
+
+def loop_counts(lexicons, texts):
+    """기존 구현: 라벨별 `keyword in text` 반복"""
+    return [[sum(1 for word in words if word and word in text) for words in lexicons.values()]
+            for text in texts]
+
+
+@pytest.fixture(params=["regex", "ahocorasick"])
+def backend(request, monkeypatch):
+    if request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+    monkeypatch.setattr(keyword_matcher, "HAS_AHOCORASICK", request.param == "ahocorasick")
+    return request.param
+
+
+LEXICONS = [
+    {"positive": NewsAnalyzer.POSITIVE_KEYWORDS, "negative": NewsAnalyzer.NEGATIVE_KEYWORDS},
+    {"positive": DARTAnalyzer.POSITIVE_KEYWORDS, "negative": DARTAnalyzer.NEGATIVE_KEYWORDS},
+    # 포함 / 겹침 / 라벨 간 중복 / 빈 키워드
+    {"a": ["ab", "abc", "b", "cab", ""], "b": ["bca", "ab", "c"], "c": ["abcab", "ca"]},
+    {"up": ["흑자", "흑자전환", "전환"], "down": ["자전", "환율", "흑자"]},
+]
+
+
+@pytest.mark.parametrize("lexicons", LEXICONS)
+def test_counts_match_keyword_loops(backend, lexicons):
+    words = [w for ws in lexicons.values() for w in ws if w]
+    alphabet = sorted(set("".join(words))) + [" ", "가", "x"]
+    rng = random.Random(0)
+    texts = ["", "관련 없음"] + list(words)
+    for _ in range(2000):
+        parts = [rng.choice(words) if rng.random() < 0.3 else rng.choice(alphabet) for _ in range(rng.randint(0, 12))]
+        texts.append("".join(parts))
+
+    matcher = KeywordMatcher(lexicons)
+    assert matcher.count(texts).tolist() == loop_counts(lexicons, texts)
+
+
+def test_totals_and_empty(backend):
+    matcher = KeywordMatcher({"positive": ["상승", "호재"], "negative": ["하락"]})
+    assert matcher.totals(["상승 호재", "하락 후 상승", "보합"]) == {"positive": 3, "negative": 1}
+    assert matcher.count([]).shape == (0, 2)
+    assert KeywordMatcher({"positive": []}).count(["상승"]).tolist() == [[0]]
@@ -0,0 +1,159 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pattern_index import MANIFEST_FILE, PatternIndex, _assign, _read_frame
+
+M, H = 20, 3
+LENGTHS = {"T0": 260, "T1": 200, "T2": 140, "T3": 90}
+
+
+def prices(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * (seed + 1) * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({'Date': pd.bdate_range('2020-01-01', periods=n).strftime('%Y-%m-%d'), 'Close': close})
+
+
+def write(folder, ticker, df):
+    path = folder / f"{ticker}.csv"
+    df.to_csv(path, index=False)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))   # 같은 초 안의 재기록도 mtime 변경
+
+
+@pytest.fixture
+def setup(tmp_path):
+    folder = tmp_path / "KR"
+    folder.mkdir()
+    full = {t: prices(n, k) for k, (t, n) in enumerate(LENGTHS.items())}
+    for t, df in full.items():
+        write(folder, t, df.iloc[:-30])          # 최근 30봉 이전 상태로 빌드
+    return folder, full, tmp_path / "index"
+
+
+def make(folder, index_dir, **kwargs):
+    return PatternIndex([folder], index_dir=str(index_dir), window=M, horizon=H, nlist=6, dim=8, **kwargs)
+
+
+def window_set(index):
+    """(종목, 시작 행, 시작/끝/기준 일자, 수익률) 집합 - 본 세그먼트 + 델타"""
+    metas = [np.asarray(index.meta)]
+    if index.delta_meta is not None:
+        metas.append(index.delta_meta)
+    meta = np.concatenate(metas)
+    rows = {(index.tickers[m['ticker']], int(m['start']), int(m['start_date']), int(m['end_date']),
+             int(m['fwd_date']), round(float(m['fwd_ret']), 6)) for m in meta}
+    assert len(rows) == len(meta)                # 중복 윈도우 없음
+    return rows
+
+
+def check_vectors(index, folder):
+    """저장된 벡터 = 현재 임베딩으로 원본 윈도우를 다시 투영한 값, 리스트 정렬 유지"""
+    expected = {}
+    for t in index.tickers:
+        windows, meta = index._windows(_read_frame(folder / f"{t}.csv", ['Close']), 0)
+        emb, _ = index.embedder.transform(windows)
+        expected.update({(t, int(s)): e for s, e in zip(meta['start'], emb)})
+    segments = [(np.asarray(index.vectors), np.asarray(index.meta))]
+    if index.delta_vectors is not None:
+        segments.append((index.delta_vectors, index.delta_meta))
+    for vectors, meta in segments:
+        got = np.stack([expected[(index.tickers[m['ticker']], int(m['start']))] for m in meta])
+        np.testing.assert_allclose(vectors, got, atol=1e-5)
+
+    lists = _assign(index._for_ivf(np.asarray(index.vectors)), index.centroids)
+    assert np.array_equal(lists, np.repeat(np.arange(len(index.offsets) - 1), np.diff(index.offsets)))
+
+
+def test_incremental_update_and_merge_match_full_build(setup):
+    folder, full, index_dir = setup
+    index = make(folder, index_dir, merge_ratio=10.0)
+    index.build()
+    gen = index.manifest['gen']
+
+    # 새 봉 추가 + 신규 종목 → 델타 세그먼트
+    for t, df in full.items():
+        write(folder, t, df)
+    write(folder, "T4", prices(120, 9))
+    result = index.update()
+    assert not result['merged'] and result['tickers'] == 5
+    assert index.manifest['delta'] and index.manifest['gen'] == gen
+
+    reference = make(folder, index_dir.parent / "reference")
+    reference.build()
+    assert window_set(index) == window_set(reference)
+    assert result['added'] == len(window_set(index)) - index.manifest['size']
+    check_vectors(index, folder)
+
+    # 변경 없음 → 아무것도 하지 않음
+    assert index.update() == {'added': 0, 'tickers': 0, 'merged': False}
+
+    # 장중 마지막 봉 교체 → 미완성 봉 기준 윈도우는 없었으므로 추가 없음, 결과는 새 빌드와 동일
+    full["T1"].loc[len(full["T1"]) - 1, 'Close'] *= 1.1
+    write(folder, "T1", full["T1"])
+    assert index.update()['added'] == 0
+    rebuilt = make(folder, index_dir.parent / "rebuilt")
+    rebuilt.build()
+    assert window_set(index) == window_set(rebuilt)
+
+    # 병합: 델타가 본 세그먼트로 합쳐지고 이전 세대 정리
+    index.merge_ratio = 0.0
+    more = prices(LENGTHS["T0"] + 15, 0)
+    write(folder, "T0", more)
+    full["T0"] = more
+    result = index.update()
+    assert result['merged'] and result['added'] == 15
+    assert index.manifest['gen'] == gen + 1 and index.manifest['delta'] is None
+    assert not (index_dir / f"gen_{gen}").exists()
+    assert index.delta_meta is None
+
+    reference.update()
+    assert window_set(index) == window_set(reference)
+    assert index.manifest['size'] == len(window_set(index))
+    check_vectors(index, folder)
+
+
+def test_manifest_round_trips_through_mmap_reload(setup):
+    folder, full, index_dir = setup
+    index = make(folder, index_dir, merge_ratio=10.0)
+    index.build()
+    for t, df in full.items():
+        write(folder, t, df)
+    index.update()
+
+    reloaded = PatternIndex.open_or_build([folder], index_dir=str(index_dir), window=M, horizon=H, dim=8)
+    assert reloaded.manifest == index.manifest
+    assert isinstance(reloaded.vectors, np.memmap) and isinstance(reloaded.meta, np.memmap)
+    assert (index_dir / MANIFEST_FILE).exists() and not (index_dir / (MANIFEST_FILE + ".tmp")).exists()
+    np.testing.assert_array_equal(reloaded.vectors, index.vectors)
+    np.testing.assert_array_equal(reloaded.delta_meta, index.delta_meta)
+    assert window_set(reloaded) == window_set(index)
+
+    queries = np.stack([full["T0"]['Close'].to_numpy()[i:i + M] for i in (10, 100, 200)])
+    assert reloaded.query(queries, top_k=5, nprobe=6) == index.query(queries, top_k=5, nprobe=6)
+    # 자기 자신 구간이 최상위 (nprobe = 전체 리스트)
+    top = reloaded.query(queries[1:2], top_k=1, nprobe=6)[0]['matches'][0]
+    assert top['ticker'] == "T0" and top['start'] == full["T0"]['Date'][100]
+
+    # 재로드한 인스턴스로 이어서 증분 갱신
+    write(folder, "T1", prices(LENGTHS["T1"] + 10, 1))
+    assert reloaded.update()['added'] == 10
+
+
+def test_changed_history_triggers_full_rebuild(setup):
+    folder, full, index_dir = setup
+    index = make(folder, index_dir)
+    index.build()
+    gen = index.manifest['gen']
+
+    write(folder, "T2", full["T2"].iloc[5:-30])   # 앞부분 삭제 (재수집 / 수정주가)
+    result = index.update()
+    assert 'windows' in result and index.manifest['gen'] == gen + 1
+    reference = make(folder, index_dir.parent / "reference")
+    reference.build()
+    assert window_set(index) == window_set(reference)
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pattern_search import PatternSearchEngine
+
+M = 20
+
+
+@pytest.fixture
+def price_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    folder = tmp_path / "KR"
+    folder.mkdir()
+    for k, n in enumerate((300, 180, 90, 15)):   # 길이가 다른 종목 (마지막은 창보다 짧음)
+        close = 1000 * (k + 1) * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        if k == 1:
+            close[50:80] = close[50]             # 가격 변동 없는 구간
+        dates = pd.bdate_range('2020-01-01', periods=n)
+        pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'), 'Close': close}).to_csv(folder / f"T{k}.csv", index=False)
+    return folder
+
+
+def naive_correlations(engine, query):
+    out = np.full((len(engine.tickers), engine.closes.shape[1] - M + 1), -np.inf)
+    for k, n in enumerate(engine.lengths):
+        x = engine.closes[k, :n]
+        for i in range(n - M + 1):
+            window = x[i:i + M]
+            if window.std() > 1e-8 * abs(window.mean()):
+                out[k, i] = np.corrcoef(query, window)[0, 1]
+    return out
+
+
+def test_correlations_match_naive_loop(price_dir):
+    engine = PatternSearchEngine([price_dir]).load()
+    rng = np.random.default_rng(1)
+    for query in (engine.closes[0, 100:100 + M], 50 + np.cumsum(rng.normal(0, 1, M))):
+        fast = engine.correlations(query)
+        slow = naive_correlations(engine, query)
+        assert fast.shape == slow.shape
+        np.testing.assert_array_equal(np.isfinite(fast), np.isfinite(slow))
+        np.testing.assert_allclose(fast[np.isfinite(fast)], slow[np.isfinite(slow)], atol=1e-9)
+
+    # 자기 자신 구간은 상관계수 1
+    assert engine.correlations(engine.closes[0, 100:100 + M])[0, 100] == pytest.approx(1.0)
+    # 변동 없는 질의는 전부 제외
+    assert np.isneginf(engine.correlations(np.full(M, 5.0))).all()
+
+
+def test_search_matches_naive_ranking(price_dir):
+    engine = PatternSearchEngine([price_dir], horizon=5).load()
+    query = engine.closes[0, 200:200 + M]
+    before = pd.Timestamp(np.datetime64(int(engine.dates[0, 200]), 'D'))
+    result = engine.search(query, top_k=5, before=before)
+
+    corr = naive_correlations(engine, query)
+    zone = M // 2
+    expected, taken = [], {}
+    for flat in np.argsort(-corr, axis=None, kind='stable'):
+        k, i = divmod(int(flat), corr.shape[1])
+        fwd = i + M - 1 + 5
+        if not np.isfinite(corr[k, i]) or fwd >= engine.lengths[k] or engine.dates[k, fwd] >= engine.dates[0, 200]:
+            continue
+        if any(abs(i - j) < zone for j in taken.get(k, ())):
+            continue
+        taken.setdefault(k, []).append(i)
+        expected.append((engine.tickers[k], i, engine.closes[k, fwd] / engine.closes[k, i + M - 1] - 1))
+        if len(expected) == 5:
+            break
+
+    got = [(m['ticker'], m['start'], m['forward_return']) for m in result['matches']]
+    assert [g[0] for g in got] == [e[0] for e in expected]
+    assert [g[1] for g in got] == [str(np.datetime64(int(engine.dates[engine.tickers.index(t)][i]), 'D'))
+                                   for t, i, _ in expected]
+    np.testing.assert_allclose([g[2] for g in got], [e[2] for e in expected])
+    assert all(m['end'] < str(before.date()) for m in result['matches'])
+
+
+def test_cache_reloads_changed_csv(price_dir):
+    first = PatternSearchEngine([price_dir]).load()
+    assert (price_dir / "_pattern" / "closes.npz").exists()
+
+    path = price_dir / "T2.csv"
+    df = pd.read_csv(path)
+    df['Close'] *= 2
+    df.to_csv(path, index=False)
+    os.utime(path, (1, 1))
+
+    second = PatternSearchEngine([price_dir]).load()
+    k = second.tickers.index("T2")
+    np.testing.assert_allclose(second.closes[k, :90], first.closes[k, :90] * 2)
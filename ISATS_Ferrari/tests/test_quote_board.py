@@ -0,0 +1,133 @@
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+import uuid
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.quote_board import QuoteBoard, QuoteFeed, load_universe
+
+
+@pytest.fixture
+def board():
+    board = QuoteBoard.create(name=f"isats_test_{uuid.uuid4().hex[:8]}", capacity=16)
+    yield board
+    board.close()
+
+
+def test_publish_and_read_across_attachments(board):
+    reader = QuoteBoard.attach(board.shm.name)
+    try:
+        assert reader.get("005930") is None
+        board.publish("005930.KS", 71500, volume=1.2e7, change_pct=1.2)
+        board.publish("AAPL", 190.5)
+
+        quote = reader.get("005930")            # 새 슬롯은 count 증가로 반영
+        assert quote['price'] == 71500 and quote['volume'] == 1.2e7 and quote['seq'] == 1
+        assert reader.get_price("aapl") == 190.5
+        board.publish("005930", 71600)
+        assert reader.get("005930.KQ")['seq'] == 2
+        assert sorted(reader.tickers) == ["005930", "AAPL"]
+        assert reader.get("AAPL", max_age=-1) is None   # 오래된 시세는 None
+    finally:
+        reader.close()
+
+
+def test_reader_rejects_record_being_written(board):
+    board.publish("005930", 71500)
+    slot = board.slot("005930")
+    seq = int(board.seqs[slot])
+
+    board.seqs[slot] = seq + 1                  # 기록 중 (홀수)
+    board.quotes[slot]['price'] = 99999
+    assert board.get("005930") is None
+
+    board.seqs[slot] = seq + 2                  # 기록 완료
+    assert board.get("005930")['price'] == 99999
+
+
+def _writer(name, n):
+    board = QuoteBoard.attach(name)
+    try:
+        for i in range(1, n + 1):
+            board.publish("TORN", i, bid=i, ask=i, volume=i, change_pct=i)
+    finally:
+        board.close()
+
+
+def test_concurrent_writer_never_yields_torn_record(board):
+    board.publish("TORN", 0, bid=0, ask=0, volume=0, change_pct=0)
+    process = mp.get_context("fork").Process(target=_writer, args=(board.shm.name, 200_000))
+    process.start()
+    last_seq, reads = 0, 0
+    try:
+        while process.is_alive() or reads == 0:
+            quote = board.get("TORN")
+            if quote is None:
+                continue
+            fields = {quote['price'], quote['bid'], quote['ask'], quote['volume'], quote['change_pct']}
+            assert len(fields) == 1                 # 한 번의 기록에서 나온 값만
+            assert quote['seq'] >= last_seq         # 갱신 횟수는 단조 증가
+            last_seq = quote['seq']
+            reads += 1
+    finally:
+        process.join()
+    assert board.get("TORN")['price'] == 200_000
+
+
+class FakeOverseas:
+    def __init__(self, listed):
+        self.listed = listed
+        self.calls = []
+
+    def get_price(self, ticker, exchange="NAS"):
+        self.calls.append((ticker, exchange))
+        if self.listed.get(ticker) == exchange:
+            return {"last": "450.5", "tvol": "1000", "rate": "0.5"}
+        return {"last": "", "tvol": "", "rate": ""}
+
+
+class FakeClient:
+    def __init__(self, listed):
+        self.overseas_stock = FakeOverseas(listed)
+
+    def get_price(self, ticker, market="KR"):
+        raise AssertionError("미국 종목은 거래소 코드로 조회해야 함")
+
+
+def test_feed_uses_exchange_per_ticker(board):
+    client = FakeClient({"SPY": "NYS", "WMT": "NYS", "QQQ": "NAS"})
+    feed = QuoteFeed(client, board, min_interval=0)
+
+    assert feed.poll("SPY", "US", "NYS")
+    assert feed.poll("QQQ", "US", "NAS")
+    assert client.overseas_stock.calls == [("SPY", "NYS"), ("QQQ", "NAS")]
+
+    # 거래소 미상: NAS에서 시세가 없으면 다음 거래소로, 찾은 거래소는 기억
+    assert feed.poll("WMT", "US")
+    assert feed.poll("WMT", "US")
+    assert client.overseas_stock.calls[2:] == [("WMT", "NAS"), ("WMT", "NYS"), ("WMT", "NYS")]
+    assert board.get_price("WMT") == 450.5
+    assert not feed.poll("NOPE", "US")
+
+
+def test_universe_includes_launcher_targets(tmp_path):
+    wallet = tmp_path / "wallet.json"
+    wallet.write_text(json.dumps({"positions": {"005930.KS": {"market": "KR"}, "IWM": {"market": "US"}}}))
+
+    universe = {t: (m, e) for t, m, e in load_universe(str(tmp_path / "missing.csv"), str(wallet))}
+    assert universe["005930"] == ("KR", None)          # 타겟 파일 없음 → 국내 기본 목록
+    assert universe["SPY"] == ("US", "NYS") and universe["VOO"] == ("US", "NYS")
+    assert universe["AAPL"] == ("US", "NAS")
+    assert universe["IWM"] == ("US", None)
+
+    targets = tmp_path / "targets.csv"
+    targets.write_text("Ticker,market\n000660.KS,KR\nSPY,US\nWMT,US\n")
+    universe = {t: (m, e) for t, m, e in load_universe(str(targets), str(wallet))}
+    assert universe["000660"] == ("KR", None) and "035420" not in universe
+    assert universe["SPY"] == ("US", "NYS") and universe["WMT"] == ("US", None)
+    assert universe["QQQ"] == ("US", "NAS")
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.state_store import StateStore
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __getattr__(self, name):
+        method = getattr(self.server, name)
+        return lambda *args, **kwargs: self.commands.append((method, args, kwargs))
+
+    async def execute(self):
+        self.server.round_trips += 1
+        return [method(*args, **kwargs) for method, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Hash / EXPIRE / PUBLISH만 흉내내는 인메모리 서버 (만료는 expire_now로 수동 발생)"""
+    def __init__(self):
+        self.data, self.ttls, self.published = {}, {}, []
+        self.round_trips = 0
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def expire(self, key, ttl):
+        if key not in self.data:
+            return False
+        self.ttls[key] = ttl
+        return True
+
+    def delete(self, key):
+        self.ttls.pop(key, None)
+        return int(self.data.pop(key, None) is not None)
+
+    def publish(self, channel, message):
+        self.published.append(message)
+        return 0
+
+    def expire_now(self, key):
+        self.delete(key)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_partial_writes_send_only_changed_fields():
+    server = FakeRedis()
+    state = StateStore(server)
+    assert run(state.update("ticker", "005930", {"price": 71500, "signal": "BUY"})) == 2
+    assert run(state.update("ticker", "005930", {"price": 71500, "signal": "BUY"})) == 0
+    trips = server.round_trips
+    assert run(state.update("ticker", "005930", {"price": 71600, "signal": "BUY"})) == 1
+    assert server.round_trips == trips + 1
+    assert run(state.get("ticker", "005930")) == {"price": 71600, "signal": "BUY"}
+
+
+def test_expired_key_is_rewritten_with_same_values():
+    server = FakeRedis()
+    state = StateStore(server)
+    fields = {"price": 71500, "signal": "BUY", "rank": "S"}
+    run(state.update("ticker", "005930", fields, ttl=30))
+    assert server.ttls["state:ticker:005930"] == 30
+
+    # TTL 만료 후 같은 값 기록 → EXPIRE 응답으로 소실 감지, 전체 재전송
+    server.expire_now("state:ticker:005930")
+    assert run(state.update("ticker", "005930", fields, ttl=30)) == 3
+    assert run(state.get("ticker", "005930")) == fields
+    assert server.ttls["state:ticker:005930"] == 30
+
+    # 만료 후 일부 필드만 바뀐 경우에도 불완전한 Hash가 남지 않음
+    server.expire_now("state:ticker:005930")
+    run(state.update("ticker", "005930", dict(fields, price=72000), ttl=30))
+    assert run(state.get("ticker", "005930")) == dict(fields, price=72000)
+
+
+def test_deleted_key_is_rewritten_on_next_change_or_resync():
+    server = FakeRedis()
+    state = StateStore(server, resync_interval=0.05)
+    run(state.update("engine", "ferrari", {"status": "RUNNING", "cash": 100}))
+
+    # 타 프로세스 삭제 / Redis 재시작: 다음 변경 시 EXISTS 응답으로 감지
+    server.data.clear()
+    run(state.update("engine", "ferrari", {"status": "RUNNING", "cash": 101}))
+    assert run(state.get("engine", "ferrari")) == {"status": "RUNNING", "cash": 101}
+
+    # 값이 그대로면 재전송 주기 경과 후 전체 재전송
+    server.data.clear()
+    assert run(state.update("engine", "ferrari", {"status": "RUNNING", "cash": 101})) == 0
+    run(asyncio.sleep(0.06))
+    assert run(state.update("engine", "ferrari", {"status": "RUNNING", "cash": 101})) == 2
+    assert run(state.get("engine", "ferrari")) == {"status": "RUNNING", "cash": 101}
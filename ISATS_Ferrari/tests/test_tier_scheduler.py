@@ -0,0 +1,103 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.watchers import TierScheduler
+
+
+def make_scheduler(monkeypatch, analyze, **kwargs):
+    targets = {'S': [{'ticker': 'FAST', 'market': 'KR'}], 'B': [{'ticker': 'SLOW', 'market': 'KR'}]}
+    scheduler = TierScheduler(targets, tier_intervals={'S': 0.05, 'A': 0.1, 'B': 10.0}, **kwargs)
+
+    async def setup():
+        pass
+
+    async def teardown():
+        await scheduler.publisher.flush()
+
+    monkeypatch.setattr(scheduler, '_setup', setup)
+    monkeypatch.setattr(scheduler, '_teardown', teardown)
+    monkeypatch.setattr(scheduler, 'analyze_target', analyze)
+    return scheduler
+
+
+async def run_for(scheduler, seconds):
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(seconds)
+    scheduler.is_active = False
+    await asyncio.wait_for(task, 2.0)
+
+
+def test_slow_poll_does_not_stall_other_tiers(monkeypatch):
+    polls = []
+
+    async def analyze(target):
+        polls.append((target['ticker'], time.monotonic()))
+        if target['ticker'] == 'SLOW':
+            await asyncio.sleep(0.6)             # 정성 분석 등 느린 조회
+
+    async def scenario():
+        scheduler = make_scheduler(monkeypatch, analyze)
+        await run_for(scheduler, 0.5)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    fast = [t for ticker, t in polls if ticker == 'FAST']
+    assert [ticker for ticker, _ in polls].count('SLOW') == 1
+    assert len(fast) >= 6                        # 0.05초 주기가 느린 조회 동안에도 유지
+    assert max(b - a for a, b in zip(fast, fast[1:])) < 0.2
+    assert not scheduler.polling                 # 종료 시 진행 중 조회 정리
+
+
+def test_promotion_during_poll_repolls_once_finished(monkeypatch):
+    active, overlaps, polls, ctx = set(), [], [], {}
+
+    async def analyze(target):
+        ticker = target['ticker']
+        if ticker in active:
+            overlaps.append(ticker)
+        active.add(ticker)
+        polls.append(ticker)
+        try:
+            if ticker == 'SLOW' and polls.count('SLOW') == 1:
+                await ctx['scheduler'].request_promotion('SLOW', 'S', 'test')
+                await asyncio.sleep(0.2)
+        finally:
+            active.discard(ticker)
+
+    async def scenario():
+        ctx['scheduler'] = scheduler = make_scheduler(monkeypatch, analyze)
+        await run_for(scheduler, 0.5)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert not overlaps                          # 같은 종목을 동시에 조회하지 않음
+    assert polls.count('SLOW') >= 3              # 승격 후 S급 주기로 재조회
+    assert scheduler.entries['SLOW']['rank'] == 'S'
+
+
+def test_reports_flush_on_timer(monkeypatch):
+    flushes, ctx = [], {}
+
+    async def analyze(target):
+        await ctx['scheduler'].report(target['ticker'], 100.0, 'tick')
+        if target['ticker'] == 'SLOW':
+            await asyncio.sleep(10)
+
+    async def scenario():
+        ctx['scheduler'] = scheduler = make_scheduler(monkeypatch, analyze, flush_interval=0.1)
+        scheduler.publisher.redis = object()     # 버퍼 적재만 확인
+
+        async def flush():
+            flushes.append(len(scheduler.publisher.buffer))
+            scheduler.publisher.buffer.clear()
+
+        monkeypatch.setattr(scheduler.publisher, 'flush', flush)
+        await run_for(scheduler, 0.55)
+
+    asyncio.run(scenario())
+    assert len(flushes) >= 4                     # 느린 조회가 끝나지 않아도 주기 전송
+    assert sum(flushes) > 0
@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+torch = pytest.importorskip("torch")
+
+from brain.time_machine import TimeMachineTrainer
+
+SEQ = 60
+
+
+@pytest.fixture
+def price_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 260
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    df = pd.DataFrame({
+        'Date': pd.bdate_range('2024-01-02', periods=n).strftime('%Y-%m-%d'),
+        'Open': close * 0.995, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': rng.integers(100_000, 1_000_000, n),
+    })
+    path = tmp_path / "TEST.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def _trainer(path, **kwargs):
+    torch.manual_seed(0)
+    trainer = TimeMachineTrainer(ticker="TEST", **kwargs)
+    trainer.data_path = str(path)
+    return trainer
+
+
+def _reference_predictions(trainer, start_offset):
+    """기존 구현: DataFrame.iloc로 매일 샘플 1개를 만들어 학습 후 1건씩 예측"""
+    total = trainer.load_and_prepare_data()
+    data = trainer.df_norm.values
+    start_idx = total - start_offset
+
+    def fit(X, y, steps):
+        trainer.model.train()
+        for _ in range(steps):
+            trainer.optimizer.zero_grad()
+            loss = trainer.criterion(trainer.model(torch.FloatTensor(np.array(X))), torch.FloatTensor(y).unsqueeze(1))
+            loss.backward()
+            trainer.optimizer.step()
+
+    base = range(max(0, start_idx - 365) + SEQ, start_idx - 1)
+    fit([data[i - SEQ:i] for i in base], [float(data[i + 1][3] > data[i][3]) for i in base], 10)
+
+    preds = []
+    for t in range(start_idx, total - 1):
+        prev = t - 1
+        fit([data[prev - SEQ:prev]], [float(data[t][3] > data[prev][3])], 1)
+        trainer.model.eval()
+        with torch.no_grad():
+            x = torch.FloatTensor(trainer.df_norm.iloc[t - SEQ:t].values).unsqueeze(0)
+            preds.append(trainer.model(x).item())
+    return preds
+
+
+def test_samples_match_iloc_construction(price_csv):
+    trainer = _trainer(price_csv)
+    trainer.load_and_prepare_data()
+    data = trainer.df_norm.values
+    idx = np.arange(SEQ + 1, len(data) - 1)
+
+    X, y = trainer._samples(idx)
+    assert np.allclose(X.numpy(), np.stack([data[i - SEQ:i] for i in idx]))
+    assert np.array_equal(y.numpy()[:, 0], (data[idx + 1, 3] > data[idx, 3]).astype(np.float32))
+
+
+def test_daily_schedule_reproduces_per_day_predictions(price_csv, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # 결과 CSV 저장 위치
+    expected = _reference_predictions(_trainer(price_csv), start_offset=40)
+
+    trainer = _trainer(price_csv, retrain_every=1, finetune_window=1, finetune_epochs=1)
+    trainer.run_simulation(start_idx_offset=40)
+    assert [h['AI_Score'] for h in trainer.history] == pytest.approx(expected, abs=1e-6)
+
+    # 기본값 = 기존 매일 재학습 방식
+    default = _trainer(price_csv)
+    default.run_simulation(start_idx_offset=40)
+    assert [h['AI_Score'] for h in default.history] == pytest.approx(expected, abs=1e-6)
+
+
+def test_batched_schedule_covers_every_day(price_csv, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    trainer = _trainer(price_csv, retrain_every=5, finetune_window=20)
+    trainer.run_simulation(start_idx_offset=40)
+    assert len(trainer.history) == 39
+    assert all(0.0 <= h['AI_Score'] <= 1.0 for h in trainer.history)
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# finrl_ensemble은 미설치 시 pip 설치를 시도하므로 먼저 확인
+pytest.importorskip("gym")
+pytest.importorskip("stable_baselines3")
+
+from stable_baselines3 import PPO
+from stable_baselines3.common.env_checker import check_env
+
+from brain.finrl_ensemble import StockTradingEnv, VecStockTradingEnv
+
+
+def _frames(lengths=(50, 80, 65), seed=0):
+    rng = np.random.default_rng(seed)
+    return [pd.DataFrame({'Close': 100 + rng.standard_normal(n).cumsum(), 'Volume': rng.random(n)})
+            for n in lengths]
+
+
+def test_sub_environment_passes_check_env():
+    vec = VecStockTradingEnv(_frames())
+    check_env(vec.envs[1], warn=False)
+
+
+def test_env_method_dispatches_per_index():
+    dfs = _frames()
+    vec = VecStockTradingEnv(dfs)
+    vec.reset()
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        vec.step(rng.uniform(-1, 1, (3, 1)).astype(np.float32))
+
+    obs = vec.env_method('_get_observation')
+    assert np.allclose(np.stack(obs), vec._get_observation())
+    assert vec.get_attr('n_steps') == [50, 80, 65]
+
+    # 종목 2만 한 스텝 → 같은 상태의 단일 환경과 결과 동일, 다른 종목 상태는 그대로
+    single = StockTradingEnv(dfs[2])
+    for name in ('balance', 'holdings', 'current_step', 'total_asset'):
+        setattr(single, name, vec.get_attr(name, [2])[0])
+    action = np.array([0.7], dtype=np.float32)
+    (obs_vec, reward_vec, _, _), = vec.env_method('step', action, indices=[2])
+    obs_single, reward_single, _, _ = single.step(action)
+    assert np.allclose(obs_vec, obs_single) and reward_vec == reward_single
+    assert vec.current_step.tolist() == [10, 10, 11]
+
+    vec.set_attr('balance', 1234.0, indices=[0])
+    vec.env_method('reset', indices=[1])
+    assert vec.balance[0] == 1234.0 and vec.current_step.tolist() == [10, 0, 11]
+
+
+def test_ppo_learns_on_vec_env():
+    vec = VecStockTradingEnv(_frames())
+    PPO('MlpPolicy', vec, n_steps=16, batch_size=24, n_epochs=1, verbose=0).learn(48)
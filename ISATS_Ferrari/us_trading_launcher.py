@@ -32,6 +32,8 @@ import pandas as pd
 
 # ISATS 모듈 임포트
 from core.kis_official_api import KISUnifiedClient
+from core.quote_board import QuoteReader, FRESH_SECONDS, kis_price_output
+from core.target_universe import US_TARGETS  # 시세 공급 프로세스와 공유
 
 # 로깅 설정
 os.makedirs(os.path.join(current_dir, "logs"), exist_ok=True)
@@ -49,30 +51,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# ================================================================================
-# 🇺🇸 미국 시장 타겟 종목
-# ================================================================================
-
-US_TARGETS = {
-    "S": [  # S급 - 핵심 대형주
-        {"ticker": "AAPL", "name": "Apple", "exchange": "NAS"},
-        {"ticker": "MSFT", "name": "Microsoft", "exchange": "NAS"},
-        {"ticker": "NVDA", "name": "NVIDIA", "exchange": "NAS"},
-    ],
-    "A": [  # A급 - 성장주
-        {"ticker": "GOOGL", "name": "Alphabet", "exchange": "NAS"},
-        {"ticker": "AMZN", "name": "Amazon", "exchange": "NAS"},
-        {"ticker": "META", "name": "Meta", "exchange": "NAS"},
-        {"ticker": "TSLA", "name": "Tesla", "exchange": "NAS"},
-    ],
-    "B": [  # B급 - ETF 및 기타
-        {"ticker": "SPY", "name": "S&P 500 ETF", "exchange": "NYS"},
-        {"ticker": "QQQ", "name": "NASDAQ 100 ETF", "exchange": "NAS"},
-        {"ticker": "VOO", "name": "Vanguard S&P 500", "exchange": "NYS"},
-    ],
-}
-
-
 # ================================================================================
 # 🕐 미국 시장 시간 체커
 # ================================================================================
@@ -142,6 +120,7 @@ class USAutoTradingEngine:
         
         self.positions = {}
         self.trade_history = []
+        self.quotes = QuoteReader()  # 공유 시세판 (시세 공급 프로세스 실행 시 API 호출 대체)
     
     async def initialize(self) -> bool:
         """엔진 초기화"""
@@ -175,8 +154,12 @@ class USAutoTradingEngine:
         name = stock["name"]
         
         try:
-            # 현재가 조회
-            price_data = self.client.overseas_stock.get_price(ticker, exchange)
+            # 현재가 조회 (공유 시세판 우선)
+            quote = self.quotes.get(ticker, max_age=FRESH_SECONDS)
+            if quote:
+                price_data = kis_price_output(quote, market="US")
+            else:
+                price_data = self.client.overseas_stock.get_price(ticker, exchange)
             
             if not price_data:
                 return {"signal": "HOLD", "reason": "가격 조회 실패"}
@@ -0,0 +1,123 @@
+"""
+⏱️ ISATS Import-Time Benchmark
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+역할:
+- 진입점(main, 감시자, 런처, Celery 워커, 대시보드)별 콜드 스타트 시간 측정
+- 진입점마다 새 인터프리터에서 모듈만 임포트 (실행 X) → 반복 측정 후 중앙값
+- python -X importtime 출력을 집계해 최상위 패키지별 누적 임포트 시간 상위 N개 표시
+
+사용 예:
+    python utils/import_benchmark.py                    # 전체 진입점, 5회
+    python utils/import_benchmark.py main core.watchers --repeat 10 --json reports/import_time.json
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 진입점 이름 → 임포트할 모듈
+ENTRY_POINTS: Dict[str, str] = {
+    'main': 'main',
+    'watchers': 'core.watchers',
+    'auto_trading_launcher': 'auto_trading_launcher',
+    'us_trading_launcher': 'us_trading_launcher',
+    'celery_worker': 'tasks.celery_tasks',
+    'dashboard': 'dashboard.server',
+}
+
+
+def _parse_importtime(stderr: str) -> Dict[str, float]:
+    """
+    -X importtime 출력 → 최상위 패키지별 누적 시간(ms)
+    - 들여쓰기가 없는 줄(다른 모듈이 임포트하지 않은 최초 임포트)만 합산 → 중복 없음
+    """
+    totals: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        if name.startswith('  '):
+            continue
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0.0) + int(cumulative) / 1000
+    return totals
+
+
+def measure(module: Optional[str], repeat: int = 5, timeout: float = 300) -> Dict:
+    """
+    모듈 1개 콜드 임포트 측정 (None이면 빈 인터프리터 기동 시간)
+
+    Returns:
+        Dict: wall_ms(중앙값) / min_ms / import_ms / top(패키지별 ms) / error
+    """
+    code = f"import importlib; importlib.import_module({module!r})" if module else "pass"
+    cmd = [sys.executable, '-X', 'importtime', '-c', code]
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    walls, packages = [], {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+                              encoding='utf-8', errors='replace', timeout=timeout)
+        walls.append((time.perf_counter() - start) * 1000)
+        if proc.returncode != 0:
+            lines = [l for l in proc.stderr.splitlines() if not l.startswith('import time:')]
+            return {'module': module, 'error': lines[-1] if lines else f"exit {proc.returncode}"}
+        packages = _parse_importtime(proc.stderr)   # 마지막 실행 기준 (캐시 워밍 후)
+
+    return {
+        'module': module,
+        'wall_ms': statistics.median(walls),
+        'min_ms': min(walls),
+        'import_ms': sum(packages.values()),
+        'top': dict(sorted(packages.items(), key=lambda kv: -kv[1])),
+        'error': None,
+    }
+
+
+def run(names: List[str], repeat: int = 5, top: int = 8) -> Dict[str, Dict]:
+    results = {'(interpreter)': measure(None, repeat)}
+    base = results['(interpreter)']['wall_ms']
+    print(f"\n{'='*80}")
+    print(f"⏱️ Import-Time Benchmark ({repeat}회 중앙값, 인터프리터 기동 {base:,.0f}ms 포함)")
+    print(f"{'='*80}")
+    for name in names:
+        result = measure(ENTRY_POINTS.get(name, name), repeat)
+        results[name] = result
+        if result['error']:
+            print(f"❌ {name:22s} 임포트 실패: {result['error']}")
+            continue
+        heaviest = ', '.join(f"{p} {ms:,.0f}" for p, ms in list(result['top'].items())[:top])
+        print(f"📦 {name:22s} {result['wall_ms']:8,.0f}ms (최소 {result['min_ms']:,.0f} | 임포트 {result['import_ms']:,.0f})")
+        print(f"   └ {heaviest}")
+    print(f"{'='*80}\n")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ISATS 진입점별 콜드 스타트 임포트 시간 측정")
+    parser.add_argument('entries', nargs='*', default=list(ENTRY_POINTS),
+                        help=f"진입점 이름 또는 모듈 경로 (기본: {', '.join(ENTRY_POINTS)})")
+    parser.add_argument('--repeat', type=int, default=5, help="진입점별 반복 횟수")
+    parser.add_argument('--top', type=int, default=8, help="표시할 무거운 패키지 수")
+    parser.add_argument('--json', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = run(args.entries, args.repeat, args.top)
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
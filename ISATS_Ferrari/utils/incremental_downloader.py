@@ -0,0 +1,273 @@
+"""
+📥 ISATS Incremental Downloader
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+역할:
+- 종목 CSV의 마지막 저장일만 읽어(파일 끝부분) 빠진 구간만 요청
+- 새 봉만 CSV 끝에 추가 (마지막 봉은 다시 받아 교체 → 장중 미완성 봉 보정)
+- 제한된 스레드 풀 동시 다운로드 + 재시도(지수 백오프) + 요청 간격 제한
+- 체크포인트(JSON): 중단된 야간 수집은 완료된 종목을 건너뛰고 이어서 실행
+
+사용 예:
+    downloader = IncrementalDownloader(fetch_fn, "data/KR", workers=8)
+    downloader.run(symbols, default_start=datetime(2021, 1, 1))
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from tqdm import tqdm
+
+CHECKPOINT_FILE = "_download_checkpoint.json"
+TAIL_BYTES = 64 * 1024
+
+
+# ==========================================
+# CSV 저장소 (파일 끝 읽기 / 추가)
+# ==========================================
+
+def _naive_dates(index) -> pd.DatetimeIndex:
+    """시간대 포함 인덱스 → 현지 날짜 기준 tz-naive 날짜"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def read_tail(path: str) -> Tuple[Optional[pd.Timestamp], int]:
+    """
+    CSV 마지막 데이터 행의 날짜와 그 행의 시작 위치
+    - 끝이 줄바꿈으로 끝나지 않으면(추가 도중 중단) 미완성 행을 잘라냄
+
+    Returns:
+        (마지막 날짜 또는 None, 마지막 행 시작 오프셋)
+    """
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return None, 0
+        f.seek(max(0, size - TAIL_BYTES))
+        data = f.read()
+
+        if not data.endswith(b'\n'):
+            cut = data.rfind(b'\n')
+            if cut < 0:
+                return None, size
+            size -= len(data) - cut - 1
+            f.truncate(size)
+            data = data[:cut + 1]
+
+        lines = data.split(b'\n')[:-1]
+        if len(lines) < 2 and size > len(data):
+            # 마지막 한 줄이 TAIL_BYTES보다 긴 경우 (비정상 파일)
+            return None, size
+        last = lines[-1]
+        start = size - len(last) - 1
+        if start == 0:
+            return None, size   # 헤더만 있음
+        try:
+            date = _naive_dates([last.split(b',')[0].decode().strip()])[0]
+        except (ValueError, UnicodeDecodeError):
+            return None, size
+        return date, start
+
+
+def read_header(path: str) -> List[str]:
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return f.readline().strip().split(',')
+
+
+def write_full(path: str, df: pd.DataFrame):
+    """전체 저장 (임시 파일 → 교체)"""
+    tmp = path + ".tmp"
+    df.to_csv(tmp)
+    os.replace(tmp, path)
+
+
+def append_bars(path: str, df: pd.DataFrame, last_date: pd.Timestamp, last_offset: int) -> int:
+    """
+    last_date 이후(당일 포함) 봉을 기존 CSV 끝에 반영
+    - 받은 데이터에 last_date 봉이 있으면 기존 마지막 행을 잘라내고 새 값으로 교체
+
+    Returns:
+        새로 추가된 봉 수 (교체된 마지막 봉 제외)
+    """
+    dates = _naive_dates(df.index)
+    df = df[dates >= last_date]
+    if df.empty:
+        return 0
+    dates = _naive_dates(df.index)
+
+    columns = read_header(path)[1:]
+    df = df.reindex(columns=columns)
+    with open(path, 'rb+') as f:
+        if dates[0] == last_date:
+            f.truncate(last_offset)
+        f.seek(0, os.SEEK_END)
+        f.write(df.to_csv(header=False, lineterminator='\n').encode('utf-8'))
+    return int((dates > last_date).sum())
+
+
+# ==========================================
+# 동시 다운로드 + 체크포인트
+# ==========================================
+
+class IncrementalDownloader:
+    """증분 / 재개 가능 / 동시 시세 다운로더"""
+
+    def __init__(
+        self,
+        fetch: Callable[[str, datetime, datetime], pd.DataFrame],
+        store_dir: str,
+        workers: int = 8,
+        retries: int = 3,
+        backoff: float = 1.0,
+        min_interval: float = 0.05,
+        checkpoint_path: Optional[str] = None
+    ):
+        """
+        Args:
+            fetch: (종목, 시작일, 종료일) → DatetimeIndex 시세 DataFrame
+            store_dir: 종목별 CSV 저장 폴더
+            workers: 동시 다운로드 수
+            retries: 실패 시 재시도 횟수
+            backoff: 재시도 대기 기본값(초, 2배씩 증가 + 지터)
+            min_interval: 요청 시작 간 최소 간격(초, 전체 스레드 공유) - API 제한 방지
+        """
+        self.fetch = fetch
+        self.store_dir = store_dir
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.min_interval = min_interval
+        self.checkpoint_path = checkpoint_path or os.path.join(store_dir, CHECKPOINT_FILE)
+        self._rate_lock = threading.Lock()
+        self._next_request = 0.0
+        os.makedirs(store_dir, exist_ok=True)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 체크포인트
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _load_checkpoint(self, run_id: str) -> Dict:
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('run_id') == run_id:
+                    return state
+            except (ValueError, OSError):
+                pass
+        return {'run_id': run_id, 'done': {}, 'failed': {}}
+
+    def _save_checkpoint(self, state: Dict):
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, self.checkpoint_path)
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 종목 1개 처리
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def _throttle(self):
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _fetch_with_retry(self, symbol: str, start: datetime, end: datetime) -> pd.DataFrame:
+        for attempt in range(self.retries + 1):
+            self._throttle()
+            try:
+                return self.fetch(symbol, start, end)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def update_symbol(self, symbol: str, default_start: datetime, end: datetime, incremental: bool = True) -> Tuple[str, int]:
+        """
+        Returns:
+            (상태, 추가된 봉 수) - 상태: new | appended | uptodate | empty
+        """
+        path = os.path.join(self.store_dir, f"{symbol}.csv")
+        last_date, last_offset = (None, 0)
+        if incremental and os.path.exists(path):
+            last_date, last_offset = read_tail(path)
+
+        if last_date is None:
+            df = self._fetch_with_retry(symbol, default_start, end)
+            if df is None or df.empty:
+                return 'empty', 0
+            write_full(path, df)
+            return 'new', len(df)
+
+        # 마지막 저장일부터 다시 요청 (마지막 봉 교체 + 새 봉 추가)
+        df = self._fetch_with_retry(symbol, last_date.to_pydatetime(), end)
+        if df is None or df.empty:
+            return 'uptodate', 0
+        added = append_bars(path, df, last_date, last_offset)
+        return ('appended' if added else 'uptodate'), added
+
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    # 전체 실행
+    # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    def run(self, symbols: List[str], default_start: datetime, end: Optional[datetime] = None,
+            incremental: bool = True, desc: str = "Download", checkpoint_every: int = 20) -> Dict:
+        """
+        Args:
+            symbols: 종목 리스트
+            default_start: 저장 파일이 없는 종목의 시작일
+            end: 종료일 (None이면 현재, 같은 날 재실행은 체크포인트에서 이어서 진행)
+            incremental: False면 전 종목 전체 재다운로드
+
+        Returns:
+            Dict: 상태별 종목 수 + 추가 봉 수
+        """
+        end = end or datetime.now()
+        run_id = f"{end.strftime('%Y-%m-%d')}|{'inc' if incremental else 'full'}"
+        state = self._load_checkpoint(run_id)
+        todo = [s for s in dict.fromkeys(symbols) if s not in state['done']]
+        if len(todo) < len(symbols):
+            print(f"♻️ [Resume] 체크포인트에서 이어서 진행: {len(symbols) - len(todo)}개 완료, {len(todo)}개 남음")
+
+        summary = {'new': 0, 'appended': 0, 'uptodate': 0, 'empty': 0, 'failed': 0, 'bars': 0}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.update_symbol, s, default_start, end, incremental): s for s in todo}
+            try:
+                for k, future in enumerate(tqdm(as_completed(futures), total=len(futures), desc=desc), 1):
+                    symbol = futures[future]
+                    try:
+                        status, added = future.result()
+                        state['done'][symbol] = status
+                        state['failed'].pop(symbol, None)
+                        summary[status] += 1
+                        summary['bars'] += added
+                    except Exception as e:
+                        state['failed'][symbol] = str(e)[:200]
+                        summary['failed'] += 1
+                    if k % checkpoint_every == 0:
+                        self._save_checkpoint(state)
+            except KeyboardInterrupt:
+                for f in futures:
+                    f.cancel()
+                raise
+            finally:
+                self._save_checkpoint(state)
+
+        print(f"✅ [{desc}] 신규 {summary['new']:,} | 갱신 {summary['appended']:,} (+{summary['bars']:,}봉) | "
+              f"최신 {summary['uptodate']:,} | 빈 응답 {summary['empty']:,} | 실패 {summary['failed']:,}")
+        return summary
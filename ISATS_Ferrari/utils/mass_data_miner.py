@@ -1,11 +1,12 @@
 import os
-import time
-import pandas as pd
+import sys
 import FinanceDataReader as fdr
 import yfinance as yf
-from tqdm import tqdm
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.incremental_downloader import IncrementalDownloader
+
 # ==========================================
 # ⛏️ Operation: Mass Mining (대규모 데이터 채굴)
 # ==========================================
@@ -74,41 +75,29 @@ def get_us_tickers(limit=500):
         print(f"   ⚠️ 미국 종목 리스트 가져오기 실패: {e}")
         return []
 
-def download_and_save(tickers, market_code):
-    """야후 파이낸스에서 데이터 다운로드 및 CSV 저장"""
-    print(f"\n⬇️ [{market_code}] 데이터 다운로드 시작 (기간: {START_DATE_STR} ~ 현재)...")
+def fetch_ohlcv(ticker, start, end):
+    """야후 파이낸스 일봉 (OHLCV만)"""
+    # yf.download는 결과를 모듈 전역(shared._DFS)에 기록하므로 스레드 풀에서 종목 간 결과가 섞임
+    # → 종목별 Ticker 객체로 조회 (download와 같은 미수정 종가)
+    df = yf.Ticker(ticker).history(start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"),
+                                   interval='1d', auto_adjust=False)
+    if df.empty:
+        return df
     
-    success_count = 0
-    fail_count = 0
+    # 필요한 컬럼만 선택 (시간대는 IncrementalDownloader가 정리)
+    return df[['Open', 'High', 'Low', 'Close', 'Volume']]
+
+def download_and_save(tickers, market_code, incremental=True, workers=8):
+    """야후 파이낸스에서 데이터 다운로드 및 CSV 저장 (기존 파일은 마지막 저장일 이후만 추가)"""
+    print(f"\n⬇️ [{market_code}] 데이터 다운로드 시작 (기간: {START_DATE_STR} ~ 현재, {'증분' if incremental else '전체'})...")
     
-    # 진행바 표시
-    pbar = tqdm(tickers, desc=f"Mining {market_code}", unit="stock")
+    # yfinance의 end는 당일 미포함 → 내일까지 요청
+    downloader = IncrementalDownloader(fetch_ohlcv, os.path.join(DATA_DIR, market_code), workers=workers)
+    summary = downloader.run(tickers, START_DATE, END_DATE + timedelta(days=1),
+                             incremental=incremental, desc=f"Mining {market_code}")
     
-    for ticker in pbar:
-        try:
-            save_path = os.path.join(DATA_DIR, market_code, f"{ticker}.csv")
-            
-            # 데이터 다운로드 (progress=False로 개별 로그 숨김)
-            df = yf.download(ticker, start=START_DATE_STR, progress=False, threads=False)
-            
-            if df.empty:
-                fail_count += 1
-                continue
-            
-            # 컬럼 정리 (MultiIndex 문제 해결)
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            
-            # 필요한 컬럼만 선택 및 저장
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
-            df.to_csv(save_path)
-            
-            success_count += 1
-            
-        except Exception as e:
-            fail_count += 1
-
-    print(f"✅ [{market_code}] 완료! 성공: {success_count}, 실패: {fail_count}")
+    success_count = summary['new'] + summary['appended'] + summary['uptodate']
+    print(f"✅ [{market_code}] 완료! 성공: {success_count}, 실패: {summary['failed'] + summary['empty']}")
     return success_count
 
 def run_miner():
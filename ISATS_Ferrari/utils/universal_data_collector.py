@@ -7,6 +7,8 @@
 - 한국 전 종목 리스트 수집 (KOSPI, KOSDAQ)
 - 5년치 일봉 데이터 자동 다운로드
 - CSV 파일로 저장 (data/US/, data/KR/)
+- 증분 갱신: 종목별 마지막 저장일 이후만 받아 추가 (utils/incremental_downloader.py)
+- 동시 다운로드 + 재시도 + 체크포인트 재개
 
 작성자: ISATS Neural Swarm
 버전: 6.0 (Universal Data Collector)
@@ -15,10 +17,8 @@
 
 import os
 import sys
-import time
 import pandas as pd
 from datetime import datetime, timedelta
-from tqdm import tqdm
 
 # 프로젝트 루트 경로
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -47,6 +47,18 @@ except ImportError:
     import FinanceDataReader as fdr
     HAS_FDR = True
 
+from utils.incremental_downloader import IncrementalDownloader
+
+
+def _fetch_us(symbol, start, end):
+    """yfinance 일봉 (종료일 미포함)"""
+    return yf.Ticker(symbol).history(start=start, end=end, interval='1d')
+
+
+def _fetch_kr(symbol, start, end):
+    """FinanceDataReader 일봉"""
+    return fdr.DataReader(symbol, start=start.strftime('%Y-%m-%d'), end=end.strftime('%Y-%m-%d'))
+
 
 # ==========================================
 # 🌎 Universal Data Collector
@@ -153,48 +165,26 @@ class UniversalDataCollector:
             print("❌ 미국 종목 리스트 수집 실패")
             return pd.DataFrame()
     
-    def download_us_data(self, stock_list, max_stocks=None):
+    def download_us_data(self, stock_list, max_stocks=None, incremental=True, workers=8):
         """
         미국 종목 데이터 다운로드
         
         Args:
             stock_list: DataFrame (Symbol, Name, Exchange)
             max_stocks: 최대 다운로드 종목 수 (None이면 전체)
+            incremental: True면 저장된 마지막 날짜 이후만 추가, False면 전체 재다운로드
+            workers: 동시 다운로드 수
         """
         print(f"\n{'='*80}")
-        print(f"📥 미국 종목 데이터 다운로드 중...")
+        print(f"📥 미국 종목 데이터 다운로드 중... ({'증분' if incremental else '전체'})")
         print(f"{'='*80}\n")
         
         if max_stocks:
             stock_list = stock_list.head(max_stocks)
         
-        success_count = 0
-        fail_count = 0
-        
-        for idx, row in tqdm(stock_list.iterrows(), total=len(stock_list), desc="US Stocks"):
-            symbol = row['Symbol']
-            
-            try:
-                # yfinance로 다운로드
-                ticker = yf.Ticker(symbol)
-                df = ticker.history(start=self.start_date, end=self.end_date, interval='1d')
-                
-                if len(df) > 0:
-                    # 저장
-                    file_path = os.path.join(self.us_dir, f"{symbol}.csv")
-                    df.to_csv(file_path)
-                    success_count += 1
-                else:
-                    fail_count += 1
-                
-                # API 제한 방지
-                time.sleep(0.1)
-            
-            except Exception as e:
-                fail_count += 1
-                continue
-        
-        print(f"\n✅ 다운로드 완료: {success_count:,}개 성공, {fail_count:,}개 실패")
+        downloader = IncrementalDownloader(_fetch_us, self.us_dir, workers=workers)
+        return downloader.run(stock_list['Symbol'].tolist(), self.start_date, self.end_date,
+                              incremental=incremental, desc="US Stocks")
     
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # 한국 종목
@@ -261,63 +251,40 @@ class UniversalDataCollector:
             print("❌ 한국 종목 리스트 수집 실패")
             return pd.DataFrame()
     
-    def download_kr_data(self, stock_list, max_stocks=None):
+    def download_kr_data(self, stock_list, max_stocks=None, incremental=True, workers=8):
         """
         한국 종목 데이터 다운로드
         
         Args:
             stock_list: DataFrame (Symbol, Name, Market)
             max_stocks: 최대 다운로드 종목 수 (None이면 전체)
+            incremental: True면 저장된 마지막 날짜 이후만 추가, False면 전체 재다운로드
+            workers: 동시 다운로드 수
         """
         print(f"\n{'='*80}")
-        print(f"📥 한국 종목 데이터 다운로드 중...")
+        print(f"📥 한국 종목 데이터 다운로드 중... ({'증분' if incremental else '전체'})")
         print(f"{'='*80}\n")
         
         if max_stocks:
             stock_list = stock_list.head(max_stocks)
         
-        success_count = 0
-        fail_count = 0
-        
-        for idx, row in tqdm(stock_list.iterrows(), total=len(stock_list), desc="KR Stocks"):
-            symbol = row['Symbol']
-            
-            try:
-                # FinanceDataReader로 다운로드
-                df = fdr.DataReader(
-                    symbol,
-                    start=self.start_date.strftime('%Y-%m-%d'),
-                    end=self.end_date.strftime('%Y-%m-%d')
-                )
-                
-                if len(df) > 0:
-                    # 저장
-                    file_path = os.path.join(self.kr_dir, f"{symbol}.csv")
-                    df.to_csv(file_path)
-                    success_count += 1
-                else:
-                    fail_count += 1
-                
-                # API 제한 방지
-                time.sleep(0.1)
-            
-            except Exception as e:
-                fail_count += 1
-                continue
-        
-        print(f"\n✅ 다운로드 완료: {success_count:,}개 성공, {fail_count:,}개 실패")
+        downloader = IncrementalDownloader(_fetch_kr, self.kr_dir, workers=workers)
+        return downloader.run(stock_list['Symbol'].tolist(), self.start_date, self.end_date,
+                              incremental=incremental, desc="KR Stocks")
     
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # 전체 실행
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     
-    def collect_all(self, us_max=None, kr_max=None):
+    def collect_all(self, us_max=None, kr_max=None, incremental=True, workers=8):
         """
         전체 데이터 수집
         
         Args:
             us_max: 미국 종목 최대 개수 (None이면 전체)
             kr_max: 한국 종목 최대 개수 (None이면 전체)
+            incremental: 증분 갱신 여부 (기존 파일은 새 봉만 추가)
+            workers: 동시 다운로드 수
         """
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 1. 미국 종목
@@ -326,7 +293,7 @@ class UniversalDataCollector:
         us_list = self.get_us_stock_list()
         
         if len(us_list) > 0:
-            self.download_us_data(us_list, max_stocks=us_max)
+            self.download_us_data(us_list, max_stocks=us_max, incremental=incremental, workers=workers)
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 2. 한국 종목
@@ -335,7 +302,7 @@ class UniversalDataCollector:
         kr_list = self.get_kr_stock_list()
         
         if len(kr_list) > 0:
-            self.download_kr_data(kr_list, max_stocks=kr_max)
+            self.download_kr_data(kr_list, max_stocks=kr_max, incremental=incremental, workers=workers)
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         # 완료
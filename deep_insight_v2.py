@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 import warnings
 from typing import Dict, List, Tuple, Optional
 from scipy.stats import pearsonr
@@ -8,6 +9,11 @@ from datetime import datetime, timedelta
 
 warnings.filterwarnings('ignore')
 
+# ISATS_Ferrari 패키지 (패턴 검색 엔진 + 가격 저장소)
+FERRARI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ISATS_Ferrari")
+sys.path.append(FERRARI_DIR)
+from core.pattern_search import PatternSearchEngine
+
 try:
     import FinanceDataReader as fdr
 except ImportError:
@@ -20,34 +26,42 @@ except ImportError:
 # ==========================================
 
 class PatternMatcher:
-    """간단한 패턴 매칭 엔진 (내장)"""
+    """패턴 매칭 엔진 (core.pattern_search 기반, 전 종목 FFT 유사도 검색)"""
     
-    def __init__(self, data_dir="data"):
+    def __init__(self, data_dir=os.path.join(FERRARI_DIR, "data")):
         self.data_dir = data_dir
-        self.db_cache = []
+        self.engine = PatternSearchEngine([os.path.join(data_dir, "KR"), os.path.join(data_dir, "US")])
         
     def load_database(self):
-        """로컬 DB 로드"""
+        """로컬 DB 로드 (가격 저장소 → 종가 배열, 변경된 CSV만 재로딩)"""
         print("📚 [PatternDB] 역사적 데이터 로딩...")
-        # 실제 구현 시 CSV 파일들 로드
-        # 여기서는 간단히 패스
-        pass
+        self.engine.load()
     
     def normalize(self, series: np.ndarray) -> np.ndarray:
         """Z-Score 정규화"""
         return (series - np.mean(series)) / (np.std(series) + 1e-8)
     
     def find_similar_patterns(self, target_close: np.ndarray, 
-                            window=60, top_k=5) -> List[Dict]:
+                            window=60, top_k=5, before=None) -> List[Dict]:
         """
         유사 패턴 검색
         
-        실제 구현에서는 DB에서 검색하지만,
-        여기서는 간단한 시뮬레이션 결과 반환
+        Args:
+            target_close: 종가 배열 (마지막 window일 사용)
+            window: 패턴 길이
+            top_k: 반환할 사례 수
+            before: 이 날짜 이전에 끝난 과거 사례만 사용
+        
+        Returns:
+            List[Dict]: ticker / start / end / similarity / forward_return
         """
-        # 실전에서는 여기에 Time Crystal의 로직 적용
-        # 지금은 더미 데이터 반환
-        return []
+        return self.search(target_close, window, top_k, before)['matches']
+    
+    def search(self, target_close: np.ndarray, window=60, top_k=100, before=None) -> Dict:
+        """유사 패턴 + 승률 통계 (similarity / win_probability / expected_return, %)"""
+        if not self.engine.loaded:
+            self.load_database()
+        return self.engine.search(np.asarray(target_close, dtype=float)[-window:], top_k=top_k, before=before)
 
 
 class TechnicalAnalyzer:
@@ -297,9 +311,15 @@ class DeepInsightV2:
             score += 1
             reasons.append("매집 신호")
         
-        # 3. 패턴 매칭 (3점) - 실제 구현 시
-        # if analysis['pattern']['win_rate'] > 70:
-        #     score += 3
+        # 3. 패턴 매칭 (3점)
+        pattern = analysis.get('pattern')
+        if pattern and pattern['matches']:
+            if pattern['win_probability'] > 70:
+                score += 3
+                reasons.append(f"유사 패턴 승률 {pattern['win_probability']:.0f}%")
+            elif pattern['win_probability'] > 60:
+                score += 1
+                reasons.append(f"유사 패턴 승률 {pattern['win_probability']:.0f}%")
         
         return min(score, 10), reasons
     
@@ -397,7 +417,19 @@ class DeepInsightV2:
         print(f"      분산 점수: {accumulation['distribution_score']:.2f}")
         print(f"      → {accumulation['signal']} 신호")
         
-        # 4. 종합 점수
+        # 4. 과거 패턴 매칭
+        print(f"\n{'─'*60}")
+        print("🔮 [패턴 매칭]")
+        print(f"{'─'*60}")
+        
+        pattern = self.pattern_matcher.search(
+            df['Close'].values, window=60, top_k=100, before=pd.Timestamp(df['Date'].iloc[-60])
+        )
+        print(f"   유사도: {pattern['similarity']:.1f}% (상위 {len(pattern['matches'])}개 사례)")
+        print(f"   5일 후 상승 확률: {pattern['win_probability']:.1f}%")
+        print(f"   평균 5일 수익률: {pattern['expected_return']:+.2f}%")
+        
+        # 5. 종합 점수
         analysis = {
             'ticker': ticker,
             'current_price': current_price,
@@ -412,7 +444,8 @@ class DeepInsightV2:
                 'strength_ratio': vol_profile['strength_ratio'],
                 'volume_ratio': vol_profile['volume_ratio'],
                 'accumulation': accumulation
-            }
+            },
+            'pattern': pattern
         }
         
         score, reasons = self.calculate_score(analysis)